@@ -35,7 +35,7 @@
 #
 ##########################################################################
 
-import os, sys, traceback
+import os, sys, json, traceback
 
 import imath
 
@@ -109,6 +109,18 @@ class execute( Gaffer.Application ) :
 					},
 				),
 
+				IECore.BoolParameter(
+					name = "worker",
+					description = "Runs as a persistent worker process, as used by the "
+						"LocalDispatcher. The script is loaded once, and then requests "
+						"are read from stdin, one per line. Each request is a JSON "
+						"object with \"nodes\", \"frames\" and \"context\" entries "
+						"matching the parameters above, and the result of each "
+						"request is written to stdout as a single line containing "
+						"0 on success and 1 on failure.",
+					defaultValue = False,
+				),
+
 			]
 
 		)
@@ -131,9 +143,43 @@ class execute( Gaffer.Application ) :
 
 		self.root()["scripts"].addChild( scriptNode )
 
+		if args["worker"].value :
+			return self.__runWorker( scriptNode )
+
+		frames = self.parameters()["frames"].getFrameListValue().asList()
+		return self.__execute( scriptNode, args["nodes"], frames, args["context"] )
+
+	def __runWorker( self, scriptNode ) :
+
+		# Stdout is reserved for our responses, so redirect it to stderr
+		# to prevent output from the tasks themselves from interfering.
+		responses = os.fdopen( os.dup( sys.stdout.fileno() ), "w" )
+		sys.stdout.flush()
+		os.dup2( sys.stderr.fileno(), sys.stdout.fileno() )
+
+		for line in iter( sys.stdin.readline, "" ) :
+
+			if not line.strip() :
+				continue
+
+			try :
+				request = json.loads( line )
+				frames = IECore.FrameList.parse( request["frames"] ).asList()
+				result = self.__execute( scriptNode, request["nodes"], frames, request["context"] )
+			except Exception as exception :
+				IECore.msg( IECore.Msg.Level.Error, "gaffer execute : worker", str( exception ) )
+				result = 1
+
+			responses.write( "%d\n" % result )
+			responses.flush()
+
+		return 0
+
+	def __execute( self, scriptNode, nodeNames, frames, contextArgs ) :
+
 		nodes = []
-		if len( args["nodes"] ) :
-			for nodeName in args["nodes"] :
+		if len( nodeNames ) :
+			for nodeName in nodeNames :
 				node = scriptNode.descendant( nodeName )
 				if node is None :
 					IECore.msg( IECore.Msg.Level.Error, "gaffer execute", "Node \"%s\" does not exist" % nodeName )
@@ -150,16 +196,15 @@ class execute( Gaffer.Application ) :
 				IECore.msg( IECore.Msg.Level.Error, "gaffer execute", "Script has no executable nodes" )
 				return 1
 
-		if len(args["context"]) % 2 :
+		if len( contextArgs ) % 2 :
 			IECore.msg( IECore.Msg.Level.Error, "gaffer execute", "Context parameter must have matching entry/value pairs" )
 			return 1
 
 		context = Gaffer.Context( scriptNode.context() )
-		for i in range( 0, len(args["context"]), 2 ) :
-			entry = args["context"][i].lstrip( "-" )
-			context[entry] = eval( args["context"][i+1] )
+		for i in range( 0, len( contextArgs ), 2 ) :
+			entry = contextArgs[i].lstrip( "-" )
+			context[entry] = eval( contextArgs[i+1] )
 
-		frames = self.parameters()["frames"].getFrameListValue().asList()
 		if not frames :
 			frames = [ scriptNode.context().getFrame() ]
 
@@ -200,6 +200,51 @@ class stats( Gaffer.Application ) :
 					defaultValue = 50,
 				),
 
+				IECore.BoolParameter(
+					name = "samplingMonitor",
+					description = "Turns on a sampling monitor, which periodically records "
+						"the processes running on each thread. This provides inclusive and "
+						"exclusive timings per plug and per node type, with much lower "
+						"overhead than the performance monitor.",
+					defaultValue = False,
+				),
+
+				IECore.IntParameter(
+					name = "samplingInterval",
+					description = "The interval between samples taken by the sampling "
+						"monitor, measured in microseconds.",
+					defaultValue = 1000,
+					minValue = 1,
+				),
+
+				IECore.FileNameParameter(
+					name = "collapsedStacks",
+					description = "Writes the stacks recorded by the sampling monitor "
+						"to this file, in the collapsed format used by `flamegraph.pl` "
+						"and speedscope. Implies `-samplingMonitor`.",
+					defaultValue = "",
+					allowEmptyString = True,
+				),
+
+				IECore.FileNameParameter(
+					name = "timeline",
+					description = "Turns on a timeline monitor which records every process, "
+						"and writes the result to this file in the Chrome trace event format. "
+						"The file may be viewed using `chrome://tracing` or Perfetto, to "
+						"examine the scheduling of work among threads.",
+					defaultValue = "",
+					allowEmptyString = True,
+					extensions = "json",
+				),
+
+				IECore.BoolParameter(
+					name = "cacheStatistics",
+					description = "Turns on collection of detailed statistics for the "
+						"compute and hash caches, including a breakdown by plug type and "
+						"node type.",
+					defaultValue = False,
+				),
+
 				IECore.BoolParameter(
 					name = "contextMonitor",
 					description = "Turns on a Context monitor to provide additional "
@@ -263,6 +308,14 @@ class stats( Gaffer.Application ) :
 					defaultValue = 0,
 				),
 
+				IECore.IntParameter(
+					name = "hashCacheMemoryLimit",
+					description = "A memory limit for the hash cache, measured in Mb and shared "
+						"between all threads. When specified, this takes precedence over the "
+						"per-thread `hashCacheSizeLimit`.",
+					defaultValue = 0,
+				),
+
 			]
 
 		)
@@ -279,6 +332,8 @@ class stats( Gaffer.Application ) :
 			Gaffer.ValuePlug.setCacheMemoryLimit( 1024 * 1024 * args["cacheMemoryLimit"].value )
 		if args["hashCacheSizeLimit"].value :
 			Gaffer.ValuePlug.setHashCacheSizeLimit( args["hashCacheSizeLimit"].value )
+		if args["hashCacheMemoryLimit"].value :
+			Gaffer.ValuePlug.setHashCacheMemoryLimit( 1024 * 1024 * args["hashCacheMemoryLimit"].value )
 
 		self.__timers = collections.OrderedDict()
 		self.__memory = collections.OrderedDict()
@@ -304,6 +359,11 @@ class stats( Gaffer.Application ) :
 					postLoadScriptExecutionContext, postLoadScriptExecutionContext
 				)
 
+		# Only report cache statistics for the computations we're measuring.
+		Gaffer.ValuePlug.setCacheStatisticsEnabled( args["cacheStatistics"].value )
+		Gaffer.ValuePlug.resetHashCacheStatistics()
+		Gaffer.ValuePlug.resetComputeCacheStatistics()
+
 		if args["performanceMonitor"].value :
 			self.__performanceMonitor = Gaffer.PerformanceMonitor()
 		else :
@@ -320,6 +380,16 @@ class stats( Gaffer.Application ) :
 		else :
 			self.__contextMonitor = None
 
+		if args["samplingMonitor"].value or args["collapsedStacks"].value :
+			self.__samplingMonitor = Gaffer.SamplingMonitor( args["samplingInterval"].value )
+		else :
+			self.__samplingMonitor = None
+
+		if args["timeline"].value :
+			self.__timelineMonitor = Gaffer.TimelineMonitor()
+		else :
+			self.__timelineMonitor = None
+
 		if args["vtune"].value :
 			try:
 				self.__vtuneMonitor = Gaffer.VTuneMonitor()
@@ -372,6 +442,10 @@ class stats( Gaffer.Application ) :
 
 		self.__output.write( "\n" )
 
+		self.__writeCaches( args )
+
+		self.__output.write( "\n" )
+
 		self.__writePerformance( script, args )
 
 		self.__output.write( "\n" )
@@ -382,6 +456,12 @@ class stats( Gaffer.Application ) :
 
 		self.__output.close()
 
+		if self.__timelineMonitor is not None :
+			self.__timelineMonitor.writeChromeTrace( args["timeline"].value )
+
+		if args["collapsedStacks"].value :
+			self.__samplingMonitor.writeCollapsedStacks( args["collapsedStacks"].value )
+
 		if args["annotatedScript"].value :
 
 			if self.__performanceMonitor is not None :
@@ -503,7 +583,7 @@ class stats( Gaffer.Application ) :
 		memory = _Memory.maxRSS()
 		# We don't expect serialisation to trigger any processes that the monitors would see,
 		# but we definitely want to know if they do.
-		with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__vtuneMonitor or _NullContextManager() :
+		with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__vtuneMonitor or _NullContextManager(), self.__timelineMonitor or _NullContextManager(), self.__samplingMonitor or _NullContextManager() :
 			with _Timer() as timer :
 				script.serialise()
 
@@ -559,7 +639,7 @@ class stats( Gaffer.Application ) :
 			computeScene()
 
 		memory = _Memory.maxRSS()
-		with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__vtuneMonitor or _NullContextManager() :
+		with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__vtuneMonitor or _NullContextManager(), self.__timelineMonitor or _NullContextManager(), self.__samplingMonitor or _NullContextManager() :
 			with contextSanitiser :
 				with _Timer() as sceneTimer :
 					computeScene()
@@ -601,7 +681,7 @@ class stats( Gaffer.Application ) :
 			computeImage()
 
 		memory = _Memory.maxRSS()
-		with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__vtuneMonitor or _NullContextManager() :
+		with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__vtuneMonitor or _NullContextManager(), self.__timelineMonitor or _NullContextManager(), self.__samplingMonitor or _NullContextManager() :
 			with contextSanitiser :
 				with _Timer() as imageTimer :
 					computeImage()
@@ -636,7 +716,7 @@ class stats( Gaffer.Application ) :
 
 		memory = _Memory.maxRSS()
 		with _Timer() as taskTimer :
-			with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__vtuneMonitor or _NullContextManager() :
+			with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__vtuneMonitor or _NullContextManager(), self.__timelineMonitor or _NullContextManager(), self.__samplingMonitor or _NullContextManager() :
 				with self.__context( script, args ) as context :
 					for frame in self.__frames( script, args ) :
 						context.setFrame( frame )
@@ -656,6 +736,9 @@ class stats( Gaffer.Application ) :
 			( "Cache limit", _Memory( Gaffer.ValuePlug.getCacheMemoryLimit() ) ),
 			( "Cache usage", _Memory( Gaffer.ValuePlug.cacheMemoryUsage() ) ),
 			( "", "" ),
+			( "Hash cache limit", _Memory( Gaffer.ValuePlug.getHashCacheMemoryLimit() ) if Gaffer.ValuePlug.getHashCacheMemoryLimit() else "{} per thread".format( Gaffer.ValuePlug.getHashCacheSizeLimit() ) ),
+			( "Hash cache usage", _Memory( Gaffer.ValuePlug.hashCacheMemoryUsage() ) ),
+			( "", "" ),
 			( "Object pool limit", _Memory( objectPool.getMaxMemoryUsage() ) ),
 			( "Object pool usage", _Memory( objectPool.memoryUsage() ) ),
 		] )
@@ -676,6 +759,49 @@ class stats( Gaffer.Application ) :
 		self.__output.write( "Memory :\n\n" )
 		self.__writeItems( items )
 
+	def __writeCaches( self, args ) :
+
+		def formatStatistics( name, stats ) :
+
+			lookups = stats.hits + stats.misses
+			return [
+				( name + " hits", stats.hits ),
+				( name + " misses", stats.misses ),
+				( name + " hit rate", "{:.1f}%".format( 100.0 * stats.hits / lookups ) if lookups else "-" ),
+				( name + " evictions", stats.evictions ),
+			]
+
+		items = formatStatistics( "Hash cache", Gaffer.ValuePlug.hashCacheStatistics() )
+		if Gaffer.ValuePlug.getCacheStatisticsEnabled() :
+			computeStatistics = Gaffer.ValuePlug.computeCacheStatistics()
+			items.append( ( "", "" ) )
+			items.extend( formatStatistics( "Compute cache", computeStatistics ) )
+			items.append( ( "Compute cache waits", computeStatistics.waits ) )
+			items.append( ( "Compute cache cost", _Memory( computeStatistics.cost ) ) )
+
+		self.__output.write( "Caches :\n\n" )
+		self.__writeItems( items )
+
+		if not Gaffer.ValuePlug.getCacheStatisticsEnabled() :
+			return
+
+		computeByPlugType = Gaffer.ValuePlug.computeCacheStatisticsByPlugType()
+		computeByNodeType = Gaffer.ValuePlug.computeCacheStatisticsByNodeType()
+		for title, byType, metric in [
+			( "Compute cache misses by plug type", computeByPlugType, "misses" ),
+			( "Compute cache evictions by plug type", computeByPlugType, "evictions" ),
+			( "Compute cache misses by node type", computeByNodeType, "misses" ),
+			( "Compute cache waits by node type", computeByNodeType, "waits" ),
+			( "Hash cache misses by plug type", Gaffer.ValuePlug.hashCacheStatisticsByPlugType(), "misses" ),
+			( "Hash cache misses by node type", Gaffer.ValuePlug.hashCacheStatisticsByNodeType(), "misses" ),
+		] :
+			items = sorted(
+				[ ( typeName, getattr( stats, metric ) ) for typeName, stats in byType.items() ],
+				key = lambda x : x[1], reverse = True
+			)
+			self.__output.write( "\n{} :\n\n".format( title ) )
+			self.__writeItems( items[:args["maxLinesPerMetric"].value] )
+
 	def __writeStatisticsItems( self, script, stats, key, n ) :
 
 		stats.sort( key = key, reverse = True )
@@ -695,6 +821,30 @@ class stats( Gaffer.Application ) :
 					)
 				)
 
+			if self.__samplingMonitor is not None :
+				self.__writeSampling( script, args )
+
+	def __writeSampling( self, script, args ) :
+
+			self.__output.write( "\nSampling :\n\n" )
+			self.__writeItems( [
+				( "Samples", self.__samplingMonitor.numSamples() ),
+				( "Sampled time", "{:.3f}s".format( self.__samplingMonitor.combinedStatistics().inclusiveDuration / 1e9 ) ),
+			] )
+
+			n = args["maxLinesPerMetric"].value
+			plugStatistics = list( self.__samplingMonitor.allStatistics().items() )
+			nodeTypeStatistics = list( self.__samplingMonitor.nodeTypeStatistics().items() )
+			for title, stats, name, metric in [
+				( "Inclusive time", plugStatistics, lambda x : x.relativeName( script ), "inclusiveDuration" ),
+				( "Exclusive time", plugStatistics, lambda x : x.relativeName( script ), "exclusiveDuration" ),
+				( "Inclusive time by node type", nodeTypeStatistics, str, "inclusiveDuration" ),
+				( "Exclusive time by node type", nodeTypeStatistics, str, "exclusiveDuration" ),
+			] :
+				stats.sort( key = lambda x : getattr( x[1], metric ), reverse = True )
+				self.__output.write( "\n{} :\n\n".format( title ) )
+				self.__writeItems( [ ( name( x[0] ), "{:.3f}s".format( getattr( x[1], metric ) / 1e9 ) ) for x in stats[:n] ] )
+
 	def __writeContext( self, script, args ) :
 
 			if self.__contextMonitor is None :
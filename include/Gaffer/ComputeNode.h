@@ -84,6 +84,15 @@ class GAFFER_API ComputeNode : public DependencyNode
 		/// Called to determine how calls to `compute()` should be cached. If `compute( output )`
 		/// will spawn TBB tasks then one of the task-based policies _must_ be used.
 		virtual ValuePlug::CachePolicy computeCachePolicy( const ValuePlug *output ) const;
+		/// May be implemented to declare that the value of `output` depends only
+		/// on the returned context variables, rather than on the context as a whole.
+		/// Hashes are then cached using only these variables, so that both hashes and
+		/// computed values are shared between contexts which differ only in other
+		/// variables. This must account for the variables used by any upstream
+		/// computations as well as by the node itself. Returns nullptr by default,
+		/// meaning that any variable may be relevant. Called for every hash cache
+		/// lookup, so must be fast.
+		virtual const std::vector<IECore::InternedString> *relevantContextVariables( const ValuePlug *output ) const;
 
 	private :
 
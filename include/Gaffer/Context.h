@@ -373,13 +373,17 @@ class GAFFER_API Context : public IECore::RefCounted
 		const Value &internalGet( const IECore::InternedString &name ) const;
 		// Returns nullptr if variable doesn't exist.
 		const Value *internalGetIfExists( const IECore::InternedString &name ) const;
+		// Because `hash()` is a sum of the hashes of all the variables, it
+		// can be updated in constant time when a single variable changes, by
+		// subtracting the old hash of the variable and adding the new one.
+		void updateHash( const IECore::MurmurHash &oldHash, const IECore::MurmurHash &newHash );
 
 		typedef boost::container::flat_map<IECore::InternedString, Value> Map;
 
 		Map m_map;
 		ChangedSignal *m_changedSignal;
-		mutable IECore::MurmurHash m_hash;
-		mutable bool m_hashValid;
+		// Sum of the hashes of all variables, maintained by `updateHash()`.
+		IECore::MurmurHash m_hash;
 		const IECore::Canceller *m_canceller;
 
 		// The alloc map holds a smart pointer to data that we allocate.  It must keep the entries
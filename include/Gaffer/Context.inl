@@ -173,8 +173,9 @@ inline bool Context::internalSet( const IECore::InternedString &name, const Valu
 		// Fast path, typically in an EditableScope, where we
 		// expect the value to have changed and don't want the
 		// expense of checking.
-		m_map[name] = value;
-		m_hashValid = false;
+		Value &v = m_map[name];
+		updateHash( v.hash(), value.hash() );
+		v = value;
 		return true;
 	}
 	else
@@ -185,8 +186,8 @@ inline bool Context::internalSet( const IECore::InternedString &name, const Valu
 		Value &v = m_map[name];
 		if( v != value )
 		{
+			updateHash( v.hash(), value.hash() );
 			v = value;
-			m_hashValid = false;
 			(*m_changedSignal)( this, name );
 			return true;
 		}
@@ -197,6 +198,16 @@ inline bool Context::internalSet( const IECore::InternedString &name, const Valu
 	}
 }
 
+inline void Context::updateHash( const IECore::MurmurHash &oldHash, const IECore::MurmurHash &newHash )
+{
+	// Unsigned arithmetic wraps, so this is exact even
+	// if the sums overflow.
+	m_hash = IECore::MurmurHash(
+		m_hash.h1() - oldHash.h1() + newHash.h1(),
+		m_hash.h2() - oldHash.h2() + newHash.h2()
+	);
+}
+
 inline const Context::Value &Context::internalGet( const IECore::InternedString &name ) const
 {
 	const Value *result = internalGetIfExists( name );
@@ -182,6 +182,7 @@ class GAFFER_API Expression : public ComputeNode
 		void compute( ValuePlug *output, const Context *context ) const override;
 
 		Gaffer::ValuePlug::CachePolicy computeCachePolicy( const Gaffer::ValuePlug *output ) const override;
+		const std::vector<IECore::InternedString> *relevantContextVariables( const Gaffer::ValuePlug *output ) const override;
 
 	private :
 
@@ -221,9 +222,13 @@ class GAFFER_API Expression : public ComputeNode
 		std::string transcribe( const std::string &expression, bool toInternalForm ) const;
 
 		void plugSet( const Plug *plug );
+		void plugInputChanged( const Plug *plug );
+		void updateStaticInputs();
 
 		EnginePtr m_engine;
 		std::vector<IECore::InternedString> m_contextNames;
+		// True if none of the inputs to the expression are computed.
+		bool m_staticInputs;
 
 		ExpressionChangedSignal m_expressionChangedSignal;
 
@@ -291,6 +291,7 @@ class GAFFER_API GraphComponent : public IECore::RunTimeTyped, public boost::sig
 		static std::string unprefixedTypeName( const char *typeName );
 
 		void throwIfChildRejected( const GraphComponent *potentialChild ) const;
+		const GraphComponent *getChildInternal( const IECore::InternedString &name ) const;
 		void setNameInternal( const IECore::InternedString &name );
 		void addChildInternal( GraphComponentPtr child, size_t index );
 		void removeChildInternal( GraphComponentPtr child, bool emitParentChanged );
@@ -299,10 +300,15 @@ class GAFFER_API GraphComponent : public IECore::RunTimeTyped, public boost::sig
 		struct Signals;
 		Signals *signals();
 
+		// Index from name to child, used to accelerate `getChild()` and
+		// `setName()`. Only built for GraphComponents with many children.
+		struct NameIndex;
+
 		std::unique_ptr<Signals> m_signals;
 		IECore::InternedString m_name;
 		GraphComponent *m_parent;
 		ChildContainer m_children;
+		std::unique_ptr<NameIndex> m_nameIndex;
 
 };
 
@@ -0,0 +1,203 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2021, Cinesite VFX Ltd. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#ifndef GAFFER_SAMPLINGMONITOR_H
+#define GAFFER_SAMPLINGMONITOR_H
+
+#include "Gaffer/Monitor.h"
+
+#include "IECore/InternedString.h"
+#include "IECore/TypeIds.h"
+
+#include "boost/chrono.hpp"
+#include "boost/unordered_map.hpp"
+
+#include "tbb/enumerable_thread_specific.h"
+#include "tbb/spin_mutex.h"
+
+#include <condition_variable>
+#include <iosfwd>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace Gaffer
+{
+
+IE_CORE_FORWARDDECLARE( Plug )
+
+/// A low overhead alternative to the PerformanceMonitor. Rather than
+/// timing every process, a background thread periodically samples the
+/// stack of processes running on each thread, and attributes the time
+/// between samples to the plugs in those stacks. The cost per process is
+/// just a push and a pop, so the SamplingMonitor may be used to profile
+/// large graphs without significantly perturbing the timings it measures.
+/// Being statistical, the results are only meaningful for plugs which
+/// account for many sampling intervals.
+class GAFFER_API SamplingMonitor : public Monitor
+{
+
+	public :
+
+		SamplingMonitor( boost::chrono::microseconds interval = boost::chrono::microseconds( 1000 ) );
+		~SamplingMonitor() override;
+
+		IE_CORE_DECLAREMEMBERPTR( SamplingMonitor )
+
+		boost::chrono::microseconds interval() const;
+
+		struct Statistics
+		{
+
+			Statistics(
+				boost::chrono::nanoseconds inclusiveDuration = boost::chrono::nanoseconds( 0 ),
+				boost::chrono::nanoseconds exclusiveDuration = boost::chrono::nanoseconds( 0 )
+			);
+
+			/// Time spent in processes for the plug, including
+			/// time spent in the upstream processes they depend on.
+			boost::chrono::nanoseconds inclusiveDuration;
+			/// Time spent in processes for the plug itself.
+			boost::chrono::nanoseconds exclusiveDuration;
+
+			Statistics & operator += ( const Statistics &rhs );
+
+			bool operator == ( const Statistics &rhs ) const;
+			bool operator != ( const Statistics &rhs ) const;
+
+		};
+
+		typedef boost::unordered_map<ConstPlugPtr, Statistics> StatisticsMap;
+		typedef std::map<IECore::TypeId, Statistics> NodeTypeStatisticsMap;
+
+		/// Returns the number of samples taken where at least one
+		/// thread was performing a process.
+		size_t numSamples() const;
+
+		StatisticsMap allStatistics() const;
+		Statistics plugStatistics( const Plug *plug ) const;
+		/// Statistics for all plugs belonging to each type of node.
+		NodeTypeStatisticsMap nodeTypeStatistics() const;
+		/// Total sampled duration, summed across all threads.
+		Statistics combinedStatistics() const;
+
+		/// Writes the sampled stacks in the "collapsed" format used by
+		/// `flamegraph.pl` and speedscope. Each line contains a unique
+		/// stack, with frames separated by `;` from the root process to
+		/// the leaf, followed by the number of times it was sampled.
+		void writeCollapsedStacks( std::ostream &stream ) const;
+		void writeCollapsedStacks( const std::string &fileName ) const;
+
+	protected :
+
+		void processStarted( const Process *process ) override;
+		void processFinished( const Process *process ) override;
+
+	private :
+
+		struct Frame
+		{
+			const Process *process;
+			const Plug *plug;
+			IECore::InternedString type;
+			// True for frames belonging to a parent process on
+			// another thread, on whose behalf we are working.
+			bool inherited;
+		};
+
+		// The stack of processes running on a single thread. This is
+		// modified only by the thread itself, and read by the sampling
+		// thread, so the mutex is almost always uncontended.
+		struct ThreadData
+		{
+			tbb::spin_mutex mutex;
+			std::vector<Frame> stack;
+			// Indices into `stack` where processes started on behalf of
+			// an unrelated parent begin. Only the last segment is running,
+			// the others are suspended waiting for work to complete.
+			std::vector<size_t> segments;
+		};
+
+		ThreadData &threadData();
+
+		typedef std::unique_ptr<ThreadData> ThreadDataPtr;
+		tbb::enumerable_thread_specific<ThreadData *, tbb::cache_aligned_allocator<ThreadData *>, tbb::ets_key_per_instance> m_threadData;
+		// Owns the ThreadData for all threads, so that the sampling
+		// thread can iterate them while new threads are being registered.
+		std::mutex m_threadsMutex;
+		std::vector<ThreadDataPtr> m_threads;
+
+		struct SampledFrame
+		{
+			ConstPlugPtr plug;
+			IECore::InternedString type;
+			bool operator < ( const SampledFrame &rhs ) const;
+		};
+
+		typedef std::vector<SampledFrame> SampledStack;
+
+		struct StackStatistics
+		{
+			size_t samples = 0;
+			boost::chrono::nanoseconds duration = boost::chrono::nanoseconds( 0 );
+		};
+
+		typedef std::map<SampledStack, StackStatistics> StackMap;
+
+		void samplingLoop();
+		void sample( boost::chrono::nanoseconds duration );
+
+		const boost::chrono::microseconds m_interval;
+
+		mutable std::mutex m_samplesMutex;
+		StackMap m_stacks;
+		size_t m_numSamples;
+
+		std::mutex m_stopMutex;
+		std::condition_variable m_stopCondition;
+		bool m_stop;
+		std::thread m_samplingThread;
+
+};
+
+IE_CORE_DECLAREPTR( SamplingMonitor )
+
+} // namespace Gaffer
+
+#endif // GAFFER_SAMPLINGMONITOR_H
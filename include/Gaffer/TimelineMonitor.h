@@ -0,0 +1,147 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2021, Cinesite VFX Ltd. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#ifndef GAFFER_TIMELINEMONITOR_H
+#define GAFFER_TIMELINEMONITOR_H
+
+#include "Gaffer/Monitor.h"
+
+#include "IECore/InternedString.h"
+#include "IECore/MurmurHash.h"
+
+#include "boost/chrono.hpp"
+
+#include "tbb/concurrent_hash_map.h"
+#include "tbb/enumerable_thread_specific.h"
+
+#include <atomic>
+#include <iosfwd>
+#include <limits>
+#include <vector>
+
+namespace Gaffer
+{
+
+IE_CORE_FORWARDDECLARE( Plug )
+
+/// A monitor which records a timeline of every process, noting
+/// when and on which thread it ran, and which process it was
+/// performed on behalf of. This is useful for identifying
+/// serialisation points and poor utilisation of threads, but
+/// has significantly more overhead than the PerformanceMonitor.
+class GAFFER_API TimelineMonitor : public Monitor
+{
+
+	public :
+
+		TimelineMonitor();
+		~TimelineMonitor() override;
+
+		IE_CORE_DECLAREMEMBERPTR( TimelineMonitor )
+
+		struct Event
+		{
+			/// Unique identifier for the process.
+			uint64_t id;
+			/// Identifier for the parent process, or 0 if the
+			/// process had no parent or the parent was not
+			/// recorded by this monitor.
+			uint64_t parentId;
+			/// The type of process.
+			IECore::InternedString type;
+			ConstPlugPtr plug;
+			IECore::MurmurHash contextHash;
+			/// The index of the thread which performed the process,
+			/// in the order that threads were first seen by the monitor.
+			size_t threadIndex;
+			/// Times are measured relative to the construction
+			/// of the monitor.
+			boost::chrono::nanoseconds startTime;
+			boost::chrono::nanoseconds finishTime;
+		};
+
+		typedef std::vector<Event> Events;
+
+		/// Returns events for all completed processes, sorted
+		/// by start time.
+		Events events() const;
+
+		/// Writes all events as JSON in the Chrome trace event format,
+		/// suitable for viewing in `chrome://tracing` or Perfetto.
+		void writeChromeTrace( std::ostream &stream ) const;
+		void writeChromeTrace( const std::string &fileName ) const;
+
+	protected :
+
+		void processStarted( const Process *process ) override;
+		void processFinished( const Process *process ) override;
+
+	private :
+
+		boost::chrono::nanoseconds now() const;
+
+		const boost::chrono::high_resolution_clock::time_point m_startTime;
+		std::atomic<uint64_t> m_nextId;
+		std::atomic_size_t m_nextThreadIndex;
+
+		// For performance reasons we record events into thread
+		// local storage while computations are running.
+		struct ThreadData
+		{
+			ThreadData() : threadIndex( std::numeric_limits<size_t>::max() ) {}
+			size_t threadIndex;
+			Events events;
+			// Indices into `events` for processes
+			// which have not finished yet.
+			std::vector<size_t> running;
+		};
+
+		tbb::enumerable_thread_specific<ThreadData, tbb::cache_aligned_allocator<ThreadData>, tbb::ets_key_per_instance> m_threadData;
+
+		// Processes may be performed on behalf of a parent on
+		// another thread, so we keep a shared record of the ids
+		// of all running processes.
+		typedef tbb::concurrent_hash_map<const Process *, uint64_t> ProcessIds;
+		ProcessIds m_runningProcessIds;
+
+};
+
+IE_CORE_DECLAREPTR( TimelineMonitor )
+
+} // namespace Gaffer
+
+#endif // GAFFER_TIMELINEMONITOR_H
@@ -42,6 +42,8 @@
 
 #include "IECore/Object.h"
 
+#include <map>
+
 namespace Gaffer
 {
 
@@ -203,6 +205,136 @@ class GAFFER_API ValuePlug : public Plug
 		static void setHashCacheMode( HashCacheMode hashCacheMode );
 		static HashCacheMode getHashCacheMode();
 
+		/// Returns the memory limit shared by the hash caches of all
+		/// threads, or 0 if the per-thread size limit is in use.
+		static size_t getHashCacheMemoryLimit();
+		/// Sets a memory limit in bytes, shared by the hash caches of all
+		/// threads. When non-zero, this takes precedence over the per-thread
+		/// size limit, and each thread's cache is resized periodically to
+		/// receive a share of the total in proportion to its recent demand.
+		/// Threads with a high miss rate are given a larger share. Passing
+		/// 0 reverts to the per-thread size limit.
+		static void setHashCacheMemoryLimit( size_t bytes );
+		/// Returns an estimate of the memory used by the hash caches of
+		/// all threads.
+		/// > Note : Per-thread usage is sampled periodically, so this is
+		/// > only approximate while computations are being performed.
+		static size_t hashCacheMemoryUsage();
+
+		//@}
+
+		/// @name Cache statistics
+		/// Statistics may be collected to help diagnose poor cache
+		/// performance. Basic statistics for the hash cache are always
+		/// available, but all other statistics are only collected after
+		/// calling `setCacheStatisticsEnabled( true )`. Collection is
+		/// disabled by default, and has negligible overhead when disabled.
+		////////////////////////////////////////////////////////////////////
+		//@{
+		static void setCacheStatisticsEnabled( bool enabled );
+		static bool getCacheStatisticsEnabled();
+
+		struct GAFFER_API HashCacheStatistics
+		{
+			/// Number of hashes retrieved from the cache.
+			uint64_t hits = 0;
+			/// Number of hashes that had to be computed because
+			/// they weren't in the cache.
+			uint64_t misses = 0;
+			/// Number of entries removed from the cache to
+			/// remain within the limits.
+			uint64_t evictions = 0;
+			/// Total cost in bytes of the entries added to
+			/// the cache.
+			uint64_t cost = 0;
+
+			bool operator == ( const HashCacheStatistics &rhs ) const;
+			bool operator != ( const HashCacheStatistics &rhs ) const;
+		};
+
+		typedef std::map<IECore::TypeId, HashCacheStatistics> HashCacheStatisticsMap;
+
+		/// Returns statistics for the hash cache, accumulated since
+		/// the last call to `resetHashCacheStatistics()`.
+		/// > Note : The hash cache does not retain plug types, so
+		/// > evictions are not available in the per-type statistics.
+		static HashCacheStatistics hashCacheStatistics();
+		static HashCacheStatisticsMap hashCacheStatisticsByPlugType();
+		static HashCacheStatisticsMap hashCacheStatisticsByNodeType();
+		static void resetHashCacheStatistics();
+
+		struct GAFFER_API ComputeCacheStatistics
+		{
+			/// Number of values retrieved from the cache.
+			uint64_t hits = 0;
+			/// Number of values that had to be computed because
+			/// they weren't in the cache.
+			uint64_t misses = 0;
+			/// Number of lookups which found the value already
+			/// being computed by another thread, and waited for
+			/// that compute to complete rather than starting
+			/// another. Threads waiting on a `TaskCollaboration`
+			/// compute assist with it.
+			uint64_t waits = 0;
+			/// Number of entries removed from the cache to
+			/// remain within the limits.
+			uint64_t evictions = 0;
+			/// Total cost in bytes of the entries added to
+			/// the cache.
+			uint64_t cost = 0;
+
+			bool operator == ( const ComputeCacheStatistics &rhs ) const;
+			bool operator != ( const ComputeCacheStatistics &rhs ) const;
+		};
+
+		typedef std::map<IECore::TypeId, ComputeCacheStatistics> ComputeCacheStatisticsMap;
+
+		/// Returns statistics for the cache of computed values,
+		/// accumulated since the last call to `resetComputeCacheStatistics()`.
+		static ComputeCacheStatistics computeCacheStatistics();
+		static ComputeCacheStatisticsMap computeCacheStatisticsByPlugType();
+		static ComputeCacheStatisticsMap computeCacheStatisticsByNodeType();
+		static void resetComputeCacheStatistics();
+		//@}
+
+		/// @name Disk cache management
+		/// Values computed using the `Standard` cache policy may also be
+		/// stored in a persistent cache on disk, from where they can be
+		/// reloaded by subsequent processes without being recomputed. The
+		/// disk cache is disabled by default, and must be enabled explicitly
+		/// for each type of plug whose values are to be stored.
+		///
+		/// > Caution : Values are keyed only on the plug hash, which
+		/// > is assumed to identify the value uniquely across processes.
+		/// > This is not true of all nodes. For instance, ImageReader and
+		/// > SceneReader hash the file name and `refreshCount`, but not the
+		/// > modification time of the file. If a file is edited between
+		/// > sessions, stale values will be loaded from the disk cache until
+		/// > it is cleared using `clearDiskCache()`. The disk cache should
+		/// > therefore only be enabled for plug types whose values are computed
+		/// > from inputs that don't change between sessions.
+		////////////////////////////////////////////////////////////////////
+		//@{
+		/// Returns the directory used to store the disk cache.
+		static std::string getDiskCacheDirectory();
+		/// Sets the directory used to store the disk cache, creating it
+		/// if necessary. An empty string disables the disk cache.
+		static void setDiskCacheDirectory( const std::string &directory );
+		/// Returns true if the disk cache is used for plugs of the
+		/// specified type.
+		static bool getDiskCacheEnabled( IECore::TypeId plugType );
+		/// Enables or disables the disk cache for plugs of the
+		/// specified type. Plugs of derived types are not affected.
+		static void setDiskCacheEnabled( IECore::TypeId plugType, bool enabled );
+		/// Returns the maximum size of the disk cache in bytes.
+		static size_t getDiskCacheSizeLimit();
+		/// Sets the maximum size of the disk cache in bytes. When the
+		/// limit is exceeded, the least recently used files are removed.
+		static void setDiskCacheSizeLimit( size_t bytes );
+		/// Returns the size of the files in the disk cache in bytes.
+		static size_t diskCacheUsage();
+		/// Removes all files from the disk cache.
+		static void clearDiskCache();
 		//@}
 
 		/// Returns a counter that increments when this plug is been dirtied
@@ -257,6 +389,21 @@ class GAFFER_API ValuePlug : public Plug
 		/// not be changed following the call.
 		void setObjectValue( IECore::ConstObjectPtr value );
 
+		/// Returns the value of `plug` from the compute cache, or null if
+		/// it is not cached. The hash must be that returned by `plug->hash()`
+		/// in the relevant context. This never triggers a computation. It is
+		/// intended for use by derived classes which compute the values of
+		/// several plugs at once, allowing them to compute only the values
+		/// which are not already cached.
+		static IECore::ConstObjectPtr getCachedObjectValue( const ValuePlug *plug, const IECore::MurmurHash &hash );
+		/// Stores a value computed for `plug` in the compute cache, so that
+		/// subsequent calls to `getValue()` return it rather than computing it
+		/// again. The hash must be that returned by `plug->hash()` in the
+		/// context the value was computed for, and the value must be identical
+		/// to the one `getValue()` would compute. Has no effect if the value is
+		/// already cached, or if the cache policy for `plug` is `Uncached`.
+		static void setCachedObjectValue( const ValuePlug *plug, const IECore::MurmurHash &hash, const IECore::ConstObjectPtr &value );
+
 		/// Reimplemented to emit `plugSetSignal()` for the parent plugs.
 		void parentChanged( Gaffer::GraphComponent *oldParent ) override;
 		/// Reimplemented for cache management.
@@ -55,6 +55,12 @@ class GAFFERIMAGE_API Blur : public FlatImageProcessor
 
 		GAFFER_NODE_DECLARE_TYPE( GafferImage::Blur, BlurTypeId, FlatImageProcessor );
 
+		enum Mode
+		{
+			Accurate = 0,
+			Fast = 1
+		};
+
 		Gaffer::V2fPlug *radiusPlug();
 		const Gaffer::V2fPlug *radiusPlug() const;
 
@@ -64,6 +70,9 @@ class GAFFERIMAGE_API Blur : public FlatImageProcessor
 		Gaffer::BoolPlug *expandDataWindowPlug();
 		const Gaffer::BoolPlug *expandDataWindowPlug() const;
 
+		Gaffer::IntPlug *modePlug();
+		const Gaffer::IntPlug *modePlug() const;
+
 		void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const override;
 
 	protected :
@@ -80,10 +89,19 @@ class GAFFERIMAGE_API Blur : public FlatImageProcessor
 		Gaffer::FloatVectorDataPlug *resampledChannelDataPlug();
 		const Gaffer::FloatVectorDataPlug *resampledChannelDataPlug() const;
 
+		// Output plug containing the horizontal pass of the Fast mode, so that
+		// it is cached for use in the vertical pass.
+		ImagePlug *horizontalPassPlug();
+		const ImagePlug *horizontalPassPlug() const;
+
 		// Internal resample node.
 		Resample *resample();
 		const Resample *resample() const;
 
+		// Reimplemented to scale the radius to suit the proxy level. In Accurate
+		// mode, the internal Resample scales the filter instead.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
 
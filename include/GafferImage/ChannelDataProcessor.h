@@ -69,6 +69,8 @@ class GAFFERIMAGE_API ChannelDataProcessor : public ImageProcessor
 
 		/// This implementation queries whether or not the requested channel is masked by the channelMaskPlug().
 		bool channelEnabled( const std::string &channel ) const override;
+		/// Returns true, since each pixel is processed independently.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
 
 		/// Implemented to initialize the output tile and then call processChannelData()
 		/// All other ImagePlug children are passed through via direct connection to the input values.
@@ -86,6 +86,9 @@ class GAFFERIMAGE_API Checkerboard : public FlatImageSource
 
 	protected :
 
+		/// Returns true, since the pattern is generated directly at the proxy resolution.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hashFormat( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void hashDataWindow( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void hashChannelNames( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
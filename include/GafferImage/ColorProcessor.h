@@ -66,6 +66,9 @@ class GAFFERIMAGE_API ColorProcessor : public ImageProcessor
 
 	protected :
 
+		/// Returns true, since each pixel is processed independently.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void hashChannelData( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 
@@ -75,6 +78,8 @@ class GAFFERIMAGE_API ColorProcessor : public ImageProcessor
 		Gaffer::ValuePlug::CachePolicy computeCachePolicy( const Gaffer::ValuePlug *output ) const override;
 		/// Implemented to use the results of colorDataPlug() via processColorData()
 		IECore::ConstFloatVectorDataPtr computeChannelData( const std::string &channelName, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent ) const override;
+		/// Implemented to evaluate colorDataPlug() only once per layer.
+		void computeChannelDataBatch( const std::vector<std::string> &channelNames, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent, std::vector<IECore::ConstFloatVectorDataPtr> &channelData ) const override;
 
 		/// May be implemented by derived classes to return true if the specified input is used in processColorData().
 		/// Must first call the base class implementation and return true if it does.
@@ -69,6 +69,9 @@ class GAFFERIMAGE_API Constant : public FlatImageSource
 
 	protected :
 
+		/// Returns true, since the colour is the same at any resolution.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hashFormat( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void hashDataWindow( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void hashChannelNames( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
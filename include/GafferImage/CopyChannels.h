@@ -61,6 +61,8 @@ class GAFFERIMAGE_API CopyChannels : public FlatImageProcessor
 
 	protected :
 
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
 
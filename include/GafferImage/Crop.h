@@ -89,6 +89,11 @@ class GAFFERIMAGE_API Crop : public ImageProcessor
 
 	protected :
 
+		/// Returns true. The crop window is computed at full resolution and
+		/// scaled to suit the proxy level, and the internal Offset node
+		/// provides its own support for proxy levels.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hashFormat( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 
 		GafferImage::Format computeFormat( const Gaffer::Context *context, const ImagePlug *parent ) const override;
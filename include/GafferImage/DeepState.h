@@ -78,6 +78,10 @@ class GAFFERIMAGE_API DeepState : public ImageProcessor
 
 	protected :
 
+		// Returns true for flat inputs, which are passed through unchanged. Deep inputs
+		// use the default downsampling, applied after flattening.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
 
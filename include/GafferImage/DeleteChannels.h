@@ -75,6 +75,8 @@ class GAFFERIMAGE_API DeleteChannels : public ImageProcessor
 
 	protected :
 
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		// Reimplemented to perform the deletion.
 		void hashChannelNames( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		IECore::ConstStringVectorDataPtr computeChannelNames( const Gaffer::Context *context, const ImagePlug *parent ) const override;
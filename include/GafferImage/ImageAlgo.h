@@ -134,7 +134,12 @@ void parallelProcessTiles(
 	TileOrder tileOrder = Unordered
 );
 
-// Call the functor in parallel, once per tile per channel
+// Call the functor in parallel, once per tile per channel. Because each
+// channel is processed by a separate call, nodes which compute several
+// channels together can't provide them in a single operation. Where a
+// functor needs several channels of a tile, it is more efficient to use
+// the per-tile overload above, retrieving the channels with
+// `ImagePlug::channelData( channelNames, tileOrigin )`.
 template <class TileFunctor>
 void parallelProcessTiles(
 	const ImagePlug *imagePlug,
@@ -145,7 +150,10 @@ void parallelProcessTiles(
 );
 
 // Process all tiles in parallel using TileFunctor, passing the
-// results in series to GatherFunctor.
+// results in series to GatherFunctor. The number of tiles which
+// have been processed but not yet gathered is limited to the number
+// of threads, so memory usage remains bounded even when the
+// GatherFunctor is slower than the TileFunctor.
 template <class TileFunctor, class GatherFunctor>
 void parallelGatherTiles(
 	const ImagePlug *image,
@@ -91,6 +91,23 @@ class GAFFERIMAGE_API ImageNode : public Gaffer::ComputeNode
 		/// \deprecated remove this once all derived classes stop using it.
 		virtual bool enabled() const;
 
+		/// Proxy levels
+		/// ============
+		///
+		/// When the context specifies a proxy level via `ImagePlug::proxyLevelContextName`,
+		/// the output image must be downsampled accordingly. By default, ImageNode does
+		/// this automatically, by computing the full resolution image and averaging blocks
+		/// of pixels. Derived classes may reimplement `supportsProxyLevel()` to return true
+		/// if they can compute the proxy image more efficiently themselves, in which case
+		/// the hash*() and compute*() methods are called with the proxy level in the context
+		/// as usual. This is typically just a matter of returning true for nodes that
+		/// operate independently on each pixel, and whose inputs will therefore already
+		/// be at the right resolution.
+		///
+		/// > Note : The automatic downsampling is not supported for deep images, for
+		/// > which an exception is thrown.
+		virtual bool supportsProxyLevel( const Gaffer::Context *context ) const;
+
 		/// Implemented to call the hash*() methods below whenever output is part of an ImagePlug.
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		/// Hash methods for the individual children of outPlug(). A derived class must either :
@@ -129,8 +146,34 @@ class GAFFERIMAGE_API ImageNode : public Gaffer::ComputeNode
 		virtual IECore::ConstStringVectorDataPtr computeChannelNames( const Gaffer::Context *context, const ImagePlug *parent ) const;
 		virtual IECore::ConstFloatVectorDataPtr computeChannelData( const std::string &channelName, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent ) const;
 
+		/// Batched channel data
+		/// ====================
+		///
+		/// Called by `ImagePlug::channelData( channelNames, tileOrigin )` to compute the
+		/// channels of a single tile which are not already in the compute cache, appending
+		/// the results to `channelData`. The results are then stored in the compute cache
+		/// as if they had been computed by `parent->channelDataPlug()`. The context contains
+		/// the tile origin but not a channel name. The default implementation simply evaluates
+		/// `parent->channelDataPlug()` for each channel in turn. Derived classes which compute
+		/// several channels together internally may reimplement it to retrieve them all from
+		/// a single computation. The results must be identical to those of `parent->channelDataPlug()`.
+		///
+		/// > Note : This is only called when the node is enabled and `supportsProxyLevel()` is
+		/// > true for any proxy level in the context.
+		virtual void computeChannelDataBatch( const std::vector<std::string> &channelNames, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent, std::vector<IECore::ConstFloatVectorDataPtr> &channelData ) const;
+
 	private :
 
+		// Called by ImagePlug to implement the batched `channelData()`. Calls
+		// `computeChannelDataBatch()` inside a Process when it is safe to do
+		// so, returning false otherwise.
+		friend class ImagePlug;
+		bool channelDataBatch( const std::vector<std::string> &channelNames, const Gaffer::Context *context, const ImagePlug *parent, std::vector<IECore::ConstFloatVectorDataPtr> &channelData ) const;
+
+		// Implement the automatic downsampling described for `supportsProxyLevel()`.
+		void hashProxy( const Gaffer::ValuePlug *output, const ImagePlug *parent, int proxyLevel, const Gaffer::Context *context, IECore::MurmurHash &h ) const;
+		void computeProxy( Gaffer::ValuePlug *output, const ImagePlug *parent, int proxyLevel, const Gaffer::Context *context ) const;
+
 		static size_t g_firstPlugIndex;
 };
 
@@ -125,6 +125,20 @@ class GAFFERIMAGE_API ImagePlug : public Gaffer::ValuePlug
 		/// InternedStrings on every lookup.
 		static const IECore::InternedString channelNameContextName;
 		static const IECore::InternedString tileOriginContextName;
+		/// The name of an optional context variable used to request a
+		/// reduced resolution "proxy" version of the image. At level `n`
+		/// the image is downsampled by a factor of `2^n`, so that each
+		/// pixel covers a `2^n x 2^n` block of full resolution pixels.
+		/// The format and data window are transformed by `proxyBox()`.
+		/// See `ImageNode::supportsProxyLevel()` for details of how
+		/// nodes are expected to respond.
+		static const IECore::InternedString proxyLevelContextName;
+		/// Returns the proxy level specified by `context`, or 0 if none
+		/// is specified.
+		static int proxyLevel( const Gaffer::Context *context );
+		/// Returns the box containing all the pixels that cover `box`
+		/// at the specified proxy level.
+		static Imath::Box2i proxyBox( const Imath::Box2i &box, int proxyLevel );
 
 		/// Utility class to scope a temporary copy of a context,
 		/// with tile/channel specific variables removed. This can be used
@@ -171,6 +185,15 @@ class GAFFERIMAGE_API ImagePlug : public Gaffer::ValuePlug
 		IECore::ConstFloatVectorDataPtr channelData( const std::string &channelName, const Imath::V2i &tileOrigin ) const;
 		/// Calls `channelDataPlug()->hash()` using a ChannelDataScope.
 		IECore::MurmurHash channelDataHash( const std::string &channelName, const Imath::V2i &tileOrigin ) const;
+		/// Returns the data for several channels of a single tile, in the same
+		/// order as `channelNames`. This is equivalent to calling `channelData()`
+		/// for each channel in turn, but nodes which compute several channels
+		/// together may provide them all in a single operation. See
+		/// `ImageNode::computeChannelDataBatch()`.
+		std::vector<IECore::ConstFloatVectorDataPtr> channelData( const std::vector<std::string> &channelNames, const Imath::V2i &tileOrigin ) const;
+		/// Returns a hash formed by appending the `channelDataHash()` for each
+		/// channel in turn.
+		IECore::MurmurHash channelDataHash( const std::vector<std::string> &channelNames, const Imath::V2i &tileOrigin ) const;
 		/// Calls `formatPlug()->getValue()` using a GlobalScope.
 		GafferImage::Format format() const;
 		/// Calls `formatPlug()->hash()` using a GlobalScope.
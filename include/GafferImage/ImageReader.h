@@ -87,6 +87,20 @@ class GAFFERIMAGE_API ImageReader : public ImageNode
 			ClampToFrame,
 		};
 
+		/// The CachePrecision controls the precision with which
+		/// channel data is stored in the compute cache. See
+		/// OpenImageIOReader::CachePrecision for details.
+		/// > Note : When a colour space conversion is applied, the
+		/// > converted R, G and B channels are cached at float precision
+		/// > by the internal ColorSpace node, so only the remaining
+		/// > channels benefit from reduced precision.
+		enum CachePrecision
+		{
+			Float = 0,
+			Half,
+			Automatic
+		};
+
 		Gaffer::StringPlug *fileNamePlug();
 		const Gaffer::StringPlug *fileNamePlug() const;
 
@@ -112,6 +126,9 @@ class GAFFERIMAGE_API ImageReader : public ImageNode
 		Gaffer::StringPlug *colorSpacePlug();
 		const Gaffer::StringPlug *colorSpacePlug() const;
 
+		Gaffer::IntPlug *cachePrecisionPlug();
+		const Gaffer::IntPlug *cachePrecisionPlug() const;
+
 		void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const override;
 
 		static size_t supportedExtensions( std::vector<std::string> &extensions );
@@ -125,8 +142,11 @@ class GAFFERIMAGE_API ImageReader : public ImageNode
 
 	protected :
 
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
+		Gaffer::ValuePlug::CachePolicy computeCachePolicy( const Gaffer::ValuePlug *output ) const override;
 
 		void hashFormat( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		GafferImage::Format computeFormat( const Gaffer::Context *context, const ImagePlug *parent ) const override;
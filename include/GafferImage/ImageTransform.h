@@ -77,6 +77,11 @@ class GAFFERIMAGE_API ImageTransform : public FlatImageProcessor
 
 	protected :
 
+		// Reimplemented to adjust the transform to suit the proxy level. The
+		// scale and translation are applied by the internal Resample, which
+		// provides its own support for proxy levels.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
 
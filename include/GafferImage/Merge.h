@@ -91,6 +91,9 @@ class GAFFERIMAGE_API Merge : public FlatImageProcessor
 
 	protected :
 
+		/// Returns true, since the merge is performed independently for each pixel.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		/// Reimplemented to hash the connected input plugs
 		void hashDataWindow( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void hashChannelNames( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
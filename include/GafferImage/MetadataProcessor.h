@@ -58,6 +58,8 @@ class GAFFERIMAGE_API MetadataProcessor : public ImageProcessor
 
 	protected :
 
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		// Reimplemented to call hashProcessedMetadata()
 		void hashMetadata( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		// Reimplemented to call computeProcessedMetadata()
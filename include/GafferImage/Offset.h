@@ -60,6 +60,10 @@ class GAFFERIMAGE_API Offset : public ImageProcessor
 
 	protected :
 
+		/// Returns true when the offset is a whole number of proxy pixels,
+		/// in which case the proxy input can simply be offset.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hashDataWindow( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void hashSampleOffsets( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void hashChannelData( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
@@ -69,6 +69,23 @@ class GAFFERIMAGE_API OpenImageIOReader : public ImageNode
 			Hold,
 		};
 
+		/// The CachePrecision controls the precision with which
+		/// flat channel data is stored in the compute cache.
+		enum CachePrecision
+		{
+			/// Data is stored as 32 bit floats.
+			Float = 0,
+			/// Data is stored as 16 bit halfs, and converted to
+			/// floats each time it is accessed. This halves the
+			/// memory used by the cache, at the expense of precision
+			/// for data which is not stored as half in the file.
+			Half,
+			/// Channels stored as half in the file are cached as
+			/// halfs, and all others as floats. This reduces memory
+			/// usage without any loss of precision.
+			Automatic
+		};
+
 		Gaffer::StringPlug *fileNamePlug();
 		const Gaffer::StringPlug *fileNamePlug() const;
 
@@ -79,6 +96,9 @@ class GAFFERIMAGE_API OpenImageIOReader : public ImageNode
 		Gaffer::IntPlug *missingFrameModePlug();
 		const Gaffer::IntPlug *missingFrameModePlug() const;
 
+		Gaffer::IntPlug *cachePrecisionPlug();
+		const Gaffer::IntPlug *cachePrecisionPlug() const;
+
 		Gaffer::IntVectorDataPlug *availableFramesPlug();
 		const Gaffer::IntVectorDataPlug *availableFramesPlug() const;
 
@@ -91,6 +111,9 @@ class GAFFERIMAGE_API OpenImageIOReader : public ImageNode
 
 	protected :
 
+		// Returns true if the file contains a MIP level matching the proxy level.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
 		Gaffer::ValuePlug::CachePolicy computeCachePolicy( const Gaffer::ValuePlug *output ) const override;
@@ -116,6 +139,9 @@ class GAFFERIMAGE_API OpenImageIOReader : public ImageNode
 		Gaffer::ObjectVectorPlug *tileBatchPlug();
 		const Gaffer::ObjectVectorPlug *tileBatchPlug() const;
 
+		Gaffer::BoolPlug *supportsProxyLevelPlug();
+		const Gaffer::BoolPlug *supportsProxyLevelPlug() const;
+
 		void hashFileName( const Gaffer::Context *context, IECore::MurmurHash &h ) const;
 
 		void plugSet( Gaffer::Plug *plug );
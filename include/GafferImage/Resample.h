@@ -99,6 +99,9 @@ class GAFFERIMAGE_API Resample : public FlatImageProcessor
 
 	protected :
 
+		// Reimplemented to adjust the matrix and filter to suit the proxy level.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		void hashDataWindow( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void hashChannelData( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 
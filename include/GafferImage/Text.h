@@ -104,6 +104,10 @@ class GAFFERIMAGE_API Text : public Shape
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
 
+		/// Returns true, since the glyphs are rendered directly at the proxy
+		/// resolution. The shadow is handled by the internal Blur and ImageTransform.
+		bool supportsProxyLevel( const Gaffer::Context *context ) const override;
+
 		bool affectsLayout( const Gaffer::Plug *input ) const;
 		void hashLayout( const Gaffer::Context *context, IECore::MurmurHash &h ) const;
 		IECore::ConstCompoundObjectPtr computeLayout( const Gaffer::Context *context ) const;
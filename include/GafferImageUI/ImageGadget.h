@@ -232,11 +232,14 @@ class GAFFERIMAGEUI_API ImageGadget : public GafferUI::Gadget
 		const GafferImage::Format &format() const;
 		const Imath::Box2i &dataWindow() const;
 		const std::vector<std::string> &channelNames() const;
+		// Data window at the current proxy level.
+		const Imath::Box2i &proxyDataWindow() const;
 
 		mutable unsigned m_dirtyFlags;
 		mutable GafferImage::Format m_format;
 		mutable Imath::Box2i m_dataWindow;
 		mutable std::vector<std::string> m_channelNames;
+		mutable Imath::Box2i m_proxyDataWindow;
 
 		// Tile storage.
 		//
@@ -324,6 +327,15 @@ class GAFFERIMAGEUI_API ImageGadget : public GafferUI::Gadget
 		std::unique_ptr<Gaffer::BackgroundTask> m_tilesTask;
 		std::atomic_bool m_renderRequestPending;
 
+		// Proxy level. When zoomed out, we compute the tiles
+		// at a reduced resolution, choosing the proxy level
+		// so that each proxy pixel still covers at least one
+		// pixel on screen.
+
+		void updateProxyLevel();
+
+		int m_proxyLevel;
+
 		// Rendering.
 
 		void visibilityChanged();
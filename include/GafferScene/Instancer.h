@@ -136,6 +136,9 @@ class GAFFERSCENE_API Instancer : public BranchCreator
 		Gaffer::BoolPlug *encapsulateInstanceGroupsPlug();
 		const Gaffer::BoolPlug *encapsulateInstanceGroupsPlug() const;
 
+		Gaffer::BoolPlug *packInstanceGroupsPlug();
+		const Gaffer::BoolPlug *packInstanceGroupsPlug() const;
+
 		Gaffer::BoolPlug *seedEnabledPlug();
 		const Gaffer::BoolPlug *seedEnabledPlug() const;
 
@@ -212,6 +215,7 @@ class GAFFERSCENE_API Instancer : public BranchCreator
 	private :
 
 		IE_CORE_FORWARDDECLARE( EngineData );
+		IE_CORE_FORWARDDECLARE( TopologyData );
 
 		Gaffer::ObjectPlug *enginePlug();
 		const Gaffer::ObjectPlug *enginePlug() const;
@@ -228,8 +232,20 @@ class GAFFERSCENE_API Instancer : public BranchCreator
 		Gaffer::PathMatcherDataPlug *setCollaboratePlug();
 		const Gaffer::PathMatcherDataPlug *setCollaboratePlug() const;
 
+		// Holds the mapping from points to prototypes and ids. This is
+		// hashed independently of the point positions and attributes, so
+		// that it can be reused when only they change.
+		Gaffer::ObjectPlug *topologyPlug();
+		const Gaffer::ObjectPlug *topologyPlug() const;
+
+		// Returns true if the groups of instances are being output as
+		// a single object, rather than as a hierarchy.
+		bool collapsesInstanceGroups( const ScenePlug *parent ) const;
+		IECore::ConstObjectPtr packedInstances( const ScenePath &sourcePath, const ScenePath &branchPath, const Gaffer::Context *context ) const;
+
 		ConstEngineDataPtr engine( const ScenePath &sourcePath, const Gaffer::Context *context ) const;
 		void engineHash( const ScenePath &sourcePath, const Gaffer::Context *context, IECore::MurmurHash &h ) const;
+		void topologyHash( const ScenePath &sourcePath, const Gaffer::Context *context, IECore::MurmurHash &h ) const;
 
 		IECore::ConstCompoundDataPtr prototypeChildNames( const ScenePath &sourcePath, const Gaffer::Context *context ) const;
 		void prototypeChildNamesHash( const ScenePath &sourcePath, const Gaffer::Context *context, IECore::MurmurHash &h ) const;
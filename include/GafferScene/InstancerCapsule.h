@@ -0,0 +1,123 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2021, Cinesite VFX Ltd. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#ifndef GAFFERSCENE_INSTANCERCAPSULE_H
+#define GAFFERSCENE_INSTANCERCAPSULE_H
+
+#include "GafferScene/Capsule.h"
+
+#include "IECore/CompoundData.h"
+#include "IECore/CompoundObject.h"
+#include "IECore/VectorTypedData.h"
+
+namespace GafferScene
+{
+
+/// Procedural representing a group of instances in packed form, as
+/// generated by the Instancer's `packInstanceGroups` mode. Rather than
+/// storing a scene location per instance, it stores the prototypes
+/// once, and describes the instances using flat arrays. Renderer backends
+/// with native support for instancing may use the accessors to consume
+/// the arrays directly. The `render()` method provides a generic fallback
+/// which outputs a renderer object for each object in each instance,
+/// sharing the prototype objects between all instances.
+class GAFFERSCENE_API InstancerCapsule : public IECoreScenePreview::Procedural
+{
+
+	public :
+
+		InstancerCapsule();
+		/// Each prototype is represented by a Capsule, which specifies the
+		/// source scene, the prototype root and the context used to evaluate
+		/// the prototype. The remaining arrays must all have the same
+		/// length, containing one element per instance :
+		///
+		/// - `prototypeIndices` : The index of the prototype for the instance.
+		/// - `names` : The name of the instance. Objects are output to the
+		///   renderer with names of the form `/<name>/<prototypeRelativePath>`.
+		/// - `transforms` : The transform of the instance, relative to the
+		///   prototype root.
+		/// - `attributes` : Contains a VectorData per instance attribute.
+		///
+		/// It is the responsibility of the caller to provide a `hash` which
+		/// uniquely identifies the instances and prototypes.
+		InstancerCapsule(
+			const std::vector<ConstCapsulePtr> &prototypes,
+			const IECore::ConstIntVectorDataPtr &prototypeIndices,
+			const IECore::ConstInternedStringVectorDataPtr &names,
+			const IECore::ConstM44fVectorDataPtr &transforms,
+			const IECore::ConstCompoundDataPtr &attributes,
+			const IECore::ConstCompoundObjectPtr &globals,
+			const IECore::MurmurHash &hash,
+			const Imath::Box3f &bound
+		);
+		~InstancerCapsule() override;
+
+		IE_CORE_DECLAREEXTENSIONOBJECT( GafferScene::InstancerCapsule, GafferScene::InstancerCapsuleTypeId, IECoreScenePreview::Procedural );
+
+		Imath::Box3f bound() const override;
+		void render( IECoreScenePreview::Renderer *renderer ) const override;
+
+		size_t numInstances() const;
+
+		const std::vector<ConstCapsulePtr> &prototypes() const;
+		const IECore::IntVectorData *prototypeIndices() const;
+		const IECore::InternedStringVectorData *names() const;
+		const IECore::M44fVectorData *transforms() const;
+		const IECore::CompoundData *attributes() const;
+		/// The scene globals, used to determine shutter and blur settings
+		/// and to provide global attributes.
+		const IECore::CompoundObject *globals() const;
+
+	private :
+
+		std::vector<ConstCapsulePtr> m_prototypes;
+		IECore::ConstIntVectorDataPtr m_prototypeIndices;
+		IECore::ConstInternedStringVectorDataPtr m_names;
+		IECore::ConstM44fVectorDataPtr m_transforms;
+		IECore::ConstCompoundDataPtr m_attributes;
+		IECore::ConstCompoundObjectPtr m_globals;
+		IECore::MurmurHash m_hash;
+		Imath::Box3f m_bound;
+
+};
+
+IE_CORE_DECLAREPTR( InstancerCapsule )
+
+} // namespace GafferScene
+
+#endif // GAFFERSCENE_INSTANCERCAPSULE_H
@@ -82,10 +82,37 @@ class GAFFERSCENE_API RenderController : public boost::signals::trackable
 
 		typedef std::function<void ( Gaffer::BackgroundTask::Status progress )> ProgressCallback;
 
+		/// Used to prioritise updates. Called with the bound of a location
+		/// in world space, and should return a positive score if the location
+		/// is a priority, typically because it is visible to the camera. The
+		/// function is called on parent locations before their children,
+		/// and must return a positive score for a location if it would do
+		/// so for any of its descendants.
+		typedef std::function<float ( const Imath::Box3f &bound )> PriorityFunction;
+
 		void update( const ProgressCallback &callback = ProgressCallback() );
-		std::shared_ptr<Gaffer::BackgroundTask> updateInBackground( const ProgressCallback &callback = ProgressCallback(), const IECore::PathMatcher &priorityPaths = IECore::PathMatcher()  );
+		/// Updates the scene on a background thread. Locations matching `priorityPaths`
+		/// are updated first, followed by locations given a positive score by
+		/// `priorityFunction`, and finally the rest of the scene.
+		std::shared_ptr<Gaffer::BackgroundTask> updateInBackground( const ProgressCallback &callback = ProgressCallback(), const IECore::PathMatcher &priorityPaths = IECore::PathMatcher(), const PriorityFunction &priorityFunction = PriorityFunction() );
 
 		void updateMatchingPaths( const IECore::PathMatcher &pathsToUpdate, const ProgressCallback &callback = ProgressCallback() );
+		/// Updates only the locations given a positive score by `priorityFunction`.
+		/// Lights and cameras are always updated, since they affect the whole scene.
+		void updatePriorityLocations( const PriorityFunction &priorityFunction, const ProgressCallback &callback = ProgressCallback() );
+
+		/// Expands additional locations beyond those specified by `setExpandedPaths()`
+		/// and `setMinimumExpansionDepth()`, so that as much detail as possible is
+		/// shown without exceeding `budget`. Locations are expanded in order of
+		/// decreasing score from `expansionFunction`, which is typically the size of
+		/// the bound in screen space. Locations are expanded only while the total number
+		/// of children they add stays within `budget`, and locations scoring zero or
+		/// less are never expanded. A budget of 0 disables automatic expansion.
+		void setExpansionBudget( size_t budget, const PriorityFunction &expansionFunction = PriorityFunction() );
+		size_t getExpansionBudget() const;
+		/// Returns the locations that have been expanded automatically to meet
+		/// the expansion budget, as computed by the last update.
+		const IECore::PathMatcher &getBudgetExpandedPaths() const;
 
 	private :
 
@@ -114,8 +141,9 @@ class GAFFERSCENE_API RenderController : public boost::signals::trackable
 		void requestUpdate();
 		void dirtyGlobals( unsigned components );
 		void dirtySceneGraphs( unsigned components );
+		void updateBudgetExpandedPaths();
 
-		void updateInternal( const ProgressCallback &callback = ProgressCallback(), const IECore::PathMatcher *pathsToUpdate = nullptr );
+		void updateInternal( const ProgressCallback &callback = ProgressCallback(), const IECore::PathMatcher *pathsToUpdate = nullptr, const PriorityFunction *priorityFunction = nullptr );
 		void updateDefaultCamera();
 		void cancelBackgroundTask();
 
@@ -129,6 +157,11 @@ class GAFFERSCENE_API RenderController : public boost::signals::trackable
 		IECore::PathMatcher m_expandedPaths;
 		size_t m_minimumExpansionDepth;
 
+		size_t m_expansionBudget;
+		PriorityFunction m_expansionFunction;
+		IECore::PathMatcher m_budgetExpandedPaths;
+		bool m_budgetExpandedPathsDirty;
+
 		boost::signals::scoped_connection m_plugDirtiedConnection;
 		boost::signals::scoped_connection m_contextChangedConnection;
 
@@ -132,6 +132,11 @@ class GAFFERSCENE_API SceneNode : public Gaffer::ComputeNode
 		/// base classes, so there should be little need to call this.
 		bool enabled( const Gaffer::Context *context ) const;
 
+		/// Stores `set` in the compute cache as the value of `outPlug()->setPlug()`
+		/// for `setName` in the current context. This allows nodes which compute
+		/// several sets at once to avoid recomputing them individually.
+		void cacheSet( const IECore::InternedString &setName, const IECore::PathMatcherData *set ) const;
+
 	private :
 
 		void plugInputChanged( Gaffer::Plug *plug );
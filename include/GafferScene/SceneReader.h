@@ -41,6 +41,8 @@
 
 #include "IECoreScene/SceneInterface.h"
 
+#include "IECore/CompoundData.h"
+
 #include "tbb/enumerable_thread_specific.h"
 
 namespace Gaffer
@@ -80,10 +82,21 @@ class GAFFERSCENE_API SceneReader : public SceneNode
 
 		void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const override;
 
+		/// Returns a CompoundData containing every set in the file, loaded
+		/// in a single traversal rather than one traversal per set. This is
+		/// quicker than loading the sets individually when all of them are
+		/// needed, and is used by `SceneAlgo::sets()` for that purpose. The
+		/// sets are also stored in the compute cache as the values of
+		/// `out.set`, so that subsequent individual queries are free.
+		IECore::ConstCompoundDataPtr allSets() const;
+
 		static size_t supportedExtensions( std::vector<std::string> &extensions );
 
 	protected :
 
+		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
+		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
+
 		/// \todo These methods defer to SceneInterface::hash() to do most of the work, but we could go further.
 		/// Currently we still hash in fileNamePlug() and refreshCountPlug() because we don't trust the current
 		/// implementation of SceneCache::hash() - it should hash the filename and modification time, but instead
@@ -107,9 +120,17 @@ class GAFFERSCENE_API SceneReader : public SceneNode
 		IECore::ConstInternedStringVectorDataPtr computeSetNames( const Gaffer::Context *context, const ScenePlug *parent ) const override;
 		IECore::ConstPathMatcherDataPtr computeSet( const IECore::InternedString &setName, const Gaffer::Context *context, const ScenePlug *parent ) const override;
 
+		Gaffer::ValuePlug::CachePolicy computeCachePolicy( const Gaffer::ValuePlug *output ) const override;
+
 	private :
 
+		// Stores a CompoundData containing every set in the file,
+		// as returned by `allSets()`.
+		Gaffer::ObjectPlug *setsPlug();
+		const Gaffer::ObjectPlug *setsPlug() const;
+
 		void plugSet( Gaffer::Plug *plug );
+		IECore::ConstCompoundDataPtr loadSets( const Gaffer::Context *context ) const;
 
 		// The typical access patterns for the SceneReader include accessing
 		// the same file repeatedly, and also the same path within the file
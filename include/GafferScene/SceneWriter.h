@@ -74,7 +74,9 @@ class GAFFERSCENE_API SceneWriter : public GafferDispatch::TaskNode
 		void execute() const override;
 
 		/// Re-implemented to open the file for writing, then iterate through the
-		/// frames, modifying the current Context and calling writeLocation().
+		/// frames, writing all locations for each. Frames are computed ahead of
+		/// the one being written, and samples which are unchanged from the
+		/// previous frame are only written once.
 		void executeSequence( const std::vector<float> &frames ) const override;
 
 		/// Re-implemented to return true, since the entire file must be written at once.
@@ -165,6 +165,7 @@ enum TypeId
 	ExistenceQueryTypeId = 110620,
 	AttributeQueryTypeId = 110621,
 	UVSamplerTypeId = 110622,
+	InstancerCapsuleTypeId = 110623,
 
 	PreviewGeometryTypeId = 110648,
 	PreviewProceduralTypeId = 110649,
@@ -85,6 +85,13 @@ class GAFFERSCENEUI_API SceneGadget : public GafferUI::Gadget
 		void setMinimumExpansionDepth( size_t depth );
 		size_t getMinimumExpansionDepth() const;
 
+		/// Automatically expands the locations that are largest on screen,
+		/// adding up to `budget` additional locations to those expanded
+		/// above. Expansion is recomputed as the camera moves. A budget of
+		/// 0 disables automatic expansion.
+		void setExpansionBudget( size_t budget );
+		size_t getExpansionBudget() const;
+
 		/// Returns the selection.
 		const IECore::PathMatcher &getSelection() const;
 		/// Sets the selection.
@@ -190,6 +197,8 @@ class GAFFERSCENEUI_API SceneGadget : public GafferUI::Gadget
 		bool m_paused;
 		IECore::PathMatcher m_blockingPaths;
 		IECore::PathMatcher m_priorityPaths;
+		size_t m_expansionBudget;
+		IECore::MurmurHash m_expansionCameraHash;
 		SceneGadgetSignal m_stateChangedSignal;
 
 		IECoreScenePreview::RendererPtr m_renderer;
@@ -55,45 +55,67 @@ class PythonExpressionEngine( Gaffer.Expression.Engine ) :
 
 		parser = _Parser( expression )
 
-		self.__expression = expression
+		self.__code = compile( expression, "<string>", "exec" )
 		self.__inPlugPaths = list( parser.plugReads )
 		self.__outPlugPaths = list( parser.plugWrites )
 
-		inPlugs.extend( [ self.__plug( node, p ) for p in self.__inPlugPaths ] )
+		parsedInPlugs = [ self.__plug( node, p ) for p in self.__inPlugPaths ]
+		inPlugs.extend( parsedInPlugs )
 		outPlugs.extend( [ self.__plug( node, p ) for p in self.__outPlugPaths ] )
 		contextNames.extend( parser.contextReads )
 
+		# Precompute the structure of the nested dictionaries used to
+		# provide access to the plugs via `parent["a"]["b"]`, so that
+		# `execute()` needn't parse plug paths. Dictionaries are referred
+		# to by their index in a list built during execution, with the
+		# `parent` dictionary itself at index 0.
+
+		self.__dictSlots = []
+		slots = { () : 0 }
+		def slot( path ) :
+			result = slots.get( path )
+			if result is None :
+				parentSlot = slot( path[:-1] )
+				result = len( slots )
+				slots[path] = result
+				self.__dictSlots.append( ( parentSlot, path[-1] ) )
+			return result
+
+		self.__inPlugAccessors = []
+		for plugPath, plug in zip( self.__inPlugPaths, parsedInPlugs ) :
+			path = tuple( plugPath.split( "." ) )
+			self.__inPlugAccessors.append(
+				( slot( path[:-1] ), path[-1], isinstance( plug, Gaffer.CompoundDataPlug ) )
+			)
+
+		self.__outPlugAccessors = []
+		for plugPath in self.__outPlugPaths :
+			path = tuple( plugPath.split( "." ) )
+			self.__outPlugAccessors.append( ( slot( path[:-1] ), path[-1], plugPath ) )
+
 	def execute( self, context, inputs ) :
 
-		plugDict = {}
-		for plugPath, plug in zip( self.__inPlugPaths, inputs ) :
-			parentDict = plugDict
-			plugPathSplit = plugPath.split( "." )
-			for p in plugPathSplit[:-1] :
-				parentDict = parentDict.setdefault( p, {} )
-			if isinstance( plug, Gaffer.CompoundDataPlug ) :
+		dicts = [ {} ]
+		for parentSlot, name in self.__dictSlots :
+			d = {}
+			dicts[parentSlot][name] = d
+			dicts.append( d )
+
+		for ( slot, name, isCompoundData ), plug in zip( self.__inPlugAccessors, inputs ) :
+			if isCompoundData :
 				value = IECore.CompoundData()
 				plug.fillCompoundData( value )
 			else :
 				value = plug.getValue()
-			parentDict[plugPathSplit[-1]] = value
-
-		for plugPath in self.__outPlugPaths :
-			parentDict = plugDict
-			for p in plugPath.split( "." )[:-1] :
-				parentDict = parentDict.setdefault( p, {} )
+			dicts[slot][name] = value
 
-		executionDict = { "imath" : imath, "IECore" : IECore, "parent" : plugDict, "context" : _ContextProxy( context ) }
+		executionDict = { "imath" : imath, "IECore" : IECore, "parent" : dicts[0], "context" : _ContextProxy( context ) }
 
-		exec( self.__expression, executionDict, executionDict )
+		exec( self.__code, executionDict, executionDict )
 
 		result = IECore.ObjectVector()
-		for plugPath in self.__outPlugPaths :
-			parentDict = plugDict
-			plugPathSplit = plugPath.split( "." )
-			for p in plugPathSplit[:-1] :
-				parentDict = parentDict[p]
-			r = parentDict.get( plugPathSplit[-1], IECore.NullObject.defaultNullObject() )
+		for slot, name, plugPath in self.__outPlugAccessors :
+			r = dicts[slot].get( name, IECore.NullObject.defaultNullObject() )
 			try:
 				result.append( r )
 			except:
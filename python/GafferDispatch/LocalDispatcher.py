@@ -36,8 +36,11 @@
 
 import os
 import errno
+import json
+import multiprocessing
 import signal
 import shlex
+import six
 import subprocess32 as subprocess
 import threading
 import time
@@ -57,6 +60,8 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 		self["executeInBackground"] = Gaffer.BoolPlug( defaultValue = False )
 		self["ignoreScriptLoadErrors"] = Gaffer.BoolPlug( defaultValue = False )
 		self["environmentCommand"] = Gaffer.StringPlug()
+		self["maxConcurrency"] = Gaffer.IntPlug( defaultValue = 1, minValue = 0 )
+		self["persistentWorkers"] = Gaffer.BoolPlug( defaultValue = False )
 
 		self.__jobPool = jobPool if jobPool else LocalDispatcher.defaultJobPool()
 
@@ -92,6 +97,14 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 			self.__environmentCommand = Gaffer.Context.current().substitute(
 				dispatcher["environmentCommand"].getValue()
 			)
+			self.__maxConcurrency = dispatcher["maxConcurrency"].getValue()
+			if self.__maxConcurrency == 0 :
+				self.__maxConcurrency = multiprocessing.cpu_count()
+			self.__persistentWorkers = dispatcher["persistentWorkers"].getValue()
+
+			# Used by background dispatches to receive notifications
+			# of process completion and kill requests.
+			self.__events = six.moves.queue.Queue()
 
 			self.__messageHandler = IECore.CapturingMessageHandler()
 			self.__messageTitle = "%s : Job %s %s" % ( self.__dispatcher.getName(), self.__name, self.__id )
@@ -122,13 +135,15 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 
 		def statistics( self ) :
 
-			batch = self.__currentBatch()
-			if batch is None or "pid" not in batch.blindData().keys() :
+			pids = [
+				b.blindData()["pid"].value for b in self.__runningBatches()
+				if "pid" in b.blindData().keys()
+			]
+			if not pids :
 				return {}
 
 			rss = 0
 			pcpu = 0.0
-			pid = batch.blindData().get( "pid" )
 
 			try :
 				stats = subprocess.check_output(
@@ -136,14 +151,14 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 					universal_newlines = True,
 				).split()
 				for i in range( 0, len(stats), 6 ) :
-					if str(pid) in stats[i:i+4] :
+					if any( str(pid) in stats[i:i+4] for pid in pids ) :
 						pcpu += float(stats[i+4])
 						rss += float(stats[i+5])
 			except :
 				return {}
 
 			return {
-				"pid" : pid,
+				"pid" : pids[0],
 				"pcpu" : pcpu,
 				"rss" : rss,
 			}
@@ -169,6 +184,9 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 
 			if not self.failed() :
 				self.__killBatchWalk( self.__batch )
+				# Wake the background dispatch so it can respond
+				# immediately.
+				self.__events.put( None )
 
 		def killed( self ) :
 
@@ -226,80 +244,184 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 
 		def __backgroundDispatch( self ) :
 
-			with self.__messageHandler :
-				self.__doBackgroundDispatch( self.__batch )
+			idleWorkers = []
+			try :
+				with self.__messageHandler :
+					self.__doBackgroundDispatch( self.__batch, idleWorkers )
+			finally :
+				for worker in idleWorkers :
+					worker.close()
+
+		def __doBackgroundDispatch( self, rootBatch, idleWorkers ) :
+
+			# Batches in depth-first order, so that with a `maxConcurrency`
+			# of 1 we execute in the same order as a foreground dispatch.
+			pending = [
+				b for b in self.__batchesInExecutionOrder( rootBatch )
+				if self.__getStatus( b ) != LocalDispatcher.Job.Status.Complete
+			]
 
-		def __doBackgroundDispatch( self, batch ) :
+			running = {}
+			failedBatch = None
 
-			if self.__getStatus( batch ) == LocalDispatcher.Job.Status.Complete :
-				return True
+			while True :
 
-			for upstreamBatch in batch.preTasks() :
-				if not self.__doBackgroundDispatch( upstreamBatch ) :
+				if rootBatch.blindData().get( "killed" ) :
+					for batch, process in running.items() :
+						os.killpg( process.pid, signal.SIGTERM )
+						if isinstance( process, _Worker ) :
+							# Plain processes are waited for by `__waitForProcess()`,
+							# but workers must be reaped explicitly.
+							process.close()
+						self.__setStatus( batch, LocalDispatcher.Job.Status.Killed )
+					self.__reportKilled( rootBatch )
 					return False
 
-			if batch.blindData().get( "killed" ) :
-				self.__reportKilled( batch )
-				return False
+				# Launch everything whose preTasks have completed, up to
+				# the concurrency limit. We stop launching new batches as
+				# soon as one has failed, but wait for those already running.
+
+				launched = True
+				while launched and failedBatch is None :
+
+					launched = False
+					for batch in pending :
+
+						if not all( self.__getStatus( b ) == LocalDispatcher.Job.Status.Complete for b in batch.preTasks() ) :
+							continue
+
+						if batch.plug() is None :
+							self.__reportCompleted( batch )
+							return True
+
+						if len( batch.frames() ) == 0 :
+							# This case occurs for nodes like TaskList and TaskContextProcessors,
+							# because they don't do anything in execute (they have empty hashes).
+							# Their batches exist only to depend on upstream batches. We don't need
+							# to do any work here, but we still signal completion for the task to
+							# provide progress feedback to the user.
+							self.__setStatus( batch, LocalDispatcher.Job.Status.Complete )
+							IECore.msg( IECore.MessageHandler.Level.Info, self.__messageTitle, "Finished " + batch.blindData()["nodeName"].value )
+						elif len( running ) < self.__maxConcurrency :
+							running[batch] = self.__launchBatch( batch, idleWorkers )
+						else :
+							continue
+
+						pending.remove( batch )
+						# Completing a batch may have made others ready,
+						# so start again from the beginning.
+						launched = True
+						break
+
+				if not running :
+					if failedBatch is not None :
+						self.__reportFailed( failedBatch )
+					return False
 
-			if batch.plug() is None :
-				self.__reportCompleted( batch )
-				return True
+				# Wait for a process to complete or for a kill request.
 
-			if len( batch.frames() ) == 0 :
-				# This case occurs for nodes like TaskList and TaskContextProcessors,
-				# because they don't do anything in execute (they have empty hashes).
-				# Their batches exist only to depend on upstream batches. We don't need
-				# to do any work here, but we still signal completion for the task to
-				# provide progress feedback to the user.
-				self.__setStatus( batch, LocalDispatcher.Job.Status.Complete )
-				IECore.msg( IECore.MessageHandler.Level.Info, self.__messageTitle, "Finished " + batch.blindData()["nodeName"].value )
-				return True
+				event = self.__events.get()
+				if event is None :
+					continue
 
-			taskContext = batch.context()
-			frames = str( IECore.frameListFromList( [ int(x) for x in batch.frames() ] ) )
+				batch, returnCode = event
+				if batch not in running :
+					# Stale notification from a process we killed.
+					continue
 
-			args = [
-				"gaffer", "execute",
-				"-script", self.__scriptFile,
-				"-nodes", batch.blindData()["nodeName"].value,
-				"-frames", frames,
-			]
+				process = running.pop( batch )
+				if isinstance( process, _Worker ) :
+					if process.usable() :
+						idleWorkers.append( process )
+					else :
+						process.close()
 
-			args = shlex.split( self.__environmentCommand ) + args
+				if returnCode :
+					self.__setStatus( batch, LocalDispatcher.Job.Status.Failed )
+					if failedBatch is None :
+						failedBatch = batch
+				else :
+					self.__setStatus( batch, LocalDispatcher.Job.Status.Complete )
 
-			if self.__ignoreScriptLoadErrors :
-				args.append( "-ignoreScriptLoadErrors" )
+		def __launchBatch( self, batch, idleWorkers ) :
+
+			taskContext = batch.context()
+			nodeName = batch.blindData()["nodeName"].value
+			frames = str( IECore.frameListFromList( [ int(x) for x in batch.frames() ] ) )
 
 			contextArgs = []
 			for entry in [ k for k in taskContext.keys() if k != "frame" and not k.startswith( "ui:" ) ] :
 				if entry not in self.__context.keys() or taskContext[entry] != self.__context[entry] :
 					contextArgs.extend( [ "-" + entry, IECore.repr( taskContext[entry] ) ] )
 
+			self.__setStatus( batch, LocalDispatcher.Job.Status.Running )
+
+			if self.__persistentWorkers :
+
+				if idleWorkers :
+					worker = idleWorkers.pop()
+				else :
+					args = self.__executeArgs( [ "-worker" ] )
+					IECore.msg( IECore.MessageHandler.Level.Info, self.__messageTitle, " ".join( args ) )
+					worker = _Worker( args )
+
+				IECore.msg(
+					IECore.MessageHandler.Level.Info, self.__messageTitle,
+					"Executing %s on frames %s in worker %d" % ( nodeName, frames, worker.pid )
+				)
+				batch.blindData()["pid"] = IECore.IntData( worker.pid )
+
+				request = { "nodes" : [ nodeName ], "frames" : frames, "context" : contextArgs }
+				threading.Thread( target = self.__waitForWorker, args = ( batch, worker, request ) ).start()
+
+				return worker
+
+			args = self.__executeArgs( [ "-nodes", nodeName, "-frames", frames ] )
 			if contextArgs :
 				args.extend( [ "-context" ] + contextArgs )
 
-			self.__setStatus( batch, LocalDispatcher.Job.Status.Running )
 			IECore.msg( IECore.MessageHandler.Level.Info, self.__messageTitle, " ".join( args ) )
 			process = subprocess.Popen( args, start_new_session=True )
 			batch.blindData()["pid"] = IECore.IntData( process.pid )
 
-			while process.poll() is None :
+			threading.Thread( target = self.__waitForProcess, args = ( batch, process ) ).start()
 
-				if batch.blindData().get( "killed" ) :
-					os.killpg( process.pid, signal.SIGTERM )
-					self.__reportKilled( batch )
-					return False
+			return process
 
-				time.sleep( 0.01 )
+		def __executeArgs( self, extraArgs ) :
 
-			if process.returncode :
-				self.__reportFailed( batch )
-				return False
+			args = [ "gaffer", "execute", "-script", self.__scriptFile ] + extraArgs
+			args = shlex.split( self.__environmentCommand ) + args
 
-			self.__setStatus( batch, LocalDispatcher.Job.Status.Complete )
+			if self.__ignoreScriptLoadErrors :
+				args.append( "-ignoreScriptLoadErrors" )
 
-			return True
+			return args
+
+		def __waitForProcess( self, batch, process ) :
+
+			process.wait()
+			self.__events.put( ( batch, process.returncode ) )
+
+		def __waitForWorker( self, batch, worker, request ) :
+
+			self.__events.put( ( batch, worker.execute( request ) ) )
+
+		def __batchesInExecutionOrder( self, batch, result = None, visited = None ) :
+
+			if result is None :
+				result = []
+				visited = set()
+
+			if batch in visited :
+				return result
+
+			visited.add( batch )
+			for upstreamBatch in batch.preTasks() :
+				self.__batchesInExecutionOrder( upstreamBatch, result, visited )
+
+			result.append( batch )
+			return result
 
 		def __getStatus( self, batch ) :
 
@@ -334,6 +456,13 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 			# than searching each time it is requested.
 			return self.__currentBatchWalk( self.__batch, set() )
 
+		def __runningBatches( self ) :
+
+			return [
+				b for b in self.__batchesInExecutionOrder( self.__batch )
+				if self.__getStatus( b ) == LocalDispatcher.Job.Status.Running
+			]
+
 		def __currentBatchWalk( self, batch, visited ) :
 
 			if batch in visited :
@@ -448,6 +577,53 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 
 		job.execute( background = self["executeInBackground"].getValue() )
 
+## A long-lived `gaffer execute -worker` process, which keeps the
+# dispatched script loaded so that it can execute many batches without
+# paying the startup cost for each one.
+class _Worker( object ) :
+
+	def __init__( self, args ) :
+
+		self.__process = subprocess.Popen(
+			args, start_new_session = True,
+			stdin = subprocess.PIPE, stdout = subprocess.PIPE,
+			universal_newlines = True,
+		)
+		self.pid = self.__process.pid
+		self.__usable = True
+
+	## Sends a request to the worker and blocks until it has been
+	# executed, returning 0 on success and 1 on failure.
+	def execute( self, request ) :
+
+		try :
+			self.__process.stdin.write( json.dumps( request ) + "\n" )
+			self.__process.stdin.flush()
+			response = self.__process.stdout.readline()
+		except ( IOError, OSError ) :
+			response = ""
+
+		if not response :
+			# The worker has died, perhaps because it failed to load
+			# the script, or because it was killed.
+			self.__usable = False
+			return 1
+
+		return int( response )
+
+	def usable( self ) :
+
+		return self.__usable
+
+	def close( self ) :
+
+		try :
+			self.__process.stdin.close()
+		except ( IOError, OSError ) :
+			pass
+
+		self.__process.wait()
+
 IECore.registerRunTimeTyped( LocalDispatcher, typeName = "GafferDispatch::LocalDispatcher" )
 IECore.registerRunTimeTyped( LocalDispatcher.JobPool, typeName = "GafferDispatch::LocalDispatcher::JobPool" )
 
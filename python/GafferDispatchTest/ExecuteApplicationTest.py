@@ -36,6 +36,7 @@
 ##########################################################################
 
 import os
+import json
 import subprocess32 as subprocess
 import unittest
 import glob
@@ -383,5 +384,44 @@ class ExecuteApplicationTest( GafferTest.TestCase ) :
 		validate( sequence = True )
 		validate( sequence = False )
 
+	def testWorker( self ) :
+
+		s = Gaffer.ScriptNode()
+
+		s["write"] = GafferDispatchTest.TextWriter()
+		s["write"]["fileName"].setValue( self.__outputFileSeq.fileName )
+		s["write"]["text"].setValue( "${value}" )
+
+		s["fileName"].setValue( self.__scriptFileName )
+		s.save()
+
+		p = subprocess.Popen(
+			[ "gaffer", "execute", self.__scriptFileName, "-worker" ],
+			stdin = subprocess.PIPE,
+			stdout = subprocess.PIPE,
+			universal_newlines = True,
+		)
+
+		def request( nodes, frames, context ) :
+
+			p.stdin.write( json.dumps( { "nodes" : nodes, "frames" : frames, "context" : context } ) + "\n" )
+			p.stdin.flush()
+			return p.stdout.readline()
+
+		self.assertEqual( request( [ "write" ], "1-2", [ "-value", "'a'" ] ), "0\n" )
+		for frame in ( 1, 2 ) :
+			with open( self.__outputFileSeq.fileNameForFrame( frame ) ) as f :
+				self.assertEqual( f.read(), "a" )
+
+		self.assertEqual( request( [ "write" ], "3", [ "-value", "'b'" ] ), "0\n" )
+		with open( self.__outputFileSeq.fileNameForFrame( 3 ) ) as f :
+			self.assertEqual( f.read(), "b" )
+
+		self.assertEqual( request( [ "doesNotExist" ], "1", [] ), "1\n" )
+
+		p.stdin.close()
+		p.wait()
+		self.assertEqual( p.returncode, 0 )
+
 if __name__ == "__main__":
 	unittest.main()
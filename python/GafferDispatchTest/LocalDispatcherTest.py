@@ -856,5 +856,125 @@ class LocalDispatcherTest( GafferTest.TestCase ) :
 			open( self.temporaryDirectory() + "/outer.txt" ).readlines(),
 		)
 
+	def testMaxConcurrency( self ) :
+
+		# Two independent tasks, each of which waits for the other to
+		# start. This can only succeed if they are executed concurrently.
+
+		s = Gaffer.ScriptNode()
+
+		for name, other in ( ( "a", "b" ), ( "b", "a" ) ) :
+			s[name] = GafferDispatch.PythonCommand()
+			s[name]["command"].setValue( inspect.cleandoc(
+				"""
+				import os
+				import time
+				open( "{directory}/{name}.started", "w" ).close()
+				startTime = time.time()
+				while not os.path.exists( "{directory}/{other}.started" ) :
+					if time.time() - startTime > 20 :
+						raise RuntimeError( "Timed out waiting for {other}" )
+					time.sleep( 0.01 )
+				"""
+			).format( directory = self.temporaryDirectory(), name = name, other = other ) )
+
+		s["list"] = GafferDispatch.TaskList()
+		s["list"]["preTasks"][0].setInput( s["a"]["task"] )
+		s["list"]["preTasks"][1].setInput( s["b"]["task"] )
+
+		d = self.__createLocalDispatcher()
+		d["executeInBackground"].setValue( True )
+		d["maxConcurrency"].setValue( 2 )
+		d.dispatch( [ s["list"] ] )
+		job = d.jobPool().jobs()[0]
+		d.jobPool().waitForAll()
+
+		self.assertFalse( job.failed() )
+		self.assertTrue( os.path.exists( self.temporaryDirectory() + "/a.started" ) )
+		self.assertTrue( os.path.exists( self.temporaryDirectory() + "/b.started" ) )
+
+	def testMaxConcurrencyRespectsPreTasks( self ) :
+
+		fileName = self.temporaryDirectory() + "/result.txt"
+
+		s = Gaffer.ScriptNode()
+		for name in [ "n1", "n2", "n2a", "n2b" ] :
+			s[name] = GafferDispatchTest.TextWriter()
+			s[name]["mode"].setValue( "a" )
+			s[name]["fileName"].setValue( fileName )
+			s[name]["text"].setValue( name + ";" )
+
+		s["n1"]["preTasks"][0].setInput( s["n2"]["task"] )
+		s["n2"]["preTasks"][0].setInput( s["n2a"]["task"] )
+		s["n2"]["preTasks"][1].setInput( s["n2b"]["task"] )
+
+		d = self.__createLocalDispatcher()
+		d["executeInBackground"].setValue( True )
+		d["maxConcurrency"].setValue( 0 )
+		d.dispatch( [ s["n1"] ] )
+		d.jobPool().waitForAll()
+
+		with open( fileName ) as f :
+			text = f.read()
+
+		self.assertTrue( text.endswith( "n2;n1;" ) )
+		self.assertEqual( sorted( text.split( ";" )[:2] ), [ "n2a", "n2b" ] )
+
+	def testPersistentWorkers( self ) :
+
+		pidFile = self.temporaryDirectory() + "/pids.txt"
+
+		s = Gaffer.ScriptNode()
+
+		lastTask = None
+		for i in range( 0, 4 ) :
+			task = GafferDispatch.PythonCommand()
+			task["command"].setValue( inspect.cleandoc(
+				"""
+				import os
+				with open( "{0}", "a" ) as f :
+					f.write( "%d\\n" % os.getpid() )
+				""".format( pidFile )
+			) )
+			if lastTask is not None :
+				task["preTasks"][0].setInput( lastTask["task"] )
+			s["task%d" % i] = task
+			lastTask = task
+
+		d = self.__createLocalDispatcher()
+		d["executeInBackground"].setValue( True )
+		d["persistentWorkers"].setValue( True )
+		d.dispatch( [ lastTask ] )
+		job = d.jobPool().jobs()[0]
+		d.jobPool().waitForAll()
+
+		self.assertFalse( job.failed() )
+		with open( pidFile ) as f :
+			pids = f.readlines()
+
+		# All tasks were executed, but only one process was needed.
+		self.assertEqual( len( pids ), 4 )
+		self.assertEqual( len( set( pids ) ), 1 )
+		self.assertNotEqual( int( pids[0] ), os.getpid() )
+
+	def testPersistentWorkersFailure( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["n1"] = GafferDispatchTest.TextWriter()
+		s["n1"]["fileName"].setValue( self.temporaryDirectory() + "/n1_####.txt" )
+		s["n2"] = GafferDispatchTest.TextWriter()
+		s["n2"]["fileName"].setValue( "" )
+		s["n1"]["preTasks"][0].setInput( s["n2"]["task"] )
+
+		d = self.__createLocalDispatcher()
+		d["executeInBackground"].setValue( True )
+		d["persistentWorkers"].setValue( True )
+		d.dispatch( [ s["n1"] ] )
+		job = d.jobPool().jobs()[0]
+		d.jobPool().waitForAll()
+
+		self.assertTrue( job.failed() )
+		self.assertFalse( os.path.isfile( s.context().substitute( s["n1"]["fileName"].getValue() ) ) )
+
 if __name__ == "__main__":
 	unittest.main()
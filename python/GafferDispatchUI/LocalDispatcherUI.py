@@ -97,6 +97,32 @@ Gaffer.Metadata.registerNode(
 
 		),
 
+		"maxConcurrency" : (
+
+			"description",
+			"""
+			The maximum number of tasks to execute at the same time when
+			executing in the background. Tasks are started as soon as all
+			their preTasks have completed, so independent branches of the
+			task graph may run in parallel. A value of 0 uses one process
+			per available CPU core.
+			""",
+
+		),
+
+		"persistentWorkers" : (
+
+			"description",
+			"""
+			Executes background tasks using long-lived worker processes
+			rather than launching a new `gaffer execute` process for each
+			task. Each worker loads the script only once, avoiding repeated
+			startup costs and allowing the compute cache to be shared between
+			tasks that depend on the same upstream results.
+			""",
+
+		),
+
 	}
 
 )
@@ -40,6 +40,7 @@ import imath
 import IECore
 
 import Gaffer
+import GafferTest
 import GafferImage
 import GafferImageTest
 import os
@@ -197,5 +198,152 @@ class BlurTest( GafferImageTest.ImageTestCase ) :
 
 		self.assertImagesEqual( finalCrop["out"], expectedReader["out"], maxDifference = 0.00001, ignoreMetadata = True )
 
+	def testFastMode( self ) :
+
+		checkerboard = GafferImage.Checkerboard()
+		checkerboard["format"].setValue( GafferImage.Format( 512, 512 ) )
+		checkerboard["size"].setValue( imath.V2f( 48 ) )
+		checkerboard["colorA"].setValue( imath.Color4f( 0 ) )
+		checkerboard["colorB"].setValue( imath.Color4f( 1 ) )
+
+		# Crop to a non-tile-aligned area, so that we test the
+		# handling of the data window as well as tile boundaries.
+		crop = GafferImage.Crop()
+		crop["in"].setInput( checkerboard["out"] )
+		crop["area"].setValue( imath.Box2i( imath.V2i( 150, 130 ), imath.V2i( 370, 390 ) ) )
+		crop["affectDisplayWindow"].setValue( False )
+
+		accurate = GafferImage.Blur()
+		accurate["in"].setInput( crop["out"] )
+
+		fast = GafferImage.Blur()
+		fast["in"].setInput( crop["out"] )
+		fast["mode"].setValue( GafferImage.Blur.Mode.Fast )
+		fast["radius"].setInput( accurate["radius"] )
+		fast["boundingMode"].setInput( accurate["boundingMode"] )
+		fast["expandDataWindow"].setInput( accurate["expandDataWindow"] )
+
+		for radius in [ imath.V2f( 2 ), imath.V2f( 3.5 ), imath.V2f( 10 ), imath.V2f( 30, 5 ), imath.V2f( 0, 20 ), imath.V2f( 50 ) ] :
+			for boundingMode in [ GafferImage.Sampler.BoundingMode.Black, GafferImage.Sampler.BoundingMode.Clamp ] :
+				for expandDataWindow in [ False, True ] :
+
+					if boundingMode == GafferImage.Sampler.BoundingMode.Clamp and expandDataWindow :
+						# The modes expand the data window by different amounts, and
+						# clamping puts significant values in the extra pixels.
+						continue
+
+					accurate["radius"].setValue( radius )
+					accurate["boundingMode"].setValue( boundingMode )
+					accurate["expandDataWindow"].setValue( expandDataWindow )
+
+					# The data window is expanded by the support of the filter,
+					# which differs slightly between the modes. The differences
+					# are within the format, so are still compared.
+					self.assertImagesEqual( fast["out"], accurate["out"], maxDifference = 0.05, ignoreDataWindow = expandDataWindow )
+
+					fastDataWindow = fast["out"]["dataWindow"].getValue()
+					unionDataWindow = imath.Box2i( fastDataWindow.min(), fastDataWindow.max() )
+					unionDataWindow.extendBy( accurate["out"]["dataWindow"].getValue() )
+					self.assertEqual( unionDataWindow, fastDataWindow )
+
+	def testFastModeEnergyPreservation( self ) :
+
+		constant = GafferImage.Constant()
+		constant["color"].setValue( imath.Color4f( 1 ) )
+
+		crop = GafferImage.Crop()
+		crop["in"].setInput( constant["out"] )
+		crop["area"].setValue( imath.Box2i( imath.V2i( 20 ), imath.V2i( 21 ) ) )
+		crop["affectDisplayWindow"].setValue( False )
+
+		blur = GafferImage.Blur()
+		blur["in"].setInput( crop["out"] )
+		blur["mode"].setValue( GafferImage.Blur.Mode.Fast )
+		blur["expandDataWindow"].setValue( True )
+
+		stats = GafferImage.ImageStats()
+		stats["in"].setInput( blur["out"] )
+		stats["area"].setValue( imath.Box2i( imath.V2i( 0 ), imath.V2i( 40 ) ) )
+
+		for i in range( 0, 10 ) :
+
+			blur["radius"].setValue( imath.V2f( i * 0.5 ) )
+			self.assertAlmostEqual( stats["average"]["r"].getValue(), 1 / 1600., delta = 0.000001 )
+
+	def testFastModePassThrough( self ) :
+
+		c = GafferImage.Constant()
+
+		b = GafferImage.Blur()
+		b["in"].setInput( c["out"] )
+		b["mode"].setValue( GafferImage.Blur.Mode.Fast )
+
+		self.assertImageHashesEqual( c["out"], b["out"] )
+		self.assertImagesEqual( c["out"], b["out"] )
+
+	def testFastModeDataWindowDependency( self ) :
+
+		constant = GafferImage.Constant()
+		constant["color"].setValue( imath.Color4f( 1 ) )
+
+		crop = GafferImage.Crop()
+		crop["in"].setInput( constant["out"] )
+		crop["area"].setValue( imath.Box2i( imath.V2i( 0 ), imath.V2i( 100 ) ) )
+		crop["affectDisplayWindow"].setValue( False )
+
+		# Take only the data window from the Crop, so that
+		# changing the crop area doesn't dirty the channel data
+		# of the input.
+
+		blur = GafferImage.Blur()
+		blur["mode"].setValue( GafferImage.Blur.Mode.Fast )
+		blur["radius"].setValue( imath.V2f( 10 ) )
+		for plug in blur["in"].children() :
+			if plug.getName() == "dataWindow" :
+				plug.setInput( crop["out"]["dataWindow"] )
+			else :
+				plug.setInput( constant["out"][plug.getName()] )
+
+		self.assertIn( blur["out"]["channelData"], blur.affects( blur["in"]["dataWindow"] ) )
+
+		with Gaffer.Context() as c :
+			c["image:channelName"] = "R"
+			c["image:tileOrigin"] = imath.V2i( 0 )
+			hash1 = blur["out"]["channelData"].hash()
+			data1 = blur["out"]["channelData"].getValue()
+			crop["area"].setValue( imath.Box2i( imath.V2i( 0 ), imath.V2i( 50 ) ) )
+			hash2 = blur["out"]["channelData"].hash()
+			data2 = blur["out"]["channelData"].getValue()
+
+		self.assertNotEqual( hash1, hash2 )
+		self.assertNotEqual( data1, data2 )
+
+	def __testPerformance( self, mode, radius ) :
+
+		checkerboard = GafferImage.Checkerboard()
+		checkerboard["format"].setValue( GafferImage.Format( 1920, 1080 ) )
+
+		blur = GafferImage.Blur()
+		blur["in"].setInput( checkerboard["out"] )
+		blur["mode"].setValue( mode )
+		blur["radius"].setValue( imath.V2f( radius ) )
+
+		GafferImageTest.processTiles( checkerboard["out"] )
+
+		with GafferTest.TestRunner.PerformanceScope() :
+			GafferImageTest.processTiles( blur["out"] )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testAccurateModePerformance( self ) :
+
+		self.__testPerformance( GafferImage.Blur.Mode.Accurate, 100 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testFastModePerformance( self ) :
+
+		self.__testPerformance( GafferImage.Blur.Mode.Fast, 100 )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -106,6 +106,142 @@ class ImageNodeTest( GafferImageTest.ImageTestCase ) :
 		self.assertNodesConstructWithDefaultValues( GafferImage )
 		self.assertNodesConstructWithDefaultValues( GafferImageTest )
 
+	def testProxyLevelFallback( self ) :
+
+		ramp = GafferImage.Ramp()
+		ramp["format"].setValue( GafferImage.Format( 100, 60 ) )
+		ramp["startPosition"].setValue( imath.V2f( 0 ) )
+		ramp["endPosition"].setValue( imath.V2f( 100, 60 ) )
+
+		# Offset only supports proxy levels natively when the offset is
+		# a whole number of proxy pixels, which this isn't, so will
+		# use the default downsampling provided by ImageNode.
+		offset = GafferImage.Offset()
+		offset["in"].setInput( ramp["out"] )
+		offset["offset"].setValue( imath.V2i( 3, -5 ) )
+
+		displayWindow = offset["out"]["format"].getValue().getDisplayWindow()
+		dataWindow = offset["out"]["dataWindow"].getValue()
+		# Proxy pixels at the edge of the data window may average in
+		# some full resolution pixels from outside it, which are black.
+		fullSampler = GafferImage.Sampler(
+			offset["out"], "R",
+			imath.Box2i( dataWindow.min() - imath.V2i( 8 ), dataWindow.max() + imath.V2i( 8 ) ),
+			GafferImage.Sampler.BoundingMode.Black
+		)
+		fullResolutionHash = offset["out"].channelDataHash( "R", imath.V2i( 0 ) )
+
+		for level in ( 1, 2, 3 ) :
+
+			with Gaffer.Context() as c :
+
+				c["image:proxyLevel"] = level
+
+				self.assertEqual(
+					offset["out"]["format"].getValue().getDisplayWindow(),
+					GafferImage.ImagePlug.proxyBox( displayWindow, level )
+				)
+
+				proxyDataWindow = offset["out"]["dataWindow"].getValue()
+				self.assertEqual( proxyDataWindow, GafferImage.ImagePlug.proxyBox( dataWindow, level ) )
+
+				self.assertNotEqual( offset["out"].channelDataHash( "R", imath.V2i( 0 ) ), fullResolutionHash )
+
+				proxySampler = GafferImage.Sampler( offset["out"], "R", proxyDataWindow )
+
+				scale = 2 ** level
+				for y in range( proxyDataWindow.min().y, proxyDataWindow.max().y ) :
+					for x in range( proxyDataWindow.min().x, proxyDataWindow.max().x ) :
+						expected = 0
+						for fy in range( y * scale, ( y + 1 ) * scale ) :
+							for fx in range( x * scale, ( x + 1 ) * scale ) :
+								expected += fullSampler.sample( fx, fy )
+						expected /= scale * scale
+						self.assertAlmostEqual( proxySampler.sample( x, y ), expected, places = 5 )
+
+	def testProxyLevelNativeSupport( self ) :
+
+		ramp = GafferImage.Ramp()
+		ramp["format"].setValue( GafferImage.Format( 100, 60 ) )
+		ramp["startPosition"].setValue( imath.V2f( 0 ) )
+		ramp["endPosition"].setValue( imath.V2f( 100, 60 ) )
+
+		# Grade processes pixels independently, so computes proxy levels
+		# directly from the downsampled input.
+		grade = GafferImage.Grade()
+		grade["in"].setInput( ramp["out"] )
+		grade["multiply"].setValue( imath.Color4f( 0.5 ) )
+
+		fullResolutionHash = grade["out"].channelDataHash( "R", imath.V2i( 0 ) )
+
+		with Gaffer.Context() as c :
+
+			c["image:proxyLevel"] = 1
+
+			self.assertNotEqual( grade["out"].channelDataHash( "R", imath.V2i( 0 ) ), fullResolutionHash )
+			self.assertEqual( grade["out"]["dataWindow"].getValue(), imath.Box2i( imath.V2i( 0 ), imath.V2i( 50, 30 ) ) )
+
+			rampData = ramp["out"].channelData( "R", imath.V2i( 0 ) )
+			gradeData = grade["out"].channelData( "R", imath.V2i( 0 ) )
+
+		for rampValue, gradeValue in zip( rampData, gradeData ) :
+			self.assertAlmostEqual( gradeValue, rampValue * 0.5, places = 6 )
+
+	def testProxyLevelGenerators( self ) :
+
+		constant = GafferImage.Constant()
+		constant["format"].setValue( GafferImage.Format( imath.Box2i( imath.V2i( -10, 5 ), imath.V2i( 91, 60 ) ), 2.0 ) )
+		constant["color"].setValue( imath.Color4f( 0.25, 0.5, 0.75, 1 ) )
+
+		fullResolutionFormat = constant["out"]["format"].getValue()
+		fullResolutionHash = constant["out"]["dataWindow"].hash()
+
+		for level in ( 1, 2, 3 ) :
+
+			with Gaffer.Context() as c :
+
+				c["image:proxyLevel"] = level
+
+				proxyBox = GafferImage.ImagePlug.proxyBox( fullResolutionFormat.getDisplayWindow(), level )
+				self.assertEqual( constant["out"]["format"].getValue().getDisplayWindow(), proxyBox )
+				self.assertEqual( constant["out"]["format"].getValue().getPixelAspect(), 2.0 )
+				self.assertEqual( constant["out"]["dataWindow"].getValue(), proxyBox )
+				self.assertNotEqual( constant["out"]["dataWindow"].hash(), fullResolutionHash )
+
+				sampler = GafferImage.Sampler( constant["out"], "G", proxyBox )
+				for y in range( proxyBox.min().y, proxyBox.max().y ) :
+					for x in range( proxyBox.min().x, proxyBox.max().x ) :
+						self.assertEqual( sampler.sample( x, y ), 0.5 )
+
+	def testProxyLevelOffset( self ) :
+
+		ramp = GafferImage.Ramp()
+		ramp["format"].setValue( GafferImage.Format( 100, 60 ) )
+		ramp["startPosition"].setValue( imath.V2f( 0 ) )
+		ramp["endPosition"].setValue( imath.V2f( 100, 60 ) )
+
+		# An offset which is a whole number of proxy pixels is
+		# applied directly to the proxy resolution input.
+		offset = GafferImage.Offset()
+		offset["in"].setInput( ramp["out"] )
+		offset["offset"].setValue( imath.V2i( 8, -16 ) )
+
+		with Gaffer.Context() as c :
+
+			c["image:proxyLevel"] = 2
+
+			rampDataWindow = ramp["out"]["dataWindow"].getValue()
+			self.assertEqual(
+				offset["out"]["dataWindow"].getValue(),
+				imath.Box2i( rampDataWindow.min() + imath.V2i( 2, -4 ), rampDataWindow.max() + imath.V2i( 2, -4 ) )
+			)
+
+			rampSampler = GafferImage.Sampler( ramp["out"], "R", rampDataWindow )
+			offsetSampler = GafferImage.Sampler( offset["out"], "R", offset["out"]["dataWindow"].getValue() )
+			for y in range( rampDataWindow.min().y, rampDataWindow.max().y ) :
+				for x in range( rampDataWindow.min().x, rampDataWindow.max().x ) :
+					self.assertEqual( offsetSampler.sample( x + 2, y - 4 ), rampSampler.sample( x, y ) )
+
 	def setUp( self ) :
 
 		GafferTest.TestCase.setUp( self )
@@ -84,6 +84,20 @@ class ImagePlugTest( GafferImageTest.ImageTestCase ) :
 				tileIndex
 			)
 
+	def testProxyBox( self ) :
+
+		for box, level, proxyBox in [
+			( imath.Box2i( imath.V2i( 0 ), imath.V2i( 100, 60 ) ), 1, imath.Box2i( imath.V2i( 0 ), imath.V2i( 50, 30 ) ) ),
+			( imath.Box2i( imath.V2i( 0 ), imath.V2i( 101, 61 ) ), 1, imath.Box2i( imath.V2i( 0 ), imath.V2i( 51, 31 ) ) ),
+			( imath.Box2i( imath.V2i( -3 ), imath.V2i( 5 ) ), 2, imath.Box2i( imath.V2i( -1 ), imath.V2i( 2 ) ) ),
+			( imath.Box2i( imath.V2i( 10 ), imath.V2i( 20 ) ), 0, imath.Box2i( imath.V2i( 10 ), imath.V2i( 20 ) ) ),
+			( imath.Box2i(), 2, imath.Box2i() ),
+		] :
+			self.assertEqual(
+				GafferImage.ImagePlug.proxyBox( box, level ),
+				proxyBox
+			)
+
 	def testDefaultChannelNames( self ) :
 
 		self.assertEqual(
@@ -306,5 +320,104 @@ class ImagePlugTest( GafferImageTest.ImageTestCase ) :
 			else:
 				self.assertEqual( tileData[i], value )
 
+	def testChannelDataBatch( self ) :
+
+		main = GafferImage.Ramp()
+		main["format"].setValue( GafferImage.Format( 200, 100 ) )
+		main["endPosition"].setValue( imath.V2f( 200, 100 ) )
+
+		diffuse = GafferImage.Ramp()
+		diffuse["format"].setValue( GafferImage.Format( 200, 100 ) )
+		diffuse["startPosition"].setValue( imath.V2f( 200, 0 ) )
+		diffuse["layer"].setValue( "diffuse" )
+
+		copy = GafferImage.CopyChannels()
+		copy["in"][0].setInput( main["out"] )
+		copy["in"][1].setInput( diffuse["out"] )
+		copy["channels"].setValue( "*" )
+
+		# Saturation is a ColorProcessor, which computes each
+		# layer's R, G and B together.
+		saturation = GafferImage.Saturation()
+		saturation["in"].setInput( copy["out"] )
+		saturation["saturation"].setValue( 0.5 )
+		saturation["channels"].setValue( "*" )
+
+		channelNames = list( saturation["out"]["channelNames"].getValue() )
+		self.assertEqual( set( channelNames ), { "R", "G", "B", "A", "diffuse.R", "diffuse.G", "diffuse.B", "diffuse.A" } )
+
+		def assertBatchMatches( image ) :
+
+			for tileOrigin in ( imath.V2i( 0 ), imath.V2i( GafferImage.ImagePlug.tileSize(), 0 ) ) :
+				for names in ( channelNames, list( reversed( channelNames ) ), [ "G" ], [] ) :
+					batch = image.channelData( names, tileOrigin )
+					self.assertEqual( len( batch ), len( names ) )
+					for name, data in zip( names, batch ) :
+						self.assertEqual( data, image.channelData( name, tileOrigin ) )
+
+					h = IECore.MurmurHash()
+					for name in names :
+						h.append( image.channelDataHash( name, tileOrigin ) )
+					self.assertEqual( image.channelDataHash( names, tileOrigin ), h )
+
+		assertBatchMatches( saturation["out"] )
+
+		saturation["channels"].setValue( "diffuse.*" )
+		assertBatchMatches( saturation["out"] )
+
+		saturation["enabled"].setValue( False )
+		assertBatchMatches( saturation["out"] )
+
+		saturation["enabled"].setValue( True )
+		with Gaffer.Context() as c :
+			c["image:proxyLevel"] = 1
+			assertBatchMatches( saturation["out"] )
+
+		# Plugs which are not computed by an ImageNode directly.
+
+		plug = GafferImage.ImagePlug()
+		plug.setInput( saturation["out"] )
+		assertBatchMatches( plug )
+		assertBatchMatches( GafferImage.ImagePlug() )
+
+	def testChannelDataBatchUsesComputeCache( self ) :
+
+		constant = GafferImage.Constant()
+		constant["color"].setValue( imath.Color4f( 0.1, 0.2, 0.3, 0.4 ) )
+
+		saturation = GafferImage.Saturation()
+		saturation["in"].setInput( constant["out"] )
+		saturation["saturation"].setValue( 0.5 )
+
+		names = [ "R", "G", "B", "A" ]
+		tileOrigin = imath.V2i( 0 )
+
+		# Values computed as a batch should be stored in the
+		# compute cache, so that they aren't computed again when
+		# they are requested individually.
+
+		Gaffer.ValuePlug.clearCache()
+		batch = saturation["out"].channelData( names, tileOrigin )
+
+		with Gaffer.PerformanceMonitor() as m :
+			for name, data in zip( names, batch ) :
+				self.assertEqual( saturation["out"].channelData( name, tileOrigin ), data )
+
+		self.assertEqual( m.plugStatistics( saturation["out"]["channelData"] ).computeCount, 0 )
+
+		# Values which are already cached shouldn't be computed
+		# again by a batch.
+
+		Gaffer.ValuePlug.clearCache()
+		green = saturation["out"].channelData( "G", tileOrigin, _copy = False )
+
+		with Gaffer.PerformanceMonitor() as m :
+			batch = saturation["out"].channelData( names, tileOrigin, _copy = False )
+			for name, data in zip( names, batch ) :
+				self.assertTrue( saturation["out"].channelData( name, tileOrigin, _copy = False ).isSame( data ) )
+
+		self.assertTrue( batch[1].isSame( green ) )
+		self.assertEqual( m.plugStatistics( saturation["out"]["channelData"] ).computeCount, 0 )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -1402,5 +1402,48 @@ class ImageWriterTest( GafferImageTest.ImageTestCase ) :
 		self.assertIn( "Ignoring metadata \"oiio:subimagename\" because it conflicts with OpenImageIO.", warnings )
 		self.assertIn( "Ignoring metadata \"oiio:subimages\" because it conflicts with OpenImageIO.", warnings )
 
+	def testDeepWriteMultipleRows( self ) :
+
+		constant = GafferImage.Constant()
+		constant["color"].setValue( imath.Color4f( 0.25, 0.5, 0.75, 1 ) )
+		constant["format"].setValue( GafferImage.Format( imath.Box2i( imath.V2i( 0 ), imath.V2i( 1000, 300 ) ), 1. ) )
+
+		flatToDeep = GafferImage.FlatToDeep()
+		flatToDeep["in"].setInput( constant["out"] )
+
+		writer = GafferImage.ImageWriter()
+		writer["in"].setInput( flatToDeep["out"] )
+		writer["fileName"].setValue( os.path.join( self.temporaryDirectory(), "deepRows.exr" ) )
+
+		reader = GafferImage.ImageReader()
+		reader["fileName"].setInput( writer["fileName"] )
+
+		for mode in [ GafferImage.ImageWriter.Mode.Scanline, GafferImage.ImageWriter.Mode.Tile ] :
+
+			writer["openexr"]["mode"].setValue( mode )
+			writer["task"].execute()
+
+			reader["refreshCount"].setValue( reader["refreshCount"].getValue() + 1 )
+			self.assertImagesEqual( reader["out"], flatToDeep["out"], ignoreMetadata = True )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testDeepWritePerformance( self ) :
+
+		constant = GafferImage.Constant()
+		constant["format"].setValue( GafferImage.Format( imath.Box2i( imath.V2i( 0 ), imath.V2i( 4096, 2048 ) ), 1. ) )
+
+		flatToDeep = GafferImage.FlatToDeep()
+		flatToDeep["in"].setInput( constant["out"] )
+
+		writer = GafferImage.ImageWriter()
+		writer["in"].setInput( flatToDeep["out"] )
+		writer["fileName"].setValue( os.path.join( self.temporaryDirectory(), "deepPerformance.exr" ) )
+
+		GafferImageTest.processTiles( flatToDeep["out"] )
+
+		with GafferTest.TestRunner.PerformanceScope() :
+			writer["task"].execute()
+
 if __name__ == "__main__":
 	unittest.main()
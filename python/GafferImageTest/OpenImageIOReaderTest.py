@@ -682,6 +682,29 @@ class OpenImageIOReaderTest( GafferImageTest.ImageTestCase ) :
 		finally :
 			GafferImage.OpenImageIOReader.setOpenFilesLimit( l )
 
+	def testProxyLevelWithoutMIPLevels( self ) :
+
+		reader = GafferImage.OpenImageIOReader()
+		reader["fileName"].setValue( self.fileName )
+
+		fullResolutionDataWindow = reader["out"]["dataWindow"].getValue()
+
+		with Gaffer.Context() as c :
+			c["image:proxyLevel"] = 1
+			# There are no MIP levels in the file, so the proxy
+			# image is computed by downsampling the full resolution
+			# image.
+			self.assertEqual(
+				reader["out"]["dataWindow"].getValue(),
+				GafferImage.ImagePlug.proxyBox( fullResolutionDataWindow, 1 )
+			)
+			# Missing files don't support proxy levels either, but
+			# errors are reported as they are at full resolution.
+			reader["fileName"].setValue( "wellIDontExist.exr" )
+			six.assertRaisesRegex( self, RuntimeError, ".*wellIDontExist.exr.*", reader["out"]["dataWindow"].getValue )
+			reader["missingFrameMode"].setValue( GafferImage.OpenImageIOReader.MissingFrameMode.Black )
+			self.assertEqual( reader["out"]["dataWindow"].getValue(), imath.Box2i() )
+
 	def testSubimageMetadataNotLoaded( self ) :
 
 		reader = GafferImage.ImageReader()
@@ -692,5 +715,80 @@ class OpenImageIOReaderTest( GafferImageTest.ImageTestCase ) :
 		self.assertNotIn( "oiio:subimagename", metadata )
 		self.assertNotIn( "oiio:subimages", metadata )
 
+	def testCachePrecision( self ) :
+
+		# Write a copy of our float test image with half precision.
+
+		halfFileName = self.temporaryDirectory() + "/half.exr"
+
+		floatReader = GafferImage.OpenImageIOReader()
+		floatReader["fileName"].setValue( self.fileName )
+
+		writer = GafferImage.ImageWriter()
+		writer["in"].setInput( floatReader["out"] )
+		writer["fileName"].setValue( halfFileName )
+		writer["openexr"]["dataType"].setValue( "half" )
+		writer["task"].execute()
+
+		halfReader = GafferImage.OpenImageIOReader()
+		halfReader["fileName"].setValue( halfFileName )
+
+		def channelData( reader, cachePrecision ) :
+
+			reader["cachePrecision"].setValue( cachePrecision )
+			return [
+				reader["out"].channelData( c, imath.V2i( 0 ) )
+				for c in reader["out"]["channelNames"].getValue()
+			]
+
+		def cacheMemoryUsage( reader, cachePrecision ) :
+
+			reader["cachePrecision"].setValue( cachePrecision )
+			Gaffer.ValuePlug.clearCache()
+			GafferImage.ImageAlgo.image( reader["out"] )
+			return Gaffer.ValuePlug.cacheMemoryUsage()
+
+		# Half and Automatic precision are both lossless for half files,
+		# and use less memory.
+
+		halfData = channelData( halfReader, GafferImage.OpenImageIOReader.CachePrecision.Float )
+		self.assertEqual( channelData( halfReader, GafferImage.OpenImageIOReader.CachePrecision.Half ), halfData )
+		self.assertEqual( channelData( halfReader, GafferImage.OpenImageIOReader.CachePrecision.Automatic ), halfData )
+
+		floatUsage = cacheMemoryUsage( halfReader, GafferImage.OpenImageIOReader.CachePrecision.Float )
+		self.assertLess( cacheMemoryUsage( halfReader, GafferImage.OpenImageIOReader.CachePrecision.Half ), floatUsage * 0.6 )
+		self.assertLess( cacheMemoryUsage( halfReader, GafferImage.OpenImageIOReader.CachePrecision.Automatic ), floatUsage * 0.6 )
+
+		# Automatic precision is lossless for float files, and Half precision
+		# matches the half file we wrote.
+
+		floatData = channelData( floatReader, GafferImage.OpenImageIOReader.CachePrecision.Float )
+		self.assertEqual( channelData( floatReader, GafferImage.OpenImageIOReader.CachePrecision.Automatic ), floatData )
+		self.assertEqual( channelData( floatReader, GafferImage.OpenImageIOReader.CachePrecision.Half ), halfData )
+
+		floatUsage = cacheMemoryUsage( floatReader, GafferImage.OpenImageIOReader.CachePrecision.Float )
+		self.assertLess( cacheMemoryUsage( floatReader, GafferImage.OpenImageIOReader.CachePrecision.Half ), floatUsage * 0.6 )
+
+	def testImageReaderCachePrecision( self ) :
+
+		reader = GafferImage.ImageReader()
+		reader["fileName"].setValue( self.fileName )
+		self.assertEqual( reader["cachePrecision"].getValue(), GafferImage.ImageReader.CachePrecision.Float )
+
+		floatImage = GafferImage.ImageAlgo.image( reader["out"] )
+		floatHash = reader["out"].channelDataHash( "R", imath.V2i( 0 ) )
+
+		# Automatic precision produces the same data as Float precision,
+		# so should share the same cache entries downstream.
+
+		reader["cachePrecision"].setValue( GafferImage.ImageReader.CachePrecision.Automatic )
+		self.assertEqual( reader["out"].channelDataHash( "R", imath.V2i( 0 ) ), floatHash )
+		self.assertEqual( GafferImage.ImageAlgo.image( reader["out"] ), floatImage )
+
+		# But Half precision may lose precision, so must not.
+
+		reader["cachePrecision"].setValue( GafferImage.ImageReader.CachePrecision.Half )
+		self.assertNotEqual( reader["out"].channelDataHash( "R", imath.V2i( 0 ) ), floatHash )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -0,0 +1,173 @@
+##########################################################################
+#
+#  Copyright (c) 2021, Cinesite VFX Ltd. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#      * Redistributions of source code must retain the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer.
+#
+#      * Redistributions in binary form must reproduce the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer in the documentation and/or other materials provided with
+#        the distribution.
+#
+#      * Neither the name of John Haddon nor the names of
+#        any other contributors to this software may be used to endorse or
+#        promote products derived from this software without specific prior
+#        written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import os
+import unittest
+import imath
+
+import GafferTest
+import GafferImage
+import GafferImageTest
+
+# Tests shared by the Median, Erode and Dilate subclasses of RankFilter.
+class RankFilterTest( GafferImageTest.ImageTestCase ) :
+
+	def testMatchesDriverChannel( self ) :
+
+		# Filtering with a driver channel uses a different algorithm
+		# to the default, but the driver channel itself should be
+		# identical.
+
+		r = GafferImage.ImageReader()
+		r["fileName"].setValue( os.path.dirname( __file__ ) + "/images/noisyRamp.exr" )
+
+		for nodeType in ( GafferImage.Median, GafferImage.Erode, GafferImage.Dilate ) :
+
+			f = nodeType()
+			f["in"].setInput( r["out"] )
+
+			driven = nodeType()
+			driven["in"].setInput( r["out"] )
+			driven["masterChannel"].setValue( "R" )
+			driven["radius"].setInput( f["radius"] )
+			driven["boundingMode"].setInput( f["boundingMode"] )
+
+			deleteChannels = GafferImage.DeleteChannels()
+			deleteChannels["in"].setInput( f["out"] )
+			deleteChannels["mode"].setValue( GafferImage.DeleteChannels.Mode.Keep )
+			deleteChannels["channels"].setValue( "R" )
+
+			drivenDeleteChannels = GafferImage.DeleteChannels()
+			drivenDeleteChannels["in"].setInput( driven["out"] )
+			drivenDeleteChannels["mode"].setValue( GafferImage.DeleteChannels.Mode.Keep )
+			drivenDeleteChannels["channels"].setValue( "R" )
+
+			for radius in [ imath.V2i( 1 ), imath.V2i( 0, 3 ), imath.V2i( 5, 2 ), imath.V2i( 12 ) ] :
+				for boundingMode in [ GafferImage.Sampler.BoundingMode.Black, GafferImage.Sampler.BoundingMode.Clamp ] :
+					f["radius"].setValue( radius )
+					f["boundingMode"].setValue( boundingMode )
+					self.assertImagesEqual( deleteChannels["out"], drivenDeleteChannels["out"] )
+
+	def __testPerformance( self, nodeType, radius ) :
+
+		ramp = GafferImage.Ramp()
+		ramp["format"].setValue( GafferImage.Format( 2048, 1556 ) )
+		ramp["startPosition"].setValue( imath.V2f( 0 ) )
+		ramp["endPosition"].setValue( imath.V2f( 2048, 1556 ) )
+
+		f = nodeType()
+		f["in"].setInput( ramp["out"] )
+		f["radius"].setValue( imath.V2i( radius ) )
+
+		GafferImageTest.processTiles( ramp["out"] )
+
+		with GafferTest.TestRunner.PerformanceScope() :
+			GafferImageTest.processTiles( f["out"] )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testMedianRadius1Performance( self ) :
+
+		self.__testPerformance( GafferImage.Median, 1 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testMedianRadius5Performance( self ) :
+
+		self.__testPerformance( GafferImage.Median, 5 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testMedianRadius20Performance( self ) :
+
+		self.__testPerformance( GafferImage.Median, 20 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testMedianRadius50Performance( self ) :
+
+		self.__testPerformance( GafferImage.Median, 50 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testErodeRadius1Performance( self ) :
+
+		self.__testPerformance( GafferImage.Erode, 1 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testErodeRadius5Performance( self ) :
+
+		self.__testPerformance( GafferImage.Erode, 5 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testErodeRadius20Performance( self ) :
+
+		self.__testPerformance( GafferImage.Erode, 20 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testErodeRadius50Performance( self ) :
+
+		self.__testPerformance( GafferImage.Erode, 50 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testDilateRadius1Performance( self ) :
+
+		self.__testPerformance( GafferImage.Dilate, 1 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testDilateRadius5Performance( self ) :
+
+		self.__testPerformance( GafferImage.Dilate, 5 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testDilateRadius20Performance( self ) :
+
+		self.__testPerformance( GafferImage.Dilate, 20 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testDilateRadius50Performance( self ) :
+
+		self.__testPerformance( GafferImage.Dilate, 50 )
+
+if __name__ == "__main__":
+	unittest.main()
@@ -91,7 +91,26 @@ Gaffer.Metadata.registerNode(
 			which the blur will bleed onto.
 			"""
 
-		]
+		],
+
+		"mode" : [
+
+			"description",
+			"""
+			The method used to compute the blur. Accurate mode filters
+			with a true gaussian, but becomes slow for large radii. Fast
+			mode approximates the gaussian with a cascade of box filters,
+			whose cost per pixel doesn't depend on the radius. This is
+			much quicker for large blurs, at the expense of small
+			differences in the shape of the falloff.
+			""",
+
+			"preset:Accurate", GafferImage.Blur.Mode.Accurate,
+			"preset:Fast", GafferImage.Blur.Mode.Fast,
+
+			"plugValueWidget:type", "GafferUI.PresetsPlugValueWidget",
+
+		],
 
 	}
 
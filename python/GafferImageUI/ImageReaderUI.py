@@ -223,6 +223,33 @@ Gaffer.Metadata.registerNode(
 
 		],
 
+		"cachePrecision" : [
+
+			"description",
+			"""
+			The precision with which channel data is stored in
+			memory once it has been read. Float uses 32 bit floats.
+			Half uses 16 bit halfs, converting back to floats on
+			demand, halving memory usage at the expense of precision
+			for float files. Automatic uses halfs only for channels
+			that are stored as half in the file, reducing memory
+			usage without any loss of precision.
+
+			> Note : When a colour space conversion is applied, the
+			> converted R, G and B channels are cached at float
+			> precision after conversion, so the saving only applies
+			> to the other channels. Set the colour space to match
+			> the working space to avoid this.
+			""",
+
+			"preset:Float", GafferImage.ImageReader.CachePrecision.Float,
+			"preset:Half", GafferImage.ImageReader.CachePrecision.Half,
+			"preset:Automatic", GafferImage.ImageReader.CachePrecision.Automatic,
+
+			"plugValueWidget:type", "GafferUI.PresetsPlugValueWidget",
+
+		],
+
 	}
 
 )
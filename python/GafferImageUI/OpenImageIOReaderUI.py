@@ -107,6 +107,27 @@ Gaffer.Metadata.registerNode(
 
 		],
 
+		"cachePrecision" : [
+
+			"description",
+			"""
+			The precision with which channel data is stored in
+			memory once it has been read. Float uses 32 bit floats.
+			Half uses 16 bit halfs, converting back to floats on
+			demand, halving memory usage at the expense of precision
+			for float files. Automatic uses halfs only for channels
+			that are stored as half in the file, reducing memory
+			usage without any loss of precision.
+			""",
+
+			"preset:Float", GafferImage.OpenImageIOReader.CachePrecision.Float,
+			"preset:Half", GafferImage.OpenImageIOReader.CachePrecision.Half,
+			"preset:Automatic", GafferImage.OpenImageIOReader.CachePrecision.Automatic,
+
+			"plugValueWidget:type", "GafferUI.PresetsPlugValueWidget",
+
+		],
+
 		"availableFrames" : [
 
 			"description",
@@ -2271,6 +2271,271 @@ class InstancerTest( GafferSceneTest.SceneTestCase ) :
 
 		self.assertEqual( instancer["variations"].getValue(), IECore.CompoundData( { "" : IECore.IntData( 0 ) } ) )
 
+	def testTopologyReusedWhenPointsMove( self ) :
+
+		def points( offset, ids ) :
+
+			result = IECoreScene.PointsPrimitive( IECore.V3fVectorData( [ imath.V3f( x + offset, 0, 0 ) for x in range( 0, 4 ) ] ) )
+			result["instanceId"] = IECoreScene.PrimitiveVariable(
+				IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+				IECore.IntVectorData( ids ),
+			)
+			result["instanceIndex"] = IECoreScene.PrimitiveVariable(
+				IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+				IECore.IntVectorData( [ 0, 1, 0, 1 ] ),
+			)
+			return result
+
+		objectToScene = GafferScene.ObjectToScene()
+		objectToScene["object"].setValue( points( 0, [ 10, 11, 12, 13 ] ) )
+
+		sphere = GafferScene.Sphere()
+		sphere["sets"].setValue( "testSet" )
+		cube = GafferScene.Cube()
+		cube["sets"].setValue( "testSet" )
+
+		prototypes = GafferScene.Parent()
+		prototypes["in"].setInput( sphere["out"] )
+		prototypes["children"][0].setInput( cube["out"] )
+		prototypes["parent"].setValue( "/" )
+
+		instancer = GafferScene.Instancer()
+		instancer["in"].setInput( objectToScene["out"] )
+		instancer["prototypes"].setInput( prototypes["out"] )
+		instancer["parent"].setValue( "/object" )
+
+		def assertInstances( offset, ids ) :
+
+			self.assertEqual( instancer["out"].childNames( "/object/instances" ), IECore.InternedStringVectorData( [ "sphere", "cube" ] ) )
+			self.assertEqual( instancer["out"].childNames( "/object/instances/sphere" ), IECore.InternedStringVectorData( [ str( i ) for i in ids[::2] ] ) )
+			self.assertEqual( instancer["out"].childNames( "/object/instances/cube" ), IECore.InternedStringVectorData( [ str( i ) for i in ids[1::2] ] ) )
+			self.assertEqual(
+				set( instancer["out"].set( "testSet" ).value.paths() ),
+				set(
+					[ "/object/instances/sphere/{}".format( i ) for i in ids[::2] ] +
+					[ "/object/instances/cube/{}".format( i ) for i in ids[1::2] ]
+				)
+			)
+			for index, i in enumerate( ids ) :
+				self.assertEqual(
+					instancer["out"].transform( "/object/instances/{}/{}".format( [ "sphere", "cube" ][index % 2], i ) ),
+					imath.M44f().translate( imath.V3f( index + offset, 0, 0 ) )
+				)
+
+		assertInstances( 0, [ 10, 11, 12, 13 ] )
+
+		# Moving the points should recompute the engine, but not the topology
+		# or anything derived from it.
+
+		objectToScene["object"].setValue( points( 1, [ 10, 11, 12, 13 ] ) )
+		with Gaffer.PerformanceMonitor() as monitor :
+			assertInstances( 1, [ 10, 11, 12, 13 ] )
+
+		self.assertEqual( monitor.plugStatistics( instancer["__engine"] ).computeCount, 1 )
+		self.assertEqual( monitor.plugStatistics( instancer["__topology"] ).computeCount, 0 )
+		self.assertEqual( monitor.plugStatistics( instancer["__prototypeChildNames"] ).computeCount, 0 )
+		self.assertEqual( monitor.plugStatistics( instancer["out"]["childNames"] ).computeCount, 0 )
+		self.assertEqual( monitor.plugStatistics( instancer["out"]["set"] ).computeCount, 0 )
+
+		# But changing the ids must update everything.
+
+		objectToScene["object"].setValue( points( 1, [ 20, 21, 22, 23 ] ) )
+		with Gaffer.PerformanceMonitor() as monitor :
+			assertInstances( 1, [ 20, 21, 22, 23 ] )
+
+		self.assertEqual( monitor.plugStatistics( instancer["__topology"] ).computeCount, 1 )
+		self.assertEqual( monitor.plugStatistics( instancer["__prototypeChildNames"] ).computeCount, 1 )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testMovingPointsPerformance( self ) :
+
+		plane = GafferScene.Plane()
+		plane["divisions"].setValue( imath.V2i( 1000 ) )
+
+		planeFilter = GafferScene.PathFilter()
+		planeFilter["paths"].setValue( IECore.StringVectorData( [ "/plane" ] ) )
+
+		transform = GafferScene.Transform()
+		transform["in"].setInput( plane["out"] )
+		transform["filter"].setInput( planeFilter["out"] )
+
+		freezeTransform = GafferScene.FreezeTransform()
+		freezeTransform["in"].setInput( transform["out"] )
+		freezeTransform["filter"].setInput( planeFilter["out"] )
+
+		sphere = GafferScene.Sphere()
+
+		instancer = GafferScene.Instancer()
+		instancer["in"].setInput( freezeTransform["out"] )
+		instancer["filter"].setInput( planeFilter["out"] )
+		instancer["prototypes"].setInput( sphere["out"] )
+
+		instancer["out"].childNames( "/plane/instances/sphere" )
+		transform["transform"]["translate"]["x"].setValue( 1 )
+		freezeTransform["out"].object( "/plane" )
+
+		with GafferTest.TestRunner.PerformanceScope() :
+			instancer["out"].childNames( "/plane/instances/sphere" )
+			instancer["out"].bound( "/plane/instances/sphere" )
+
+	def __packedInstancesTestScene( self ) :
+
+		points = IECoreScene.PointsPrimitive( IECore.V3fVectorData( [ imath.V3f( x, 0, 0 ) for x in range( 0, 4 ) ] ) )
+		points["testFloat"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.FloatVectorData( [ 0, 1, 2, 3 ] ),
+		)
+
+		objectToScene = GafferScene.ObjectToScene()
+		objectToScene["object"].setValue( points )
+
+		sphere = GafferScene.Sphere()
+
+		group = GafferScene.Group()
+		group["in"][0].setInput( sphere["out"] )
+		group["transform"]["scale"].setValue( imath.V3f( 2 ) )
+
+		groupFilter = GafferScene.PathFilter()
+		groupFilter["paths"].setValue( IECore.StringVectorData( [ "/group" ] ) )
+
+		groupAttributes = GafferScene.CustomAttributes()
+		groupAttributes["in"].setInput( group["out"] )
+		groupAttributes["filter"].setInput( groupFilter["out"] )
+		groupAttributes["attributes"].addChild( Gaffer.NameValuePlug( "groupAttribute", 1 ) )
+
+		instancer = GafferScene.Instancer()
+		instancer["in"].setInput( objectToScene["out"] )
+		instancer["prototypes"].setInput( groupAttributes["out"] )
+		instancer["parent"].setValue( "/object" )
+		instancer["attributes"].setValue( "testFloat" )
+
+		return instancer, sphere
+
+	def __assertPackedRenderMatchesCapsule( self, instancer, path, objectPaths ) :
+
+		instancer["packInstanceGroups"].setValue( False )
+		instancer["encapsulateInstanceGroups"].setValue( True )
+		capsule = instancer["out"].object( path )
+		self.assertIsInstance( capsule, GafferScene.Capsule )
+
+		instancer["encapsulateInstanceGroups"].setValue( False )
+		instancer["packInstanceGroups"].setValue( True )
+		packed = instancer["out"].object( path )
+		self.assertIsInstance( packed, GafferScene.InstancerCapsule )
+
+		batch = GafferScene.Private.IECoreScenePreview.Renderer.RenderType.Batch
+		expectedRenderer = GafferScene.Private.IECoreScenePreview.CapturingRenderer( batch )
+		capsule.render( expectedRenderer )
+		renderer = GafferScene.Private.IECoreScenePreview.CapturingRenderer( batch )
+		packed.render( renderer )
+
+		for objectPath in objectPaths :
+
+			expected = expectedRenderer.capturedObject( objectPath )
+			actual = renderer.capturedObject( objectPath )
+			self.assertIsNotNone( expected )
+			self.assertIsNotNone( actual )
+
+			self.assertEqual( actual.capturedSamples(), expected.capturedSamples() )
+			self.assertEqual( actual.capturedTransforms(), expected.capturedTransforms() )
+			self.assertEqual( actual.capturedAttributes().attributes(), expected.capturedAttributes().attributes() )
+
+		return packed
+
+	def testPackInstanceGroups( self ) :
+
+		instancer, sphere = self.__packedInstancesTestScene()
+		instancer["packInstanceGroups"].setValue( True )
+
+		self.assertEqual( instancer["out"].childNames( "/object/instances/group" ), IECore.InternedStringVectorData() )
+		self.assertEqual( instancer["out"].set( "set" ), instancer["in"].set( "set" ) )
+
+		packed = instancer["out"].object( "/object/instances/group" )
+		self.assertIsInstance( packed, GafferScene.InstancerCapsule )
+		self.assertEqual( packed.bound(), instancer["out"].bound( "/object/instances/group" ) )
+		self.assertEqual( packed.numInstances(), 4 )
+		self.assertEqual( packed.names(), IECore.InternedStringVectorData( [ "0", "1", "2", "3" ] ) )
+		self.assertEqual( packed.prototypeIndices(), IECore.IntVectorData( [ 0 ] * 4 ) )
+		self.assertEqual(
+			packed.transforms(),
+			IECore.M44fVectorData( [ imath.M44f().translate( imath.V3f( x, 0, 0 ) ) for x in range( 0, 4 ) ] )
+		)
+		self.assertEqual( packed.attributes(), IECore.CompoundData( { "testFloat" : IECore.FloatVectorData( [ 0, 1, 2, 3 ] ) } ) )
+
+		self.assertEqual( len( packed.prototypes() ), 1 )
+		self.assertEqual( packed.prototypes()[0].root(), "/group" )
+		self.assertTrue( packed.prototypes()[0].scene().isSame( instancer["prototypes"] ) )
+
+		self.__assertPackedRenderMatchesCapsule(
+			instancer, "/object/instances/group",
+			[ "/{}/sphere".format( i ) for i in range( 0, 4 ) ]
+		)
+
+		# Edits to the prototypes must produce a new object.
+
+		sphere["radius"].setValue( 2 )
+		self.assertNotEqual( instancer["out"].object( "/object/instances/group" ), packed )
+
+	def testPackInstanceGroupsGlobalsDependency( self ) :
+
+		instancer, sphere = self.__packedInstancesTestScene()
+		instancer["packInstanceGroups"].setValue( True )
+
+		options = GafferScene.StandardOptions()
+		options["in"].setInput( instancer["in"].getInput() )
+		instancer["in"].setInput( options["out"] )
+
+		self.assertIn( instancer["out"]["object"], instancer.affects( instancer["in"]["globals"] ) )
+
+		objectHash = instancer["out"].objectHash( "/object/instances/group" )
+
+		cs = GafferTest.CapturingSlot( instancer.plugDirtiedSignal() )
+		options["options"]["shutter"]["enabled"].setValue( True )
+		self.assertIn( instancer["out"]["object"], [ s[0] for s in cs ] )
+
+		self.assertNotEqual( instancer["out"].objectHash( "/object/instances/group" ), objectHash )
+
+	def testPackInstanceGroupsWithContextVariations( self ) :
+
+		instancer, sphere = self.__packedInstancesTestScene()
+		instancer["seedEnabled"].setValue( True )
+		instancer["rawSeed"].setValue( True )
+
+		sphere["expression"] = Gaffer.Expression()
+		sphere["expression"].setExpression( 'parent["radius"] = 1 + context.get( "seed", 0 ) % 2' )
+
+		packed = self.__assertPackedRenderMatchesCapsule(
+			instancer, "/object/instances/group",
+			[ "/{}/sphere".format( i ) for i in range( 0, 4 ) ]
+		)
+
+		self.assertEqual( len( packed.prototypes() ), 4 )
+		self.assertEqual( packed.prototypeIndices(), IECore.IntVectorData( [ 0, 1, 2, 3 ] ) )
+		for i, prototype in enumerate( packed.prototypes() ) :
+			self.assertEqual( prototype.context()["seed"], i )
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testPackInstanceGroupsPerformance( self ) :
+
+		plane = GafferScene.Plane()
+		plane["divisions"].setValue( imath.V2i( 1000 ) )
+
+		planeFilter = GafferScene.PathFilter()
+		planeFilter["paths"].setValue( IECore.StringVectorData( [ "/plane" ] ) )
+
+		sphere = GafferScene.Sphere()
+
+		instancer = GafferScene.Instancer()
+		instancer["in"].setInput( plane["out"] )
+		instancer["filter"].setInput( planeFilter["out"] )
+		instancer["prototypes"].setInput( sphere["out"] )
+		instancer["packInstanceGroups"].setValue( True )
+
+		with GafferTest.TestRunner.PerformanceScope() :
+			instancer["out"].object( "/plane/instances/sphere" )
+
 	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
 	@GafferTest.TestRunner.PerformanceTestMethod()
 	def testContextSetPerfNoVariationsSingleEvaluate( self ):
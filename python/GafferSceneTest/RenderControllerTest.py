@@ -171,6 +171,143 @@ class RenderControllerTest( GafferSceneTest.SceneTestCase ) :
 		self.assertEqual( bound( "/group/sphere" ), translatedBound )
 		self.assertEqual( bound( "/group/sphere1" ), translatedBound )
 
+	def testUpdatePriorityLocations( self ) :
+
+		sphere1 = GafferScene.Sphere()
+		sphere1["name"].setValue( "sphere1" )
+
+		sphere2 = GafferScene.Sphere()
+		sphere2["name"].setValue( "sphere2" )
+		sphere2["transform"]["translate"]["x"].setValue( 5 )
+
+		group = GafferScene.Group()
+		group["in"][0].setInput( sphere1["out"] )
+		group["in"][1].setInput( sphere2["out"] )
+
+		renderer = GafferScene.Private.IECoreScenePreview.Renderer.create(
+			"OpenGL",
+			GafferScene.Private.IECoreScenePreview.Renderer.RenderType.Interactive
+		)
+		controller = GafferScene.RenderController( group["out"], Gaffer.Context(), renderer )
+		controller.setMinimumExpansionDepth( 3 )
+		controller.update()
+
+		def bound( path ) :
+
+			renderer.option( "gl:selection", IECore.PathMatcherData( IECore.PathMatcher( [ path ] ) ) )
+			return renderer.command( "gl:queryBound", { "selection" : True } )
+
+		def worldBound( path ) :
+
+			return group["out"].bound( path ) * group["out"].fullTransform( path )
+
+		bound1Orig = worldBound( "/group/sphere1" )
+		bound2Orig = worldBound( "/group/sphere2" )
+		self.assertEqual( bound( "/group/sphere1" ), bound1Orig )
+		self.assertEqual( bound( "/group/sphere2" ), bound2Orig )
+
+		sphere1["radius"].setValue( 1.5 )
+		sphere2["radius"].setValue( 1.5 )
+
+		# Only locations extending beyond x == 3 are prioritised,
+		# so only `sphere2` (and its parent) should be updated.
+
+		controller.updatePriorityLocations( lambda b : 1 if b.max().x > 3 else 0 )
+
+		bound1Updated = worldBound( "/group/sphere1" )
+		bound2Updated = worldBound( "/group/sphere2" )
+		self.assertEqual( bound( "/group/sphere1" ), bound1Orig )
+		self.assertEqual( bound( "/group/sphere2" ), bound2Updated )
+
+		controller.update()
+
+		self.assertEqual( bound( "/group/sphere1" ), bound1Updated )
+		self.assertEqual( bound( "/group/sphere2" ), bound2Updated )
+
+	def testExpansionBudget( self ) :
+
+		sphere = GafferScene.Sphere()
+
+		groupA = GafferScene.Group()
+		groupA["name"].setValue( "groupA" )
+		groupA["in"][0].setInput( sphere["out"] )
+		groupA["in"][1].setInput( sphere["out"] )
+		groupA["transform"]["translate"]["x"].setValue( -5 )
+
+		groupB = GafferScene.Group()
+		groupB["name"].setValue( "groupB" )
+		groupB["in"][0].setInput( sphere["out"] )
+		groupB["transform"]["translate"]["x"].setValue( 5 )
+
+		group = GafferScene.Group()
+		group["in"][0].setInput( groupA["out"] )
+		group["in"][1].setInput( groupB["out"] )
+
+		renderer = GafferScene.Private.IECoreScenePreview.Renderer.create(
+			"OpenGL",
+			GafferScene.Private.IECoreScenePreview.Renderer.RenderType.Interactive
+		)
+		controller = GafferScene.RenderController( group["out"], Gaffer.Context(), renderer )
+		controller.setMinimumExpansionDepth( 1 )
+		controller.update()
+
+		def bound( path ) :
+
+			renderer.option( "gl:selection", IECore.PathMatcherData( IECore.PathMatcher( [ path ] ) ) )
+			return renderer.command( "gl:queryBound", { "selection" : True } )
+
+		self.assertEqual( controller.getExpansionBudget(), 0 )
+		self.assertEqual( controller.getBudgetExpandedPaths(), IECore.PathMatcher() )
+		self.assertTrue( bound( "/group/groupB/sphere" ).isEmpty() )
+
+		# Prefer locations with positive x. Expanding `groupB` costs
+		# one location, and `groupA` costs two.
+
+		def expansionFunction( bound ) :
+
+			return 2 if bound.center().x > 0 else 1
+
+		controller.setExpansionBudget( 1, expansionFunction )
+		self.assertEqual( controller.getExpansionBudget(), 1 )
+		controller.update()
+
+		self.assertEqual( controller.getBudgetExpandedPaths(), IECore.PathMatcher( [ "/group/groupB" ] ) )
+		self.assertEqual(
+			bound( "/group/groupB/sphere" ),
+			group["out"].bound( "/group/groupB/sphere" ) * group["out"].fullTransform( "/group/groupB/sphere" )
+		)
+		self.assertTrue( bound( "/group/groupA/sphere" ).isEmpty() )
+
+		# `groupA` doesn't fit in the budget, even though it
+		# is the only candidate.
+
+		controller.setExpansionBudget( 1, lambda bound : 1 if bound.center().x < 0 else 0 )
+		controller.update()
+		self.assertEqual( controller.getBudgetExpandedPaths(), IECore.PathMatcher() )
+		self.assertTrue( bound( "/group/groupB/sphere" ).isEmpty() )
+
+		controller.setExpansionBudget( 3, expansionFunction )
+		controller.update()
+		self.assertEqual( controller.getBudgetExpandedPaths(), IECore.PathMatcher( [ "/group/groupA", "/group/groupB" ] ) )
+		self.assertFalse( bound( "/group/groupA/sphere" ).isEmpty() )
+		self.assertFalse( bound( "/group/groupA/sphere1" ).isEmpty() )
+
+		# Explicitly expanded locations don't count towards the budget.
+
+		controller.setExpandedPaths( IECore.PathMatcher( [ "/group/groupA" ] ) )
+		controller.setExpansionBudget( 1, expansionFunction )
+		controller.update()
+		self.assertEqual( controller.getBudgetExpandedPaths(), IECore.PathMatcher( [ "/group/groupB" ] ) )
+		self.assertFalse( bound( "/group/groupA/sphere" ).isEmpty() )
+		self.assertFalse( bound( "/group/groupB/sphere" ).isEmpty() )
+
+		controller.setExpandedPaths( IECore.PathMatcher() )
+		controller.setExpansionBudget( 0 )
+		controller.update()
+		self.assertEqual( controller.getBudgetExpandedPaths(), IECore.PathMatcher() )
+		self.assertTrue( bound( "/group/groupA/sphere" ).isEmpty() )
+		self.assertTrue( bound( "/group/groupB/sphere" ).isEmpty() )
+
 	def testUpdateRemoveFromLightSet( self ) :
 
 		sphere = GafferScene.Sphere()
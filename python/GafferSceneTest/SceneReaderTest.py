@@ -43,6 +43,7 @@ import IECore
 import IECoreScene
 
 import Gaffer
+import GafferTest
 import GafferScene
 import GafferSceneTest
 
@@ -596,5 +597,175 @@ class SceneReaderTest( GafferSceneTest.SceneTestCase ) :
 		self.assertEqual( mh.messages[0].level, IECore.Msg.Level.Warning )
 		self.assertEqual( mh.messages[0].message, 'Failed to load attribute "test:double4" at location "/sphere"' )
 
+	def __writeTaggedHierarchy( self, fileName, depth, branchFactor ) :
+
+		# Writes a hierarchy where every location is tagged "all",
+		# and every other leaf is tagged "even". Returns the expected
+		# paths for the "even" set.
+
+		expected = IECore.PathMatcher()
+
+		def walk( scene, path, depth ) :
+
+			scene.writeTags( [ "all" ] )
+			if depth == 0 :
+				if sum( int( n ) for n in path ) % 2 == 0 :
+					scene.writeTags( [ "even" ] )
+					expected.addPath( "/" + "/".join( path ) )
+				return
+
+			for i in range( 0, branchFactor ) :
+				walk( scene.createChild( str( i ) ), path + [ str( i ) ], depth - 1 )
+
+		scene = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Write )
+		for i in range( 0, branchFactor ) :
+			walk( scene.createChild( str( i ) ), [ str( i ) ], depth - 1 )
+		del scene
+
+		return expected
+
+	def testLargeSets( self ) :
+
+		expected = self.__writeTaggedHierarchy( self.__testFile, 3, 10 )
+
+		reader = GafferScene.SceneReader()
+		reader["fileName"].setValue( self.__testFile )
+		reader["refreshCount"].setValue( self.uniqueInt( self.__testFile ) )
+
+		self.assertEqual( reader["out"].set( "even" ).value, expected )
+		self.assertEqual( reader["out"].set( "all" ).value.size(), 1110 )
+
+	def testSetsLoadedInSingleTraversal( self ) :
+
+		self.__writeTaggedHierarchy( self.__testFile, 2, 10 )
+
+		reader = GafferScene.SceneReader()
+		reader["fileName"].setValue( self.__testFile )
+		reader["refreshCount"].setValue( self.uniqueInt( self.__testFile ) )
+
+		with Gaffer.PerformanceMonitor() as m :
+			sets = GafferScene.SceneAlgo.sets( reader["out"] )
+
+		self.assertEqual( set( sets.keys() ), { "all", "even" } )
+		self.assertEqual( sets["all"].value.size(), 110 )
+		self.assertEqual( m.plugStatistics( reader["__sets"] ).computeCount, 1 )
+
+		# Sets which don't exist are empty, and don't trigger
+		# another traversal.
+
+		with m :
+			self.assertEqual( reader["out"].set( "nonexistent" ).value, IECore.PathMatcher() )
+
+		self.assertEqual( m.plugStatistics( reader["__sets"] ).computeCount, 1 )
+
+	def testSingleSetTraversal( self ) :
+
+		# Write a hierarchy where every location has its own tag,
+		# and one sparse set is shared by just two locations.
+
+		scene = IECoreScene.SceneCache( self.__testFile, IECore.IndexedIO.OpenMode.Write )
+		for i in range( 0, 10 ) :
+			child = scene.createChild( str( i ) )
+			child.writeTags( [ "child{}".format( i ) ] )
+			for j in range( 0, 10 ) :
+				grandChild = child.createChild( str( j ) )
+				grandChild.writeTags( [ "grandChild{}{}".format( i, j ) ] )
+				if i == 3 and j in ( 4, 5 ) :
+					grandChild.writeTags( [ "sparse" ] )
+		del scene, child, grandChild
+
+		reader = GafferScene.SceneReader()
+		reader["fileName"].setValue( self.__testFile )
+		reader["refreshCount"].setValue( self.uniqueInt( self.__testFile ) )
+
+		# Requesting a single set must not load all the others.
+
+		with Gaffer.PerformanceMonitor() as m :
+			self.assertEqual( reader["out"].set( "sparse" ).value, IECore.PathMatcher( [ "/3/4", "/3/5" ] ) )
+			self.assertEqual( reader["out"].set( "child2" ).value, IECore.PathMatcher( [ "/2" ] ) )
+
+		self.assertEqual( m.plugStatistics( reader["__sets"] ).computeCount, 0 )
+		self.assertEqual( m.plugStatistics( reader["out"]["set"] ).computeCount, 2 )
+
+		# But requesting all of them should load them in one traversal.
+
+		with Gaffer.PerformanceMonitor() as m :
+			sets = GafferScene.SceneAlgo.sets( reader["out"] )
+
+		self.assertEqual( len( sets.keys() ), 112 )
+		self.assertEqual( sets["sparse"].value, IECore.PathMatcher( [ "/3/4", "/3/5" ] ) )
+		self.assertEqual( m.plugStatistics( reader["__sets"] ).computeCount, 1 )
+		self.assertEqual( m.plugStatistics( reader["out"]["set"] ).computeCount, 0 )
+
+		# And the sets loaded that way are cached as the individual
+		# values of `out.set`.
+
+		with Gaffer.PerformanceMonitor() as m :
+			self.assertEqual( reader["out"].set( "child5" ).value, IECore.PathMatcher( [ "/5" ] ) )
+			sets = GafferScene.SceneAlgo.sets( reader["out"], [ "sparse", "child3" ] )
+
+		self.assertEqual( sets["child3"].value, IECore.PathMatcher( [ "/3" ] ) )
+		self.assertEqual( m.plugStatistics( reader["__sets"] ).computeCount, 0 )
+		self.assertEqual( m.plugStatistics( reader["out"]["set"] ).computeCount, 0 )
+
+	def testNamedSetsLoadedInSingleTraversal( self ) :
+
+		self.__writeTaggedHierarchy( self.__testFile, 2, 10 )
+
+		reader = GafferScene.SceneReader()
+		reader["fileName"].setValue( self.__testFile )
+		reader["refreshCount"].setValue( self.uniqueInt( self.__testFile ) )
+
+		with Gaffer.PerformanceMonitor() as m :
+			sets = GafferScene.SceneAlgo.sets( reader["out"], [ "all", "even", "nonexistent" ] )
+			self.assertEqual( reader["out"].set( "all" ), sets["all"] )
+
+		self.assertEqual( sets["all"].value.size(), 110 )
+		self.assertEqual( sets["nonexistent"].value, IECore.PathMatcher() )
+		self.assertEqual( m.plugStatistics( reader["__sets"] ).computeCount, 1 )
+		self.assertEqual( m.plugStatistics( reader["out"]["set"] ).computeCount, 0 )
+
+	def testFileNameAffectsSets( self ) :
+
+		reader = GafferScene.SceneReader()
+		for plug in ( reader["fileName"], reader["refreshCount"] ) :
+			affected = reader.affects( plug )
+			self.assertIn( reader["out"]["set"], affected )
+			self.assertIn( reader["out"]["setNames"], affected )
+
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testSetPerformance( self ) :
+
+		self.__writeTaggedHierarchy( self.__testFile, 4, 15 )
+
+		reader = GafferScene.SceneReader()
+		reader["fileName"].setValue( self.__testFile )
+		reader["refreshCount"].setValue( self.uniqueInt( self.__testFile ) )
+
+		with GafferTest.TestRunner.PerformanceScope() :
+			reader["out"].set( "even" )
+
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testMultipleSetPerformance( self ) :
+
+		# Write a hierarchy with 20 different tags, so that
+		# `SceneAlgo::sets()` would require 20 traversals if
+		# each set was loaded separately.
+
+		scene = IECoreScene.SceneCache( self.__testFile, IECore.IndexedIO.OpenMode.Write )
+		for i in range( 0, 100 ) :
+			child = scene.createChild( str( i ) )
+			for j in range( 0, 100 ) :
+				grandChild = child.createChild( str( j ) )
+				grandChild.writeTags( [ "tag{}".format( ( i + j ) % 20 ) ] )
+		del scene, child, grandChild
+
+		reader = GafferScene.SceneReader()
+		reader["fileName"].setValue( self.__testFile )
+		reader["refreshCount"].setValue( self.uniqueInt( self.__testFile ) )
+
+		with GafferTest.TestRunner.PerformanceScope() :
+			GafferScene.SceneAlgo.sets( reader["out"] )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -318,8 +318,13 @@ class SceneWriterTest( GafferSceneTest.SceneTestCase ) :
 		dispatcher["frameRange"].setValue( "1-10" )
 		dispatcher.dispatch( [ script["writer"] ] )
 
+		# The plane is static, so only a single object sample is written. But
+		# bounds are written on every frame, demonstrating that the file wasn't
+		# reopened on each frame.
 		scene = IECoreScene.SceneInterface.create( fileName, IECore.IndexedIO.OpenMode.Read )
-		self.assertEqual( scene.child( "plane" ).numObjectSamples(), 10 )
+		self.assertEqual( scene.child( "plane" ).numObjectSamples(), 1 )
+		self.assertEqual( scene.child( "plane" ).objectSampleTime( 0 ), 1 / 24.0 )
+		self.assertEqual( scene.child( "plane" ).numBoundSamples(), 10 )
 
 	def testFileNameWithFrameDependency( self ) :
 
@@ -373,5 +378,91 @@ class SceneWriterTest( GafferSceneTest.SceneTestCase ) :
 		self.assertEqual( sceneReader["out"].object( "/plane" )["test"].data.value, 10 )
 		self.assertEqual( sceneReader["out"].attributes( "/plane" ), IECore.CompoundObject() )
 
+	def testStaticSamplesWrittenOnce( self ) :
+
+		script = Gaffer.ScriptNode()
+		script["sphere"] = GafferScene.Sphere()
+		script["sphere"]["sets"].setValue( "A" )
+		script["group"] = GafferScene.Group()
+		script["group"]["in"][0].setInput( script["sphere"]["out"] )
+		script["expression"] = Gaffer.Expression()
+		script["expression"].setExpression( 'parent["group"]["transform"]["translate"]["x"] = context.getFrame()' )
+		script["writer"] = GafferScene.SceneWriter()
+		script["writer"]["in"].setInput( script["group"]["out"] )
+		script["writer"]["fileName"].setValue( os.path.join( self.temporaryDirectory(), "test.scc" ) )
+
+		with Gaffer.Context() :
+			script["writer"].executeSequence( [ 1, 2, 3, 4, 5 ] )
+
+		scene = IECoreScene.SceneCache( script["writer"]["fileName"].getValue(), IECore.IndexedIO.OpenMode.Read )
+
+		group = scene.child( "group" )
+		self.assertEqual( group.numTransformSamples(), 5 )
+		for frame in range( 1, 6 ) :
+			self.assertEqual( group.readTransformAsMatrix( frame / 24.0 ), imath.M44d().translate( imath.V3d( frame, 0, 0 ) ) )
+
+		sphere = group.child( "sphere" )
+		self.assertEqual( sphere.numObjectSamples(), 1 )
+		self.assertEqual( sphere.numTransformSamples(), 1 )
+		self.assertEqual( sphere.numBoundSamples(), 5 )
+		self.assertIn( IECore.InternedString( "A" ), sphere.readTags() )
+		self.assertEqual( sphere.readObject( 3 / 24.0 ), script["sphere"]["out"].object( "/sphere" ) )
+
+	def testHeldSamplesWrittenBeforeChange( self ) :
+
+		script = Gaffer.ScriptNode()
+		script["sphere"] = GafferScene.Sphere()
+		script["expression"] = Gaffer.Expression()
+		script["expression"].setExpression( 'parent["sphere"]["radius"] = 1 if context.getFrame() < 4 else 2' )
+		script["writer"] = GafferScene.SceneWriter()
+		script["writer"]["in"].setInput( script["sphere"]["out"] )
+		script["writer"]["fileName"].setValue( os.path.join( self.temporaryDirectory(), "test.scc" ) )
+
+		with Gaffer.Context() :
+			script["writer"].executeSequence( [ 1, 2, 3, 4, 5 ] )
+
+		scene = IECoreScene.SceneCache( script["writer"]["fileName"].getValue(), IECore.IndexedIO.OpenMode.Read )
+		sphere = scene.child( "sphere" )
+
+		# The sample at frame 3 is written so that the reader doesn't
+		# interpolate between frames 1 and 4, and the sample at frame 5
+		# is omitted because it is unchanged.
+		self.assertEqual( sphere.numObjectSamples(), 3 )
+		self.assertEqual(
+			[ sphere.objectSampleTime( i ) for i in range( 0, 3 ) ],
+			[ 1 / 24.0, 3 / 24.0, 4 / 24.0 ]
+		)
+
+		with Gaffer.Context() as context :
+			for frame in range( 1, 6 ) :
+				context.setFrame( frame )
+				self.assertEqual(
+					sphere.readObject( context.getTime() ).bound(),
+					script["sphere"]["out"].object( "/sphere" ).bound()
+				)
+
+	@unittest.skipIf( GafferTest.inCI(), "Performance not relevant on CI platform" )
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testStaticSequencePerformance( self ) :
+
+		script = Gaffer.ScriptNode()
+		script["plane"] = GafferScene.Plane()
+		script["plane"]["divisions"].setValue( imath.V2i( 100 ) )
+		script["sphere"] = GafferScene.Sphere()
+		script["sphere"]["divisions"].setValue( imath.V2i( 50 ) )
+		script["instancer"] = GafferScene.Instancer()
+		script["instancer"]["in"].setInput( script["plane"]["out"] )
+		script["instancer"]["prototypes"].setInput( script["sphere"]["out"] )
+		script["filter"] = GafferScene.PathFilter()
+		script["filter"]["paths"].setValue( IECore.StringVectorData( [ "/plane" ] ) )
+		script["instancer"]["filter"].setInput( script["filter"]["out"] )
+		script["writer"] = GafferScene.SceneWriter()
+		script["writer"]["in"].setInput( script["instancer"]["out"] )
+		script["writer"]["fileName"].setValue( os.path.join( self.temporaryDirectory(), "test.scc" ) )
+
+		with Gaffer.Context() :
+			with GafferTest.TestRunner.PerformanceScope() :
+				script["writer"].executeSequence( range( 1, 51 ) )
+
 if __name__ == "__main__":
 	unittest.main()
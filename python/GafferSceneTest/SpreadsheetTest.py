@@ -39,6 +39,7 @@ import unittest
 import IECore
 
 import Gaffer
+import GafferTest
 import GafferScene
 import GafferSceneTest
 
@@ -93,5 +94,82 @@ class SpreadsheetTest( GafferSceneTest.SceneTestCase ) :
 				row["name"].setValue( rowName )
 				self.assertEqual( s["out"]["v"].getValue(), match )
 
+	def testPathMatcherSyntaxFirstMatchWins( self ) :
+
+		s = Gaffer.Spreadsheet()
+		s["rows"].addColumn( Gaffer.IntPlug( "v" ) )
+		s["selector"].setValue( "${scene:path}" )
+
+		for i, rowName in enumerate( [
+			"/a/.../c",
+			"/a/b*/c",
+			"/a/b/c",
+			"/a/...",
+			"/...",
+			"/x/*",
+			"/x/y",
+		] ) :
+			row = s["rows"].addRow()
+			row["name"].setValue( rowName )
+			row["cells"]["v"]["value"].setValue( i + 1 )
+
+		for path, expectedValue in [
+			( "/a/b/c", 1 ),
+			( "/a/c", 1 ),
+			( "/a/b/b/c", 1 ),
+			( "/a/bb/d", 4 ),
+			( "/a", 4 ),
+			( "/", 5 ),
+			( "/x/y", 5 ),
+		] :
+			with Gaffer.Context() as c :
+				c["scene:path"] = GafferScene.ScenePlug.stringToPath( path )
+				self.assertEqual( s["out"]["v"].getValue(), expectedValue, msg = path )
+
+		for i in ( 1, 4, 5 ) :
+			s["rows"][i]["enabled"].setValue( False )
+
+		for path, expectedValue in [
+			( "/a/b/c", 2 ),
+			( "/a/c", 0 ),
+			( "/a/bb/c", 2 ),
+			( "/a/b/b/c", 0 ),
+			( "/x/y", 6 ),
+			( "/x/z", 6 ),
+			( "/x/y/z", 0 ),
+		] :
+			with Gaffer.Context() as c :
+				c["scene:path"] = GafferScene.ScenePlug.stringToPath( path )
+				self.assertEqual( s["out"]["v"].getValue(), expectedValue, msg = path )
+
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testWildcardPathRowsPerformance( self ) :
+
+		s = Gaffer.Spreadsheet()
+		s["rows"].addColumn( Gaffer.IntPlug( "v" ) )
+		s["selector"].setValue( "${scene:path}" )
+
+		numRows = 10000
+		for i in range( 0, numRows ) :
+			row = s["rows"].addRow()
+			row["name"].setValue( "/assets/asset{0}/.../geo{0}*".format( i ) )
+			row["cells"]["v"]["value"].setValue( i )
+
+		paths = [
+			GafferScene.ScenePlug.stringToPath( "/assets/asset{0}/model/render/geo{0}Shape".format( i ) )
+			for i in range( 0, numRows )
+		]
+
+		# Compute the rows map up front, so we measure only the lookups.
+		with Gaffer.Context() as c :
+			c["scene:path"] = paths[0]
+			s["out"]["v"].getValue()
+
+		with Gaffer.Context() as c :
+			with GafferTest.TestRunner.PerformanceScope() :
+				for i, path in enumerate( paths ) :
+					c["scene:path"] = path
+					self.assertEqual( s["out"]["v"].getValue(), i )
+
 if __name__ == "__main__":
 	unittest.main()
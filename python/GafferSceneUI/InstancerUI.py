@@ -644,6 +644,29 @@ Gaffer.Metadata.registerNode(
 
 		],
 
+		"packInstanceGroups" : [
+
+			"description",
+			"""
+			Converts each group of instances into a single packed object,
+			which stores the prototype once, along with flat arrays of
+			instance names, transforms and attributes. This avoids
+			generating a scene location for each instance, and is
+			substantially cheaper than `encapsulateInstanceGroups` when
+			instancing large numbers of points. Renderers output the packed
+			instances by sharing the prototype objects between all instances.
+			Takes precedence over `encapsulateInstanceGroups`.
+
+			> Note : Motion blur is not currently supported for the instance
+			> transforms themselves, although deformation and transform blur
+			> within the prototypes is preserved.
+			""",
+			"label", "Pack Instance Groups",
+
+			"layout:section", "Settings.Encapsulation",
+
+		],
+
 		"seedEnabled" : [
 			"description",
 			"""
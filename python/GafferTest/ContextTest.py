@@ -482,6 +482,40 @@ class ContextTest( GafferTest.TestCase ) :
 		self.assertEqual( c.names(), Gaffer.Context().names() )
 		self.assertEqual( h, c.hash() )
 
+	def testHashIndependentOfEditHistory( self ) :
+
+		c1 = Gaffer.Context()
+		c1["a"] = 1
+		c1["b"] = "b"
+		c1["c"] = imath.V2i( 1, 2 )
+
+		c2 = Gaffer.Context()
+		c2["c"] = 10
+		c2["c"] = imath.V2i( 1, 2 )
+		c2["d"] = 20
+		c2["b"] = "b"
+		c2["a"] = 2
+		del c2["d"]
+		c2["e"] = 1
+		c2["f"] = 2
+		c2.removeMatching( "e f" )
+		c2["a"] = 1
+
+		self.assertEqual( c1, c2 )
+		self.assertEqual( c1.hash(), c2.hash() )
+		self.assertEqual( Gaffer.Context( c2 ).hash(), c1.hash() )
+
+		# Edits made while `changedSignal()` is connected take a different
+		# code path, so check those too.
+
+		cs = GafferTest.CapturingSlot( c2.changedSignal() )
+		c2["a"] = 2
+		c2["a"] = 1
+		c2["g"] = 1
+		del c2["g"]
+		self.assertEqual( len( cs ), 4 )
+		self.assertEqual( c1.hash(), c2.hash() )
+
 
 	@GafferTest.TestRunner.PerformanceTestMethod()
 	def testManySubstitutions( self ) :
@@ -768,11 +802,26 @@ class ContextTest( GafferTest.TestCase ) :
 
 		GafferTest.testContextHashPerformance( 10, 10, True )
 
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testContextHashPerformanceManyVariables( self ) :
+
+		GafferTest.testContextHashPerformance( 100, 10, False )
+
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testContextHashPerformanceManyVariablesStartInitialized( self ) :
+
+		GafferTest.testContextHashPerformance( 100, 10, True )
+
 	@GafferTest.TestRunner.PerformanceTestMethod()
 	def testContextCopyPerformance( self ) :
 
 		GafferTest.testContextCopyPerformance( 10, 10 )
 
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testContextCopyPerformanceManyVariables( self ) :
+
+		GafferTest.testContextCopyPerformance( 100, 10 )
+
 	def testCopyEditableScope( self ) :
 
 		GafferTest.testCopyEditableScope()
@@ -1475,6 +1475,112 @@ class ExpressionTest( GafferTest.TestCase ) :
 			s["n"]["user"]["p"].getValue
 		)
 
+	def testHashesSharedBetweenIrrelevantContexts( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["n"] = GafferTest.AddNode()
+
+		s["e"] = Gaffer.Expression()
+		s["e"].setExpression( 'parent["n"]["op1"] = int( context.getFrame() )' )
+
+		Gaffer.ValuePlug.clearHashCache()
+		with Gaffer.PerformanceMonitor() as m :
+			for i in range( 0, 10 ) :
+				with Gaffer.Context() as c :
+					c["irrelevant"] = i
+					self.assertEqual( s["n"]["sum"].getValue(), 1 )
+
+		# The expression doesn't use `irrelevant`, so it only needs
+		# to be hashed once. The AddNode doesn't declare the variables
+		# it depends on, so must be hashed in every context.
+		self.assertEqual( m.plugStatistics( s["e"]["__execute"] ).hashCount, 1 )
+		self.assertEqual( m.plugStatistics( s["n"]["sum"] ).hashCount, 10 )
+
+		with Gaffer.Context() as c :
+			c.setFrame( 2 )
+			self.assertEqual( s["n"]["sum"].getValue(), 2 )
+
+	def testComputedInputsUseWholeContext( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["n1"] = GafferTest.AddNode()
+		s["n2"] = GafferTest.AddNode()
+
+		s["e1"] = Gaffer.Expression()
+		s["e1"].setExpression( 'parent["n1"]["op1"] = context["test"]' )
+
+		# `e2` doesn't use `test` itself, but its input depends on
+		# it, so we must not share results across different values.
+		s["e2"] = Gaffer.Expression()
+		s["e2"].setExpression( 'parent["n2"]["op1"] = parent["n1"]["sum"] * 2' )
+
+		for i in range( 0, 10 ) :
+			with Gaffer.Context() as c :
+				c["test"] = i
+				self.assertEqual( s["n2"]["sum"].getValue(), i * 2 )
+
+	def testUpstreamConnectionsUseWholeContext( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["n1"] = GafferTest.AddNode()
+		s["n2"] = GafferTest.AddNode()
+		s["n3"] = GafferTest.AddNode()
+
+		s["e1"] = Gaffer.Expression()
+		s["e1"].setExpression( 'parent["n1"]["op1"] = context["test"]' )
+
+		s["e2"] = Gaffer.Expression()
+		s["e2"].setExpression( 'parent["n3"]["op1"] = parent["n2"]["op1"] * 2' )
+
+		for i in range( 0, 3 ) :
+			with Gaffer.Context() as c :
+				c["test"] = i
+				self.assertEqual( s["n3"]["sum"].getValue(), 0 )
+
+		# Connecting the source of the expression's input doesn't
+		# touch the expression directly, but must still be accounted
+		# for.
+		s["n2"]["op1"].setInput( s["n1"]["sum"] )
+
+		for i in range( 0, 3 ) :
+			with Gaffer.Context() as c :
+				c["test"] = i
+				self.assertEqual( s["n3"]["sum"].getValue(), i * 2 )
+
+		s["n2"]["op1"].setInput( None )
+
+		for i in range( 0, 3 ) :
+			with Gaffer.Context() as c :
+				c["test"] = i
+				self.assertEqual( s["n3"]["sum"].getValue(), 0 )
+
+	def testSubstitutedStringInputsUseWholeContext( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["n"] = Gaffer.Node()
+		s["n"]["user"]["in"] = Gaffer.StringPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+		s["n"]["user"]["out"] = Gaffer.StringPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+
+		s["e"] = Gaffer.Expression()
+		s["e"].setExpression( 'parent["n"]["user"]["out"] = parent["n"]["user"]["in"]' )
+
+		def assertFrames( expected ) :
+			for frame in ( 1, 2 ) :
+				with Gaffer.Context() as c :
+					c.setFrame( frame )
+					self.assertEqual( s["n"]["user"]["out"].getValue(), expected.format( frame = frame ) )
+
+		s["n"]["user"]["in"].setValue( "static" )
+		assertFrames( "static" )
+
+		# Setting a value with substitutions doesn't change the expression's
+		# inputs, but makes it dependent on the frame.
+		s["n"]["user"]["in"].setValue( "frame${frame}" )
+		assertFrames( "frame{frame}" )
+
+		s["n"]["user"]["in"].setValue( "static" )
+		assertFrames( "static" )
+
 	@GafferTest.TestRunner.PerformanceTestMethod()
 	def testParallelPerformance( self ):
 		s = Gaffer.ScriptNode()
@@ -1494,6 +1600,33 @@ class ExpressionTest( GafferTest.TestCase ) :
 		with GafferTest.TestRunner.PerformanceScope() :
 			GafferTest.parallelGetValue( s["n"]["user"]["p"], 100 )
 
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testEvaluationPerformance( self ) :
+
+		# Measures the per-evaluation overhead of a simple expression
+		# with several inputs and outputs, by evaluating it in many
+		# different contexts.
+
+		s = Gaffer.ScriptNode()
+		s["n"] = Gaffer.Node()
+		for name in [ "a", "b", "c", "sum", "product" ] :
+			s["n"]["user"][name] = Gaffer.IntPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+
+		s["e"] = Gaffer.Expression()
+		s["e"].setExpression( inspect.cleandoc(
+			"""
+			a = parent["n"]["user"]["a"]
+			b = parent["n"]["user"]["b"]
+			c = parent["n"]["user"]["c"]
+			f = context["iteration"]
+			parent["n"]["user"]["sum"] = int( a + b + c + f )
+			parent["n"]["user"]["product"] = int( a * b * c * f )
+			"""
+		) )
+
+		with GafferTest.TestRunner.PerformanceScope() :
+			GafferTest.parallelGetValue( s["n"]["user"]["sum"], 100000, "iteration" )
+
 
 
 if __name__ == "__main__":
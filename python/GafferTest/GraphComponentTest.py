@@ -1092,5 +1092,81 @@ class GraphComponentTest( GafferTest.TestCase ) :
 		with six.assertRaisesRegex( self, Exception, 'Child "c2" is in more than one position' ) :
 			p.reorderChildren( [ c1, c2, c2 ] )
 
+	def testManyChildrenNameLookups( self ) :
+
+		# Exercises the index used to accelerate lookups on
+		# GraphComponents with many children.
+
+		s = Gaffer.ScriptNode()
+		for i in range( 0, 100 ) :
+			s.addChild( Gaffer.Node( "n%d" % i ) )
+
+		for i in range( 0, 100 ) :
+			self.assertEqual( s["n%d" % i].getName(), "n%d" % i )
+			self.assertTrue( s.descendant( "n%d.user" % i ).isSame( s["n%d" % i]["user"] ) )
+
+		# Renaming
+
+		n = s["n10"]
+		with Gaffer.UndoScope( s ) :
+			n.setName( "renamed" )
+
+		self.assertNotIn( "n10", s )
+		self.assertTrue( s["renamed"].isSame( n ) )
+
+		s.undo()
+		self.assertNotIn( "renamed", s )
+		self.assertTrue( s["n10"].isSame( n ) )
+
+		s.redo()
+		self.assertNotIn( "n10", s )
+		self.assertTrue( s["renamed"].isSame( n ) )
+
+		# Unique name generation
+
+		self.assertEqual( s["n50"].setName( "n1" ), "n100" )
+		self.assertEqual( s["n51"].setName( "renamed" ), "renamed1" )
+		self.assertEqual( s["n100"].setName( "n1" ), "n100" )
+
+		s.addChild( Gaffer.Node( "n20" ) )
+		self.assertEqual( s.children()[-1].getName(), "n101" )
+
+		# A name freed by renaming a child can be reused.
+
+		s["n99"].setName( "x" )
+		s.addChild( Gaffer.Node( "n99" ) )
+		self.assertEqual( s.children()[-1].getName(), "n99" )
+
+		# Removal
+
+		n = s["n30"]
+		with Gaffer.UndoScope( s ) :
+			s.removeChild( n )
+
+		self.assertNotIn( "n30", s )
+		s.undo()
+		self.assertTrue( s["n30"].isSame( n ) )
+
+		# Reparenting
+
+		b = Gaffer.Box()
+		s["b"] = b
+		b.addChild( s["n40"] )
+		self.assertNotIn( "n40", s )
+		self.assertIn( "n40", b )
+
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testManyChildren( self ) :
+
+		g = Gaffer.GraphComponent()
+
+		with GafferTest.TestRunner.PerformanceScope() :
+
+			for i in range( 0, 10000 ) :
+				g.addChild( Gaffer.GraphComponent() )
+
+			for i in range( 0, 10000 ) :
+				g["GraphComponent%d" % i if i else "GraphComponent"]
+
 if __name__ == "__main__":
 	unittest.main()
@@ -0,0 +1,200 @@
+##########################################################################
+#
+#  Copyright (c) 2021, Cinesite VFX Ltd. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#      * Redistributions of source code must retain the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer.
+#
+#      * Redistributions in binary form must reproduce the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer in the documentation and/or other materials provided with
+#        the distribution.
+#
+#      * Neither the name of John Haddon nor the names of
+#        any other contributors to this software may be used to endorse or
+#        promote products derived from this software without specific prior
+#        written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import os
+import time
+import unittest
+
+import IECore
+
+import Gaffer
+import GafferTest
+
+class SamplingMonitorTest( GafferTest.TestCase ) :
+
+	class DurationNode( Gaffer.ComputeNode ) :
+
+		def __init__( self, name = "DurationNode" ) :
+
+			Gaffer.ComputeNode.__init__( self, name )
+
+			self["in"] = Gaffer.FloatPlug()
+			self["out"] = Gaffer.FloatPlug( direction = Gaffer.Plug.Direction.Out )
+
+			self["hashDuration"] = Gaffer.FloatPlug()
+			self["computeDuration"] = Gaffer.FloatPlug()
+
+		def affects( self, input ) :
+
+			result = Gaffer.ComputeNode.affects( self, input )
+			if input in ( self["in"], self["hashDuration"], self["computeDuration"] ) :
+				result.append( self["out"] )
+
+			return result
+
+		def hash( self, output, context, h ) :
+
+			if output.isSame( self["out"] ) :
+
+				self["in"].hash( h )
+				self["computeDuration"].hash( h )
+
+				time.sleep( self["hashDuration"].getValue() )
+
+		def compute( self, plug, context ) :
+
+			if plug.isSame( self["out"] ) :
+
+				d = self["computeDuration"].getValue()
+				time.sleep( d )
+
+				self["out"].setValue( self["in"].getValue() + d )
+
+			else :
+
+				Gaffer.ComputeNode.compute( self, plug, context )
+
+	IECore.registerRunTimeTyped( DurationNode, typeName = "GafferTest::SamplingMonitorTest::DurationNode" )
+
+	def testConstructor( self ) :
+
+		self.assertEqual( Gaffer.SamplingMonitor().interval(), 1000 )
+		self.assertEqual( Gaffer.SamplingMonitor( interval = 10 ).interval(), 10 )
+		self.assertRaises( Exception, Gaffer.SamplingMonitor, 0 )
+
+	def testStatistics( self ) :
+
+		n1 = self.DurationNode( "n1" )
+		n1["hashDuration"].setValue( 0.2 )
+		n1["computeDuration"].setValue( 0.4 )
+
+		n2 = self.DurationNode( "n2" )
+		n2["in"].setInput( n1["out"] )
+		n2["hashDuration"].setValue( 0.1 )
+		n2["computeDuration"].setValue( 0.2 )
+
+		m = Gaffer.SamplingMonitor()
+		self.assertEqual( m.numSamples(), 0 )
+		self.assertEqual( m.allStatistics(), {} )
+
+		with m :
+			n2["out"].getValue()
+
+		def seconds( n ) :
+
+			return n / ( 1000000000.0 )
+
+		# See PerformanceMonitorTest.testDurations for why the tolerance
+		# is so wide in CI.
+		delta = 1.0 if GafferTest.inCI() else 0.05
+
+		self.assertGreater( m.numSamples(), 0 )
+		self.assertEqual( set( m.allStatistics().keys() ), { n1["out"], n2["out"] } )
+
+		self.assertAlmostEqual( seconds( m.plugStatistics( n1["out"] ).inclusiveDuration ), 0.6, delta = delta )
+		self.assertAlmostEqual( seconds( m.plugStatistics( n1["out"] ).exclusiveDuration ), 0.6, delta = delta )
+		self.assertAlmostEqual( seconds( m.plugStatistics( n2["out"] ).inclusiveDuration ), 0.9, delta = delta )
+		self.assertAlmostEqual( seconds( m.plugStatistics( n2["out"] ).exclusiveDuration ), 0.3, delta = delta )
+		self.assertEqual( m.plugStatistics( n1["in"] ), Gaffer.SamplingMonitor.Statistics() )
+
+		combined = m.combinedStatistics()
+		self.assertEqual( combined.inclusiveDuration, combined.exclusiveDuration )
+		self.assertEqual(
+			combined.inclusiveDuration,
+			sum( s.exclusiveDuration for s in m.allStatistics().values() )
+		)
+
+		nodeTypeStatistics = m.nodeTypeStatistics()
+		self.assertEqual( list( nodeTypeStatistics.keys() ), [ "GafferTest::SamplingMonitorTest::DurationNode" ] )
+		# Time spent in `n1` is billed to the inclusive time of the node type
+		# only once, even though it was sampled beneath `n2`.
+		self.assertEqual( nodeTypeStatistics["GafferTest::SamplingMonitorTest::DurationNode"].inclusiveDuration, combined.inclusiveDuration )
+		self.assertEqual( nodeTypeStatistics["GafferTest::SamplingMonitorTest::DurationNode"].exclusiveDuration, combined.exclusiveDuration )
+
+	def testCollapsedStacks( self ) :
+
+		n1 = self.DurationNode( "n1" )
+		n1["computeDuration"].setValue( 0.2 )
+
+		n2 = self.DurationNode( "n2" )
+		n2["in"].setInput( n1["out"] )
+
+		with Gaffer.SamplingMonitor() as m :
+			n2["out"].getValue()
+
+		fileName = os.path.join( self.temporaryDirectory(), "stacks.txt" )
+		m.writeCollapsedStacks( fileName )
+
+		with open( fileName ) as f :
+			lines = f.readlines()
+
+		self.assertGreater( len( lines ), 0 )
+
+		samples = 0
+		stacks = set()
+		for line in lines :
+			stack, count = line.rsplit( " ", 1 )
+			samples += int( count )
+			stacks.add( stack )
+
+		self.assertEqual( samples, m.numSamples() )
+		self.assertIn(
+			"n2.out [computeNode:compute];n1.out [computeNode:compute]",
+			stacks
+		)
+
+	def testParallelEvaluation( self ) :
+
+		n = self.DurationNode()
+		n["hashDuration"].setValue( 0.001 )
+
+		with Gaffer.SamplingMonitor( interval = 100 ) as m :
+			GafferTest.parallelGetValue( n["out"], 200, "iteration" )
+
+		self.assertGreater( m.numSamples(), 0 )
+		self.assertEqual( set( m.allStatistics().keys() ), { n["out"] } )
+
+	@GafferTest.TestRunner.PerformanceTestMethod()
+	def testOverhead( self ) :
+
+		a = GafferTest.AddNode()
+
+		with Gaffer.SamplingMonitor() :
+			with GafferTest.TestRunner.PerformanceScope() :
+				GafferTest.parallelGetValue( a["sum"], 1000000, "iteration" )
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,133 @@
+##########################################################################
+#
+#  Copyright (c) 2021, Cinesite VFX Ltd. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#      * Redistributions of source code must retain the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer.
+#
+#      * Redistributions in binary form must reproduce the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer in the documentation and/or other materials provided with
+#        the distribution.
+#
+#      * Neither the name of John Haddon nor the names of
+#        any other contributors to this software may be used to endorse or
+#        promote products derived from this software without specific prior
+#        written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import json
+import os
+import unittest
+
+import IECore
+
+import Gaffer
+import GafferTest
+
+class TimelineMonitorTest( GafferTest.TestCase ) :
+
+	def test( self ) :
+
+		a1 = GafferTest.AddNode()
+		a2 = GafferTest.AddNode()
+		a2["op1"].setInput( a1["sum"] )
+
+		with Gaffer.TimelineMonitor() as m :
+			a2["sum"].getValue()
+
+		events = m.events()
+		self.assertEqual(
+			{ ( e.plug.fullName(), e.type ) for e in events },
+			{
+				( a1["sum"].fullName(), "computeNode:hash" ),
+				( a1["sum"].fullName(), "computeNode:compute" ),
+				( a2["sum"].fullName(), "computeNode:hash" ),
+				( a2["sum"].fullName(), "computeNode:compute" ),
+			}
+		)
+
+		self.assertEqual( len( { e.id for e in events } ), len( events ) )
+		self.assertEqual( [ e.startTime for e in events ], sorted( e.startTime for e in events ) )
+
+		eventsByType = { ( e.plug.node(), e.type ) : e for e in events }
+		for processType in ( "computeNode:hash", "computeNode:compute" ) :
+			parent = eventsByType[( a2, processType )]
+			child = eventsByType[( a1, processType )]
+			self.assertEqual( parent.parentId, 0 )
+			self.assertEqual( child.parentId, parent.id )
+			self.assertGreaterEqual( child.startTime, parent.startTime )
+			self.assertLessEqual( child.finishTime, parent.finishTime )
+
+		for e in events :
+			self.assertLessEqual( e.startTime, e.finishTime )
+			self.assertEqual( e.contextHash, Gaffer.Context.current().hash() )
+			self.assertEqual( e.threadIndex, 0 )
+
+	def testChromeTrace( self ) :
+
+		a1 = GafferTest.AddNode()
+		a2 = GafferTest.AddNode()
+		a2["op1"].setInput( a1["sum"] )
+
+		with Gaffer.TimelineMonitor() as m :
+			a2["sum"].getValue()
+
+		fileName = os.path.join( self.temporaryDirectory(), "trace.json" )
+		m.writeChromeTrace( fileName )
+
+		with open( fileName ) as f :
+			trace = json.load( f )
+
+		processes = [ e for e in trace["traceEvents"] if e["ph"] == "X" ]
+		self.assertEqual( len( processes ), len( m.events() ) )
+
+		for traceEvent, event in zip( processes, m.events() ) :
+			self.assertEqual( traceEvent["name"], event.plug.fullName() )
+			self.assertEqual( traceEvent["cat"], event.type )
+			self.assertEqual( traceEvent["tid"], event.threadIndex )
+			self.assertEqual( traceEvent["args"]["id"], event.id )
+			self.assertEqual( traceEvent["args"]["parent"], event.parentId )
+			self.assertEqual( traceEvent["args"]["context"], str( event.contextHash ) )
+			self.assertAlmostEqual( traceEvent["ts"], event.startTime / 1000.0, places = 2 )
+
+		threadNames = [ e for e in trace["traceEvents"] if e["ph"] == "M" ]
+		self.assertEqual( [ e["tid"] for e in threadNames ], [ 0 ] )
+
+	def testParallelEvaluation( self ) :
+
+		a = GafferTest.AddNode()
+
+		with Gaffer.TimelineMonitor() as m :
+			GafferTest.parallelGetValue( a["sum"], 1000, "iteration" )
+
+		events = m.events()
+		self.assertEqual( len( [ e for e in events if e.type == "computeNode:hash" ] ), 1000 )
+		self.assertEqual( len( { e.id for e in events } ), len( events ) )
+		self.assertEqual( { e.plug for e in events }, { a["sum"] } )
+
+		fileName = os.path.join( self.temporaryDirectory(), "trace.json" )
+		m.writeChromeTrace( fileName )
+		with open( fileName ) as f :
+			json.load( f )
+
+if __name__ == "__main__":
+	unittest.main()
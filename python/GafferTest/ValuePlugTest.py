@@ -971,17 +971,305 @@ class ValuePlugTest( GafferTest.TestCase ) :
 			backgroundTask2.cancelAndWait()
 			backgroundTask1.cancelAndWait()
 
+	def testHashCacheStatistics( self ) :
+
+		node = GafferTest.AddNode()
+
+		Gaffer.ValuePlug.clearHashCache()
+		Gaffer.ValuePlug.resetHashCacheStatistics()
+
+		node["sum"].hash()
+		s = Gaffer.ValuePlug.hashCacheStatistics()
+		self.assertEqual( s.hits, 0 )
+		self.assertEqual( s.misses, 1 )
+
+		node["sum"].hash()
+		s = Gaffer.ValuePlug.hashCacheStatistics()
+		self.assertEqual( s.hits, 1 )
+		self.assertEqual( s.misses, 1 )
+		self.assertEqual( s.evictions, 0 )
+
+		Gaffer.ValuePlug.setHashCacheSizeLimit( 1 )
+		with Gaffer.Context() as c :
+			for i in range( 0, 10 ) :
+				c.setFrame( i )
+				node["sum"].hash()
+
+		s = Gaffer.ValuePlug.hashCacheStatistics()
+		self.assertEqual( s.misses, 11 )
+		self.assertGreaterEqual( s.evictions, 9 )
+
+		Gaffer.ValuePlug.resetHashCacheStatistics()
+		s = Gaffer.ValuePlug.hashCacheStatistics()
+		self.assertEqual( s.hits, 0 )
+		self.assertEqual( s.misses, 0 )
+		self.assertEqual( s.evictions, 0 )
+
+	def testHashCacheMemoryLimit( self ) :
+
+		self.assertEqual( Gaffer.ValuePlug.getHashCacheMemoryLimit(), 0 )
+
+		limit = 1024 * 1024
+		Gaffer.ValuePlug.setHashCacheMemoryLimit( limit )
+		self.assertEqual( Gaffer.ValuePlug.getHashCacheMemoryLimit(), limit )
+
+		node = GafferTest.AddNode()
+		Gaffer.ValuePlug.clearHashCache()
+		Gaffer.ValuePlug.resetHashCacheStatistics()
+
+		with Gaffer.Context() as c :
+			for i in range( 0, 50000 ) :
+				c.setFrame( i )
+				node["sum"].hash()
+
+		self.assertGreater( Gaffer.ValuePlug.hashCacheMemoryUsage(), 0 )
+		self.assertLessEqual( Gaffer.ValuePlug.hashCacheMemoryUsage(), limit )
+		self.assertGreater( Gaffer.ValuePlug.hashCacheStatistics().evictions, 0 )
+
+		# The per-thread size limit should not apply while there
+		# is a memory limit.
+
+		Gaffer.ValuePlug.setHashCacheSizeLimit( 1 )
+		Gaffer.ValuePlug.resetHashCacheStatistics()
+		with Gaffer.Context() as c :
+			for i in range( 0, 10 ) :
+				c.setFrame( i )
+				node["sum"].hash()
+			for i in range( 0, 10 ) :
+				c.setFrame( i )
+				node["sum"].hash()
+
+		self.assertEqual( Gaffer.ValuePlug.hashCacheStatistics().hits, 10 )
+
+	def testCacheStatistics( self ) :
+
+		self.assertFalse( Gaffer.ValuePlug.getCacheStatisticsEnabled() )
+
+		node = GafferTest.CachingTestNode()
+		node["in"].setValue( "d" )
+
+		Gaffer.ValuePlug.clearCache()
+		Gaffer.ValuePlug.resetComputeCacheStatistics()
+		Gaffer.ValuePlug.resetHashCacheStatistics()
+
+		# Statistics are not collected while disabled.
+
+		node["out"].getValue()
+		self.assertEqual( Gaffer.ValuePlug.computeCacheStatistics(), Gaffer.ValuePlug.ComputeCacheStatistics() )
+		self.assertEqual( Gaffer.ValuePlug.computeCacheStatisticsByPlugType(), {} )
+
+		Gaffer.ValuePlug.setCacheStatisticsEnabled( True )
+		self.assertTrue( Gaffer.ValuePlug.getCacheStatisticsEnabled() )
+
+		Gaffer.ValuePlug.clearCache()
+		node["out"].getValue()
+
+		s = Gaffer.ValuePlug.computeCacheStatistics()
+		self.assertEqual( s.hits, 0 )
+		self.assertEqual( s.misses, 1 )
+		self.assertGreater( s.cost, 0 )
+
+		node["out"].getValue()
+
+		s = Gaffer.ValuePlug.computeCacheStatistics()
+		self.assertEqual( s.hits, 1 )
+		self.assertEqual( s.misses, 1 )
+		self.assertEqual( s.evictions, 0 )
+
+		self.assertEqual( list( Gaffer.ValuePlug.computeCacheStatisticsByPlugType().keys() ), [ "Gaffer::ObjectPlug" ] )
+		self.assertEqual( Gaffer.ValuePlug.computeCacheStatisticsByPlugType()["Gaffer::ObjectPlug"], s )
+		self.assertEqual( list( Gaffer.ValuePlug.computeCacheStatisticsByNodeType().keys() ), [ "GafferTest::CachingTestNode" ] )
+		self.assertEqual( Gaffer.ValuePlug.computeCacheStatisticsByNodeType()["GafferTest::CachingTestNode"], s )
+
+		# Evictions should be attributed to the type of plug
+		# that computed the value, but clearing the cache
+		# should not count as eviction.
+
+		Gaffer.ValuePlug.setCacheMemoryLimit( 1 )
+		self.assertEqual( Gaffer.ValuePlug.computeCacheStatistics().evictions, 1 )
+		self.assertEqual( Gaffer.ValuePlug.computeCacheStatisticsByPlugType()["Gaffer::ObjectPlug"].evictions, 1 )
+		self.assertEqual( Gaffer.ValuePlug.computeCacheStatisticsByNodeType()["GafferTest::CachingTestNode"].evictions, 1 )
+
+		Gaffer.ValuePlug.setCacheMemoryLimit( self.__originalCacheMemoryLimit )
+		node["out"].getValue()
+		Gaffer.ValuePlug.clearCache()
+		self.assertEqual( Gaffer.ValuePlug.computeCacheStatistics().evictions, 1 )
+
+		# Hash cache statistics should be broken down by type too.
+
+		Gaffer.ValuePlug.clearHashCache()
+		Gaffer.ValuePlug.resetHashCacheStatistics()
+		self.assertEqual( Gaffer.ValuePlug.hashCacheStatistics(), Gaffer.ValuePlug.HashCacheStatistics() )
+		Gaffer.ValuePlug.resetComputeCacheStatistics()
+		self.assertEqual( Gaffer.ValuePlug.computeCacheStatistics(), Gaffer.ValuePlug.ComputeCacheStatistics() )
+
+		node["out"].hash()
+		node["out"].hash()
+
+		s = Gaffer.ValuePlug.hashCacheStatistics()
+		self.assertEqual( s.hits, 1 )
+		self.assertEqual( s.misses, 1 )
+		self.assertEqual( Gaffer.ValuePlug.hashCacheStatisticsByPlugType()["Gaffer::ObjectPlug"].hits, 1 )
+		self.assertEqual( Gaffer.ValuePlug.hashCacheStatisticsByNodeType()["GafferTest::CachingTestNode"].misses, 1 )
+
+	def testComputeCacheWaits( self ) :
+
+		class BlockingNode( Gaffer.ComputeNode ) :
+
+			def __init__( self, name = "BlockingNode" ) :
+
+				Gaffer.ComputeNode.__init__( self, name )
+
+				self.computeStarted = threading.Event()
+				self.computeReleased = threading.Event()
+				self["out"] = Gaffer.IntPlug( direction = Gaffer.Plug.Direction.Out )
+
+			def compute( self, output, context ) :
+
+				if output == self["out"] :
+					self.computeStarted.set()
+					self.computeReleased.wait()
+					output.setValue( 1 )
+
+			def computeCachePolicy( self, output ) :
+
+				return Gaffer.ValuePlug.CachePolicy.TaskCollaboration
+
+		IECore.registerRunTimeTyped( BlockingNode )
+
+		node = BlockingNode()
+
+		Gaffer.ValuePlug.clearCache()
+		Gaffer.ValuePlug.setCacheStatisticsEnabled( True )
+		Gaffer.ValuePlug.resetComputeCacheStatistics()
+
+		# Start a compute on one thread, and then request the same
+		# value from another thread while it is still in progress.
+
+		thread1 = threading.Thread( target = node["out"].getValue )
+		thread1.start()
+		node.computeStarted.wait()
+
+		thread2 = threading.Thread( target = node["out"].getValue )
+		thread2.start()
+		# Give the second thread time to find the compute in progress.
+		time.sleep( 0.5 )
+		node.computeReleased.set()
+
+		thread1.join()
+		thread2.join()
+
+		s = Gaffer.ValuePlug.computeCacheStatistics()
+		self.assertEqual( s.hits, 0 )
+		self.assertEqual( s.misses, 1 )
+		self.assertEqual( s.waits, 1 )
+		self.assertEqual( Gaffer.ValuePlug.computeCacheStatisticsByNodeType()["BlockingNode"].waits, 1 )
+
+		# Now the value is cached, so further lookups are hits.
+
+		self.assertEqual( node["out"].getValue(), 1 )
+		s = Gaffer.ValuePlug.computeCacheStatistics()
+		self.assertEqual( s.hits, 1 )
+		self.assertEqual( s.waits, 1 )
+
+	def testDiskCache( self ) :
+
+		class StandardCachingTestNode( GafferTest.CachingTestNode ) :
+
+			def __init__( self, name = "StandardCachingTestNode" ) :
+
+				GafferTest.CachingTestNode.__init__( self, name )
+
+			def computeCachePolicy( self, output ) :
+
+				return Gaffer.ValuePlug.CachePolicy.Standard
+
+		IECore.registerRunTimeTyped( StandardCachingTestNode )
+
+		node = StandardCachingTestNode()
+		node["in"].setValue( "d" )
+
+		self.assertEqual( Gaffer.ValuePlug.getDiskCacheDirectory(), "" )
+		self.assertFalse( Gaffer.ValuePlug.getDiskCacheEnabled( Gaffer.ObjectPlug.staticTypeId() ) )
+
+		directory = os.path.join( self.temporaryDirectory(), "diskCache" )
+		Gaffer.ValuePlug.setDiskCacheDirectory( directory )
+		self.assertEqual( Gaffer.ValuePlug.getDiskCacheDirectory(), directory )
+		self.assertTrue( os.path.isdir( directory ) )
+
+		# Disk cache not yet enabled for ObjectPlugs, so nothing should be stored.
+
+		self.assertEqual( node["out"].getValue(), IECore.StringData( "d" ) )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheUsage(), 0 )
+
+		Gaffer.ValuePlug.setDiskCacheEnabled( Gaffer.ObjectPlug.staticTypeId(), True )
+		self.assertTrue( Gaffer.ValuePlug.getDiskCacheEnabled( Gaffer.ObjectPlug.staticTypeId() ) )
+		self.assertFalse( Gaffer.ValuePlug.getDiskCacheEnabled( Gaffer.IntPlug.staticTypeId() ) )
+
+		# First compute should store the result on disk.
+
+		Gaffer.ValuePlug.clearCache()
+		with Gaffer.PerformanceMonitor() as m :
+			self.assertEqual( node["out"].getValue(), IECore.StringData( "d" ) )
+		self.assertEqual( m.plugStatistics( node["out"] ).computeCount, 1 )
+		self.assertGreater( Gaffer.ValuePlug.diskCacheUsage(), 0 )
+
+		# Subsequent computes should load the result from disk, even
+		# when the in-memory cache has been cleared.
+
+		Gaffer.ValuePlug.clearCache()
+		with Gaffer.PerformanceMonitor() as m :
+			self.assertEqual( node["out"].getValue(), IECore.StringData( "d" ) )
+		self.assertEqual( m.plugStatistics( node["out"] ).computeCount, 0 )
+
+		# Clearing the disk cache should force a recompute.
+
+		Gaffer.ValuePlug.clearDiskCache()
+		self.assertEqual( Gaffer.ValuePlug.diskCacheUsage(), 0 )
+
+		Gaffer.ValuePlug.clearCache()
+		with Gaffer.PerformanceMonitor() as m :
+			self.assertEqual( node["out"].getValue(), IECore.StringData( "d" ) )
+		self.assertEqual( m.plugStatistics( node["out"] ).computeCount, 1 )
+
+		# The size limit should be respected.
+
+		for i in range( 0, 10 ) :
+			node["in"].setValue( str( i ) * 1000 )
+			node["out"].getValue()
+
+		usage = Gaffer.ValuePlug.diskCacheUsage()
+		Gaffer.ValuePlug.setDiskCacheSizeLimit( usage // 2 )
+		self.assertLessEqual( Gaffer.ValuePlug.diskCacheUsage(), usage // 2 )
+
+		# Reopening the directory should find the existing files.
+
+		usage = Gaffer.ValuePlug.diskCacheUsage()
+		Gaffer.ValuePlug.setDiskCacheDirectory( "" )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheUsage(), 0 )
+		Gaffer.ValuePlug.setDiskCacheDirectory( directory )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheUsage(), usage )
+
 	def setUp( self ) :
 
 		GafferTest.TestCase.setUp( self )
 
 		self.__originalCacheMemoryLimit = Gaffer.ValuePlug.getCacheMemoryLimit()
+		self.__originalDiskCacheSizeLimit = Gaffer.ValuePlug.getDiskCacheSizeLimit()
+		self.__originalHashCacheSizeLimit = Gaffer.ValuePlug.getHashCacheSizeLimit()
+		self.__originalHashCacheMemoryLimit = Gaffer.ValuePlug.getHashCacheMemoryLimit()
 
 	def tearDown( self ) :
 
 		GafferTest.TestCase.tearDown( self )
 
 		Gaffer.ValuePlug.setCacheMemoryLimit( self.__originalCacheMemoryLimit )
+		Gaffer.ValuePlug.setDiskCacheDirectory( "" )
+		Gaffer.ValuePlug.setDiskCacheEnabled( Gaffer.ObjectPlug.staticTypeId(), False )
+		Gaffer.ValuePlug.setDiskCacheSizeLimit( self.__originalDiskCacheSizeLimit )
+		Gaffer.ValuePlug.setHashCacheSizeLimit( self.__originalHashCacheSizeLimit )
+		Gaffer.ValuePlug.setHashCacheMemoryLimit( self.__originalHashCacheMemoryLimit )
+		Gaffer.ValuePlug.setCacheStatisticsEnabled( False )
 
 if __name__ == "__main__":
 	unittest.main()
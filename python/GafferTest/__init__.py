@@ -147,6 +147,8 @@ from .DownstreamIteratorTest import DownstreamIteratorTest
 from .PerformanceMonitorTest import PerformanceMonitorTest
 from .MetadataAlgoTest import MetadataAlgoTest
 from .ContextMonitorTest import ContextMonitorTest
+from .TimelineMonitorTest import TimelineMonitorTest
+from .SamplingMonitorTest import SamplingMonitorTest
 from .PlugAlgoTest import PlugAlgoTest
 from .BoxInTest import BoxInTest
 from .BoxOutTest import BoxOutTest
@@ -93,3 +93,8 @@ ValuePlug::CachePolicy ComputeNode::computeCachePolicy( const ValuePlug *output
 	/// known to be declaring an appropriate policy.
 	return ValuePlug::CachePolicy::Legacy;
 }
+
+const std::vector<IECore::InternedString> *ComputeNode::relevantContextVariables( const ValuePlug *output ) const
+{
+	return nullptr;
+}
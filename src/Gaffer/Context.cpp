@@ -231,7 +231,7 @@ static InternedString g_frame( "frame" );
 static InternedString g_framesPerSecond( "framesPerSecond" );
 
 Context::Context()
-	:	m_changedSignal( nullptr ), m_hashValid( false ), m_canceller( nullptr )
+	:	m_changedSignal( nullptr ), m_hash( 0, 0 ), m_canceller( nullptr )
 {
 	set( g_frame, 1.0f );
 	set( g_framesPerSecond, 24.0f );
@@ -244,8 +244,7 @@ Context::Context( const Context &other )
 
 Context::Context( const Context &other, CopyMode mode )
 	:	m_changedSignal( nullptr ),
-		m_hash( other.m_hash ),
-		m_hashValid( other.m_hashValid ),
+		m_hash( 0, 0 ),
 		m_canceller( other.m_canceller )
 {
 	// Reserving one extra spot before we copy in the existing variables means that we will
@@ -257,6 +256,7 @@ Context::Context( const Context &other, CopyMode mode )
 	if( mode == CopyMode::NonOwning )
 	{
 		m_map = other.m_map;
+		m_hash = other.m_hash;
 	}
 	else
 	{
@@ -339,8 +339,8 @@ void Context::remove( const IECore::InternedString &name )
 	Map::iterator it = m_map.find( name );
 	if( it != m_map.end() )
 	{
+		updateHash( it->second.hash(), MurmurHash( 0, 0 ) );
 		m_map.erase( it );
-		m_hashValid = false;
 		if( m_changedSignal )
 		{
 			(*m_changedSignal)( this, name );
@@ -359,11 +359,12 @@ void Context::removeMatching( const StringAlgo::MatchPattern &pattern )
 	{
 		if( StringAlgo::matchMultiple( it->first, pattern ) )
 		{
+			const InternedString name = it->first;
+			updateHash( it->second.hash(), MurmurHash( 0, 0 ) );
 			it = m_map.erase( it );
-			m_hashValid = false;
 			if( m_changedSignal )
 			{
-				(*m_changedSignal)( this, it->first );
+				(*m_changedSignal)( this, name );
 			}
 		}
 		else
@@ -428,20 +429,9 @@ Context::ChangedSignal &Context::changedSignal()
 
 IECore::MurmurHash Context::hash() const
 {
-	if( m_hashValid )
-	{
-		return m_hash;
-	}
-
-	uint64_t sumH1 = 0, sumH2 = 0;
-	for( Map::const_iterator it = m_map.begin(), eIt = m_map.end(); it != eIt; ++it )
-	{
-		sumH1 += it->second.hash().h1();
-		sumH2 += it->second.hash().h2();
-	}
-
-	m_hash = MurmurHash( sumH1, sumH2 );
-	m_hashValid = true;
+	// The hash is maintained incrementally by `updateHash()`, so this
+	// is constant time regardless of the number of variables. This is
+	// crucial, because `ValuePlug` relies on it for every hash cache lookup.
 	return m_hash;
 }
 
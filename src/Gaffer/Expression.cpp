@@ -45,6 +45,7 @@
 
 #include "IECore/Exception.h"
 #include "IECore/MessageHandler.h"
+#include "IECore/StringAlgo.h"
 
 #include "boost/bind.hpp"
 #include "boost/bind/placeholders.hpp"
@@ -61,7 +62,7 @@ size_t Expression::g_firstPlugIndex;
 GAFFER_NODE_DEFINE_TYPE( Expression );
 
 Expression::Expression( const std::string &name )
-	:	ComputeNode( name ), m_engine( nullptr )
+	:	ComputeNode( name ), m_engine( nullptr ), m_staticInputs( true )
 {
 	storeIndexOfNextChild( g_firstPlugIndex );
 
@@ -89,6 +90,9 @@ Expression::Expression( const std::string &name )
 	addChild( new ObjectVectorPlug( "__execute", Plug::Out, new ObjectVector ) );
 
 	plugSetSignal().connect( boost::bind( &Expression::plugSet, this, ::_1 ) );
+	plugInputChangedSignal().connect( boost::bind( &Expression::plugInputChanged, this, ::_1 ) );
+	inPlug()->childAddedSignal().connect( boost::bind( &Expression::updateStaticInputs, this ) );
+	inPlug()->childRemovedSignal().connect( boost::bind( &Expression::updateStaticInputs, this ) );
 }
 
 Expression::~Expression()
@@ -344,6 +348,21 @@ Gaffer::ValuePlug::CachePolicy Expression::computeCachePolicy( const Gaffer::Val
 	return ComputeNode::computeCachePolicy( output );
 }
 
+const std::vector<IECore::InternedString> *Expression::relevantContextVariables( const Gaffer::ValuePlug *output ) const
+{
+	if( output != executePlug() && !outPlug()->isAncestorOf( output ) )
+	{
+		return ComputeNode::relevantContextVariables( output );
+	}
+
+	// The result depends on the context variables used by the expression,
+	// and on the values of the inputs. If any input is computed, it may
+	// depend on any context variable, so we can't make any claims. But
+	// if all the inputs are static values, then only our own context
+	// variables are relevant.
+	return m_staticInputs ? &m_contextNames : ComputeNode::relevantContextVariables( output );
+}
+
 
 void Expression::compute( ValuePlug *output, const Context *context ) const
 {
@@ -505,6 +524,15 @@ std::string Expression::transcribe( const std::string &expression, bool toIntern
 
 void Expression::plugSet( const Plug *plug )
 {
+	if( inPlug()->isAncestorOf( plug ) )
+	{
+		// Plug set signals are propagated to all downstream plugs, so
+		// this also catches changes to the values of our inputs' sources.
+		// A new value may introduce or remove substitutions.
+		updateStaticInputs();
+		return;
+	}
+
 	if( m_engine || plug != expressionPlug() )
 	{
 		return;
@@ -546,6 +574,48 @@ void Expression::plugSet( const Plug *plug )
 
 }
 
+void Expression::plugInputChanged( const Plug *plug )
+{
+	// Input changes are propagated to all downstream plugs, so
+	// this also catches changes to the sources of our inputs.
+	if( inPlug()->isAncestorOf( plug ) )
+	{
+		updateStaticInputs();
+	}
+}
+
+void Expression::updateStaticInputs()
+{
+	// We cache this rather than computing it in `relevantContextVariables()`,
+	// because that is called for every hash cache lookup.
+	m_staticInputs = true;
+	for( ValuePlug::RecursiveIterator it( inPlug() ); !it.done(); ++it )
+	{
+		if( !(*it)->children().empty() )
+		{
+			continue;
+		}
+
+		const Plug *source = (*it)->source();
+		if( source->direction() == Plug::Out )
+		{
+			m_staticInputs = false;
+			return;
+		}
+
+		// StringPlugs substitute context variables into their values,
+		// so depend on variables we know nothing about.
+		if( auto stringPlug = IECore::runTimeCast<const StringPlug>( source ) )
+		{
+			if( stringPlug->substitutions() && IECore::StringAlgo::hasSubstitutions( stringPlug->getValue() ) )
+			{
+				m_staticInputs = false;
+				return;
+			}
+		}
+	}
+}
+
 //////////////////////////////////////////////////////////////////////////
 // Expression::Engine implementation
 //////////////////////////////////////////////////////////////////////////
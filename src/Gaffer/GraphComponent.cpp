@@ -112,8 +112,126 @@ void validateName( const InternedString &name )
 	throw IECore::Exception( what );
 }
 
+// Splits `name` into a prefix and a numeric suffix, returning the suffix.
+// Names without a numeric suffix are considered to have a suffix of 0.
+// Unlike `StringAlgo::numericSuffix()`, this never throws for overly long
+// suffixes, which is important because it is used on every child name
+// added to a NameIndex.
+long splitNumericSuffix( const std::string &name, std::string &prefix )
+{
+	size_t prefixSize = name.size();
+	while( prefixSize && name[prefixSize-1] >= '0' && name[prefixSize-1] <= '9' )
+	{
+		prefixSize--;
+	}
+
+	prefix = name.substr( 0, prefixSize );
+	return strtol( name.c_str() + prefixSize, nullptr, 10 );
+}
+
+// Number of children at which we start using a NameIndex. Below
+// this a linear search is quicker, and doesn't cost any memory.
+const size_t g_nameIndexThreshold = 32;
+
 } // namespace
 
+//////////////////////////////////////////////////////////////////////////
+// GraphComponent::NameIndex
+//
+// Provides constant time lookup of children by name, and fast generation
+// of unique names. We maintain this only for GraphComponents with many
+// children (typically Boxes, ScriptNodes and Spreadsheet rows), because
+// the vast majority of GraphComponents are plugs with only a handful of
+// children.
+//
+// Note that during `addChildInternal()` a new child may briefly share its
+// name with an existing sibling. In this case the sibling remains in the
+// index, and the new child is added when it has been given a unique name.
+//////////////////////////////////////////////////////////////////////////
+
+struct GraphComponent::NameIndex : boost::noncopyable
+{
+
+	NameIndex( const ChildContainer &children )
+	{
+		for( const auto &child : children )
+		{
+			add( child.get() );
+		}
+	}
+
+	const GraphComponent *find( const InternedString &name ) const
+	{
+		auto it = m_children.find( name );
+		return it != m_children.end() ? it->second : nullptr;
+	}
+
+	void add( const GraphComponent *child )
+	{
+		if( !m_children.insert( { child->getName(), child } ).second )
+		{
+			// Either already in the index, or sharing its name
+			// with a sibling.
+			return;
+		}
+
+		std::string prefix;
+		const long suffix = splitNumericSuffix( child->getName().string(), prefix );
+		m_suffixes[prefix].insert( suffix );
+	}
+
+	void remove( const GraphComponent *child )
+	{
+		auto it = m_children.find( child->getName() );
+		if( it == m_children.end() || it->second != child )
+		{
+			return;
+		}
+
+		m_children.erase( it );
+
+		std::string prefix;
+		const long suffix = splitNumericSuffix( child->getName().string(), prefix );
+		auto sIt = m_suffixes.find( prefix );
+		sIt->second.erase( sIt->second.find( suffix ) );
+		if( sIt->second.empty() )
+		{
+			m_suffixes.erase( sIt );
+		}
+	}
+
+	// Returns the largest numeric suffix of any child whose name
+	// consists of `prefix` followed by an optional suffix, ignoring
+	// `exclude`. Returns -1 if there is no such child.
+	long maxSuffix( const std::string &prefix, const GraphComponent *exclude ) const
+	{
+		auto it = m_suffixes.find( prefix );
+		if( it == m_suffixes.end() )
+		{
+			return -1;
+		}
+
+		auto sIt = it->second.rbegin();
+		if( find( exclude->getName() ) == exclude )
+		{
+			std::string excludePrefix;
+			const long excludeSuffix = splitNumericSuffix( exclude->getName().string(), excludePrefix );
+			if( excludePrefix == prefix && *sIt == excludeSuffix )
+			{
+				++sIt;
+			}
+		}
+
+		return sIt != it->second.rend() ? *sIt : -1;
+	}
+
+	private :
+
+		std::unordered_map<InternedString, const GraphComponent *> m_children;
+		std::unordered_map<std::string, std::multiset<long>> m_suffixes;
+
+};
+
 //////////////////////////////////////////////////////////////////////////
 // GraphComponent::Signals
 //
@@ -184,13 +302,23 @@ const IECore::InternedString &GraphComponent::setName( const IECore::InternedStr
 	IECore::InternedString newName = name;
 	if( m_parent )
 	{
+		const NameIndex *nameIndex = m_parent->m_nameIndex.get();
+
 		bool uniqueAlready = true;
-		for( ChildContainer::const_iterator it=m_parent->m_children.begin(), eIt=m_parent->m_children.end(); it != eIt; it++ )
+		if( nameIndex )
+		{
+			const GraphComponent *existing = nameIndex->find( newName );
+			uniqueAlready = !existing || existing == this;
+		}
+		else
 		{
-			if( *it != this && (*it)->m_name == newName )
+			for( ChildContainer::const_iterator it=m_parent->m_children.begin(), eIt=m_parent->m_children.end(); it != eIt; it++ )
 			{
-				uniqueAlready = false;
-				break;
+				if( *it != this && (*it)->m_name == newName )
+				{
+					uniqueAlready = false;
+					break;
+				}
 			}
 		}
 
@@ -201,21 +329,32 @@ const IECore::InternedString &GraphComponent::setName( const IECore::InternedStr
 			std::string prefix;
 			int suffix = StringAlgo::numericSuffix( newName.value(), 1, &prefix );
 
-			// iterate over all the siblings to find the minimum value for the suffix which
-			// will be greater than any existing suffix.
-			for( ChildContainer::const_iterator it=m_parent->m_children.begin(), eIt=m_parent->m_children.end(); it != eIt; it++ )
+			if( nameIndex )
 			{
-				if( *it == this )
+				const long siblingSuffix = nameIndex->maxSuffix( prefix, this );
+				if( siblingSuffix >= 0 )
 				{
-					continue;
+					suffix = max( suffix, (int)siblingSuffix + 1 );
 				}
-				if( (*it)->m_name.value().compare( 0, prefix.size(), prefix ) == 0 )
+			}
+			else
+			{
+				// iterate over all the siblings to find the minimum value for the suffix which
+				// will be greater than any existing suffix.
+				for( ChildContainer::const_iterator it=m_parent->m_children.begin(), eIt=m_parent->m_children.end(); it != eIt; it++ )
 				{
-					char *endPtr = nullptr;
-					long siblingSuffix = strtol( (*it)->m_name.value().c_str() + prefix.size(), &endPtr, 10 );
-					if( *endPtr == '\0' )
+					if( *it == this )
+					{
+						continue;
+					}
+					if( (*it)->m_name.value().compare( 0, prefix.size(), prefix ) == 0 )
 					{
-						suffix = max( suffix, (int)siblingSuffix + 1 );
+						char *endPtr = nullptr;
+						long siblingSuffix = strtol( (*it)->m_name.value().c_str() + prefix.size(), &endPtr, 10 );
+						if( *endPtr == '\0' )
+						{
+							suffix = max( suffix, (int)siblingSuffix + 1 );
+						}
 					}
 				}
 			}
@@ -242,10 +381,39 @@ const IECore::InternedString &GraphComponent::setName( const IECore::InternedStr
 
 void GraphComponent::setNameInternal( const IECore::InternedString &name )
 {
+	NameIndex *nameIndex = m_parent ? m_parent->m_nameIndex.get() : nullptr;
+	if( nameIndex )
+	{
+		nameIndex->remove( this );
+	}
+
 	m_name = name;
+
+	if( nameIndex )
+	{
+		nameIndex->add( this );
+	}
+
 	Signals::emitLazily( m_signals.get(), &Signals::nameChangedSignal, this );
 }
 
+const GraphComponent *GraphComponent::getChildInternal( const IECore::InternedString &name ) const
+{
+	if( m_nameIndex )
+	{
+		return m_nameIndex->find( name );
+	}
+
+	for( ChildContainer::const_iterator it=m_children.begin(), eIt=m_children.end(); it!=eIt; it++ )
+	{
+		if( (*it)->m_name==name )
+		{
+			return it->get();
+		}
+	}
+	return nullptr;
+}
+
 const IECore::InternedString &GraphComponent::getName() const
 {
 	return m_name;
@@ -400,6 +568,14 @@ void GraphComponent::addChildInternal( GraphComponentPtr child, size_t index )
 	m_children.insert( m_children.begin() + min( index, m_children.size() ), child );
 	child->m_parent = this;
 	child->setName( child->m_name.value() ); // to force uniqueness
+	if( m_nameIndex )
+	{
+		m_nameIndex->add( child.get() );
+	}
+	else if( m_children.size() >= g_nameIndexThreshold )
+	{
+		m_nameIndex.reset( new NameIndex( m_children ) );
+	}
 	Signals::emitLazily( m_signals.get(), &Signals::childAddedSignal, this, child.get() );
 	child->parentChanged( previousParent );
 	Signals::emitLazily( child->m_signals.get(), &Signals::parentChangedSignal, child.get(), previousParent );
@@ -451,6 +627,10 @@ void GraphComponent::removeChildInternal( GraphComponentPtr child, bool emitPare
 		// recorded and replayed automatically.
 		throw Exception( boost::str( boost::format( "GraphComponent::removeChildInternal : \"%s\" is not a child of \"%s\"." ) % child->fullName() % fullName() ) );
 	}
+	if( m_nameIndex )
+	{
+		m_nameIndex->remove( child.get() );
+	}
 	m_children.erase( it );
 	child->m_parent = nullptr;
 	Signals::emitLazily( m_signals.get(), &Signals::childRemovedSignal, this, child.get() );
@@ -0,0 +1,345 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2021, Cinesite VFX Ltd. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#include "Gaffer/SamplingMonitor.h"
+
+#include "Gaffer/Node.h"
+#include "Gaffer/Plug.h"
+#include "Gaffer/Process.h"
+
+#include "IECore/Exception.h"
+
+#include "boost/container/flat_set.hpp"
+
+#include <algorithm>
+#include <cassert>
+#include <fstream>
+
+using namespace Gaffer;
+
+//////////////////////////////////////////////////////////////////////////
+// SamplingMonitor::Statistics
+//////////////////////////////////////////////////////////////////////////
+
+SamplingMonitor::Statistics::Statistics( boost::chrono::nanoseconds inclusiveDuration, boost::chrono::nanoseconds exclusiveDuration )
+	:	inclusiveDuration( inclusiveDuration ), exclusiveDuration( exclusiveDuration )
+{
+}
+
+SamplingMonitor::Statistics & SamplingMonitor::Statistics::operator += ( const Statistics &rhs )
+{
+	inclusiveDuration += rhs.inclusiveDuration;
+	exclusiveDuration += rhs.exclusiveDuration;
+	return *this;
+}
+
+bool SamplingMonitor::Statistics::operator == ( const Statistics &rhs ) const
+{
+	return
+		inclusiveDuration == rhs.inclusiveDuration &&
+		exclusiveDuration == rhs.exclusiveDuration
+	;
+}
+
+bool SamplingMonitor::Statistics::operator != ( const Statistics &rhs ) const
+{
+	return !( *this == rhs );
+}
+
+//////////////////////////////////////////////////////////////////////////
+// SamplingMonitor::SampledFrame
+//////////////////////////////////////////////////////////////////////////
+
+bool SamplingMonitor::SampledFrame::operator < ( const SampledFrame &rhs ) const
+{
+	if( plug != rhs.plug )
+	{
+		return plug < rhs.plug;
+	}
+	return std::less<const char *>()( type.c_str(), rhs.type.c_str() );
+}
+
+//////////////////////////////////////////////////////////////////////////
+// SamplingMonitor
+//////////////////////////////////////////////////////////////////////////
+
+SamplingMonitor::SamplingMonitor( boost::chrono::microseconds interval )
+	:	m_threadData( nullptr ), m_interval( interval ), m_numSamples( 0 ), m_stop( false )
+{
+	if( m_interval.count() <= 0 )
+	{
+		throw IECore::InvalidArgumentException( "SamplingMonitor : Interval must be positive" );
+	}
+	m_samplingThread = std::thread( [this] { samplingLoop(); } );
+}
+
+SamplingMonitor::~SamplingMonitor()
+{
+	{
+		std::lock_guard<std::mutex> lock( m_stopMutex );
+		m_stop = true;
+	}
+	m_stopCondition.notify_one();
+	m_samplingThread.join();
+}
+
+boost::chrono::microseconds SamplingMonitor::interval() const
+{
+	return m_interval;
+}
+
+size_t SamplingMonitor::numSamples() const
+{
+	std::lock_guard<std::mutex> lock( m_samplesMutex );
+	return m_numSamples;
+}
+
+SamplingMonitor::StatisticsMap SamplingMonitor::allStatistics() const
+{
+	StatisticsMap result;
+
+	std::lock_guard<std::mutex> lock( m_samplesMutex );
+	boost::container::flat_set<const Plug *> visited;
+	for( const auto &stack : m_stacks )
+	{
+		// Recursion means a plug may appear in a stack more than once,
+		// but the time must only be billed to its inclusive duration once.
+		visited.clear();
+		for( const auto &frame : stack.first )
+		{
+			if( visited.insert( frame.plug.get() ).second )
+			{
+				result[frame.plug].inclusiveDuration += stack.second.duration;
+			}
+		}
+		result[stack.first.back().plug].exclusiveDuration += stack.second.duration;
+	}
+
+	return result;
+}
+
+SamplingMonitor::Statistics SamplingMonitor::plugStatistics( const Plug *plug ) const
+{
+	const StatisticsMap statistics = allStatistics();
+	auto it = statistics.find( ConstPlugPtr( plug ) );
+	return it != statistics.end() ? it->second : Statistics();
+}
+
+SamplingMonitor::NodeTypeStatisticsMap SamplingMonitor::nodeTypeStatistics() const
+{
+	NodeTypeStatisticsMap result;
+
+	std::lock_guard<std::mutex> lock( m_samplesMutex );
+	boost::container::flat_set<IECore::TypeId> visited;
+	for( const auto &stack : m_stacks )
+	{
+		visited.clear();
+		for( const auto &frame : stack.first )
+		{
+			const Node *node = frame.plug->node();
+			if( node && visited.insert( node->typeId() ).second )
+			{
+				result[node->typeId()].inclusiveDuration += stack.second.duration;
+			}
+		}
+		if( const Node *node = stack.first.back().plug->node() )
+		{
+			result[node->typeId()].exclusiveDuration += stack.second.duration;
+		}
+	}
+
+	return result;
+}
+
+SamplingMonitor::Statistics SamplingMonitor::combinedStatistics() const
+{
+	Statistics result;
+
+	std::lock_guard<std::mutex> lock( m_samplesMutex );
+	for( const auto &stack : m_stacks )
+	{
+		result.inclusiveDuration += stack.second.duration;
+	}
+	result.exclusiveDuration = result.inclusiveDuration;
+
+	return result;
+}
+
+void SamplingMonitor::writeCollapsedStacks( std::ostream &stream ) const
+{
+	std::lock_guard<std::mutex> lock( m_samplesMutex );
+	for( const auto &stack : m_stacks )
+	{
+		bool first = true;
+		for( const auto &frame : stack.first )
+		{
+			if( !first )
+			{
+				stream << ";";
+			}
+			first = false;
+			stream << frame.plug->fullName() << " [" << frame.type.string() << "]";
+		}
+		stream << " " << stack.second.samples << "\n";
+	}
+}
+
+void SamplingMonitor::writeCollapsedStacks( const std::string &fileName ) const
+{
+	std::ofstream stream( fileName );
+	if( !stream.good() )
+	{
+		throw IECore::IOException( "Unable to open file \"" + fileName + "\"" );
+	}
+	writeCollapsedStacks( stream );
+}
+
+void SamplingMonitor::processStarted( const Process *process )
+{
+	ThreadData &data = threadData();
+	const Process *parent = process->parent();
+
+	tbb::spin_mutex::scoped_lock lock( data.mutex );
+
+	if( data.stack.empty() || data.stack.back().process != parent )
+	{
+		// We're starting a new task, either at the top level or on
+		// behalf of a parent process running on another thread. Copy
+		// the parent's ancestry so that we sample complete stacks.
+		// This is safe because the ancestors are waiting for us to
+		// finish.
+		data.segments.push_back( data.stack.size() );
+		for( const Process *p = parent; p; p = p->parent() )
+		{
+			data.stack.push_back( { p, p->plug(), p->type(), true } );
+		}
+		std::reverse( data.stack.begin() + data.segments.back(), data.stack.end() );
+	}
+
+	data.stack.push_back( { process, process->plug(), process->type(), false } );
+}
+
+void SamplingMonitor::processFinished( const Process *process )
+{
+	ThreadData &data = threadData();
+
+	tbb::spin_mutex::scoped_lock lock( data.mutex );
+
+	assert( !data.stack.empty() && data.stack.back().process == process );
+	data.stack.pop_back();
+	if( data.stack.size() == data.segments.back() || data.stack.back().inherited )
+	{
+		data.stack.resize( data.segments.back() );
+		data.segments.pop_back();
+	}
+}
+
+SamplingMonitor::ThreadData &SamplingMonitor::threadData()
+{
+	ThreadData *&data = m_threadData.local();
+	if( !data )
+	{
+		std::lock_guard<std::mutex> lock( m_threadsMutex );
+		m_threads.push_back( ThreadDataPtr( new ThreadData ) );
+		data = m_threads.back().get();
+	}
+	return *data;
+}
+
+void SamplingMonitor::samplingLoop()
+{
+	auto then = boost::chrono::steady_clock::now();
+	std::unique_lock<std::mutex> lock( m_stopMutex );
+	while( true )
+	{
+		m_stopCondition.wait_for( lock, std::chrono::microseconds( m_interval.count() ) );
+		if( m_stop )
+		{
+			return;
+		}
+		// Bill the time actually elapsed, in case we woke late.
+		const auto now = boost::chrono::steady_clock::now();
+		sample( now - then );
+		then = now;
+	}
+}
+
+void SamplingMonitor::sample( boost::chrono::nanoseconds duration )
+{
+	// Take a snapshot of every thread's stack. We must convert to
+	// SampledFrames while the lock is held, because the plugs are only
+	// guaranteed to be alive while their processes are running.
+
+	std::vector<SampledStack> stacks;
+	{
+		std::lock_guard<std::mutex> threadsLock( m_threadsMutex );
+		for( const auto &data : m_threads )
+		{
+			tbb::spin_mutex::scoped_lock lock( data->mutex );
+			if( data->stack.empty() )
+			{
+				continue;
+			}
+			stacks.push_back( SampledStack() );
+			for( auto it = data->stack.begin() + data->segments.back(), eIt = data->stack.end(); it != eIt; ++it )
+			{
+				if( it->plug )
+				{
+					stacks.back().push_back( { it->plug, it->type } );
+				}
+			}
+			if( stacks.back().empty() )
+			{
+				stacks.pop_back();
+			}
+		}
+	}
+
+	if( stacks.empty() )
+	{
+		return;
+	}
+
+	std::lock_guard<std::mutex> lock( m_samplesMutex );
+	for( auto &stack : stacks )
+	{
+		StackStatistics &s = m_stacks[stack];
+		s.samples++;
+		s.duration += duration;
+	}
+	m_numSamples++;
+}
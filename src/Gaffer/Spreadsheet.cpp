@@ -50,6 +50,8 @@
 #include "boost/multi_index_container.hpp"
 #include "boost/variant.hpp"
 
+#include <limits>
+#include <memory>
 #include <unordered_map>
 
 using namespace std;
@@ -81,6 +83,136 @@ void appendLeafPlugs( const Gaffer::Plug *p, DependencyNode::AffectedPlugsContai
 	}
 }
 
+InternedString g_ellipsis( "..." );
+const size_t g_noRowIndex = std::numeric_limits<size_t>::max();
+
+// Trie of MatchPatternPaths, used to find the first row matching a
+// path in time roughly proportional to the length of the path rather
+// than the number of rows. Each node stores the index of the first row
+// terminating there, along with the minimum row index in its subtree,
+// so that we can stop searching branches that cannot improve on a
+// match we have already found. Matching follows the same rules as
+// `StringAlgo::match( path, pattern )`, with each pattern element
+// matched using `StringAlgo::match()` and `...` matching any number
+// of path elements.
+class PathRowsTrie : boost::noncopyable
+{
+
+	public :
+
+		void add( const StringAlgo::MatchPatternPath &pattern, size_t index )
+		{
+			Node *node = &m_root;
+			node->minIndex = std::min( node->minIndex, index );
+			for( const auto &element : pattern )
+			{
+				std::unique_ptr<Node> *child;
+				if( element == g_ellipsis )
+				{
+					child = &node->ellipsisChild;
+				}
+				else if( StringAlgo::hasWildcards( element.string() ) )
+				{
+					auto it = std::find_if(
+						node->wildcardChildren.begin(), node->wildcardChildren.end(),
+						[&element] ( const WildcardChild &c ) { return c.first == element; }
+					);
+					if( it == node->wildcardChildren.end() )
+					{
+						node->wildcardChildren.push_back( WildcardChild( element, nullptr ) );
+						it = node->wildcardChildren.end() - 1;
+					}
+					child = &it->second;
+				}
+				else
+				{
+					child = &node->plainChildren[element];
+				}
+
+				if( !*child )
+				{
+					child->reset( new Node );
+				}
+				node = child->get();
+				node->minIndex = std::min( node->minIndex, index );
+			}
+			node->index = std::min( node->index, index );
+		}
+
+		// Returns the index of the first matching row, or 0
+		// if there is none.
+		size_t rowIndex( const vector<InternedString> &path ) const
+		{
+			size_t result = g_noRowIndex;
+			match( &m_root, path.begin(), path.end(), result );
+			return result == g_noRowIndex ? 0 : result;
+		}
+
+	private :
+
+		struct Node;
+		using WildcardChild = std::pair<InternedString, std::unique_ptr<Node>>;
+
+		struct Node
+		{
+			Node() : index( g_noRowIndex ), minIndex( g_noRowIndex ) {}
+			// Index of the first row terminating at this node.
+			size_t index;
+			// Minimum `index` of this node and all its descendants.
+			size_t minIndex;
+			std::unordered_map<InternedString, std::unique_ptr<Node>> plainChildren;
+			std::vector<WildcardChild> wildcardChildren;
+			std::unique_ptr<Node> ellipsisChild;
+		};
+
+		using PathIterator = vector<InternedString>::const_iterator;
+
+		void match( const Node *node, PathIterator it, PathIterator end, size_t &result ) const
+		{
+			if( node->minIndex >= result )
+			{
+				return;
+			}
+
+			if( it == end )
+			{
+				result = std::min( result, node->index );
+			}
+			else
+			{
+				auto plainIt = node->plainChildren.find( *it );
+				if( plainIt != node->plainChildren.end() )
+				{
+					match( plainIt->second.get(), it + 1, end, result );
+				}
+
+				for( const auto &child : node->wildcardChildren )
+				{
+					if( StringAlgo::match( it->c_str(), child.first.c_str() ) )
+					{
+						match( child.second.get(), it + 1, end, result );
+					}
+				}
+			}
+
+			if( node->ellipsisChild )
+			{
+				// `...` matches any number of elements, including none.
+				for( PathIterator eIt = it; ; ++eIt )
+				{
+					match( node->ellipsisChild.get(), eIt, end, result );
+					if( eIt == end )
+					{
+						break;
+					}
+				}
+			}
+		}
+
+		Node m_root;
+
+};
+
 // Data type stored on `rowsMapPlug()` and used for quickly
 // finding the right row for a selector.
 class RowsMap : public IECore::Data
@@ -120,15 +252,7 @@ class RowsMap : public IECore::Data
 					m_plainRows.insert( { name, i } );
 				}
 
-				const StringAlgo::MatchPatternPath path = StringAlgo::matchPatternPath( name );
-				if( hasWildcards || name.find( "..." ) != string::npos )
-				{
-					m_wildcardPathRows.push_back( { path, i } );
-				}
-				else
-				{
-					m_plainPathRows.insert( { path, i } );
-				}
+				m_pathRows.add( StringAlgo::matchPatternPath( name ), i );
 			}
 		}
 
@@ -182,24 +306,7 @@ class RowsMap : public IECore::Data
 			}
 			else if( auto p = get<const vector<InternedString> *>( selector ) )
 			{
-				auto it = m_plainPathRows.find( *p );
-				if( it != m_plainPathRows.end() )
-				{
-					result = it->second;
-				}
-				for( auto &row : m_wildcardPathRows )
-				{
-					if( result && row.index > result )
-					{
-						break;
-					}
-
-					if( StringAlgo::match( *p, row.path ) )
-					{
-						result = row.index;
-						break;
-					}
-				}
+				result = m_pathRows.rowIndex( **p );
 			}
 			return result;
 		}
@@ -225,27 +332,12 @@ class RowsMap : public IECore::Data
 		using Vector = std::vector<Row>;
 		Vector m_wildcardRows;
 
-		// As above, but for when the selector is an InternedStringVectorData,
-		// in which case we want to use PathMatcher-style matching. We could do
-		// better here if we generalised the PathMatcher::Node data structure to
-		// allow us to store our `index` in place of the `bool terminator`. For
-		// now we assume that Spreadsheets with extreme numbers of rows will
-		// have only plain rows (as in EditScopes), and the PathMap will be
-		// sufficient. If this assumption plays out in practice, then a simpler
-		// implementation might just be to make `StringAlgo::match()` compatible
-		// with the behaviour of `*` and `...` in PathMatcher, so we can just
-		// use the original code path for everything . That would be a breaking
-		// change though.
-		using PathMap = std::map<StringAlgo::MatchPatternPath, size_t>;
-		PathMap m_plainPathRows;
-
-		struct PathRow
-		{
-			StringAlgo::MatchPatternPath path;
-			size_t index;
-		};
-		using PathVector = std::vector<PathRow>;
-		PathVector m_wildcardPathRows;
+		// All rows, for when the selector is an InternedStringVectorData,
+		// in which case we want to use PathMatcher-style matching. The trie
+		// handles plain and wildcard rows alike, so that Spreadsheets with
+		// large numbers of wildcard rows (as is common for per-location
+		// look development) don't require a linear search.
+		PathRowsTrie m_pathRows;
 
 		// List of active row names for `activeRowNamesPlug()`.
 		StringVectorDataPtr m_activeRowNames;
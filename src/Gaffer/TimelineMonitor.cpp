@@ -0,0 +1,256 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2021, Cinesite VFX Ltd. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#include "Gaffer/TimelineMonitor.h"
+
+#include "Gaffer/Context.h"
+#include "Gaffer/Plug.h"
+#include "Gaffer/Process.h"
+
+#include "IECore/Exception.h"
+
+#include "boost/format.hpp"
+
+#include <algorithm>
+#include <cassert>
+#include <fstream>
+#include <unordered_map>
+
+using namespace Gaffer;
+
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+void writeJSONString( std::ostream &stream, const std::string &s )
+{
+	stream << "\"";
+	for( const char c : s )
+	{
+		switch( c )
+		{
+			case '"' :
+				stream << "\\\"";
+				break;
+			case '\\' :
+				stream << "\\\\";
+				break;
+			case '\n' :
+				stream << "\\n";
+				break;
+			default :
+				if( (unsigned char)c < 0x20 )
+				{
+					stream << boost::format( "\\u%04x" ) % (int)c;
+				}
+				else
+				{
+					stream << c;
+				}
+		}
+	}
+	stream << "\"";
+}
+
+// Chrome trace timestamps are measured in microseconds.
+double microseconds( boost::chrono::nanoseconds t )
+{
+	return (double)t.count() / 1000.0;
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// TimelineMonitor
+//////////////////////////////////////////////////////////////////////////
+
+TimelineMonitor::TimelineMonitor()
+	:	m_startTime( boost::chrono::high_resolution_clock::now() ), m_nextId( 1 ), m_nextThreadIndex( 0 )
+{
+}
+
+TimelineMonitor::~TimelineMonitor()
+{
+}
+
+TimelineMonitor::Events TimelineMonitor::events() const
+{
+	Events result;
+	for( const auto &threadData : m_threadData )
+	{
+		for( const auto &event : threadData.events )
+		{
+			// Skip processes which are still running.
+			if( event.finishTime >= event.startTime )
+			{
+				result.push_back( event );
+			}
+		}
+	}
+
+	std::sort(
+		result.begin(), result.end(),
+		[] ( const Event &a, const Event &b ) { return a.startTime < b.startTime; }
+	);
+
+	return result;
+}
+
+void TimelineMonitor::writeChromeTrace( std::ostream &stream ) const
+{
+	const Events events = this->events();
+
+	std::unordered_map<uint64_t, size_t> threadIndices;
+	size_t numThreads = 0;
+	for( const auto &event : events )
+	{
+		threadIndices[event.id] = event.threadIndex;
+		numThreads = std::max( numThreads, event.threadIndex + 1 );
+	}
+
+	stream << "{\n\"traceEvents\" : [\n";
+
+	for( size_t i = 0; i < numThreads; ++i )
+	{
+		stream << boost::format( "{ \"name\" : \"thread_name\", \"ph\" : \"M\", \"pid\" : 0, \"tid\" : %1%, \"args\" : { \"name\" : \"Thread %1%\" } },\n" ) % i;
+	}
+
+	bool first = true;
+	for( const auto &event : events )
+	{
+		if( !first )
+		{
+			stream << ",\n";
+		}
+		first = false;
+
+		const std::string plugName = event.plug->fullName();
+		stream << "{ \"name\" : ";
+		writeJSONString( stream, plugName );
+		stream << ", \"cat\" : ";
+		writeJSONString( stream, event.type.string() );
+		stream << boost::format( ", \"ph\" : \"X\", \"pid\" : 0, \"tid\" : %d, \"ts\" : %.3f, \"dur\" : %.3f" )
+			% event.threadIndex
+			% microseconds( event.startTime )
+			% microseconds( event.finishTime - event.startTime )
+		;
+		stream << boost::format( ", \"args\" : { \"id\" : %d, \"parent\" : %d, \"context\" : \"%s\" } }" )
+			% event.id
+			% event.parentId
+			% event.contextHash.toString()
+		;
+
+		// When a process is performed on behalf of a parent on another
+		// thread, we link the two with a flow event. This makes it easy to
+		// see where a thread is waiting on work from other threads.
+		auto parentIt = threadIndices.find( event.parentId );
+		if( parentIt != threadIndices.end() && parentIt->second != event.threadIndex )
+		{
+			stream << boost::format(
+				",\n{ \"name\" : \"parent\", \"cat\" : \"parent\", \"ph\" : \"s\", \"id\" : %1%, \"pid\" : 0, \"tid\" : %2%, \"ts\" : %4$.3f },\n"
+				"{ \"name\" : \"parent\", \"cat\" : \"parent\", \"ph\" : \"f\", \"bp\" : \"e\", \"id\" : %1%, \"pid\" : 0, \"tid\" : %3%, \"ts\" : %4$.3f }"
+			)
+				% event.id
+				% parentIt->second
+				% event.threadIndex
+				% microseconds( event.startTime )
+			;
+		}
+	}
+
+	stream << "\n],\n\"displayTimeUnit\" : \"ns\"\n}\n";
+}
+
+void TimelineMonitor::writeChromeTrace( const std::string &fileName ) const
+{
+	std::ofstream stream( fileName );
+	if( !stream.good() )
+	{
+		throw IECore::IOException( "Unable to open file \"" + fileName + "\"" );
+	}
+	writeChromeTrace( stream );
+}
+
+void TimelineMonitor::processStarted( const Process *process )
+{
+	ThreadData &threadData = m_threadData.local();
+	if( threadData.threadIndex == std::numeric_limits<size_t>::max() )
+	{
+		threadData.threadIndex = m_nextThreadIndex++;
+	}
+
+	Event event;
+	event.id = m_nextId++;
+	event.parentId = 0;
+	if( const Process *parent = process->parent() )
+	{
+		ProcessIds::const_accessor accessor;
+		if( m_runningProcessIds.find( accessor, parent ) )
+		{
+			event.parentId = accessor->second;
+		}
+	}
+	event.type = process->type();
+	event.plug = process->plug();
+	event.contextHash = process->context()->hash();
+	event.threadIndex = threadData.threadIndex;
+	event.startTime = now();
+	event.finishTime = boost::chrono::nanoseconds( -1 );
+
+	m_runningProcessIds.insert( ProcessIds::value_type( process, event.id ) );
+	threadData.running.push_back( threadData.events.size() );
+	threadData.events.push_back( event );
+}
+
+void TimelineMonitor::processFinished( const Process *process )
+{
+	ThreadData &threadData = m_threadData.local();
+	assert( !threadData.running.empty() );
+
+	Event &event = threadData.events[threadData.running.back()];
+	threadData.running.pop_back();
+	event.finishTime = now();
+	m_runningProcessIds.erase( process );
+}
+
+boost::chrono::nanoseconds TimelineMonitor::now() const
+{
+	return boost::chrono::high_resolution_clock::now() - m_startTime;
+}
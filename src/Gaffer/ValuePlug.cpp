@@ -43,14 +43,22 @@
 #include "Gaffer/Private/IECorePreview/LRUCache.h"
 #include "Gaffer/Process.h"
 
+#include "IECore/FileIndexedIO.h"
 #include "IECore/MessageHandler.h"
 
 #include "boost/bind.hpp"
+#include "boost/filesystem.hpp"
 #include "boost/format.hpp"
+#include "boost/noncopyable.hpp"
 
 #include "tbb/enumerable_thread_specific.h"
+#include "tbb/spin_mutex.h"
+#include "tbb/spin_rw_mutex.h"
 
 #include <atomic>
+#include <ctime>
+#include <mutex>
+#include <set>
 
 using namespace Gaffer;
 
@@ -90,6 +98,236 @@ const uint64_t DIRTY_COUNT_RANGE_MAX = std::numeric_limits<uint64_t>::max() / 2;
 
 } // namespace
 
+//////////////////////////////////////////////////////////////////////////
+// Cache statistics
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+template<typename T>
+bool statisticsEqual( const T &a, const T &b )
+{
+	return
+		a.hits == b.hits &&
+		a.misses == b.misses &&
+		a.evictions == b.evictions &&
+		a.cost == b.cost
+	;
+}
+
+} // namespace
+
+bool ValuePlug::HashCacheStatistics::operator == ( const HashCacheStatistics &rhs ) const
+{
+	return statisticsEqual( *this, rhs );
+}
+
+bool ValuePlug::HashCacheStatistics::operator != ( const HashCacheStatistics &rhs ) const
+{
+	return !( *this == rhs );
+}
+
+bool ValuePlug::ComputeCacheStatistics::operator == ( const ComputeCacheStatistics &rhs ) const
+{
+	return statisticsEqual( *this, rhs ) && waits == rhs.waits;
+}
+
+bool ValuePlug::ComputeCacheStatistics::operator != ( const ComputeCacheStatistics &rhs ) const
+{
+	return !( *this == rhs );
+}
+
+namespace
+{
+
+std::atomic_bool g_cacheStatisticsEnabled( false );
+
+inline bool cacheStatisticsEnabled()
+{
+	return g_cacheStatisticsEnabled.load( std::memory_order_relaxed );
+}
+
+enum CacheIndex
+{
+	HashCacheIndex = 0,
+	ComputeCacheIndex = 1
+};
+
+// Internal form of `HashCacheStatistics` and `ComputeCacheStatistics`.
+struct RawCacheStatistics
+{
+	uint64_t hits = 0;
+	uint64_t misses = 0;
+	uint64_t waits = 0;
+	uint64_t evictions = 0;
+	uint64_t cost = 0;
+
+	RawCacheStatistics &operator += ( const RawCacheStatistics &rhs )
+	{
+		hits += rhs.hits;
+		misses += rhs.misses;
+		waits += rhs.waits;
+		evictions += rhs.evictions;
+		cost += rhs.cost;
+		return *this;
+	}
+
+	template<typename T>
+	T statistics() const
+	{
+		T result;
+		result.hits = hits;
+		result.misses = misses;
+		result.evictions = evictions;
+		result.cost = cost;
+		assignWaits( result );
+		return result;
+	}
+
+	// Waits are only recorded for the compute cache.
+	void assignWaits( ValuePlug::HashCacheStatistics & ) const
+	{
+	}
+
+	void assignWaits( ValuePlug::ComputeCacheStatistics &statistics ) const
+	{
+		statistics.waits = waits;
+	}
+};
+
+typedef std::map<IECore::TypeId, RawCacheStatistics> RawCacheStatisticsMap;
+
+// Statistics are accumulated separately by each thread to avoid
+// contention, and are merged on demand. The mutex is only contended
+// when statistics are being queried or reset.
+struct CacheStatisticsThreadData
+{
+	tbb::spin_mutex mutex;
+	RawCacheStatistics totals[2];
+	RawCacheStatisticsMap byPlugType[2];
+	RawCacheStatisticsMap byNodeType[2];
+};
+
+tbb::enumerable_thread_specific<CacheStatisticsThreadData> g_cacheStatisticsThreadData;
+
+IECore::TypeId nodeTypeId( const ValuePlug *plug )
+{
+	const Node *node = plug->node();
+	return node ? node->typeId() : IECore::InvalidTypeId;
+}
+
+void recordCacheStatistic( CacheIndex cache, IECore::TypeId plugType, IECore::TypeId nodeType, uint64_t RawCacheStatistics::*statistic, uint64_t value = 1 )
+{
+	CacheStatisticsThreadData &threadData = g_cacheStatisticsThreadData.local();
+	tbb::spin_mutex::scoped_lock lock( threadData.mutex );
+	threadData.totals[cache].*statistic += value;
+	if( plugType != IECore::InvalidTypeId )
+	{
+		threadData.byPlugType[cache][plugType].*statistic += value;
+	}
+	if( nodeType != IECore::InvalidTypeId )
+	{
+		threadData.byNodeType[cache][nodeType].*statistic += value;
+	}
+}
+
+void recordCacheStatistic( CacheIndex cache, const ValuePlug *plug, uint64_t RawCacheStatistics::*statistic, uint64_t value = 1 )
+{
+	recordCacheStatistic( cache, plug->typeId(), nodeTypeId( plug ), statistic, value );
+}
+
+RawCacheStatistics rawCacheStatistics( CacheIndex cache )
+{
+	RawCacheStatistics result;
+	for( auto &threadData : g_cacheStatisticsThreadData )
+	{
+		tbb::spin_mutex::scoped_lock lock( threadData.mutex );
+		result += threadData.totals[cache];
+	}
+	return result;
+}
+
+template<typename T>
+std::map<IECore::TypeId, T> cacheStatisticsMap( CacheIndex cache, RawCacheStatisticsMap CacheStatisticsThreadData::*map )
+{
+	RawCacheStatisticsMap merged;
+	for( auto &threadData : g_cacheStatisticsThreadData )
+	{
+		tbb::spin_mutex::scoped_lock lock( threadData.mutex );
+		for( const auto &s : (threadData.*map)[cache] )
+		{
+			merged[s.first] += s.second;
+		}
+	}
+
+	std::map<IECore::TypeId, T> result;
+	for( const auto &s : merged )
+	{
+		result[s.first] = s.second.statistics<T>();
+	}
+	return result;
+}
+
+// Used to detect waits, where a thread finds a value already being computed
+// by another thread and waits for it rather than computing it itself. The
+// key is registered before the cache lookup, and the getter unregisters it
+// if it is called for that key on this thread. Scopes nest, so that lookups
+// made by the getter itself, or by tasks executed while waiting, are
+// accounted for separately.
+thread_local const void *t_pendingKey = nullptr;
+
+class PendingKeyScope : boost::noncopyable
+{
+
+	public :
+
+		PendingKeyScope( const void *key )
+			:	m_key( key ), m_previousKey( t_pendingKey )
+		{
+			t_pendingKey = key;
+		}
+
+		~PendingKeyScope()
+		{
+			t_pendingKey = m_previousKey;
+		}
+
+		// Returns true if the getter wasn't called for our
+		// key on this thread.
+		bool waited() const
+		{
+			return t_pendingKey == m_key;
+		}
+
+		static void getterCalled( const void *key )
+		{
+			if( t_pendingKey == key )
+			{
+				t_pendingKey = nullptr;
+			}
+		}
+
+	private :
+
+		const void *m_key;
+		const void *m_previousKey;
+
+};
+
+void resetCacheStatisticsThreadData( CacheIndex cache )
+{
+	for( auto &threadData : g_cacheStatisticsThreadData )
+	{
+		tbb::spin_mutex::scoped_lock lock( threadData.mutex );
+		threadData.totals[cache] = RawCacheStatistics();
+		threadData.byPlugType[cache].clear();
+		threadData.byNodeType[cache].clear();
+	}
+}
+
+} // namespace
+
 //////////////////////////////////////////////////////////////////////////
 // The HashProcess manages the task of calling ComputeNode::hash() and
 // managing a cache of recently computed hashes.
@@ -103,8 +341,8 @@ namespace
 struct HashCacheKey
 {
 	HashCacheKey() {};
-	HashCacheKey( const ValuePlug *plug, const Context *context, uint64_t dirtyCount )
-		:	plug( plug ), contextHash( context->hash() ), dirtyCount( dirtyCount )
+	HashCacheKey( const ValuePlug *plug, const IECore::MurmurHash &contextHash, uint64_t dirtyCount )
+		:	plug( plug ), contextHash( contextHash ), dirtyCount( dirtyCount )
 	{
 	}
 
@@ -147,13 +385,15 @@ size_t hash_value( const HashCacheKey &key )
 // - `computeNode` and `cachePolicy` are properties of the plug which
 //   is included in the HashCacheKey. We store them explicitly only
 //   for convenience and performance.
-// - `context` is represented in HashCacheKey via `contextHash`.
+// - `context` is represented in HashCacheKey via `contextHash`. If
+//   `ComputeNode::relevantContextVariables()` declares the variables
+//   the plug depends on, then `contextHash` includes only those.
 // - `destinationPlug` does not influence the results of the computation
 //   in any way. It is merely used for error reporting.
 struct HashProcessKey : public HashCacheKey
 {
-	HashProcessKey( const ValuePlug *plug, const ValuePlug *destinationPlug, const Context *context, uint64_t dirtyCount, const ComputeNode *computeNode, ValuePlug::CachePolicy cachePolicy )
-		:	HashCacheKey( plug, context, dirtyCount ),
+	HashProcessKey( const ValuePlug *plug, const ValuePlug *destinationPlug, const IECore::MurmurHash &contextHash, uint64_t dirtyCount, const ComputeNode *computeNode, ValuePlug::CachePolicy cachePolicy )
+		:	HashCacheKey( plug, contextHash, dirtyCount ),
 			destinationPlug( destinationPlug ),
 			computeNode( computeNode ),
 			cachePolicy( cachePolicy )
@@ -236,7 +476,7 @@ class ValuePlug::HashProcess : public Process
 
 			const ComputeNode *computeNode = IECore::runTimeCast<const ComputeNode>( p->node() );
 			const Context *currentContext = Context::current();
-			const HashProcessKey processKey( p, plug, currentContext, p->m_dirtyCount, computeNode, computeNode ? computeNode->hashCachePolicy( p ) : CachePolicy::Uncached );
+			const HashProcessKey processKey( p, plug, contextHash( p, currentContext, computeNode ), p->m_dirtyCount, computeNode, computeNode ? computeNode->hashCachePolicy( p ) : CachePolicy::Uncached );
 
 			if( processKey.cachePolicy == CachePolicy::Uncached )
 			{
@@ -250,27 +490,36 @@ class ValuePlug::HashProcess : public Process
 				ThreadData &threadData = g_threadData.local();
 				if( threadData.clearCache.load( std::memory_order_acquire ) )
 				{
+					threadData.clearing = true;
 					threadData.cache.clear();
+					threadData.clearing = false;
+					threadData.usage = 0;
 					threadData.clearCache.store( 0, std::memory_order_release );
 				}
 
-				if( threadData.cache.getMaxCost() != g_cacheSizeLimit )
+				if( threadData.lookups.load( std::memory_order_relaxed ) - threadData.windowLookups >= g_adaptationInterval )
 				{
-					threadData.cache.setMaxCost( g_cacheSizeLimit );
+					adaptCacheSize( threadData );
+				}
+
+				const size_t sizeLimit = g_memoryLimit ? threadData.sizeLimit : g_cacheSizeLimit.load();
+				if( threadData.cache.getMaxCost() != sizeLimit )
+				{
+					threadData.cache.setMaxCost( sizeLimit );
 				}
 
 				// And then look up the result in our cache.
 				if( g_hashCacheMode == HashCacheMode::Standard )
 				{
-					return threadData.cache.get( processKey, currentContext->canceller() );
+					return lookup( threadData, processKey, currentContext->canceller() );
 				}
 				else if( g_hashCacheMode == HashCacheMode::Checked )
 				{
 					HashProcessKey legacyProcessKey( processKey );
 					legacyProcessKey.dirtyCount = g_legacyGlobalDirtyCount + DIRTY_COUNT_RANGE_MAX + 1;
 
-					const IECore::MurmurHash check = threadData.cache.get( legacyProcessKey, currentContext->canceller() );
-					const IECore::MurmurHash result = threadData.cache.get( processKey, currentContext->canceller() );
+					const IECore::MurmurHash check = lookup( threadData, legacyProcessKey, currentContext->canceller() );
+					const IECore::MurmurHash result = lookup( threadData, processKey, currentContext->canceller() );
 
 					if( result != check )
 					{
@@ -294,7 +543,7 @@ class ValuePlug::HashProcess : public Process
 					HashProcessKey legacyProcessKey( processKey );
 					legacyProcessKey.dirtyCount = g_legacyGlobalDirtyCount + DIRTY_COUNT_RANGE_MAX + 1;
 
-					return threadData.cache.get( legacyProcessKey, currentContext->canceller() );
+					return lookup( threadData, legacyProcessKey, currentContext->canceller() );
 				}
 			}
 		}
@@ -307,12 +556,58 @@ class ValuePlug::HashProcess : public Process
 		static void setCacheSizeLimit( size_t maxEntriesPerThread )
 		{
 			g_cacheSizeLimit = maxEntriesPerThread;
-			g_globalCache.setMaxCost( g_cacheSizeLimit );
+			if( !g_memoryLimit )
+			{
+				g_globalCache.setMaxCost( g_cacheSizeLimit );
+			}
+		}
+
+		static size_t getCacheMemoryLimit()
+		{
+			return g_memoryLimit;
+		}
+
+		static void setCacheMemoryLimit( size_t bytes )
+		{
+			g_memoryLimit = bytes;
+			g_globalCache.setMaxCost( bytes ? bytes / g_entryMemory : g_cacheSizeLimit.load() );
+		}
+
+		static size_t cacheMemoryUsage()
+		{
+			size_t result = g_globalCache.currentCost();
+			for( const auto &threadData : g_threadData )
+			{
+				result += threadData.usage.load( std::memory_order_relaxed );
+			}
+			return result * g_entryMemory;
+		}
+
+		static HashCacheStatistics statistics()
+		{
+			const RawStatistics raw = rawStatistics();
+			std::lock_guard<std::mutex> lock( g_statisticsMutex );
+			const uint64_t lookups = raw.lookups - g_statisticsBaseline.lookups;
+			HashCacheStatistics result;
+			result.misses = raw.misses - g_statisticsBaseline.misses;
+			result.hits = lookups > result.misses ? lookups - result.misses : 0;
+			result.evictions = raw.evictions - g_statisticsBaseline.evictions;
+			result.cost = result.misses * g_entryMemory;
+			return result;
+		}
+
+		static void resetStatistics()
+		{
+			const RawStatistics raw = rawStatistics();
+			std::lock_guard<std::mutex> lock( g_statisticsMutex );
+			g_statisticsBaseline = raw;
 		}
 
 		static void clearCache()
 		{
+			g_clearingGlobalCache = true;
 			g_globalCache.clear();
+			g_clearingGlobalCache = false;
 			// The docs for enumerable_thread_specific aren't particularly clear
 			// on whether or not it's ok to iterate an e_t_s while concurrently using
 			// local(), which is what we do here. So far in practice it seems to be
@@ -360,6 +655,26 @@ class ValuePlug::HashProcess : public Process
 
 	private :
 
+		// Returns the hash of the context for use in the HashCacheKey. If
+		// the node declares the only variables the plug depends on, then the
+		// hash includes only those, so that cache entries are shared between
+		// contexts which differ in other variables.
+		static IECore::MurmurHash contextHash( const ValuePlug *plug, const Context *context, const ComputeNode *computeNode )
+		{
+			const std::vector<IECore::InternedString> *variables = computeNode ? computeNode->relevantContextVariables( plug ) : nullptr;
+			if( !variables )
+			{
+				return context->hash();
+			}
+
+			IECore::MurmurHash result;
+			for( const auto &variable : *variables )
+			{
+				result.append( context->variableHash( variable ) );
+			}
+			return result;
+		}
+
 		HashProcess( const HashProcessKey &key )
 			:	Process( staticType, key.plug, key.destinationPlug )
 		{
@@ -397,6 +712,11 @@ class ValuePlug::HashProcess : public Process
 			// via the context.
 			assert( canceller == Context::current()->canceller() );
 			cost = 1;
+			g_globalMisses++;
+			if( cacheStatisticsEnabled() )
+			{
+				recordMiss( key );
+			}
 			IECore::MurmurHash result;
 			switch( key.cachePolicy )
 			{
@@ -433,16 +753,121 @@ class ValuePlug::HashProcess : public Process
 			{
 				case CachePolicy::TaskCollaboration :
 				case CachePolicy::TaskIsolation :
+					if( cacheStatisticsEnabled() && g_globalCache.cached( key ) )
+					{
+						recordCacheStatistic( HashCacheIndex, key.plug->typeId(), key.computeNode->typeId(), &RawCacheStatistics::hits );
+					}
 					return g_globalCache.get( key, canceller );
 				default :
 				{
 					assert( key.cachePolicy != CachePolicy::Uncached );
+					increment( g_threadData.local().misses );
+					if( cacheStatisticsEnabled() )
+					{
+						recordMiss( key );
+					}
 					HashProcess process( key );
 					return process.m_result;
 				}
 			}
 		}
 
+		static void globalCacheRemovalCallback( const HashCacheKey &key, const IECore::MurmurHash &value )
+		{
+			if( !g_clearingGlobalCache )
+			{
+				g_globalEvictions++;
+			}
+		}
+
+		// Counters are only ever incremented by the thread that owns them,
+		// so we can avoid the cost of an atomic read-modify-write. They are
+		// atomic only so that they can be read safely by other threads.
+		static void increment( std::atomic<uint64_t> &counter )
+		{
+			counter.store( counter.load( std::memory_order_relaxed ) + 1, std::memory_order_relaxed );
+		}
+
+		// Adaptive sizing
+		// ===============
+		//
+		// When a memory limit is in use, each thread periodically claims a share
+		// of the limit in proportion to its recent demand. Demand is measured
+		// as the number of lookups made since the last adaptation, with misses
+		// counted twice so that threads whose working set doesn't fit in their
+		// current cache are given more room. Weights decay geometrically so that
+		// the shares follow changes in the workload.
+
+		struct ThreadData;
+
+		static void adaptCacheSize( ThreadData &threadData )
+		{
+			const uint64_t lookups = threadData.lookups.load( std::memory_order_relaxed );
+			const uint64_t misses = threadData.misses.load( std::memory_order_relaxed );
+
+			const uint64_t weight = threadData.weight / 2 + ( lookups - threadData.windowLookups ) + ( misses - threadData.windowMisses );
+			// Unsigned wraparound is well defined, so this is correct
+			// even when our weight decreases.
+			const uint64_t totalWeight = g_totalWeight.fetch_add( weight - threadData.weight ) + ( weight - threadData.weight );
+			threadData.weight = weight;
+			threadData.windowLookups = lookups;
+			threadData.windowMisses = misses;
+			threadData.usage = threadData.cache.currentCost();
+
+			const size_t limit = g_memoryLimit / g_entryMemory;
+			const size_t globalCost = g_globalCache.currentCost();
+			const size_t available = limit > globalCost ? limit - globalCost : 0;
+			const double share = totalWeight ? std::min( 1.0, (double)weight / (double)totalWeight ) : 1.0;
+			threadData.sizeLimit = std::max(
+				std::min( g_minimumSizeLimit, available ),
+				(size_t)( share * available )
+			);
+		}
+
+		static IECore::MurmurHash lookup( ThreadData &threadData, const HashProcessKey &key, const IECore::Canceller *canceller )
+		{
+			increment( threadData.lookups );
+			if( cacheStatisticsEnabled() )
+			{
+				const IECore::TypeId plugType = key.plug->typeId();
+				const IECore::TypeId nodeType = key.computeNode->typeId();
+				if( threadData.cache.cached( key ) )
+				{
+					recordCacheStatistic( HashCacheIndex, plugType, nodeType, &RawCacheStatistics::hits );
+				}
+			}
+			return threadData.cache.get( key, canceller );
+		}
+
+		static void recordMiss( const HashProcessKey &key )
+		{
+			const IECore::TypeId plugType = key.plug->typeId();
+			const IECore::TypeId nodeType = key.computeNode->typeId();
+			recordCacheStatistic( HashCacheIndex, plugType, nodeType, &RawCacheStatistics::misses );
+			recordCacheStatistic( HashCacheIndex, plugType, nodeType, &RawCacheStatistics::cost, g_entryMemory );
+		}
+
+		struct RawStatistics
+		{
+			uint64_t lookups = 0;
+			uint64_t misses = 0;
+			uint64_t evictions = 0;
+		};
+
+		static RawStatistics rawStatistics()
+		{
+			RawStatistics result;
+			result.misses = g_globalMisses;
+			result.evictions = g_globalEvictions;
+			for( const auto &threadData : g_threadData )
+			{
+				result.lookups += threadData.lookups.load( std::memory_order_relaxed );
+				result.misses += threadData.misses.load( std::memory_order_relaxed );
+				result.evictions += threadData.evictions.load( std::memory_order_relaxed );
+			}
+			return result;
+		}
+
 		// Global cache. We use this for heavy hash computations that will spawn subtasks,
 		// so that the work and the result is shared among all threads.
 		typedef IECorePreview::LRUCache<HashCacheKey, IECore::MurmurHash, IECorePreview::LRUCachePolicy::TaskParallel, HashProcessKey> GlobalCache;
@@ -459,15 +884,61 @@ class ValuePlug::HashProcess : public Process
 
 		struct ThreadData
 		{
-			ThreadData() : cache( localCacheGetter, g_cacheSizeLimit, Cache::RemovalCallback(), /* cacheErrors = */ false ), clearCache( 0 ) {}
+			ThreadData()
+				:	cache(
+						localCacheGetter, g_cacheSizeLimit,
+						[this] ( const HashCacheKey &key, const IECore::MurmurHash &value ) {
+							if( !clearing )
+							{
+								increment( evictions );
+							}
+						},
+						/* cacheErrors = */ false
+					),
+					clearCache( 0 ), clearing( false ),
+					lookups( 0 ), misses( 0 ), evictions( 0 ), usage( 0 ),
+					windowLookups( 0 ), windowMisses( 0 ), weight( 0 ), sizeLimit( g_minimumSizeLimit )
+			{
+			}
+
 			Cache cache;
 			// Flag to request that hashCache be cleared.
 			std::atomic_int clearCache;
+			// True while we're clearing the cache, so that
+			// removals are not counted as evictions.
+			bool clearing;
+
+			// Statistics.
+			std::atomic<uint64_t> lookups;
+			std::atomic<uint64_t> misses;
+			std::atomic<uint64_t> evictions;
+			// Sampled from `cache.currentCost()` during `adaptCacheSize()`,
+			// since that cannot be read safely from other threads.
+			std::atomic_size_t usage;
+
+			// Adaptive sizing.
+			uint64_t windowLookups;
+			uint64_t windowMisses;
+			uint64_t weight;
+			size_t sizeLimit;
 		};
 
 		static tbb::enumerable_thread_specific<ThreadData, tbb::cache_aligned_allocator<ThreadData>, tbb::ets_key_per_instance > g_threadData;
 		static std::atomic_size_t g_cacheSizeLimit;
 
+		static std::atomic_size_t g_memoryLimit;
+		static std::atomic<uint64_t> g_totalWeight;
+		// Approximate memory used by a single cache entry.
+		static const size_t g_entryMemory = 200;
+		static const size_t g_minimumSizeLimit = 1000;
+		static const uint64_t g_adaptationInterval = 10000;
+
+		static std::atomic<uint64_t> g_globalMisses;
+		static std::atomic<uint64_t> g_globalEvictions;
+		static std::atomic_bool g_clearingGlobalCache;
+		static std::mutex g_statisticsMutex;
+		static RawStatistics g_statisticsBaseline;
+
 		IECore::MurmurHash m_result;
 
 };
@@ -476,10 +947,316 @@ const IECore::InternedString ValuePlug::HashProcess::staticType( "computeNode:ha
 tbb::enumerable_thread_specific<ValuePlug::HashProcess::ThreadData, tbb::cache_aligned_allocator<ValuePlug::HashProcess::ThreadData>, tbb::ets_key_per_instance > ValuePlug::HashProcess::g_threadData;
 // Default limit corresponds to a cost of roughly 25Mb per thread.
 std::atomic_size_t ValuePlug::HashProcess::g_cacheSizeLimit( 128000 );
-ValuePlug::HashProcess::GlobalCache ValuePlug::HashProcess::g_globalCache( globalCacheGetter, g_cacheSizeLimit, Cache::RemovalCallback(), /* cacheErrors = */ false );
+std::atomic_size_t ValuePlug::HashProcess::g_memoryLimit( 0 );
+std::atomic<uint64_t> ValuePlug::HashProcess::g_totalWeight( 0 );
+const size_t ValuePlug::HashProcess::g_entryMemory;
+const size_t ValuePlug::HashProcess::g_minimumSizeLimit;
+const uint64_t ValuePlug::HashProcess::g_adaptationInterval;
+std::atomic<uint64_t> ValuePlug::HashProcess::g_globalMisses( 0 );
+std::atomic<uint64_t> ValuePlug::HashProcess::g_globalEvictions( 0 );
+std::atomic_bool ValuePlug::HashProcess::g_clearingGlobalCache( false );
+std::mutex ValuePlug::HashProcess::g_statisticsMutex;
+ValuePlug::HashProcess::RawStatistics ValuePlug::HashProcess::g_statisticsBaseline;
+ValuePlug::HashProcess::GlobalCache ValuePlug::HashProcess::g_globalCache( globalCacheGetter, g_cacheSizeLimit, globalCacheRemovalCallback, /* cacheErrors = */ false );
 std::atomic<uint64_t> ValuePlug::HashProcess::g_legacyGlobalDirtyCount( 0 );
 ValuePlug::HashCacheMode ValuePlug::HashProcess::g_hashCacheMode( defaultHashCacheMode() );
 
+//////////////////////////////////////////////////////////////////////////
+// DiskCache. An optional persistent cache used by the ComputeProcess to
+// share the results of `Standard` computes between processes.
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+const IECore::IndexedIO::EntryID g_diskCacheObjectEntry( "o" );
+const std::string g_diskCacheExtension( ".cache" );
+
+class DiskCache : boost::noncopyable
+{
+
+	public :
+
+		DiskCache()
+			:	m_active( false ), m_sizeLimit( 10ull * 1024 * 1024 * 1024 ), m_usage( 0 )
+		{
+		}
+
+		std::string getDirectory() const
+		{
+			Mutex::scoped_lock lock( m_mutex, /* write = */ false );
+			return m_directory.string();
+		}
+
+		void setDirectory( const std::string &directory )
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			m_directory = directory;
+			m_usage = 0;
+			if( !m_directory.empty() )
+			{
+				boost::filesystem::create_directories( m_directory );
+				for( const auto &entry : entries( m_directory ) )
+				{
+					m_usage += entry.size;
+				}
+			}
+			m_active = !m_directory.empty() && !m_plugTypes.empty();
+		}
+
+		bool getEnabled( IECore::TypeId plugType ) const
+		{
+			Mutex::scoped_lock lock( m_mutex, /* write = */ false );
+			return m_plugTypes.count( plugType );
+		}
+
+		void setEnabled( IECore::TypeId plugType, bool enabled )
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			if( enabled )
+			{
+				m_plugTypes.insert( plugType );
+			}
+			else
+			{
+				m_plugTypes.erase( plugType );
+			}
+			m_active = !m_directory.empty() && !m_plugTypes.empty();
+		}
+
+		// Fast check made before every `Standard` compute. Avoids
+		// taking the lock at all when the cache is not in use.
+		bool enabled( IECore::TypeId plugType ) const
+		{
+			if( !m_active )
+			{
+				return false;
+			}
+			return getEnabled( plugType );
+		}
+
+		size_t getSizeLimit() const
+		{
+			return m_sizeLimit;
+		}
+
+		void setSizeLimit( size_t bytes )
+		{
+			m_sizeLimit = bytes;
+			if( m_usage > m_sizeLimit )
+			{
+				evict();
+			}
+		}
+
+		size_t usage() const
+		{
+			return m_usage;
+		}
+
+		void clear()
+		{
+			const boost::filesystem::path directory = getDirectory();
+			if( directory.empty() )
+			{
+				return;
+			}
+
+			std::lock_guard<std::mutex> evictionLock( m_evictionMutex );
+			boost::system::error_code ec;
+			for( const auto &entry : entries( directory ) )
+			{
+				boost::filesystem::remove( entry.path, ec );
+			}
+			m_usage = 0;
+		}
+
+		IECore::ConstObjectPtr get( const IECore::MurmurHash &hash, IECore::TypeId plugType ) const
+		{
+			const boost::filesystem::path path = filePath( hash, plugType );
+			boost::system::error_code ec;
+			if( path.empty() || !boost::filesystem::exists( path, ec ) )
+			{
+				return nullptr;
+			}
+
+			try
+			{
+				IECore::ConstObjectPtr result;
+				{
+					IECore::IndexedIOPtr io = new IECore::FileIndexedIO( path.string(), {}, IECore::IndexedIO::Read );
+					result = IECore::Object::load( io, g_diskCacheObjectEntry );
+				}
+				// Eviction removes the files with the oldest modification
+				// times first, so we touch the file to record its use.
+				boost::filesystem::last_write_time( path, std::time( nullptr ), ec );
+				return result;
+			}
+			catch( const std::exception &e )
+			{
+				// Most likely the file was removed by another process
+				// while we were reading it. Either way, we fall back to
+				// computing the value afresh.
+				IECore::msg( IECore::Msg::Debug, "ValuePlug::DiskCache", boost::format( "Failed to read \"%s\" : %s" ) % path.string() % e.what() );
+				return nullptr;
+			}
+		}
+
+		void set( const IECore::MurmurHash &hash, IECore::TypeId plugType, const IECore::Object *value )
+		{
+			const boost::filesystem::path path = filePath( hash, plugType );
+			boost::system::error_code ec;
+			if( path.empty() || boost::filesystem::exists( path, ec ) )
+			{
+				return;
+			}
+
+			size_t size = 0;
+			try
+			{
+				// We write to a temporary file and then rename it, so that
+				// other threads and processes never see a partial file.
+				boost::filesystem::create_directories( path.parent_path() );
+				const boost::filesystem::path tmpPath = boost::filesystem::unique_path( path.string() + ".%%%%-%%%%-%%%%" );
+				try
+				{
+					IECore::IndexedIOPtr io = new IECore::FileIndexedIO( tmpPath.string(), {}, IECore::IndexedIO::Write );
+					value->save( io, g_diskCacheObjectEntry );
+				}
+				catch( ... )
+				{
+					boost::filesystem::remove( tmpPath, ec );
+					throw;
+				}
+				size = boost::filesystem::file_size( tmpPath );
+				boost::filesystem::rename( tmpPath, path );
+			}
+			catch( const std::exception &e )
+			{
+				IECore::msg( IECore::Msg::Warning, "ValuePlug::DiskCache", boost::format( "Failed to write \"%s\" : %s" ) % path.string() % e.what() );
+				return;
+			}
+
+			if( ( m_usage += size ) > m_sizeLimit )
+			{
+				evict();
+			}
+		}
+
+	private :
+
+		struct Entry
+		{
+			boost::filesystem::path path;
+			std::time_t time;
+			size_t size;
+		};
+
+		static std::vector<Entry> entries( const boost::filesystem::path &directory )
+		{
+			std::vector<Entry> result;
+			boost::system::error_code ec;
+			for( boost::filesystem::recursive_directory_iterator it( directory, ec ), eIt; it != eIt; it.increment( ec ) )
+			{
+				if( ec )
+				{
+					break;
+				}
+				const boost::filesystem::path &path = it->path();
+				if( path.extension() != g_diskCacheExtension || !boost::filesystem::is_regular_file( it->status() ) )
+				{
+					continue;
+				}
+				const size_t size = boost::filesystem::file_size( path, ec );
+				const std::time_t time = boost::filesystem::last_write_time( path, ec );
+				if( !ec )
+				{
+					result.push_back( { path, time, size } );
+				}
+			}
+			return result;
+		}
+
+		// Returns an empty path if the cache is not in use. The
+		// Gaffer version and plug type are included in the file
+		// name so that we never load results from an incompatible
+		// version, or results computed for a different type of plug.
+		boost::filesystem::path filePath( const IECore::MurmurHash &hash, IECore::TypeId plugType ) const
+		{
+			IECore::MurmurHash h = hash;
+			h.append( (uint64_t)plugType );
+			h.append( GAFFER_MILESTONE_VERSION );
+			h.append( GAFFER_MAJOR_VERSION );
+			h.append( GAFFER_MINOR_VERSION );
+			h.append( GAFFER_PATCH_VERSION );
+			const std::string name = h.toString();
+
+			Mutex::scoped_lock lock( m_mutex, /* write = */ false );
+			if( m_directory.empty() )
+			{
+				return boost::filesystem::path();
+			}
+			return m_directory / name.substr( 0, 2 ) / ( name + g_diskCacheExtension );
+		}
+
+		// Removes the least recently used files until we're comfortably
+		// below the size limit, so that we're not evicting on every write.
+		void evict()
+		{
+			std::unique_lock<std::mutex> evictionLock( m_evictionMutex, std::try_to_lock );
+			if( !evictionLock.owns_lock() )
+			{
+				// Another thread is already evicting.
+				return;
+			}
+
+			const boost::filesystem::path directory = getDirectory();
+			if( directory.empty() )
+			{
+				return;
+			}
+
+			std::vector<Entry> e = entries( directory );
+			std::sort(
+				e.begin(), e.end(),
+				[] ( const Entry &a, const Entry &b ) { return a.time < b.time; }
+			);
+
+			size_t usage = 0;
+			for( const auto &entry : e )
+			{
+				usage += entry.size;
+			}
+
+			const size_t target = m_sizeLimit - m_sizeLimit / 10;
+			boost::system::error_code ec;
+			for( auto it = e.begin(); it != e.end() && usage > target; ++it )
+			{
+				if( boost::filesystem::remove( it->path, ec ) )
+				{
+					usage -= it->size;
+				}
+			}
+
+			m_usage = usage;
+		}
+
+		typedef tbb::spin_rw_mutex Mutex;
+		mutable Mutex m_mutex;
+		boost::filesystem::path m_directory;
+		std::set<IECore::TypeId> m_plugTypes;
+		std::atomic_bool m_active;
+
+		std::atomic_size_t m_sizeLimit;
+		std::atomic_size_t m_usage;
+		std::mutex m_evictionMutex;
+
+};
+
+DiskCache g_diskCache;
+
+} // namespace
+
 //////////////////////////////////////////////////////////////////////////
 // The ComputeProcess manages the task of calling ComputeNode::compute()
 // and storing a cache of recently computed results.
@@ -528,6 +1305,26 @@ bool spawnsTasks( const ComputeProcessKey &key )
 	return key.cachePolicy == ValuePlug::CachePolicy::TaskCollaboration;
 }
 
+// Value stored in the compute cache. We store the types of the plug
+// and node that computed the value alongside it, so that evictions can
+// be attributed to them when collecting statistics.
+struct ComputeCacheValue
+{
+	ComputeCacheValue()
+		:	plugType( IECore::InvalidTypeId ), nodeType( IECore::InvalidTypeId )
+	{
+	}
+
+	ComputeCacheValue( const IECore::ConstObjectPtr &value, const ValuePlug *plug )
+		:	value( value ), plugType( plug->typeId() ), nodeType( nodeTypeId( plug ) )
+	{
+	}
+
+	IECore::ConstObjectPtr value;
+	IECore::TypeId plugType;
+	IECore::TypeId nodeType;
+};
+
 } // namespace
 
 class ValuePlug::ComputeProcess : public Process
@@ -552,7 +1349,9 @@ class ValuePlug::ComputeProcess : public Process
 
 		static void clearCache()
 		{
+			g_clearingCache = true;
 			g_cache.clear();
+			g_clearingCache = false;
 		}
 
 		static IECore::ConstObjectPtr value( const ValuePlug *plug, const IECore::MurmurHash *precomputedHash )
@@ -589,11 +1388,20 @@ class ValuePlug::ComputeProcess : public Process
 				// from inside a lock. If tasks were spawned without being
 				// isolated, TBB could steal an outer task which tries to get
 				// the same item from the cache, leading to deadlock.
+				const bool recordStatistics = cacheStatisticsEnabled();
 				if( auto result = g_cache.getIfCached( processKey ) )
 				{
-					return *result;
+					if( recordStatistics )
+					{
+						recordCacheStatistic( ComputeCacheIndex, processKey.plug, &RawCacheStatistics::hits );
+					}
+					return result->value;
 				}
 				ComputeProcess process( processKey );
+				if( recordStatistics )
+				{
+					recordCacheStatistic( ComputeCacheIndex, processKey.plug, &RawCacheStatistics::misses );
+				}
 				// Store the value in the cache, after first checking that this
 				// hasn't been done already. The check is useful because it's
 				// common for an upstream compute triggered by us to have
@@ -610,13 +1418,72 @@ class ValuePlug::ComputeProcess : public Process
 				/// that.
 				if( !g_cache.getIfCached( processKey ) )
 				{
-					g_cache.set( processKey, process.m_result, process.m_result->memoryUsage() );
+					const size_t cost = process.m_result->memoryUsage();
+					g_cache.set( processKey, ComputeCacheValue( process.m_result, processKey.plug ), cost );
+					if( recordStatistics )
+					{
+						recordCacheStatistic( ComputeCacheIndex, processKey.plug, &RawCacheStatistics::cost, cost );
+					}
 				}
 				return process.m_result;
 			}
 			else
 			{
-				return g_cache.get( processKey, Context::current()->canceller() );
+				if( !cacheStatisticsEnabled() )
+				{
+					return g_cache.get( processKey, Context::current()->canceller() ).value;
+				}
+
+				if( g_cache.cached( processKey ) )
+				{
+					recordCacheStatistic( ComputeCacheIndex, processKey.plug, &RawCacheStatistics::hits );
+					return g_cache.get( processKey, Context::current()->canceller() ).value;
+				}
+
+				PendingKeyScope pendingKeyScope( &processKey );
+				IECore::ConstObjectPtr result = g_cache.get( processKey, Context::current()->canceller() ).value;
+				if( pendingKeyScope.waited() )
+				{
+					recordCacheStatistic( ComputeCacheIndex, processKey.plug, &RawCacheStatistics::waits );
+				}
+				return result;
+			}
+		}
+
+		static IECore::ConstObjectPtr cachedValue( const ValuePlug *plug, const IECore::MurmurHash &hash )
+		{
+			const ValuePlug *p = sourcePlug( plug );
+			const ComputeNode *computeNode = IECore::runTimeCast<const ComputeNode>( p->node() );
+			const ComputeProcessKey processKey( p, plug, computeNode, computeNode ? computeNode->computeCachePolicy( p ) : CachePolicy::Uncached, &hash );
+			if( processKey.cachePolicy == CachePolicy::Uncached )
+			{
+				return nullptr;
+			}
+
+			auto result = g_cache.getIfCached( processKey );
+			if( result && cacheStatisticsEnabled() )
+			{
+				recordCacheStatistic( ComputeCacheIndex, p, &RawCacheStatistics::hits );
+			}
+			return result ? result->value : nullptr;
+		}
+
+		static void storeValue( const ValuePlug *plug, const IECore::MurmurHash &hash, const IECore::ConstObjectPtr &value )
+		{
+			const ValuePlug *p = sourcePlug( plug );
+			const ComputeNode *computeNode = IECore::runTimeCast<const ComputeNode>( p->node() );
+			const ComputeProcessKey processKey( p, plug, computeNode, computeNode ? computeNode->computeCachePolicy( p ) : CachePolicy::Uncached, &hash );
+			if( processKey.cachePolicy == CachePolicy::Uncached || g_cache.getIfCached( processKey ) )
+			{
+				return;
+			}
+
+			const size_t cost = value->memoryUsage();
+			g_cache.set( processKey, ComputeCacheValue( value, p ), cost );
+			if( cacheStatisticsEnabled() )
+			{
+				recordCacheStatistic( ComputeCacheIndex, p, &RawCacheStatistics::misses );
+				recordCacheStatistic( ComputeCacheIndex, p, &RawCacheStatistics::cost, cost );
 			}
 		}
 
@@ -676,18 +1543,33 @@ class ValuePlug::ComputeProcess : public Process
 			}
 		}
 
-		static IECore::ConstObjectPtr cacheGetter( const ComputeProcessKey &key, size_t &cost, const IECore::Canceller *canceller )
+		static ComputeCacheValue cacheGetter( const ComputeProcessKey &key, size_t &cost, const IECore::Canceller *canceller )
 		{
 			// Canceller will be passed to `ComputeNode::hash()` implicitly
 			// via the context.
 			assert( canceller == Context::current()->canceller() );
+			PendingKeyScope::getterCalled( &key );
 			IECore::ConstObjectPtr result;
 			switch( key.cachePolicy )
 			{
 				case CachePolicy::Standard :
 				{
+					const IECore::TypeId plugType = key.plug->typeId();
+					const bool useDiskCache = g_diskCache.enabled( plugType );
+					if( useDiskCache )
+					{
+						result = g_diskCache.get( key, plugType );
+						if( result )
+						{
+							break;
+						}
+					}
 					ComputeProcess process( key );
 					result = process.m_result;
+					if( useDiskCache )
+					{
+						g_diskCache.set( key, plugType, result.get() );
+					}
 					break;
 				}
 				case CachePolicy::TaskCollaboration :
@@ -714,20 +1596,35 @@ class ValuePlug::ComputeProcess : public Process
 			}
 
 			cost = result->memoryUsage();
-			return result;
+			if( cacheStatisticsEnabled() )
+			{
+				recordCacheStatistic( ComputeCacheIndex, key.plug, &RawCacheStatistics::misses );
+				recordCacheStatistic( ComputeCacheIndex, key.plug, &RawCacheStatistics::cost, cost );
+			}
+			return ComputeCacheValue( result, key.plug );
+		}
+
+		static void cacheRemovalCallback( const IECore::MurmurHash &key, const ComputeCacheValue &value )
+		{
+			if( cacheStatisticsEnabled() && !g_clearingCache )
+			{
+				recordCacheStatistic( ComputeCacheIndex, value.plugType, value.nodeType, &RawCacheStatistics::evictions );
+			}
 		}
 
 		// A cache mapping from ValuePlug::hash() to the result of the previous computation
 		// for that hash. This allows us to cache results for faster repeat evaluation
-		typedef IECorePreview::LRUCache<IECore::MurmurHash, IECore::ConstObjectPtr, IECorePreview::LRUCachePolicy::TaskParallel, ComputeProcessKey> Cache;
+		typedef IECorePreview::LRUCache<IECore::MurmurHash, ComputeCacheValue, IECorePreview::LRUCachePolicy::TaskParallel, ComputeProcessKey> Cache;
 		static Cache g_cache;
+		static std::atomic_bool g_clearingCache;
 
 		IECore::ConstObjectPtr m_result;
 
 };
 
 const IECore::InternedString ValuePlug::ComputeProcess::staticType( "computeNode:compute" );
-ValuePlug::ComputeProcess::Cache ValuePlug::ComputeProcess::g_cache( cacheGetter, 1024 * 1024 * 1024 * 1, ValuePlug::ComputeProcess::Cache::RemovalCallback(), /* cacheErrors = */ false ); // 1 gig
+ValuePlug::ComputeProcess::Cache ValuePlug::ComputeProcess::g_cache( cacheGetter, 1024 * 1024 * 1024 * 1, cacheRemovalCallback, /* cacheErrors = */ false ); // 1 gig
+std::atomic_bool ValuePlug::ComputeProcess::g_clearingCache( false );
 
 //////////////////////////////////////////////////////////////////////////
 // SetValueAction implementation
@@ -1072,6 +1969,16 @@ IECore::ConstObjectPtr ValuePlug::getValueInternal( const IECore::MurmurHash *pr
 	return ComputeProcess::value( this, precomputedHash );
 }
 
+IECore::ConstObjectPtr ValuePlug::getCachedObjectValue( const ValuePlug *plug, const IECore::MurmurHash &hash )
+{
+	return ComputeProcess::cachedValue( plug, hash );
+}
+
+void ValuePlug::setCachedObjectValue( const ValuePlug *plug, const IECore::MurmurHash &hash, const IECore::ConstObjectPtr &value )
+{
+	ComputeProcess::storeValue( plug, hash, value );
+}
+
 void ValuePlug::setObjectValue( IECore::ConstObjectPtr value )
 {
 	bool haveInput = getInput();
@@ -1210,3 +2117,109 @@ ValuePlug::HashCacheMode ValuePlug::getHashCacheMode()
 {
 	return HashProcess::getHashCacheMode();
 }
+
+size_t ValuePlug::getHashCacheMemoryLimit()
+{
+	return HashProcess::getCacheMemoryLimit();
+}
+
+void ValuePlug::setHashCacheMemoryLimit( size_t bytes )
+{
+	HashProcess::setCacheMemoryLimit( bytes );
+}
+
+size_t ValuePlug::hashCacheMemoryUsage()
+{
+	return HashProcess::cacheMemoryUsage();
+}
+
+void ValuePlug::setCacheStatisticsEnabled( bool enabled )
+{
+	g_cacheStatisticsEnabled = enabled;
+}
+
+bool ValuePlug::getCacheStatisticsEnabled()
+{
+	return g_cacheStatisticsEnabled;
+}
+
+ValuePlug::HashCacheStatistics ValuePlug::hashCacheStatistics()
+{
+	return HashProcess::statistics();
+}
+
+ValuePlug::HashCacheStatisticsMap ValuePlug::hashCacheStatisticsByPlugType()
+{
+	return cacheStatisticsMap<HashCacheStatistics>( HashCacheIndex, &CacheStatisticsThreadData::byPlugType );
+}
+
+ValuePlug::HashCacheStatisticsMap ValuePlug::hashCacheStatisticsByNodeType()
+{
+	return cacheStatisticsMap<HashCacheStatistics>( HashCacheIndex, &CacheStatisticsThreadData::byNodeType );
+}
+
+void ValuePlug::resetHashCacheStatistics()
+{
+	HashProcess::resetStatistics();
+	resetCacheStatisticsThreadData( HashCacheIndex );
+}
+
+ValuePlug::ComputeCacheStatistics ValuePlug::computeCacheStatistics()
+{
+	return rawCacheStatistics( ComputeCacheIndex ).statistics<ComputeCacheStatistics>();
+}
+
+ValuePlug::ComputeCacheStatisticsMap ValuePlug::computeCacheStatisticsByPlugType()
+{
+	return cacheStatisticsMap<ComputeCacheStatistics>( ComputeCacheIndex, &CacheStatisticsThreadData::byPlugType );
+}
+
+ValuePlug::ComputeCacheStatisticsMap ValuePlug::computeCacheStatisticsByNodeType()
+{
+	return cacheStatisticsMap<ComputeCacheStatistics>( ComputeCacheIndex, &CacheStatisticsThreadData::byNodeType );
+}
+
+void ValuePlug::resetComputeCacheStatistics()
+{
+	resetCacheStatisticsThreadData( ComputeCacheIndex );
+}
+
+std::string ValuePlug::getDiskCacheDirectory()
+{
+	return g_diskCache.getDirectory();
+}
+
+void ValuePlug::setDiskCacheDirectory( const std::string &directory )
+{
+	g_diskCache.setDirectory( directory );
+}
+
+bool ValuePlug::getDiskCacheEnabled( IECore::TypeId plugType )
+{
+	return g_diskCache.getEnabled( plugType );
+}
+
+void ValuePlug::setDiskCacheEnabled( IECore::TypeId plugType, bool enabled )
+{
+	g_diskCache.setEnabled( plugType, enabled );
+}
+
+size_t ValuePlug::getDiskCacheSizeLimit()
+{
+	return g_diskCache.getSizeLimit();
+}
+
+void ValuePlug::setDiskCacheSizeLimit( size_t bytes )
+{
+	g_diskCache.setSizeLimit( bytes );
+}
+
+size_t ValuePlug::diskCacheUsage()
+{
+	return g_diskCache.usage();
+}
+
+void ValuePlug::clearDiskCache()
+{
+	g_diskCache.clear();
+}
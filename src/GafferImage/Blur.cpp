@@ -36,12 +36,19 @@
 
 #include "GafferImage/Blur.h"
 
+#include "GafferImage/BufferAlgo.h"
 #include "GafferImage/FilterAlgo.h"
 #include "GafferImage/Resample.h"
+#include "GafferImage/Sampler.h"
 
+#include "Gaffer/Context.h"
 #include "Gaffer/StringPlug.h"
 
+#include <cmath>
+
+using namespace std;
 using namespace Imath;
+using namespace IECore;
 using namespace Gaffer;
 using namespace GafferImage;
 
@@ -49,6 +56,158 @@ GAFFER_NODE_DEFINE_TYPE( Blur );
 
 const char *g_blurFilterName = "smoothGaussian";
 
+//////////////////////////////////////////////////////////////////////////
+// Fast mode utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// The Fast mode approximates the gaussian with a cascade of "extended box"
+// filters, as described in "Theoretical Foundations of Gaussian Convolution
+// by Extended Box Filtering" by Gwosdek et al. Each box averages `2 * radius + 1`
+// pixels, plus one more pixel at either end weighted by `alpha`. The fractional
+// end weights allow the variance of the cascade to match any target exactly,
+// and each pass costs the same per pixel regardless of radius, because it is
+// implemented as a running sum.
+struct ExtendedBox
+{
+	int radius;
+	float alpha;
+};
+
+const int g_extendedBoxPasses = 3;
+
+// Returns the variance of the kernel used by the Accurate mode, as sampled
+// at the integer pixel offsets used by the internal Resample.
+double accurateVariance( float blurRadius )
+{
+	// See `Blur::compute()` for the derivation of the filter width.
+	const double halfWidth = 1.0 + blurRadius;
+	double sum = 1.0;
+	double weightedSum = 0.0;
+	for( int x = 1; x < halfWidth; ++x )
+	{
+		const double w = exp( -5.0 * x * x / ( halfWidth * halfWidth ) );
+		sum += 2.0 * w;
+		weightedSum += 2.0 * w * x * x;
+	}
+	return weightedSum / sum;
+}
+
+ExtendedBox extendedBox( float blurRadius )
+{
+	ExtendedBox result = { 0, 0.0f };
+	if( blurRadius <= 0.0f )
+	{
+		return result;
+	}
+
+	// Each pass contributes an equal share of the variance. We choose the
+	// largest plain box that doesn't exceed that share, and then make up the
+	// difference using the end weights.
+	const double passVariance = accurateVariance( blurRadius ) / g_extendedBoxPasses;
+	int r = max( 0, (int)( ( sqrt( 1.0 + 12.0 * passVariance ) - 1.0 ) / 2.0 ) );
+	while( ( r + 1 ) * ( r + 2 ) / 3.0 <= passVariance )
+	{
+		r++;
+	}
+	while( r > 0 && r * ( r + 1 ) / 3.0 > passVariance )
+	{
+		r--;
+	}
+
+	result.radius = r;
+	result.alpha = ( 2 * r + 1 ) * ( passVariance - r * ( r + 1 ) / 3.0 ) / ( 2.0 * ( ( r + 1 ) * ( r + 1 ) - passVariance ) );
+	return result;
+}
+
+// The number of pixels the complete cascade reads on either side of
+// each output pixel. Zero means the filter is the identity.
+int support( const ExtendedBox &box )
+{
+	if( box.radius == 0 && box.alpha <= 0.0f )
+	{
+		return 0;
+	}
+	return g_extendedBoxPasses * ( box.radius + 1 );
+}
+
+V2i support( const V2f &blurRadius )
+{
+	return V2i( support( extendedBox( blurRadius.x ) ), support( extendedBox( blurRadius.y ) ) );
+}
+
+// Returns the radius in pixels at the proxy level specified by the context.
+V2f proxyRadius( const V2f &radius, const Gaffer::Context *context )
+{
+	return radius / (float)( 1 << ImagePlug::proxyLevel( context ) );
+}
+
+Box2i expandDataWindow( const Box2i &dataWindow, const V2i &support )
+{
+	if( BufferAlgo::empty( dataWindow ) )
+	{
+		return dataWindow;
+	}
+	return Box2i( dataWindow.min - support, dataWindow.max + support );
+}
+
+// Filters `count + 2 * ( box.radius + 1 )` values from `in` into `count`
+// values in `out`. Each value consists of `lanes` interleaved floats, all of
+// which are filtered independently. This allows rows to be filtered with
+// `lanes == 1`, and all the columns of a tile to be filtered at once by passing
+// the tile width as `lanes`.
+void extendedBoxPass( const float *in, float *out, int count, int lanes, const ExtendedBox &box, vector<double> &sums )
+{
+	const int width = 2 * box.radius + 1;
+	const double weight = 1.0 / ( width + 2.0 * box.alpha );
+	const double endWeight = box.alpha * weight;
+
+	sums.assign( lanes, 0.0 );
+	for( int i = 1; i <= width; ++i )
+	{
+		const float *v = in + i * lanes;
+		for( int l = 0; l < lanes; ++l )
+		{
+			sums[l] += v[l];
+		}
+	}
+
+	for( int i = 0; i < count; ++i )
+	{
+		const float *first = in + i * lanes;
+		const float *last = first + ( width + 1 ) * lanes;
+		float *o = out + i * lanes;
+		for( int l = 0; l < lanes; ++l )
+		{
+			o[l] = sums[l] * weight + ( first[l] + last[l] ) * endWeight;
+			sums[l] += last[l] - first[l + lanes];
+		}
+	}
+}
+
+// Applies the full cascade to `buffer`, which must contain
+// `count + 2 * support( box )` values. The `count` results are
+// left at the start of `buffer`.
+void extendedBoxFilter( vector<float> &buffer, int count, int lanes, const ExtendedBox &box, vector<float> &scratch, vector<double> &sums )
+{
+	scratch.resize( buffer.size() );
+	int length = count + 2 * support( box );
+	for( int i = 0; i < g_extendedBoxPasses; ++i )
+	{
+		length -= 2 * ( box.radius + 1 );
+		extendedBoxPass( buffer.data(), scratch.data(), length, lanes, box, sums );
+		buffer.swap( scratch );
+	}
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// Blur
+//////////////////////////////////////////////////////////////////////////
+
 size_t Blur::g_firstPlugIndex = 0;
 
 Blur::Blur( const std::string &name )
@@ -61,12 +220,15 @@ Blur::Blur( const std::string &name )
 	addChild( new V2fPlug( "radius", Plug::In, V2f( 0 ), V2f( 0 ) ) );
 	addChild( resample->boundingModePlug()->createCounterpart( "boundingMode", Plug::In ) );
 	addChild( new BoolPlug( "expandDataWindow" ) );
+	addChild( new IntPlug( "mode", Plug::In, Accurate, Accurate, Fast ) );
 
 	addChild( new V2fPlug( "__filterScale", Plug::Out ) );
 
 	addChild( new AtomicBox2iPlug( "__resampledDataWindow", Plug::In, Box2i(), Plug::Default & ~Plug::Serialisable ) );
 	addChild( new FloatVectorDataPlug( "__resampledChannelData", Plug::In, ImagePlug::blackTile(), Plug::Default & ~Plug::Serialisable ) );
 
+	addChild( new ImagePlug( "__horizontalPass", Plug::Out ) );
+
 	addChild( resample );
 
 	resample->inPlug()->setInput( inPlug() );
@@ -81,6 +243,13 @@ Blur::Blur( const std::string &name )
 	outPlug()->formatPlug()->setInput( inPlug()->formatPlug() );
 	outPlug()->metadataPlug()->setInput( inPlug()->metadataPlug() );
 	outPlug()->channelNamesPlug()->setInput( inPlug()->channelNamesPlug() );
+
+	horizontalPassPlug()->formatPlug()->setInput( inPlug()->formatPlug() );
+	horizontalPassPlug()->metadataPlug()->setInput( inPlug()->metadataPlug() );
+	horizontalPassPlug()->channelNamesPlug()->setInput( inPlug()->channelNamesPlug() );
+	// As for Resample, we pass through the deep plug so that the Sampler
+	// used in the vertical pass can check it.
+	horizontalPassPlug()->deepPlug()->setInput( inPlug()->deepPlug() );
 }
 
 Blur::~Blur()
@@ -117,44 +286,64 @@ const Gaffer::BoolPlug *Blur::expandDataWindowPlug() const
 	return getChild<BoolPlug>( g_firstPlugIndex + 2 );
 }
 
+Gaffer::IntPlug *Blur::modePlug()
+{
+	return getChild<IntPlug>( g_firstPlugIndex + 3 );
+}
+
+const Gaffer::IntPlug *Blur::modePlug() const
+{
+	return getChild<IntPlug>( g_firstPlugIndex + 3 );
+}
+
 Gaffer::V2fPlug *Blur::filterScalePlug()
 {
-	return getChild<V2fPlug>( g_firstPlugIndex + 3 );
+	return getChild<V2fPlug>( g_firstPlugIndex + 4 );
 }
 
 const Gaffer::V2fPlug *Blur::filterScalePlug() const
 {
-	return getChild<V2fPlug>( g_firstPlugIndex + 3 );
+	return getChild<V2fPlug>( g_firstPlugIndex + 4 );
 }
 
 Gaffer::AtomicBox2iPlug *Blur::resampledDataWindowPlug()
 {
-	return getChild<AtomicBox2iPlug>( g_firstPlugIndex + 4 );
+	return getChild<AtomicBox2iPlug>( g_firstPlugIndex + 5 );
 }
 
 const Gaffer::AtomicBox2iPlug *Blur::resampledDataWindowPlug() const
 {
-	return getChild<AtomicBox2iPlug>( g_firstPlugIndex + 4 );
+	return getChild<AtomicBox2iPlug>( g_firstPlugIndex + 5 );
 }
 
 Gaffer::FloatVectorDataPlug *Blur::resampledChannelDataPlug()
 {
-	return getChild<FloatVectorDataPlug>( g_firstPlugIndex + 5 );
+	return getChild<FloatVectorDataPlug>( g_firstPlugIndex + 6 );
 }
 
 const Gaffer::FloatVectorDataPlug *Blur::resampledChannelDataPlug() const
 {
-	return getChild<FloatVectorDataPlug>( g_firstPlugIndex + 5 );
+	return getChild<FloatVectorDataPlug>( g_firstPlugIndex + 6 );
+}
+
+ImagePlug *Blur::horizontalPassPlug()
+{
+	return getChild<ImagePlug>( g_firstPlugIndex + 7 );
+}
+
+const ImagePlug *Blur::horizontalPassPlug() const
+{
+	return getChild<ImagePlug>( g_firstPlugIndex + 7 );
 }
 
 Resample *Blur::resample()
 {
-	return getChild<Resample>( g_firstPlugIndex + 6 );
+	return getChild<Resample>( g_firstPlugIndex + 8 );
 }
 
 const Resample *Blur::resample() const
 {
-	return getChild<Resample>( g_firstPlugIndex + 6 );
+	return getChild<Resample>( g_firstPlugIndex + 8 );
 }
 
 void Blur::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const
@@ -163,16 +352,35 @@ void Blur::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs )
 
 	if(
 		input == expandDataWindowPlug() ||
-		input == resampledDataWindowPlug()
+		input == resampledDataWindowPlug() ||
+		input == inPlug()->dataWindowPlug()
 	)
 	{
 		outputs.push_back( outPlug()->dataWindowPlug() );
+		if( input != resampledDataWindowPlug() )
+		{
+			outputs.push_back( horizontalPassPlug()->dataWindowPlug() );
+		}
+		if( input == inPlug()->dataWindowPlug() )
+		{
+			// The Samplers used by Fast mode depend on the
+			// data window of the image they sample.
+			outputs.push_back( horizontalPassPlug()->channelDataPlug() );
+			outputs.push_back( outPlug()->channelDataPlug() );
+		}
 	}
 	else if( input->parent<V2fPlug>() == radiusPlug() )
 	{
 		outputs.push_back( filterScalePlug()->getChild<ValuePlug>( input->getName() ) );
 		outputs.push_back( outPlug()->dataWindowPlug() );
 		outputs.push_back( outPlug()->channelDataPlug() );
+		outputs.push_back( horizontalPassPlug()->dataWindowPlug() );
+		outputs.push_back( horizontalPassPlug()->channelDataPlug() );
+	}
+	else if( input == modePlug() )
+	{
+		outputs.push_back( outPlug()->dataWindowPlug() );
+		outputs.push_back( outPlug()->channelDataPlug() );
 	}
 	else if(
 		input == resampledChannelDataPlug()
@@ -180,6 +388,14 @@ void Blur::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs )
 	{
 		outputs.push_back( outPlug()->channelDataPlug() );
 	}
+	else if(
+		input == inPlug()->channelDataPlug() ||
+		input == boundingModePlug()
+	)
+	{
+		outputs.push_back( horizontalPassPlug()->channelDataPlug() );
+		outputs.push_back( outPlug()->channelDataPlug() );
+	}
 }
 
 void Blur::hash( const ValuePlug *output, const Context *context, IECore::MurmurHash &h ) const
@@ -217,50 +433,194 @@ void Blur::compute( ValuePlug *output, const Context *context ) const
 	FlatImageProcessor::compute( output, context );
 }
 
+bool Blur::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void Blur::hashDataWindow( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
-	if( radiusPlug()->getValue() != V2f( 0 ) && expandDataWindowPlug()->getValue() )
+	const V2f radius = proxyRadius( radiusPlug()->getValue(), context );
+	if( radius == V2f( 0 ) || !expandDataWindowPlug()->getValue() )
+	{
+		h = inPlug()->dataWindowPlug()->hash();
+		return;
+	}
+
+	if( parent != horizontalPassPlug() && modePlug()->getValue() == Accurate )
 	{
 		h = resampledDataWindowPlug()->hash();
+		return;
 	}
-	else
+
+	V2i s = support( radius );
+	if( parent == horizontalPassPlug() )
+	{
+		s.y = 0;
+	}
+
+	if( s == V2i( 0 ) )
 	{
 		h = inPlug()->dataWindowPlug()->hash();
+		return;
 	}
+
+	FlatImageProcessor::hashDataWindow( parent, context, h );
+	inPlug()->dataWindowPlug()->hash( h );
+	h.append( s );
 }
 
 Imath::Box2i Blur::computeDataWindow( const Gaffer::Context *context, const ImagePlug *parent ) const
 {
-	if( radiusPlug()->getValue() != V2f( 0 ) && expandDataWindowPlug()->getValue() )
+	const V2f radius = proxyRadius( radiusPlug()->getValue(), context );
+	if( radius == V2f( 0 ) || !expandDataWindowPlug()->getValue() )
+	{
+		return inPlug()->dataWindowPlug()->getValue();
+	}
+
+	if( parent != horizontalPassPlug() && modePlug()->getValue() == Accurate )
 	{
 		return resampledDataWindowPlug()->getValue();
 	}
-	else
+
+	V2i s = support( radius );
+	if( parent == horizontalPassPlug() )
 	{
-		return inPlug()->dataWindowPlug()->getValue();
+		s.y = 0;
 	}
+
+	return expandDataWindow( inPlug()->dataWindowPlug()->getValue(), s );
 }
 
 void Blur::hashChannelData( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
-	if( radiusPlug()->getValue() != V2f( 0 ) )
+	const V2f radius = proxyRadius( radiusPlug()->getValue(), context );
+	if( radius == V2f( 0 ) )
+	{
+		h = inPlug()->channelDataPlug()->hash();
+		return;
+	}
+
+	if( parent != horizontalPassPlug() && modePlug()->getValue() == Accurate )
 	{
 		h = resampledChannelDataPlug()->hash();
+		return;
 	}
-	else
+
+	// Fast mode. The horizontal pass filters `inPlug()` in X, and the
+	// output filters the horizontal pass in Y. Either may be a pass-through
+	// if the radius on that axis is 0.
+
+	const bool horizontal = parent == horizontalPassPlug();
+	const ExtendedBox box = extendedBox( horizontal ? radius.x : radius.y );
+	const int s = support( box );
+	const ImagePlug *source = horizontal ? inPlug() : horizontalPassPlug();
+	if( s == 0 )
 	{
-		h = inPlug()->channelDataPlug()->hash();
+		h = source->channelDataPlug()->hash();
+		return;
 	}
+
+	FlatImageProcessor::hashChannelData( parent, context, h );
+
+	const V2i tileOrigin = context->get<V2i>( ImagePlug::tileOriginContextName );
+	const Box2i tileBound( tileOrigin, tileOrigin + V2i( ImagePlug::tileSize() ) );
+	const V2i margin = horizontal ? V2i( s, 0 ) : V2i( 0, s );
+
+	Sampler sampler(
+		source,
+		context->get<std::string>( ImagePlug::channelNameContextName ),
+		Box2i( tileBound.min - margin, tileBound.max + margin ),
+		(Sampler::BoundingMode)boundingModePlug()->getValue()
+	);
+	sampler.hash( h );
+
+	h.append( box.radius );
+	h.append( box.alpha );
+	// Another tile might happen to need to filter over the same input
+	// tiles as this one, so we must include the tile origin to make sure
+	// each tile has a unique hash.
+	h.append( tileOrigin );
 }
 
 IECore::ConstFloatVectorDataPtr Blur::computeChannelData( const std::string &channelName, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent ) const
 {
-	if( radiusPlug()->getValue() != V2f( 0 ) )
+	const V2f radius = proxyRadius( radiusPlug()->getValue(), context );
+	if( radius == V2f( 0 ) )
+	{
+		return inPlug()->channelDataPlug()->getValue();
+	}
+
+	if( parent != horizontalPassPlug() && modePlug()->getValue() == Accurate )
 	{
 		return resampledChannelDataPlug()->getValue();
 	}
+
+	const bool horizontal = parent == horizontalPassPlug();
+	const ExtendedBox box = extendedBox( horizontal ? radius.x : radius.y );
+	const int s = support( box );
+	const ImagePlug *source = horizontal ? inPlug() : horizontalPassPlug();
+	if( s == 0 )
+	{
+		return source->channelDataPlug()->getValue();
+	}
+
+	const int tileSize = ImagePlug::tileSize();
+	const Box2i tileBound( tileOrigin, tileOrigin + V2i( tileSize ) );
+	const V2i margin = horizontal ? V2i( s, 0 ) : V2i( 0, s );
+	const Box2i inputBound( tileBound.min - margin, tileBound.max + margin );
+
+	Sampler sampler(
+		source,
+		channelName,
+		inputBound,
+		(Sampler::BoundingMode)boundingModePlug()->getValue()
+	);
+
+	FloatVectorDataPtr resultData = new FloatVectorData;
+	vector<float> &result = resultData->writable();
+	result.resize( tileSize * tileSize );
+
+	vector<float> buffer;
+	vector<float> scratch;
+	vector<double> sums;
+
+	if( horizontal )
+	{
+		// Filter one row at a time.
+		for( int y = tileBound.min.y; y < tileBound.max.y; ++y )
+		{
+			Canceller::check( context->canceller() );
+
+			buffer.resize( inputBound.size().x );
+			vector<float>::iterator it = buffer.begin();
+			for( int x = inputBound.min.x; x < inputBound.max.x; ++x )
+			{
+				*it++ = sampler.sample( x, y );
+			}
+
+			extendedBoxFilter( buffer, tileSize, 1, box, scratch, sums );
+			std::copy( buffer.begin(), buffer.begin() + tileSize, result.begin() + ( y - tileBound.min.y ) * tileSize );
+		}
+	}
 	else
 	{
-		return inPlug()->channelDataPlug()->getValue();
+		// Filter all columns at once, so that we access
+		// memory contiguously.
+		buffer.resize( inputBound.size().x * inputBound.size().y );
+		vector<float>::iterator it = buffer.begin();
+		for( int y = inputBound.min.y; y < inputBound.max.y; ++y )
+		{
+			Canceller::check( context->canceller() );
+			for( int x = inputBound.min.x; x < inputBound.max.x; ++x )
+			{
+				*it++ = sampler.sample( x, y );
+			}
+		}
+
+		extendedBoxFilter( buffer, tileSize, tileSize, box, scratch, sums );
+		std::copy( buffer.begin(), buffer.begin() + tileSize * tileSize, result.begin() );
 	}
+
+	return resultData;
 }
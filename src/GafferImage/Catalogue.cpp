@@ -112,6 +112,9 @@ class Catalogue::InternalImage : public ImageNode
 			// the fileName plug.
 			addChild( new ImageReader() );
 			imageReader()->fileNamePlug()->setInput( fileNamePlug() );
+			// Catalogue images are saved at half precision by default,
+			// so we can usually halve their memory usage without any loss.
+			imageReader()->cachePrecisionPlug()->setValue( ImageReader::Automatic );
 
 			// Used to merge all channels from multiple
 			// incoming Display nodes.
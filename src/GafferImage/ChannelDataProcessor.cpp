@@ -129,6 +129,11 @@ bool ChannelDataProcessor::channelEnabled( const std::string &channel ) const
 	return IECore::StringAlgo::matchMultiple( channel, channelsPlug()->getValue() );
 }
 
+bool ChannelDataProcessor::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void ChannelDataProcessor::hashChannelData( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	ImageProcessor::hashChannelData( output, context, h );
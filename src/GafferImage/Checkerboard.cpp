@@ -89,6 +89,19 @@ inline float filteredStripes( float x, float period, float filterWidth )
 	return max( 0.0f, min( 1.0f, ( ( xp - nearestBoundary ) * ( period * 0.5f ) / filterWidth * boundaryDirection + 0.5f ) ) );
 }
 
+// Appends a scale to the transform, mapping from full resolution pixels
+// to the proxy level specified by the context. The inverse of the result
+// then accounts for the larger footprint of each proxy pixel when filtering.
+M33f proxyTransform( const M33f &transform, const Gaffer::Context *context )
+{
+	const int proxyLevel = ImagePlug::proxyLevel( context );
+	if( !proxyLevel )
+	{
+		return transform;
+	}
+	return transform * M33f().setScale( V2f( 1.0f / (float)( 1 << proxyLevel ) ) );
+}
+
 } // namespace
 
 //////////////////////////////////////////////////////////////////////////
@@ -206,26 +219,38 @@ void Checkerboard::affects( const Gaffer::Plug *input, AffectedPlugsContainer &o
 	}
 }
 
+bool Checkerboard::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void Checkerboard::hashFormat( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	FlatImageSource::hashFormat( output, context, h );
 	h.append( formatPlug()->hash() );
+	h.append( ImagePlug::proxyLevel( context ) );
 }
 
 GafferImage::Format Checkerboard::computeFormat( const Gaffer::Context *context, const ImagePlug *parent ) const
 {
-	return formatPlug()->getValue();
+	const Format format = formatPlug()->getValue();
+	if( const int proxyLevel = ImagePlug::proxyLevel( context ) )
+	{
+		return Format( ImagePlug::proxyBox( format.getDisplayWindow(), proxyLevel ), format.getPixelAspect() );
+	}
+	return format;
 }
 
 void Checkerboard::hashDataWindow( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	FlatImageSource::hashDataWindow( output, context, h );
 	h.append( formatPlug()->hash() );
+	h.append( ImagePlug::proxyLevel( context ) );
 }
 
 Imath::Box2i Checkerboard::computeDataWindow( const Gaffer::Context *context, const ImagePlug *parent ) const
 {
-	return formatPlug()->getValue().getDisplayWindow();
+	return ImagePlug::proxyBox( formatPlug()->getValue().getDisplayWindow(), ImagePlug::proxyLevel( context ) );
 }
 
 IECore::ConstCompoundDataPtr Checkerboard::computeMetadata( const Gaffer::Context *context, const ImagePlug *parent ) const
@@ -273,7 +298,7 @@ void Checkerboard::hashChannelData( const GafferImage::ImagePlug *output, const
 	colorBPlug()->getChild( channelIndex )->hash( h );
 
 	h.append( sizePlug()->getValue() );
-	transformPlug()->hash( h );
+	h.append( proxyTransform( transformPlug()->matrix(), context ) );
 }
 
 IECore::ConstFloatVectorDataPtr Checkerboard::computeChannelData( const std::string &channelName, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent ) const
@@ -283,7 +308,7 @@ IECore::ConstFloatVectorDataPtr Checkerboard::computeChannelData( const std::str
 	const float valueA = colorAPlug()->getChild( channelIndex )->getValue();
 	const float valueB = colorBPlug()->getChild( channelIndex )->getValue();
 	const V2f size = sizePlug()->getValue();
-	const M33f transform = transformPlug()->matrix();
+	const M33f transform = proxyTransform( transformPlug()->matrix(), context );
 	const M33f inverseTransform = transform.inverse();
 
 	V2f baseA( 1, 0 );
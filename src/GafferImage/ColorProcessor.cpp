@@ -136,6 +136,11 @@ void ColorProcessor::affects( const Gaffer::Plug *input, AffectedPlugsContainer
 	}
 }
 
+bool ColorProcessor::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void ColorProcessor::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	ImageProcessor::hash( output, context, h );
@@ -321,6 +326,49 @@ IECore::ConstFloatVectorDataPtr ColorProcessor::computeChannelData( const std::s
 	return boost::static_pointer_cast<const FloatVectorData>( colorData->members()[ImageAlgo::colorIndex( baseName)] );
 }
 
+void ColorProcessor::computeChannelDataBatch( const std::vector<std::string> &channelNames, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent, std::vector<IECore::ConstFloatVectorDataPtr> &channelData ) const
+{
+	// Rather than computing each channel individually, which would
+	// require R, G and B to separately hash and retrieve the same
+	// color data, we retrieve the color data once for each layer.
+
+	vector<pair<string, ConstObjectVectorPtr>> layerColorData;
+
+	ImagePlug::ChannelDataScope channelDataScope( context );
+	for( const auto &channel : channelNames )
+	{
+		channelDataScope.setChannelName( &channel );
+
+		const std::string &channels = channelsPlug()->getValue();
+		const std::string &baseName = ImageAlgo::baseName( channel );
+
+		if(
+			( baseName != "R" && baseName != "G" && baseName != "B" ) ||
+			!StringAlgo::matchMultiple( channel, channels )
+		)
+		{
+			// Auxiliary channel, or not in channel mask. Pass through.
+			channelData.push_back( inPlug()->channelDataPlug()->getValue() );
+			continue;
+		}
+
+		const std::string layerName = ImageAlgo::layerName( channel );
+		auto it = std::find_if(
+			layerColorData.begin(), layerColorData.end(),
+			[&layerName] ( const pair<string, ConstObjectVectorPtr> &l ) { return l.first == layerName; }
+		);
+		if( it == layerColorData.end() )
+		{
+			Context::EditableScope layerScope( context );
+			layerScope.set( g_layerNameKey, &layerName );
+			layerColorData.push_back( { layerName, boost::static_pointer_cast<const ObjectVector>( colorDataPlug()->getValue() ) } );
+			it = layerColorData.end() - 1;
+		}
+
+		channelData.push_back( boost::static_pointer_cast<const FloatVectorData>( it->second->members()[ImageAlgo::colorIndex( baseName )] ) );
+	}
+}
+
 bool ColorProcessor::affectsColorData( const Gaffer::Plug *input ) const
 {
 	return input == inPlug()->channelDataPlug() || input == inPlug()->channelNamesPlug() || input == processUnpremultipliedPlug();
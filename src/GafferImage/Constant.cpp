@@ -119,26 +119,38 @@ void Constant::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outpu
 	}
 }
 
+bool Constant::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void Constant::hashFormat( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	FlatImageSource::hashFormat( output, context, h );
 	h.append( formatPlug()->hash() );
+	h.append( ImagePlug::proxyLevel( context ) );
 }
 
 GafferImage::Format Constant::computeFormat( const Gaffer::Context *context, const ImagePlug *parent ) const
 {
-	return formatPlug()->getValue();
+	const Format format = formatPlug()->getValue();
+	if( const int proxyLevel = ImagePlug::proxyLevel( context ) )
+	{
+		return Format( ImagePlug::proxyBox( format.getDisplayWindow(), proxyLevel ), format.getPixelAspect() );
+	}
+	return format;
 }
 
 void Constant::hashDataWindow( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	FlatImageSource::hashDataWindow( output, context, h );
 	h.append( formatPlug()->hash() );
+	h.append( ImagePlug::proxyLevel( context ) );
 }
 
 Imath::Box2i Constant::computeDataWindow( const Gaffer::Context *context, const ImagePlug *parent ) const
 {
-	return formatPlug()->getValue().getDisplayWindow();
+	return ImagePlug::proxyBox( formatPlug()->getValue().getDisplayWindow(), ImagePlug::proxyLevel( context ) );
 }
 
 IECore::ConstCompoundDataPtr Constant::computeMetadata( const Gaffer::Context *context, const ImagePlug *parent ) const
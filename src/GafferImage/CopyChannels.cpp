@@ -157,6 +157,11 @@ void CopyChannels::affects( const Gaffer::Plug *input, AffectedPlugsContainer &o
 	}
 }
 
+bool CopyChannels::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void CopyChannels::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	FlatImageProcessor::hash( output, context, h );
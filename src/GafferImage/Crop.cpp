@@ -41,6 +41,8 @@
 #include "GafferImage/FormatPlug.h"
 #include "GafferImage/Offset.h"
 
+#include "Gaffer/Context.h"
+
 using namespace Imath;
 using namespace IECore;
 using namespace Gaffer;
@@ -237,6 +239,11 @@ void Crop::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs )
 
 }
 
+bool Crop::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void Crop::hashFormat( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	if ( ! affectDisplayWindowPlug()->getValue() )
@@ -252,6 +259,7 @@ void Crop::hashFormat( const GafferImage::ImagePlug *parent, const Gaffer::Conte
 	inPlug()->formatPlug()->hash( h );
 	cropWindowPlug()->hash( h );
 	offsetPlug()->hash( h );
+	h.append( ImagePlug::proxyLevel( context ) );
 }
 
 GafferImage::Format Crop::computeFormat( const Gaffer::Context *context, const ImagePlug *parent ) const
@@ -269,6 +277,11 @@ GafferImage::Format Crop::computeFormat( const Gaffer::Context *context, const I
 	displayWindow.max += offset;
 	displayWindow.min += offset;
 
+	if( const int proxyLevel = ImagePlug::proxyLevel( context ) )
+	{
+		displayWindow = ImagePlug::proxyBox( displayWindow, proxyLevel );
+	}
+
 	return GafferImage::Format( displayWindow, inPlug()->formatPlug()->getValue().getPixelAspect() );
 }
 
@@ -278,6 +291,11 @@ void Crop::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context
 
 	if ( output == cropWindowPlug() )
 	{
+		// The crop window is always computed at full resolution, and
+		// is adjusted for proxy levels where it is used.
+		Context::EditableScope fullResolutionScope( context );
+		fullResolutionScope.remove( ImagePlug::proxyLevelContextName );
+
 		int areaSource = areaSourcePlug()->getValue();
 
 		switch ( areaSource )
@@ -318,10 +336,14 @@ void Crop::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context
 		inPlug()->dataWindowPlug()->hash( h );
 		cropWindowPlug()->hash( h );
 		affectDataWindowPlug()->hash( h );
+		h.append( ImagePlug::proxyLevel( context ) );
 	}
 	else if( output->parent<Plug>() == offsetPlug() )
 	{
+		// The offset is computed at full resolution, and the
+		// internal Offset node adjusts it for proxy levels.
 		ImagePlug::GlobalScope c( context );
+		c.remove( ImagePlug::proxyLevelContextName );
 		affectDisplayWindowPlug()->hash( h );
 		resetOriginPlug()->hash( h );
 		cropWindowPlug()->hash( h );
@@ -336,6 +358,9 @@ void Crop::compute( Gaffer::ValuePlug *output, const Gaffer::Context *context )
 {
 	if ( output == cropWindowPlug() )
 	{
+		Context::EditableScope fullResolutionScope( context );
+		fullResolutionScope.remove( ImagePlug::proxyLevelContextName );
+
 		int areaSource = areaSourcePlug()->getValue();
 		Imath::Box2i cropWindow;
 
@@ -379,7 +404,7 @@ void Crop::compute( Gaffer::ValuePlug *output, const Gaffer::Context *context )
 
 		if( enabledPlug()->getValue() )
 		{
-			const Box2i cropWindow = cropWindowPlug()->getValue();
+			const Box2i cropWindow = ImagePlug::proxyBox( cropWindowPlug()->getValue(), ImagePlug::proxyLevel( context ) );
 			if( affectDataWindowPlug()->getValue() )
 			{
 				result = BufferAlgo::intersection( result, cropWindow );
@@ -391,6 +416,7 @@ void Crop::compute( Gaffer::ValuePlug *output, const Gaffer::Context *context )
 	else if( output->parent<Plug>() == offsetPlug() )
 	{
 		ImagePlug::GlobalScope c( context );
+		c.remove( ImagePlug::proxyLevelContextName );
 		V2i offset( 0 );
 		if( affectDisplayWindowPlug()->getValue() )
 		{
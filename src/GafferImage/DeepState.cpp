@@ -923,6 +923,11 @@ void DeepState::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outp
 	}
 }
 
+bool DeepState::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return !inPlug()->deep();
+}
+
 void DeepState::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	ImageProcessor::hash( output, context, h );
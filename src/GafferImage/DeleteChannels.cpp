@@ -106,6 +106,11 @@ void DeleteChannels::affects( const Gaffer::Plug *input, AffectedPlugsContainer
 	}
 }
 
+bool DeleteChannels::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void DeleteChannels::hashChannelNames( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	ImageProcessor::hashChannelNames( output, context, h );
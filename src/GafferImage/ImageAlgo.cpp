@@ -67,7 +67,7 @@ class CopyTile
 				m_dataWindow( dataWindow )
 		{}
 
-		void operator()( const ImagePlug *imagePlug, const string &channelName, const Imath::V2i &tileOrigin )
+		void operator()( const ImagePlug *imagePlug, const Imath::V2i &tileOrigin )
 		{
 			const Imath::Box2i tileBound( tileOrigin, tileOrigin + Imath::V2i( ImagePlug::tileSize() ) );
 			const Imath::Box2i b = BufferAlgo::intersection( tileBound, m_dataWindow );
@@ -75,17 +75,18 @@ class CopyTile
 			const size_t imageStride = m_dataWindow.size().x;
 			const size_t tileStrideSize = sizeof(float) * b.size().x;
 
-			const int channelIndex = std::find( m_channelNames.begin(), m_channelNames.end(), channelName ) - m_channelNames.begin();
-			float *channelBegin = m_imageChannelData[channelIndex];
-
-			IECore::ConstFloatVectorDataPtr tileData = imagePlug->channelDataPlug()->getValue();
-			const float *tileDataBegin = &(tileData->readable()[0]);
-
-			for( int y = b.min.y; y < b.max.y; y++ )
+			const vector<IECore::ConstFloatVectorDataPtr> tileData = imagePlug->channelData( m_channelNames, tileOrigin );
+			for( size_t channelIndex = 0; channelIndex < m_channelNames.size(); ++channelIndex )
 			{
-				const float *tilePtr = tileDataBegin + ( y - tileOrigin.y ) * ImagePlug::tileSize() + ( b.min.x - tileOrigin.x );
-				float *channelPtr = channelBegin + ( m_dataWindow.size().y - ( 1 + y - m_dataWindow.min.y ) ) * imageStride + ( b.min.x - m_dataWindow.min.x );
-				std::memcpy( channelPtr, tilePtr, tileStrideSize );
+				float *channelBegin = m_imageChannelData[channelIndex];
+				const float *tileDataBegin = &(tileData[channelIndex]->readable()[0]);
+
+				for( int y = b.min.y; y < b.max.y; y++ )
+				{
+					const float *tilePtr = tileDataBegin + ( y - tileOrigin.y ) * ImagePlug::tileSize() + ( b.min.x - tileOrigin.x );
+					float *channelPtr = channelBegin + ( m_dataWindow.size().y - ( 1 + y - m_dataWindow.min.y ) ) * imageStride + ( b.min.x - m_dataWindow.min.x );
+					std::memcpy( channelPtr, tilePtr, tileStrideSize );
+				}
 			}
 		}
 
@@ -185,7 +186,7 @@ IECoreImage::ImagePrimitivePtr GafferImage::ImageAlgo::image( const ImagePlug *i
 	}
 
 	CopyTile copyTile( imageChannelData, channelNames, dataWindow );
-	ImageAlgo::parallelProcessTiles( imagePlug, channelNames, copyTile, dataWindow );
+	ImageAlgo::parallelProcessTiles( imagePlug, copyTile, dataWindow );
 
 	return result;
 
@@ -224,14 +225,14 @@ IECore::MurmurHash GafferImage::ImageAlgo::imageHash( const ImagePlug *imagePlug
 	}
 
 	ImageAlgo::parallelGatherTiles(
-		imagePlug, channelNames,
+		imagePlug,
 		// Tile
-		[] ( const ImagePlug *imageP, const string &channelName, const Imath::V2i &tileOrigin )
+		[ &channelNames ] ( const ImagePlug *imageP, const Imath::V2i &tileOrigin )
 		{
-			return imageP->channelDataPlug()->hash();
+			return imageP->channelDataHash( channelNames, tileOrigin );
 		},
 		// Gather
-		[ &result ] ( const ImagePlug *imageP, const string &channelName, const Imath::V2i &tileOrigin, const IECore::MurmurHash &tileHash )
+		[ &result ] ( const ImagePlug *imageP, const Imath::V2i &tileOrigin, const IECore::MurmurHash &tileHash )
 		{
 			result.append( tileHash );
 		},
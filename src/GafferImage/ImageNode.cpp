@@ -37,17 +37,95 @@
 
 #include "GafferImage/ImageNode.h"
 
+#include "GafferImage/BufferAlgo.h"
 #include "GafferImage/FormatPlug.h"
 
 #include "Gaffer/Context.h"
+#include "Gaffer/Process.h"
 #include "Gaffer/ScriptNode.h"
 
+#include "IECore/Canceller.h"
+
 using namespace std;
 using namespace Imath;
 using namespace IECore;
 using namespace GafferImage;
 using namespace Gaffer;
 
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// Removes the proxy level from the context, so that we can access
+// the full resolution image.
+struct FullResolutionScope : public ImagePlug::ChannelDataScope
+{
+
+	FullResolutionScope( const Context *context )
+		:	ChannelDataScope( context )
+	{
+		remove( ImagePlug::proxyLevelContextName );
+	}
+
+};
+
+// Process used to compute a batch of channels via `computeChannelDataBatch()`,
+// so that it is visible to monitors and exceptions are reported in the
+// same way as they are for the individual channel computes.
+class ChannelDataBatchProcess : public Process
+{
+
+	public :
+
+		template<typename F>
+		ChannelDataBatchProcess( const ImagePlug *parent, F &&f )
+			:	Process( staticType, parent->channelDataPlug() )
+		{
+			try
+			{
+				IECore::Canceller::check( context()->canceller() );
+				f();
+			}
+			catch( ... )
+			{
+				handleException();
+			}
+		}
+
+		static const InternedString staticType;
+
+};
+
+const InternedString ChannelDataBatchProcess::staticType( "imageNode:channelDataBatch" );
+
+void throwIfDeep( const ImagePlug *image )
+{
+	if( image->deep() )
+	{
+		throw IECore::Exception( "Proxy levels are not supported for deep images" );
+	}
+}
+
+// Returns the region of the full resolution data window that is
+// covered by the proxy tile at `tileOrigin`.
+Box2i fullResolutionRegion( const V2i &tileOrigin, int proxyLevel, const Box2i &dataWindow )
+{
+	const Box2i result = BufferAlgo::intersection(
+		Box2i( tileOrigin * ( 1 << proxyLevel ), ( tileOrigin + V2i( ImagePlug::tileSize() ) ) * ( 1 << proxyLevel ) ),
+		dataWindow
+	);
+	return BufferAlgo::empty( result ) ? Box2i() : result;
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// ImageNode
+//////////////////////////////////////////////////////////////////////////
+
 GAFFER_NODE_DEFINE_TYPE( ImageNode );
 
 size_t ImageNode::g_firstPlugIndex = 0;
@@ -89,6 +167,11 @@ bool ImageNode::enabled() const
 	return enabledPlug()->getValue();
 };
 
+bool ImageNode::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return false;
+}
+
 void ImageNode::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	const ImagePlug *imagePlug = output->parent<ImagePlug>();
@@ -99,6 +182,13 @@ void ImageNode::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *co
 	}
 	if( imagePlug && enabledValue )
 	{
+		const int proxyLevel = ImagePlug::proxyLevel( context );
+		if( proxyLevel && !supportsProxyLevel( context ) )
+		{
+			hashProxy( output, imagePlug, proxyLevel, context, h );
+			return;
+		}
+
 		// We don't call ComputeNode::hash() immediately here, because for subclasses which
 		// want to pass through a specific hash in the hash*() methods it's a waste of time (the
 		// hash will get overwritten anyway). Instead we call ComputeNode::hash() in our
@@ -206,6 +296,13 @@ void ImageNode::compute( ValuePlug *output, const Context *context ) const
 		return;
 	}
 
+	const int proxyLevel = ImagePlug::proxyLevel( context );
+	if( proxyLevel && !supportsProxyLevel( context ) )
+	{
+		computeProxy( output, imagePlug, proxyLevel, context );
+		return;
+	}
+
 	// node is enabled - defer to our derived classes to perform the appropriate computation
 
 	if( output == imagePlug->formatPlug() )
@@ -270,6 +367,182 @@ void ImageNode::compute( ValuePlug *output, const Context *context ) const
 	}
 }
 
+void ImageNode::computeChannelDataBatch( const std::vector<std::string> &channelNames, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent, std::vector<IECore::ConstFloatVectorDataPtr> &channelData ) const
+{
+	ImagePlug::ChannelDataScope channelDataScope( context );
+	for( const auto &channelName : channelNames )
+	{
+		channelDataScope.setChannelName( &channelName );
+		channelData.push_back( parent->channelDataPlug()->getValue() );
+	}
+}
+
+bool ImageNode::channelDataBatch( const std::vector<std::string> &channelNames, const Gaffer::Context *context, const ImagePlug *parent, std::vector<IECore::ConstFloatVectorDataPtr> &channelData ) const
+{
+	bool enabledValue;
+	{
+		ImagePlug::GlobalScope c( context );
+		enabledValue = enabled();
+	}
+
+	const int proxyLevel = ImagePlug::proxyLevel( context );
+	if( !enabledValue || ( proxyLevel && !supportsProxyLevel( context ) ) )
+	{
+		// The output is passed through or computed by our automatic
+		// downsampling, so we can't use the derived class implementation.
+		return false;
+	}
+
+	const V2i &tileOrigin = context->get<V2i>( ImagePlug::tileOriginContextName );
+	if( tileOrigin.x % ImagePlug::tileSize() || tileOrigin.y % ImagePlug::tileSize() )
+	{
+		throw Exception( "The image:tileOrigin must be a multiple of ImagePlug::tileSize()" );
+	}
+
+	ChannelDataBatchProcess process(
+		parent,
+		[&] {
+			computeChannelDataBatch( channelNames, tileOrigin, context, parent, channelData );
+		}
+	);
+	return true;
+}
+
+void ImageNode::hashProxy( const Gaffer::ValuePlug *output, const ImagePlug *parent, int proxyLevel, const Gaffer::Context *context, IECore::MurmurHash &h ) const
+{
+	FullResolutionScope fullResolutionScope( context );
+
+	if( output == parent->formatPlug() || output == parent->dataWindowPlug() )
+	{
+		ComputeNode::hash( output, context, h );
+		output->hash( h );
+		h.append( proxyLevel );
+	}
+	else if( output == parent->channelDataPlug() )
+	{
+		throwIfDeep( parent );
+
+		ComputeNode::hash( output, context, h );
+		h.append( proxyLevel );
+
+		const V2i tileOrigin = context->get<V2i>( ImagePlug::tileOriginContextName );
+		h.append( tileOrigin );
+
+		const Box2i region = fullResolutionRegion( tileOrigin, proxyLevel, parent->dataWindow() );
+		h.append( region );
+
+		V2i fullResolutionTileOrigin;
+		for( fullResolutionTileOrigin.y = ImagePlug::tileOrigin( region.min ).y; fullResolutionTileOrigin.y < region.max.y; fullResolutionTileOrigin.y += ImagePlug::tileSize() )
+		{
+			for( fullResolutionTileOrigin.x = ImagePlug::tileOrigin( region.min ).x; fullResolutionTileOrigin.x < region.max.x; fullResolutionTileOrigin.x += ImagePlug::tileSize() )
+			{
+				fullResolutionScope.setTileOrigin( &fullResolutionTileOrigin );
+				output->hash( h );
+			}
+		}
+	}
+	else
+	{
+		// Metadata, channel names and deep are independent of
+		// resolution, as are the sample offsets for flat images.
+		if( output == parent->sampleOffsetsPlug() )
+		{
+			throwIfDeep( parent );
+		}
+		h = output->hash();
+	}
+}
+
+void ImageNode::computeProxy( Gaffer::ValuePlug *output, const ImagePlug *parent, int proxyLevel, const Gaffer::Context *context ) const
+{
+	FullResolutionScope fullResolutionScope( context );
+
+	if( output == parent->formatPlug() )
+	{
+		const Format format = parent->formatPlug()->getValue();
+		static_cast<AtomicFormatPlug *>( output )->setValue(
+			Format( ImagePlug::proxyBox( format.getDisplayWindow(), proxyLevel ), format.getPixelAspect() )
+		);
+	}
+	else if( output == parent->dataWindowPlug() )
+	{
+		static_cast<AtomicBox2iPlug *>( output )->setValue(
+			ImagePlug::proxyBox( parent->dataWindowPlug()->getValue(), proxyLevel )
+		);
+	}
+	else if( output == parent->channelDataPlug() )
+	{
+		throwIfDeep( parent );
+
+		// Each proxy pixel is the average of the block of full resolution
+		// pixels it covers. We accumulate the full resolution tiles into the
+		// proxy tile one at a time, treating pixels outside the data window
+		// as black.
+
+		const V2i tileOrigin = context->get<V2i>( ImagePlug::tileOriginContextName );
+		const Box2i region = fullResolutionRegion( tileOrigin, proxyLevel, parent->dataWindow() );
+
+		FloatVectorDataPtr resultData = new FloatVectorData( vector<float>( ImagePlug::tilePixels(), 0.0f ) );
+		vector<float> &result = resultData->writable();
+
+		V2i fullResolutionTileOrigin;
+		for( fullResolutionTileOrigin.y = ImagePlug::tileOrigin( region.min ).y; fullResolutionTileOrigin.y < region.max.y; fullResolutionTileOrigin.y += ImagePlug::tileSize() )
+		{
+			for( fullResolutionTileOrigin.x = ImagePlug::tileOrigin( region.min ).x; fullResolutionTileOrigin.x < region.max.x; fullResolutionTileOrigin.x += ImagePlug::tileSize() )
+			{
+				Canceller::check( context->canceller() );
+
+				fullResolutionScope.setTileOrigin( &fullResolutionTileOrigin );
+				ConstFloatVectorDataPtr tileData = parent->channelDataPlug()->getValue();
+				const vector<float> &tile = tileData->readable();
+
+				const Box2i tileRegion = BufferAlgo::intersection(
+					region, Box2i( fullResolutionTileOrigin, fullResolutionTileOrigin + V2i( ImagePlug::tileSize() ) )
+				);
+
+				for( int y = tileRegion.min.y; y < tileRegion.max.y; ++y )
+				{
+					const float *in = &tile[ImagePlug::pixelIndex( V2i( tileRegion.min.x, y ), fullResolutionTileOrigin )];
+					float *out = &result[ImagePlug::pixelIndex( V2i( 0, y >> proxyLevel ), V2i( 0, tileOrigin.y ) )];
+					for( int x = tileRegion.min.x; x < tileRegion.max.x; ++x )
+					{
+						out[(x >> proxyLevel) - tileOrigin.x] += *in++;
+					}
+				}
+			}
+		}
+
+		const float scale = 1.0f / (float)( 1 << ( 2 * proxyLevel ) );
+		for( auto &v : result )
+		{
+			v *= scale;
+		}
+
+		static_cast<FloatVectorDataPlug *>( output )->setValue( resultData );
+	}
+	else if( output == parent->metadataPlug() )
+	{
+		// Metadata, channel names and deep are independent of resolution,
+		// as are the sample offsets for flat images. So we output the full
+		// resolution values directly, evaluating them in `fullResolutionScope`
+		// rather than recursing to ourselves at the same proxy level.
+		static_cast<AtomicCompoundDataPlug *>( output )->setValue( parent->metadataPlug()->getValue() );
+	}
+	else if( output == parent->channelNamesPlug() )
+	{
+		static_cast<StringVectorDataPlug *>( output )->setValue( parent->channelNamesPlug()->getValue() );
+	}
+	else if( output == parent->deepPlug() )
+	{
+		static_cast<BoolPlug *>( output )->setValue( parent->deepPlug()->getValue() );
+	}
+	else if( output == parent->sampleOffsetsPlug() )
+	{
+		throwIfDeep( parent );
+		static_cast<IntVectorDataPlug *>( output )->setValue( parent->sampleOffsetsPlug()->getValue() );
+	}
+}
+
 GafferImage::Format ImageNode::computeFormat( const Gaffer::Context *context, const ImagePlug *parent ) const
 {
 	throw IECore::NotImplementedException( string( typeName() ) + "::computeFormat" );
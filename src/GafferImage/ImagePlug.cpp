@@ -42,6 +42,7 @@
 #include "GafferImage/BufferAlgo.h"
 #include "GafferImage/FormatPlug.h"
 #include "GafferImage/ImageAlgo.h"
+#include "GafferImage/ImageNode.h"
 
 #include "Gaffer/Context.h"
 #include "Gaffer/ContextAlgo.h"
@@ -61,6 +62,7 @@ GAFFER_PLUG_DEFINE_TYPE( ImagePlug );
 
 const IECore::InternedString ImagePlug::channelNameContextName = "image:channelName";
 const IECore::InternedString ImagePlug::tileOriginContextName = "image:tileOrigin";
+const IECore::InternedString ImagePlug::proxyLevelContextName = "image:proxyLevel";
 
 static ContextAlgo::GlobalScope::Registration g_globalScopeRegistration(
 	ImagePlug::staticTypeId(),
@@ -283,6 +285,27 @@ const Gaffer::FloatVectorDataPlug *ImagePlug::channelDataPlug() const
 	return getChild<FloatVectorDataPlug>( g_firstPlugIndex+6 );
 }
 
+int ImagePlug::proxyLevel( const Gaffer::Context *context )
+{
+	return context->get<int>( proxyLevelContextName, 0 );
+}
+
+Imath::Box2i ImagePlug::proxyBox( const Imath::Box2i &box, int proxyLevel )
+{
+	if( BufferAlgo::empty( box ) )
+	{
+		return Box2i();
+	}
+
+	// Arithmetic shifts round towards negative infinity, giving
+	// us the floor of the division for the min, and we negate
+	// around the shift to get the ceiling for the max.
+	return Box2i(
+		V2i( box.min.x >> proxyLevel, box.min.y >> proxyLevel ),
+		V2i( -( -box.max.x >> proxyLevel ), -( -box.max.y >> proxyLevel ) )
+	);
+}
+
 ImagePlug::GlobalScope::GlobalScope( const Gaffer::Context *context )
 	:   EditableScope( context )
 {
@@ -344,6 +367,112 @@ IECore::MurmurHash ImagePlug::channelDataHash( const std::string &channelName, c
 	return channelDataPlug()->hash();
 }
 
+std::vector<IECore::ConstFloatVectorDataPtr> ImagePlug::channelData( const std::vector<std::string> &channelNames, const Imath::V2i &tile ) const
+{
+	ChannelDataScope channelDataScope( Context::current() );
+	channelDataScope.setTileOrigin( &tile );
+
+	std::vector<IECore::ConstFloatVectorDataPtr> result( channelNames.size() );
+
+	const FloatVectorDataPlug *source = channelDataPlug()->source<FloatVectorDataPlug>();
+	const ImagePlug *sourceImage = source->parent<ImagePlug>();
+	const ImageNode *node = sourceImage ? runTimeCast<const ImageNode>( sourceImage->node() ) : nullptr;
+	if( !node || source->direction() != Plug::Out )
+	{
+		for( size_t i = 0; i < channelNames.size(); ++i )
+		{
+			channelDataScope.setChannelName( &channelNames[i] );
+			result[i] = channelDataPlug()->getValue();
+		}
+		return result;
+	}
+
+	// The channel data is computed by an ImageNode, so we give it the
+	// opportunity to compute all the channels at once. We only ask it
+	// for the channels which aren't already in the compute cache, and
+	// store the results in the cache so that they are available to
+	// subsequent calls to `channelDataPlug()->getValue()`. When the
+	// output is uncached, there is nothing to be found in the cache,
+	// so we don't waste time hashing each channel to look it up.
+
+	const bool uncached = node->computeCachePolicy( source ) == ValuePlug::CachePolicy::Uncached;
+
+	std::vector<IECore::MurmurHash> hashes;
+	std::vector<size_t> missingIndices;
+	missingIndices.reserve( channelNames.size() );
+	if( uncached )
+	{
+		for( size_t i = 0; i < channelNames.size(); ++i )
+		{
+			missingIndices.push_back( i );
+		}
+	}
+	else
+	{
+		hashes.resize( channelNames.size() );
+		for( size_t i = 0; i < channelNames.size(); ++i )
+		{
+			channelDataScope.setChannelName( &channelNames[i] );
+			hashes[i] = channelDataPlug()->hash();
+			result[i] = boost::static_pointer_cast<const FloatVectorData>( getCachedObjectValue( channelDataPlug(), hashes[i] ) );
+			if( !result[i] )
+			{
+				missingIndices.push_back( i );
+			}
+		}
+	}
+
+	if( missingIndices.size() > 1 )
+	{
+		std::vector<std::string> missingChannelNames;
+		missingChannelNames.reserve( missingIndices.size() );
+		for( size_t i : missingIndices )
+		{
+			missingChannelNames.push_back( channelNames[i] );
+		}
+
+		ChannelDataScope batchScope( Context::current() );
+		batchScope.remove( channelNameContextName );
+		std::vector<IECore::ConstFloatVectorDataPtr> batchResult;
+		batchResult.reserve( missingIndices.size() );
+		if( node->channelDataBatch( missingChannelNames, Context::current(), sourceImage, batchResult ) )
+		{
+			for( size_t j = 0; j < missingIndices.size(); ++j )
+			{
+				const size_t i = missingIndices[j];
+				if( !uncached )
+				{
+					setCachedObjectValue( channelDataPlug(), hashes[i], batchResult[j] );
+				}
+				result[i] = batchResult[j];
+			}
+			return result;
+		}
+	}
+
+	for( size_t i : missingIndices )
+	{
+		channelDataScope.setChannelName( &channelNames[i] );
+		result[i] = channelDataPlug()->getValue( uncached ? nullptr : &hashes[i] );
+	}
+
+	return result;
+}
+
+IECore::MurmurHash ImagePlug::channelDataHash( const std::vector<std::string> &channelNames, const Imath::V2i &tile ) const
+{
+	ChannelDataScope channelDataScope( Context::current() );
+	channelDataScope.setTileOrigin( &tile );
+
+	IECore::MurmurHash result;
+	for( const auto &channelName : channelNames )
+	{
+		channelDataScope.setChannelName( &channelName );
+		channelDataPlug()->hash( result );
+	}
+	return result;
+}
+
 GafferImage::Format ImagePlug::format() const
 {
 	GlobalScope globalScope( Context::current() );
@@ -138,6 +138,7 @@ ImageReader::ImageReader( const std::string &name )
 	addChild( endPlug );
 
 	addChild( new StringPlug( "colorSpace" ) );
+	addChild( new IntPlug( "cachePrecision", Plug::In, Float, /* min */ Float, /* max */ Automatic ) );
 
 	addChild( new AtomicCompoundDataPlug( "__intermediateMetadata", Plug::In, new CompoundData, Plug::Default & ~Plug::Serialisable ) );
 	addChild( new StringPlug( "__intermediateColorSpace", Plug::Out, "", Plug::Default & ~Plug::Serialisable ) );
@@ -151,6 +152,7 @@ ImageReader::ImageReader( const std::string &name )
 	oiioReader->fileNamePlug()->setInput( fileNamePlug() );
 	oiioReader->refreshCountPlug()->setInput( refreshCountPlug() );
 	oiioReader->missingFrameModePlug()->setInput( missingFrameModePlug() );
+	oiioReader->cachePrecisionPlug()->setInput( cachePrecisionPlug() );
 	intermediateMetadataPlug()->setInput( oiioReader->outPlug()->metadataPlug() );
 
 	ColorSpacePtr colorSpace = new ColorSpace( "__colorSpace" );
@@ -247,54 +249,64 @@ const StringPlug *ImageReader::colorSpacePlug() const
 	return getChild<StringPlug>( g_firstChildIndex + 5 );
 }
 
+IntPlug *ImageReader::cachePrecisionPlug()
+{
+	return getChild<IntPlug>( g_firstChildIndex + 6 );
+}
+
+const IntPlug *ImageReader::cachePrecisionPlug() const
+{
+	return getChild<IntPlug>( g_firstChildIndex + 6 );
+}
+
 AtomicCompoundDataPlug *ImageReader::intermediateMetadataPlug()
 {
-	return getChild<AtomicCompoundDataPlug>( g_firstChildIndex + 6 );
+	return getChild<AtomicCompoundDataPlug>( g_firstChildIndex + 7 );
 }
 
 const AtomicCompoundDataPlug *ImageReader::intermediateMetadataPlug() const
 {
-	return getChild<AtomicCompoundDataPlug>( g_firstChildIndex + 6 );
+	return getChild<AtomicCompoundDataPlug>( g_firstChildIndex + 7 );
 }
 
 StringPlug *ImageReader::intermediateColorSpacePlug()
 {
-	return getChild<StringPlug>( g_firstChildIndex + 7 );
+	return getChild<StringPlug>( g_firstChildIndex + 8 );
 }
 
 const StringPlug *ImageReader::intermediateColorSpacePlug() const
 {
-	return getChild<StringPlug>( g_firstChildIndex + 7 );
+	return getChild<StringPlug>( g_firstChildIndex + 8 );
 }
 
 ImagePlug *ImageReader::intermediateImagePlug()
 {
-	return getChild<ImagePlug>( g_firstChildIndex + 8 );
+	return getChild<ImagePlug>( g_firstChildIndex + 9 );
 }
 
 const ImagePlug *ImageReader::intermediateImagePlug() const
 {
-	return getChild<ImagePlug>( g_firstChildIndex + 8 );
+	return getChild<ImagePlug>( g_firstChildIndex + 9 );
 }
 
 OpenImageIOReader *ImageReader::oiioReader()
 {
-	return getChild<OpenImageIOReader>( g_firstChildIndex + 9 );
+	return getChild<OpenImageIOReader>( g_firstChildIndex + 10 );
 }
 
 const OpenImageIOReader *ImageReader::oiioReader() const
 {
-	return getChild<OpenImageIOReader>( g_firstChildIndex + 9 );
+	return getChild<OpenImageIOReader>( g_firstChildIndex + 10 );
 }
 
 ColorSpace *ImageReader::colorSpace()
 {
-	return getChild<ColorSpace>( g_firstChildIndex + 10 );
+	return getChild<ColorSpace>( g_firstChildIndex + 11 );
 }
 
 const ColorSpace *ImageReader::colorSpace() const
 {
-	return getChild<ColorSpace>( g_firstChildIndex + 10 );
+	return getChild<ColorSpace>( g_firstChildIndex + 11 );
 }
 
 size_t ImageReader::supportedExtensions( std::vector<std::string> &extensions )
@@ -348,6 +360,11 @@ void ImageReader::affects( const Plug *input, AffectedPlugsContainer &outputs )
 	}
 }
 
+bool ImageReader::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void ImageReader::hash( const ValuePlug *output, const Context *context, IECore::MurmurHash &h ) const
 {
 	ImageNode::hash( output, context, h );
@@ -387,6 +404,19 @@ void ImageReader::compute( ValuePlug *output, const Context *context ) const
 	}
 }
 
+Gaffer::ValuePlug::CachePolicy ImageReader::computeCachePolicy( const Gaffer::ValuePlug *output ) const
+{
+	if( output == outPlug()->channelDataPlug() )
+	{
+		// Our channel data is just a pass-through of the intermediate
+		// image, which is already cached by our internal nodes. Caching
+		// it again would duplicate it, and would also store a float copy
+		// of any tiles our reader is caching at half precision.
+		return ValuePlug::CachePolicy::Uncached;
+	}
+	return ImageNode::computeCachePolicy( output );
+}
+
 void ImageReader::hashFormat( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	FrameMaskScope scope( context, this, /* clampBlack = */ true );
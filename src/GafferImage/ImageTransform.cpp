@@ -86,6 +86,21 @@ Box2f transform( const Box2f &b, const M33f &m )
 	return r;
 }
 
+// Adjusts a matrix in full resolution pixel space for use at the proxy
+// level specified by the context. Scale and rotation are unchanged, but
+// the translation must be reduced to match the proxy resolution. This is
+// equivalent to the adjustment the internal Resample makes itself.
+M33f proxyMatrix( const M33f &matrix, const Gaffer::Context *context )
+{
+	M33f result = matrix;
+	if( const int proxyLevel = ImagePlug::proxyLevel( context ) )
+	{
+		result[2][0] /= (float)( 1 << proxyLevel );
+		result[2][1] /= (float)( 1 << proxyLevel );
+	}
+	return result;
+}
+
 Imath::Box2i samplerWindow( const Imath::V2i &tileOrigin, const Imath::M33f &samplerMatrix )
 {
 	const Box2f tileBound( tileOrigin, tileOrigin + V2i( ImagePlug::tileSize() ) );
@@ -451,6 +466,11 @@ void ImageTransform::compute( ValuePlug *output, const Context *context ) const
 	FlatImageProcessor::compute( output, context );
 }
 
+bool ImageTransform::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void ImageTransform::hashDeep( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	// We need the CleanScope here because `hash/computeChannelData()` both use a Sampler,
@@ -486,7 +506,7 @@ void ImageTransform::hashDataWindow( const GafferImage::ImagePlug *parent, const
 	{
 		FlatImageProcessor::hashDataWindow( parent, context, h );
 		inPlug()->dataWindowPlug()->hash( h );
-		h.append( matrix );
+		h.append( proxyMatrix( matrix, context ) );
 	}
 }
 
@@ -511,7 +531,7 @@ Imath::Box2i ImageTransform::computeDataWindow( const Gaffer::Context *context,
 		{
 			return in;
 		}
-		return box2fToBox2i( transform( Box2f( V2f( in.min ), V2f( in.max ) ), matrix ) );
+		return box2fToBox2i( transform( Box2f( V2f( in.min ), V2f( in.max ) ), proxyMatrix( matrix, context ) ) );
 	}
 }
 
@@ -535,7 +555,7 @@ void ImageTransform::hashChannelData( const GafferImage::ImagePlug *parent, cons
 		// Rotation of the resampled input.
 		FlatImageProcessor::hashChannelData( parent, context, h );
 
-		const M33f samplerMatrix = matrix.inverse() * resampleMatrix;
+		const M33f samplerMatrix = proxyMatrix( matrix, context ).inverse() * proxyMatrix( resampleMatrix, context );
 
 		Sampler sampler(
 			resampledInPlug(),
@@ -566,7 +586,7 @@ IECore::ConstFloatVectorDataPtr ImageTransform::computeChannelData( const std::s
 	{
 		// Rotation of the resampled input.
 
-		const M33f samplerMatrix = matrix.inverse() * resampleMatrix;
+		const M33f samplerMatrix = proxyMatrix( matrix, context ).inverse() * proxyMatrix( resampleMatrix, context );
 
 		Sampler sampler(
 			resampledInPlug(),
@@ -63,6 +63,7 @@
 #include "tbb/spin_mutex.h"
 
 #include <memory>
+#include <unordered_map>
 
 #include <sys/utsname.h>
 #include <zlib.h>
@@ -155,30 +156,47 @@ void copyDeepArea(
 
 typedef std::shared_ptr<ImageOutput> ImageOutputPtr;
 
-class TileSampleOffsetsProcessor
+class FlatTileProcessor
 {
+	// Computes all channels for a tile together, so that nodes which
+	// process several channels at once can provide them in a single
+	// operation. See `ImageNode::computeChannelDataBatch()`.
 	public:
-		typedef ConstIntVectorDataPtr Result;
+		typedef std::vector<ConstFloatVectorDataPtr> Result;
 
-		TileSampleOffsetsProcessor() {}
+		FlatTileProcessor( const std::vector<std::string> &channelNames ) : m_channelNames( channelNames ) {}
 
 		Result operator()( const ImagePlug *imagePlug, const V2i &tileOrigin ) const
 		{
-			return imagePlug->sampleOffsetsPlug()->getValue();
+			return imagePlug->channelData( m_channelNames, tileOrigin );
 		}
+
+	private:
+
+		const std::vector<std::string> &m_channelNames;
 };
 
-class TileChannelDataProcessor
+// Adapts a writer which accepts one channel at a time, so that it can
+// gather the results of FlatTileProcessor.
+template<typename ChannelWriter>
+class FlatTileGatherer
 {
 	public:
-		typedef ConstFloatVectorDataPtr Result;
 
-		TileChannelDataProcessor() {}
+		FlatTileGatherer( ChannelWriter &writer, const std::vector<std::string> &channelNames ) : m_writer( writer ), m_channelNames( channelNames ) {}
 
-		ConstFloatVectorDataPtr operator()( const ImagePlug *imagePlug, const string &channelName, const V2i &tileOrigin ) const
+		void operator()( const ImagePlug *imagePlug, const V2i &tileOrigin, const FlatTileProcessor::Result &channelData )
 		{
-			return imagePlug->channelDataPlug()->getValue();
+			for( size_t i = 0; i < m_channelNames.size(); ++i )
+			{
+				m_writer( imagePlug, m_channelNames[i], tileOrigin, channelData[i] );
+			}
 		}
+
+	private:
+
+		ChannelWriter &m_writer;
+		const std::vector<std::string> &m_channelNames;
 };
 
 struct V2iHash
@@ -190,17 +208,35 @@ struct V2iHash
 	}
 };
 
-class SampleOffsetsAccumulator
+// The sample offsets and channel data for a single deep tile.
+struct DeepTileData
 {
+	ConstIntVectorDataPtr sampleOffsets;
+	std::vector<ConstFloatVectorDataPtr> channelData;
+};
+
+class DeepTileProcessor
+{
+	// Computes the sample offsets and all channels for a tile together, so
+	// that deep images can be written in a single streaming pass, rather than
+	// requiring the sample offsets for the entire image to be computed
+	// up front.
 	public:
-		typedef std::unordered_map<Imath::V2i, ConstIntVectorDataPtr, V2iHash> Result;
+		typedef DeepTileData Result;
 
-		void operator()( const ImagePlug *imagePlug, const V2i &tileOrigin, ConstIntVectorDataPtr sampleOffsets )
+		DeepTileProcessor( const std::vector<std::string> &channelNames ) : m_channelNames( channelNames ) {}
+
+		Result operator()( const ImagePlug *imagePlug, const V2i &tileOrigin ) const
 		{
-			m_sampleOffsets[tileOrigin] = sampleOffsets;
+			DeepTileData result;
+			result.sampleOffsets = imagePlug->sampleOffsetsPlug()->getValue();
+			result.channelData = imagePlug->channelData( m_channelNames, tileOrigin );
+			return result;
 		}
 
-		Result m_sampleOffsets;
+	private:
+
+		const std::vector<std::string> &m_channelNames;
 };
 
 class FlatTileWriter
@@ -216,10 +252,10 @@ class FlatTileWriter
 	// possibility that multiple output tiles may be contained within a single
 	// Gaffer tile.
 	//
-	// The instance of the class stores a vector of tile data storage vectors,
-	// all of which start off empty. We only allocate the space for the tiles
-	// when we need to start filling them, and free the space once the tiles
-	// have been written to the ImageOutput. We also store a vector of bool
+	// The instance of the class stores a vector of pointers to tile data, all
+	// of which start off null. We only allocate the tiles when we need to start
+	// filling them, and free them once they have been written to the
+	// ImageOutput, so that at most a row of output tiles is held in memory. We also store a vector of bool
 	// values (m_tilesFilled) to determine which output tiles have been filled
 	// with data, and are therefore ready to write.
 	//
@@ -266,11 +302,6 @@ class FlatTileWriter
 		{
 			m_tilesData.resize( m_numTiles.x * m_numTiles.y );
 			m_tilesFilled.resize( m_numTiles.x * m_numTiles.y, false );
-
-			for( size_t i = 0; i < m_tilesData.size(); ++i )
-			{
-				m_tilesData[i] = new FloatVectorData;
-			}
 		}
 
 		void finish()
@@ -278,13 +309,13 @@ class FlatTileWriter
 			for( size_t tileIndex = m_nextTileIndex; tileIndex < m_tilesData.size(); ++tileIndex )
 			{
 				Imath::V2i tileOrigin = outTileOrigin( tileIndex );
-				if( !m_tilesData[tileIndex]->readable().empty() )
+				if( m_tilesData[tileIndex] )
 				{
 					writeTile( tileOrigin, m_tilesData[tileIndex] );
 				}
 				else
 				{
-					// If the tileData object hasn't been resized, then
+					// If the tileData object hasn't been allocated, then
 					// we have never even tried to write data to this
 					// tile, so write the static black tile.
 					writeTile( tileOrigin, blackTile() );
@@ -314,11 +345,12 @@ class FlatTileWriter
 					size_t tileIndex = outTileIndex( outTileOrig );
 					Imath::Box2i outTileBnds = outTileBounds( tileIndex );
 
-					vector<float> &tile = m_tilesData[tileIndex]->writable();
-					if( tile.empty() )
+					FloatVectorDataPtr &tileData = m_tilesData[tileIndex];
+					if( !tileData )
 					{
-						tile.resize( m_spec.tile_width * m_spec.tile_height * m_spec.channelnames.size(), 0. );
+						tileData = new FloatVectorData( vector<float>( m_spec.tile_width * m_spec.tile_height * m_spec.channelnames.size(), 0. ) );
 					}
+					vector<float> &tile = tileData->writable();
 
 					Imath::Box2i copyArea( BufferAlgo::intersection( m_processWindow, BufferAlgo::intersection( inTileBounds, outTileBnds ) ) );
 
@@ -403,12 +435,12 @@ class FlatTileWriter
 			{
 				Imath::V2i tileOrigin = outTileOrigin( tileIndex );
 
-				if( m_tilesFilled[tileIndex] )
+				if( m_tilesFilled[tileIndex] && m_tilesData[tileIndex] )
 				{
 					writeTile( tileOrigin, m_tilesData[tileIndex] );
 					m_tilesData[tileIndex].reset();
 				}
-				else if( !BufferAlgo::intersects( m_inputTilesBounds, outTileBounds( tileIndex ) ) )
+				else if( m_tilesFilled[tileIndex] || !BufferAlgo::intersects( m_inputTilesBounds, outTileBounds( tileIndex ) ) )
 				{
 					writeTile( tileOrigin, blackTile() );
 				}
@@ -584,31 +616,34 @@ class FlatScanlineWriter
 class DeepTileWriter
 {
 	// This class is created to be used by parallelGatherTiles, and called
-	// in series for each Gaffer tile/channel from the top down.
+	// in series for each Gaffer tile from the top down.
 	//
 	// The tile traversal logic is identical to FlatTileWriter above, with the
 	// difference that all tiles will be fully covered by input tiles ( because
 	// the data windows are expected to match, since EXR supports setting the
 	// data window ).
+	//
+	// Because we need to set all the sample counts for an output tile before
+	// copying any channel data into it, we can't copy input tiles as they
+	// arrive. Instead we hold onto the input tiles until all the output tiles
+	// they overlap have been filled and written, so that only the input tiles
+	// covering the current row of output tiles are held in memory.
 
 	public:
 		DeepTileWriter(
 				ImageOutputPtr out,
 				const std::string &fileName,
 				const Imath::Box2i &processWindow,
-				const GafferImage::Format &format,
-				const SampleOffsetsAccumulator::Result &sampleOffsets
+				const GafferImage::Format &format
 			) :
 				m_out( out ),
 				m_fileName( fileName ),
 				m_format( format ),
 				m_spec( m_out->spec() ),
 				m_processWindow( processWindow ),
-				m_sampleOffsets( sampleOffsets ),
 				m_outputDataWindow( m_format.fromEXRSpace( Imath::Box2i( Imath::V2i( m_spec.x, m_spec.y ), Imath::V2i( m_spec.x + m_spec.width - 1, m_spec.y + m_spec.height - 1 ) ) ) ),
 				m_numTiles( Imath::V2i( (int)ceil( float( m_spec.width ) / m_spec.tile_width ), (int)ceil( float( m_spec.height ) / m_spec.tile_height ) ) ),
 				m_nextTileIndex( 0 ),
-				m_tilesData( m_numTiles.x * m_numTiles.y),
 				m_tilesFilled( m_numTiles.x * m_numTiles.y, false )
 		{
 			if( BufferAlgo::empty( m_processWindow ) )
@@ -620,60 +655,20 @@ class DeepTileWriter
 				assert( m_spec.width == 1 && m_spec.height == 1 );
 
 				prepOutTile( 0 );
-				writeDeepTile( outTileOrigin( 0 ), m_tilesData[0] );
+				writeDeepTile( outTileOrigin( 0 ), m_tileData );
 			}
 		}
 
-		void operator()( const ImagePlug *imagePlug, const string &channelName, const V2i &tileOrigin, ConstFloatVectorDataPtr data )
+		void operator()( const ImagePlug *imagePlug, const V2i &tileOrigin, const DeepTileData &tileData )
 		{
-			const size_t channelIndex = std::find( m_spec.channelnames.begin(), m_spec.channelnames.end(), channelName ) - m_spec.channelnames.begin();
-
-			const Imath::Box2i inTileBounds( tileOrigin, tileOrigin + Imath::V2i( ImagePlug::tileSize() ) );
+			assert( tileData.sampleOffsets->readable().back() == (int)tileData.channelData[0]->readable().size() );
 
-			Box2i writeRegion = BufferAlgo::intersection( m_outputDataWindow, inTileBounds );
-			const Imath::V2i outTileSize( m_spec.tile_width, m_spec.tile_height );
-			Box2i tilesWrite(
-				outTileOriginContaining( writeRegion.min ),
-				outTileOriginContaining( writeRegion.max - Imath::V2i( 1 ) ) + outTileSize
-			);
-
-			Imath::V2i outTileOrig( tilesWrite.min.x, tilesWrite.max.y - m_spec.tile_height );
+			m_inputTiles[tileOrigin] = tileData;
 
-			const std::vector<int> &sampleOffsets = m_sampleOffsets.at( tileOrigin )->readable();
-			assert( sampleOffsets.back() == (int)data->readable().size() );
-
-			// For any output tiles that overlap this input tile, copy the overlapping area into
-			// the output tile
-			for( ; outTileOrig.y >= tilesWrite.min.y; outTileOrig.y -= m_spec.tile_height )
-			{
-				for( outTileOrig.x = tilesWrite.min.x; outTileOrig.x < tilesWrite.max.x; outTileOrig.x += m_spec.tile_width )
-				{
-					size_t tileIndex = outTileIndex( outTileOrig );
-
-					if( !m_tilesData[tileIndex].pixels() )
-					{
-						prepOutTile( tileIndex );
-					}
-
-					Imath::Box2i outTileBnds = outTileBounds( tileIndex );
-					Imath::Box2i copyArea( BufferAlgo::intersection( m_processWindow, BufferAlgo::intersection( inTileBounds, outTileBnds ) ) );
-
-					V2i offset = copyArea.min - tileOrigin;
-					const int inOffsetPos = offset.y * ImagePlug::tileSize() + offset.x;
-
-					const int outStartIndex = ( outTileBnds.max.y - copyArea.max.y ) * outTileBnds.size().x + copyArea.min.x - outTileBnds.min.x;
-					copyDeepArea(
-						&sampleOffsets[0], &data->readable()[0], inOffsetPos, copyArea.size(),
-						m_tilesData[tileIndex], outStartIndex, outTileBnds.size().x, channelIndex
-					);
-				}
-			}
-
-			if( channelIndex == ( m_spec.channelnames.size() - 1 ) )
-			{
-				flagFilledTiles( inTileBounds );
-				writeFilledTiles();
-			}
+			const Imath::Box2i inTileBounds( tileOrigin, tileOrigin + Imath::V2i( ImagePlug::tileSize() ) );
+			flagFilledTiles( inTileBounds );
+			writeFilledTiles();
+			releaseInputTiles();
 		}
 
 	private:
@@ -704,10 +699,18 @@ class DeepTileWriter
 			return BufferAlgo::intersection( m_outputDataWindow, Imath::Box2i( origin, origin + Imath::V2i( m_spec.tile_width, m_spec.tile_height ) ) );
 		}
 
+		// Returns the index of the last output tile to be written which overlaps the
+		// specified input tile. Output tiles are written from the top left to the
+		// bottom right, so this is the one containing the bottom right pixel.
+		inline size_t lastOutTileIndex( const Imath::V2i &inTileOrigin ) const
+		{
+			const Imath::Box2i region = BufferAlgo::intersection( m_outputDataWindow, Imath::Box2i( inTileOrigin, inTileOrigin + Imath::V2i( ImagePlug::tileSize() ) ) );
+			return outTileIndex( outTileOriginContaining( Imath::V2i( region.max.x - 1, region.min.y ) ) );
+		}
 
 		void flagFilledTiles( const Imath::Box2i &inTileBounds )
 		{
-			for( size_t i = m_nextTileIndex; i < m_tilesData.size(); ++i )
+			for( size_t i = m_nextTileIndex; i < m_tilesFilled.size(); ++i )
 			{
 				if( !m_tilesFilled[i] )
 				{
@@ -727,14 +730,13 @@ class DeepTileWriter
 		void writeFilledTiles()
 		{
 			size_t tileIndex;
-			for( tileIndex = m_nextTileIndex; tileIndex < m_tilesData.size(); ++tileIndex )
+			for( tileIndex = m_nextTileIndex; tileIndex < m_tilesFilled.size(); ++tileIndex )
 			{
-				Imath::V2i tileOrigin = outTileOrigin( tileIndex );
-
 				if( m_tilesFilled[tileIndex] )
 				{
-					writeDeepTile( tileOrigin, m_tilesData[tileIndex] );
-					m_tilesData[tileIndex].clear();
+					prepOutTile( tileIndex );
+					fillOutTile( tileIndex );
+					writeDeepTile( outTileOrigin( tileIndex ), m_tileData );
 				}
 				else
 				{
@@ -745,21 +747,35 @@ class DeepTileWriter
 			m_nextTileIndex = tileIndex;
 		}
 
+		// Discards any input tiles which are no longer needed because all the
+		// output tiles they overlap have been written.
+		void releaseInputTiles()
+		{
+			for( auto it = m_inputTiles.begin(); it != m_inputTiles.end(); )
+			{
+				if( lastOutTileIndex( it->first ) < m_nextTileIndex )
+				{
+					it = m_inputTiles.erase( it );
+				}
+				else
+				{
+					++it;
+				}
+			}
+		}
+
 		// Prepare the deep data for an outputTile.  We need to set all the pixel sizes before setting any
 		// channel data, because changing pixel sizes after setting data would trigger a full reallocation
 		void prepOutTile( int tileIndex )
 		{
-			const Imath::V2i targetTileSize( m_spec.tile_width, m_spec.tile_height );
-
 			Box2i outTileBnds = outTileBounds( tileIndex );
 
 			int numPixels = outTileBnds.size().x * outTileBnds.size().y;
 
-			DeepData &curTile = m_tilesData[tileIndex];
 			if (int(m_spec.channelformats.size()) == m_spec.nchannels)
 			{
 				// Init with format specified per channel
-				curTile.init(
+				m_tileData.init(
 					numPixels, m_spec.channelnames.size(),
 					m_spec.channelformats, m_spec.channelnames
 				);
@@ -767,7 +783,7 @@ class DeepTileWriter
 			else
 			{
 				// Init with global format
-				curTile.init(
+				m_tileData.init(
 					numPixels, m_spec.channelnames.size(),
 					m_spec.format, m_spec.channelnames
 				);
@@ -795,14 +811,14 @@ class DeepTileWriter
 					V2i pixelOffset = pixelCoord - tileOrigin;
 					int pixelIndex = pixelOffset.y * ImagePlug::tileSize() + pixelOffset.x;
 
-					const vector<int> &offsets = m_sampleOffsets.at(tileOrigin)->readable();
+					const vector<int> &offsets = m_inputTiles.at( tileOrigin ).sampleOffsets->readable();
 
 					int subScanlineLength = std::min( ImagePlug::tileSize() - pixelOffset.x, outTileBnds.max.x - pixelCoord.x );
 					int prevOffset = pixelIndex > 0 ? offsets[pixelIndex - 1] : 0;
 					for( int j = 0; j < subScanlineLength; j++ )
 					{
 						int offset = offsets[ pixelIndex + j ];
-						curTile.set_samples( i, offset - prevOffset);
+						m_tileData.set_samples( i, offset - prevOffset);
 						prevOffset = offset;
 						i++;
 					}
@@ -811,6 +827,44 @@ class DeepTileWriter
 			}
 		}
 
+		// Copy the channel data from all the input tiles overlapping an output tile.
+		void fillOutTile( int tileIndex )
+		{
+			const Imath::Box2i outTileBnds = outTileBounds( tileIndex );
+			const Imath::Box2i fillRegion = BufferAlgo::intersection( m_processWindow, outTileBnds );
+			if( BufferAlgo::empty( fillRegion ) )
+			{
+				return;
+			}
+
+			V2i tileOrigin;
+			const V2i minTileOrigin = ImagePlug::tileOrigin( fillRegion.min );
+			const V2i maxTileOrigin = ImagePlug::tileOrigin( fillRegion.max - V2i( 1 ) );
+			for( tileOrigin.y = minTileOrigin.y; tileOrigin.y <= maxTileOrigin.y; tileOrigin.y += ImagePlug::tileSize() )
+			{
+				for( tileOrigin.x = minTileOrigin.x; tileOrigin.x <= maxTileOrigin.x; tileOrigin.x += ImagePlug::tileSize() )
+				{
+					const DeepTileData &inTile = m_inputTiles.at( tileOrigin );
+					const std::vector<int> &sampleOffsets = inTile.sampleOffsets->readable();
+
+					const Imath::Box2i inTileBounds( tileOrigin, tileOrigin + Imath::V2i( ImagePlug::tileSize() ) );
+					const Imath::Box2i copyArea( BufferAlgo::intersection( fillRegion, inTileBounds ) );
+
+					V2i offset = copyArea.min - tileOrigin;
+					const int inOffsetPos = offset.y * ImagePlug::tileSize() + offset.x;
+
+					const int outStartIndex = ( outTileBnds.max.y - copyArea.max.y ) * outTileBnds.size().x + copyArea.min.x - outTileBnds.min.x;
+					for( size_t channelIndex = 0; channelIndex < inTile.channelData.size(); ++channelIndex )
+					{
+						copyDeepArea(
+							&sampleOffsets[0], &inTile.channelData[channelIndex]->readable()[0], inOffsetPos, copyArea.size(),
+							m_tileData, outStartIndex, outTileBnds.size().x, channelIndex
+						);
+					}
+				}
+			}
+		}
+
 		void writeDeepTile( const Imath::V2i &tileOrigin, const DeepData &tileData ) const
 		{
 			Imath::V2i exrTileOrigin = m_format.toEXRSpace( tileOrigin + Imath::V2i( 0, m_spec.tile_height - 1 ) );
@@ -831,43 +885,40 @@ class DeepTileWriter
 		const GafferImage::Format &m_format;
 		const ImageSpec m_spec;
 		const Imath::Box2i m_processWindow;
-		const SampleOffsetsAccumulator::Result &m_sampleOffsets;
 		const Imath::Box2i m_outputDataWindow;
 		const Imath::V2i m_numTiles;
 		size_t m_nextTileIndex;
-		std::vector<DeepData> m_tilesData;
 		std::vector<bool> m_tilesFilled;
+		std::unordered_map<Imath::V2i, DeepTileData, V2iHash> m_inputTiles;
+		DeepData m_tileData;
 };
 
 class DeepScanlineWriter
 {
 	// This class is created to be used by parallelGatherTiles and called in
-	// series for each Gaffer tile/channel from the top down.
+	// series for each Gaffer tile from the top down.
 	//
 	// The deep variant assumes that the dataWindow of the file matches the
 	// Gaffer data window ( since the only deep format we support is EXR, and
 	// EXR allows us to set the data window ).
 	//
-	// It stores an OpenImageIO::DeepData big enough to hold ImagePlug::tileSize()
-	// scanlines. As it receives each tile, it copies the data into the
-	// appropriate location in the buffer. When it's copied the last channel
-	// of the last tile of each row, it writes all of the data from the buffer
-	// into the ImageOutput object.
+	// It holds onto the tiles it receives until it has a complete row. It then
+	// prepares an OpenImageIO::DeepData big enough to hold ImagePlug::tileSize()
+	// scanlines, copies the data for the row into it, and writes it into the
+	// ImageOutput object. So at most a single row of tiles is held in memory.
 
 	public:
 		DeepScanlineWriter(
 				ImageOutputPtr out,
 				const std::string &fileName,
 				const Imath::Box2i &processWindow,
-				const GafferImage::Format &format,
-				const SampleOffsetsAccumulator::Result &sampleOffsets
+				const GafferImage::Format &format
 			) :
 				m_out( out ),
 				m_fileName( fileName ),
 				m_format( format ),
 				m_spec( m_out->spec() ),
-				m_processWindow( processWindow ),
-				m_sampleOffsets( sampleOffsets )
+				m_processWindow( processWindow )
 		{
 			if( BufferAlgo::empty( m_processWindow ) )
 			{
@@ -886,35 +937,28 @@ class DeepScanlineWriter
 			else
 			{
 				m_chunkY = m_format.toEXRSpace( ImagePlug::tileOrigin( processWindow.max - V2i( 1 ) ).y + ImagePlug::tileSize() ) + 1;
-				prepChunk();
+				m_minTileOriginX = ImagePlug::tileOrigin( processWindow.min ).x;
+				m_rowTiles.resize( ( ImagePlug::tileOrigin( processWindow.max - V2i( 1 ) ).x - m_minTileOriginX ) / ImagePlug::tileSize() + 1 );
 			}
 		}
 
-		void operator()( const ImagePlug *imagePlug, const string &channelName, const V2i &tileOrigin, ConstFloatVectorDataPtr data )
+		void operator()( const ImagePlug *imagePlug, const V2i &tileOrigin, const DeepTileData &tileData )
 		{
-			const size_t channelIndex = std::find( m_spec.channelnames.begin(), m_spec.channelnames.end(), channelName ) - m_spec.channelnames.begin();
-
-			const Imath::Box2i inTileBounds( tileOrigin, tileOrigin + Imath::V2i( ImagePlug::tileSize() ) );
+			assert( tileData.sampleOffsets->readable().back() == (int)tileData.channelData[0]->readable().size() );
 
-			Imath::Box2i copyArea( BufferAlgo::intersection( m_processWindow, inTileBounds ) );
-
-			const std::vector<int> &sampleOffsets = m_sampleOffsets.at( tileOrigin )->readable();
-			assert( sampleOffsets.back() == (int)data->readable().size() );
-			V2i offset = copyArea.min - tileOrigin;
-			const int inOffsetPos = offset.y * ImagePlug::tileSize() + offset.x;
-
-			// Copy into the chunk the region of this tile that overlaps the process window ( which for
-			// deep is always the data window )
-			copyDeepArea(
-				&sampleOffsets[0], &data->readable()[0], inOffsetPos, copyArea.size(), m_deepData,
-				copyArea.min.x - m_processWindow.min.x, m_spec.width, channelIndex
-			);
+			m_rowTiles[rowTileIndex( tileOrigin )] = tileData;
 
 			// Do the write once we receive the final tile for this row
-			V2i maxTileOrigin = ImagePlug::tileOrigin( m_processWindow.max - V2i( 1 ) );
-			if( channelIndex == ( m_spec.channelnames.size() - 1 ) && tileOrigin.x == maxTileOrigin.x )
+			if( rowTileIndex( tileOrigin ) == m_rowTiles.size() - 1 )
 			{
+				prepChunk();
+				fillChunk( tileOrigin.y );
 				writeDeepScanlines();
+
+				for( auto &rowTile : m_rowTiles )
+				{
+					rowTile = DeepTileData();
+				}
 			}
 		}
 
@@ -924,6 +968,11 @@ class DeepScanlineWriter
 			return std::pair<int,int>( std::max( m_chunkY, m_spec.y ), std::min( m_chunkY + ImagePlug::tileSize(), m_spec.height + m_spec.y ) );
 		}
 
+		inline size_t rowTileIndex( const Imath::V2i &tileOrigin ) const
+		{
+			return ( tileOrigin.x - m_minTileOriginX ) / ImagePlug::tileSize();
+		}
+
 		// Prepare the next chunk of scanlines.  This is a piece of DeepData which is up to tileSize pixels tall,
 		// and the width of the image.  We need to set all the pixel sizes before set any channel data, because
 		// changing pixel sizes after setting data would trigger a full reallocation
@@ -976,7 +1025,7 @@ class DeepScanlineWriter
 					V2i pixelOffset = pixelCoord - tileOrigin;
 					int pixelIndex = pixelOffset.y * ImagePlug::tileSize() + pixelOffset.x;
 
-					const vector<int> &offsets = m_sampleOffsets.at(tileOrigin)->readable();
+					const vector<int> &offsets = m_rowTiles[rowTileIndex( tileOrigin )].sampleOffsets->readable();
 
 					int subScanlineLength = std::min( ImagePlug::tileSize() - pixelOffset.x, m_spec.width - x );
 					int prevOffset = pixelIndex > 0 ? offsets[pixelIndex - 1] : 0;
@@ -992,6 +1041,32 @@ class DeepScanlineWriter
 			}
 		}
 
+		// Copy into the chunk the region of each tile in the row that overlaps the
+		// process window ( which for deep is always the data window )
+		void fillChunk( int tileOriginY )
+		{
+			for( size_t i = 0; i < m_rowTiles.size(); ++i )
+			{
+				const DeepTileData &rowTile = m_rowTiles[i];
+				const std::vector<int> &sampleOffsets = rowTile.sampleOffsets->readable();
+
+				const V2i tileOrigin( m_minTileOriginX + (int)i * ImagePlug::tileSize(), tileOriginY );
+				const Imath::Box2i inTileBounds( tileOrigin, tileOrigin + Imath::V2i( ImagePlug::tileSize() ) );
+				const Imath::Box2i copyArea( BufferAlgo::intersection( m_processWindow, inTileBounds ) );
+
+				V2i offset = copyArea.min - tileOrigin;
+				const int inOffsetPos = offset.y * ImagePlug::tileSize() + offset.x;
+
+				for( size_t channelIndex = 0; channelIndex < rowTile.channelData.size(); ++channelIndex )
+				{
+					copyDeepArea(
+						&sampleOffsets[0], &rowTile.channelData[channelIndex]->readable()[0], inOffsetPos, copyArea.size(), m_deepData,
+						copyArea.min.x - m_processWindow.min.x, m_spec.width, channelIndex
+					);
+				}
+			}
+		}
+
 		void writeDeepScanlines()
 		{
 			auto range = scanlineRange();
@@ -1002,7 +1077,6 @@ class DeepScanlineWriter
 
 			// Advance to next chunk
 			m_chunkY += ImagePlug::tileSize();
-			prepChunk();
 		}
 
 		ImageOutputPtr m_out;
@@ -1010,8 +1084,9 @@ class DeepScanlineWriter
 		const GafferImage::Format &m_format;
 		const ImageSpec m_spec;
 		const Imath::Box2i m_processWindow;
-		const SampleOffsetsAccumulator::Result &m_sampleOffsets;
 		int m_chunkY;
+		int m_minTileOriginX;
+		std::vector<DeepTileData> m_rowTiles;
 		DeepData m_deepData;
 };
 
@@ -1675,40 +1750,37 @@ void ImageWriter::execute() const
 
 	if( !deep )
 	{
-		TileChannelDataProcessor processor;
+		FlatTileProcessor processor( spec.channelnames );
 
 		if ( spec.tile_width == 0 )
 		{
 			FlatScanlineWriter flatScanlineWriter( out, fileName, processDataWindow, imageFormat );
-			ImageAlgo::parallelGatherTiles( appropriateColorSpaceNode->outPlug(), spec.channelnames, processor, flatScanlineWriter, processDataWindow, ImageAlgo::TopToBottom );
+			FlatTileGatherer<FlatScanlineWriter> gatherer( flatScanlineWriter, spec.channelnames );
+			ImageAlgo::parallelGatherTiles( appropriateColorSpaceNode->outPlug(), processor, gatherer, processDataWindow, ImageAlgo::TopToBottom );
 			flatScanlineWriter.finish();
 		}
 		else
 		{
 			FlatTileWriter flatTileWriter( out, fileName, processDataWindow, imageFormat );
-			ImageAlgo::parallelGatherTiles( appropriateColorSpaceNode->outPlug(), spec.channelnames, processor, flatTileWriter, processDataWindow, ImageAlgo::TopToBottom );
+			FlatTileGatherer<FlatTileWriter> gatherer( flatTileWriter, spec.channelnames );
+			ImageAlgo::parallelGatherTiles( appropriateColorSpaceNode->outPlug(), processor, gatherer, processDataWindow, ImageAlgo::TopToBottom );
 			flatTileWriter.finish();
 		}
 
 	}
 	else
 	{
-		TileSampleOffsetsProcessor sampleOffsetsProcessor;
-
-		SampleOffsetsAccumulator sampleOffsetsAccumulator;
-		ImageAlgo::parallelGatherTiles( appropriateColorSpaceNode->outPlug(), sampleOffsetsProcessor, sampleOffsetsAccumulator, processDataWindow );
-
-		TileChannelDataProcessor channelDataProcessor = TileChannelDataProcessor();
+		DeepTileProcessor processor( spec.channelnames );
 
 		if( spec.tile_width == 0 )
 		{
-			DeepScanlineWriter deepScanlineWriter( out, fileName, processDataWindow, imageFormat, sampleOffsetsAccumulator.m_sampleOffsets );
-			ImageAlgo::parallelGatherTiles( appropriateColorSpaceNode->outPlug(), spec.channelnames, channelDataProcessor, deepScanlineWriter, processDataWindow, ImageAlgo::TopToBottom );
+			DeepScanlineWriter deepScanlineWriter( out, fileName, processDataWindow, imageFormat );
+			ImageAlgo::parallelGatherTiles( appropriateColorSpaceNode->outPlug(), processor, deepScanlineWriter, processDataWindow, ImageAlgo::TopToBottom );
 		}
 		else
 		{
-			DeepTileWriter deepTileWriter( out, fileName, processDataWindow, imageFormat, sampleOffsetsAccumulator.m_sampleOffsets );
-			ImageAlgo::parallelGatherTiles( appropriateColorSpaceNode->outPlug(), spec.channelnames, channelDataProcessor, deepTileWriter, processDataWindow, ImageAlgo::TopToBottom );
+			DeepTileWriter deepTileWriter( out, fileName, processDataWindow, imageFormat );
+			ImageAlgo::parallelGatherTiles( appropriateColorSpaceNode->outPlug(), processor, deepTileWriter, processDataWindow, ImageAlgo::TopToBottom );
 		}
 	}
 
@@ -665,6 +665,11 @@ void Merge::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs
 	}
 }
 
+bool Merge::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void Merge::hashDataWindow( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	FlatImageProcessor::hashDataWindow( output, context, h );
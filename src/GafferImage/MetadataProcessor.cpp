@@ -70,6 +70,11 @@ void MetadataProcessor::affects( const Gaffer::Plug *input, AffectedPlugsContain
 	}
 }
 
+bool MetadataProcessor::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void MetadataProcessor::hashMetadata( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	ImageProcessor::hashMetadata( parent, context, h );
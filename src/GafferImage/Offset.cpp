@@ -47,6 +47,23 @@ using namespace IECore;
 using namespace Gaffer;
 using namespace GafferImage;
 
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// Returns the offset to apply at the proxy level specified by the context.
+// `supportsProxyLevel()` guarantees that the division is exact.
+V2i proxyOffset( const V2i &offset, const Gaffer::Context *context )
+{
+	const int proxyLevel = ImagePlug::proxyLevel( context );
+	return V2i( offset.x >> proxyLevel, offset.y >> proxyLevel );
+}
+
+} // namespace
+
 //////////////////////////////////////////////////////////////////////////
 // Offset node
 //////////////////////////////////////////////////////////////////////////
@@ -114,9 +131,16 @@ void Offset::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs
 	}
 }
 
-void Offset::hashDataWindow( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
+bool Offset::supportsProxyLevel( const Gaffer::Context *context ) const
 {
+	const int proxyScale = 1 << ImagePlug::proxyLevel( context );
 	const V2i offset = offsetPlug()->getValue();
+	return offset.x % proxyScale == 0 && offset.y % proxyScale == 0;
+}
+
+void Offset::hashDataWindow( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
+{
+	const V2i offset = proxyOffset( offsetPlug()->getValue(), context );
 	if( offset == V2i( 0 ) )
 	{
 		h = inPlug()->dataWindowPlug()->hash();
@@ -125,7 +149,7 @@ void Offset::hashDataWindow( const GafferImage::ImagePlug *parent, const Gaffer:
 	{
 		ImageProcessor::hashDataWindow( parent, context, h );
 		inPlug()->dataWindowPlug()->hash( h );
-		offsetPlug()->hash( h );
+		h.append( offset );
 	}
 }
 
@@ -134,7 +158,7 @@ Imath::Box2i Offset::computeDataWindow( const Gaffer::Context *context, const Im
 	Box2i dataWindow = inPlug()->dataWindowPlug()->getValue();
 	if( !dataWindow.isEmpty() )
 	{
-		const V2i offset = offsetPlug()->getValue();
+		const V2i offset = proxyOffset( offsetPlug()->getValue(), context );
 		dataWindow.min += offset;
 		dataWindow.max += offset;
 	}
@@ -145,7 +169,7 @@ void Offset::hashChannelData( const GafferImage::ImagePlug *parent, const Gaffer
 {
 	ImagePlug::ChannelDataScope offsetScope( context );
 
-	const V2i offset = offsetPlug()->getValue();
+	const V2i offset = proxyOffset( offsetPlug()->getValue(), context );
 	const V2i tileOrigin = context->get<V2i>( ImagePlug::tileOriginContextName );
 	if( offset.x % ImagePlug::tileSize() == 0 && offset.y % ImagePlug::tileSize() == 0 )
 	{
@@ -194,7 +218,7 @@ IECore::ConstFloatVectorDataPtr Offset::computeChannelData( const std::string &c
 {
 	ImagePlug::ChannelDataScope offsetScope( context );
 
-	const V2i offset = offsetPlug()->getValue();
+	const V2i offset = proxyOffset( offsetPlug()->getValue(), context );
 	if( offset.x % ImagePlug::tileSize() == 0 && offset.y % ImagePlug::tileSize() == 0 )
 	{
 		V2i offsetOrigin = tileOrigin - offset;
@@ -300,7 +324,7 @@ void Offset::hashSampleOffsets( const GafferImage::ImagePlug *parent, const Gaff
 		return;
 	}
 
-	const V2i offset = offsetPlug()->getValue();
+	const V2i offset = proxyOffset( offsetPlug()->getValue(), context );
 	const V2i tileOrigin = context->get<V2i>( ImagePlug::tileOriginContextName );
 	if( offset.x % ImagePlug::tileSize() == 0 && offset.y % ImagePlug::tileSize() == 0 )
 	{
@@ -349,7 +373,7 @@ IECore::ConstIntVectorDataPtr Offset::computeSampleOffsets( const Imath::V2i &ti
 		return ImagePlug::flatTileSampleOffsets();
 	}
 
-	const V2i offset = offsetPlug()->getValue();
+	const V2i offset = proxyOffset( offsetPlug()->getValue(), context );
 	if( ( offset.x % ImagePlug::tileSize() == 0 && offset.y % ImagePlug::tileSize() == 0 ) )
 	{
 		V2i offsetOrigin = tileOrigin - offset;
@@ -45,13 +45,16 @@
 
 #include "Gaffer/Context.h"
 #include "Gaffer/StringPlug.h"
+#include "Gaffer/TypedPlug.h"
 
 #include "IECoreImage/OpenImageIOAlgo.h"
 
+#include "IECore/Canceller.h"
 #include "IECore/Export.h"
 #include "IECore/FileSequence.h"
 #include "IECore/FileSequenceFunctions.h"
 #include "IECore/MessageHandler.h"
+#include "IECore/VectorTypedData.h"
 
 #include "OpenImageIO/imagecache.h"
 #include "OpenImageIO/deepdata.h"
@@ -63,6 +66,7 @@
 
 #include "tbb/mutex.h"
 
+#include <cstdlib>
 #include <memory>
 
 OIIO_NAMESPACE_USING
@@ -152,14 +156,18 @@ V2i coordinateDivide( V2i a, V2i b )
 // the origin ).
 //
 //
+class File;
+typedef std::shared_ptr<File> FilePtr;
+
 class File
 {
 
 	public:
 
-		// Create a File handle object for an image input and image spec
-		File( std::unique_ptr<ImageInput> imageInput, ImageSpec imageSpec, const std::string &infoFileName )
-			: m_imageInput( std::move( imageInput ) ), m_imageSpec( imageSpec )
+		// Create a File handle object for an image input and image spec. The image input
+		// must already be positioned at the first subimage of the specified MIP level.
+		File( std::unique_ptr<ImageInput> imageInput, ImageSpec imageSpec, const std::string &infoFileName, int mipLevel = 0 )
+			: m_imageInput( std::move( imageInput ) ), m_imageSpec( imageSpec ), m_fileName( infoFileName ), m_mipLevel( mipLevel )
 		{
 			std::vector<std::string> channelNames;
 
@@ -235,7 +243,7 @@ class File
 					break;
 				}
 				subImageIndex++;
-			} while( m_imageInput->seek_subimage( subImageIndex, 0, currentSpec ) );
+			} while( m_imageInput->seek_subimage( subImageIndex, m_mipLevel, currentSpec ) );
 
 			m_channelNamesData = new StringVectorData( channelNames );
 
@@ -265,8 +273,9 @@ class File
 		}
 
 
-		// Read a chunk of data from the file, formatted as a tile batch that will be stored on the tile batch plug
-		ConstObjectVectorPtr readTileBatch( V3i tileBatchIndex )
+		// Read a chunk of data from the file, formatted as a tile batch that will be stored on the tile batch plug.
+		// Flat tiles may be stored as HalfVectorData according to `cachePrecision`.
+		ConstObjectVectorPtr readTileBatch( V3i tileBatchIndex, OpenImageIOReader::CachePrecision cachePrecision )
 		{
 			V2i batchFirstTile = V2i( tileBatchIndex.x, tileBatchIndex.y ) * m_tileBatchSize;
 			Box2i targetRegion = Box2i( batchFirstTile * ImagePlug::tileSize(),
@@ -286,7 +295,8 @@ class File
 			std::vector<float> fileData;
 			DeepData fileDeepData;
 			Box2i fileDataRegion;
-			const int nchannels = readRegion( tileBatchIndex.z, targetRegion, fileData, fileDeepData, fileDataRegion );
+			std::vector<TypeDesc> channelFormats;
+			const int nchannels = readRegion( tileBatchIndex.z, targetRegion, fileData, fileDeepData, fileDataRegion, channelFormats );
 
 			// Pull data apart into tiles ( separate for each channel instead of interleaved )
 			int tileBatchNumElements = nchannels * m_tileBatchSize.y * m_tileBatchSize.x;
@@ -433,7 +443,18 @@ class File
 									dataIndex += nchannels;
 								}
 							}
-							resultChannels->members()[ subIndex ] = tileData;
+
+							if(
+								cachePrecision == OpenImageIOReader::Half ||
+								( cachePrecision == OpenImageIOReader::Automatic && channelFormats[c] == TypeDesc::HALF )
+							)
+							{
+								resultChannels->members()[ subIndex ] = new HalfVectorData( vector<half>( tile.begin(), tile.end() ) );
+							}
+							else
+							{
+								resultChannels->members()[ subIndex ] = tileData;
+							}
 						}
 						else
 						{
@@ -507,15 +528,28 @@ class File
 			return m_channelNamesData;
 		}
 
+		const std::string &fileName() const
+		{
+			return m_fileName;
+		}
+
+		// Returns the data window for `spec`, in Gaffer's coordinate system.
+		static Box2i dataWindow( const ImageSpec &spec )
+		{
+			const Box2i dataWindow( V2i( spec.x, spec.y ), V2i( spec.width + spec.x, spec.height + spec.y ) );
+			return flopDisplayWindow( dataWindow, spec.full_y, spec.full_height );
+		}
+
 	private:
 		// Fill the data vector ( for a flat image ) or the deepData object ( for a deep image )
 		// with all data for the specified subImage and target region,
 		// setting the dataRegion to represent the actual bounds of the data read ( which may have had to
-		// be enlarged to match tile boundaries ), and returning the number of channels read
+		// be enlarged to match tile boundaries ), filling channelFormats with the format each channel
+		// is stored with in the file, and returning the number of channels read
 		//
 		// This is currenly only used by readTileBatch below - we always cache to tile batches when reading
 		// channel data.
-		int readRegion( int subImage, const Box2i &targetRegion, std::vector<float> &data, DeepData &deepData, Box2i &dataRegion )
+		int readRegion( int subImage, const Box2i &targetRegion, std::vector<float> &data, DeepData &deepData, Box2i &dataRegion, std::vector<TypeDesc> &channelFormats )
 		{
 			/// \todo OIIO 2.0 introduces thread-safe `read_*()` methods that
 			/// are passed the subimage directly. Upgrade to use those and remove
@@ -523,7 +557,7 @@ class File
 			tbb::mutex::scoped_lock lock( m_mutex );
 
 			ImageSpec subImageSpec;
-			m_imageInput->seek_subimage( subImage, 0, subImageSpec );
+			m_imageInput->seek_subimage( subImage, m_mipLevel, subImageSpec );
 
 			const V2i fileDataOrigin( m_imageSpec.x, m_imageSpec.y );
 			const Box2i fileDataWindow( fileDataOrigin,
@@ -614,6 +648,12 @@ class File
 
 			dataRegion = flopDisplayWindow( fileDataRegion, m_imageSpec.full_y, m_imageSpec.full_height );
 
+			channelFormats.clear();
+			for( int c = 0; c < subImageSpec.nchannels; ++c )
+			{
+				channelFormats.push_back( subImageSpec.channelformat( c ) );
+			}
+
 			return subImageSpec.nchannels;
 		}
 
@@ -648,6 +688,8 @@ class File
 
 		std::unique_ptr<ImageInput> m_imageInput;
 		ImageSpec m_imageSpec;
+		const std::string m_fileName;
+		const int m_mipLevel;
 		ConstStringVectorDataPtr m_channelNamesData;
 		std::map<std::string, ChannelMapEntry> m_channelMap;
 		Imath::V2i m_tileBatchSize;
@@ -656,9 +698,6 @@ class File
 };
 
 
-
-typedef std::shared_ptr<File> FilePtr;
-
 // For success, file should be set, and error left null
 // For failure, file should be left null, and error should be set
 struct CacheEntry
@@ -668,10 +707,18 @@ struct CacheEntry
 };
 
 
-CacheEntry fileCacheGetter( const std::string &fileName, size_t &cost, const IECore::Canceller *canceller )
+// The file cache is keyed by file name and MIP level, so that
+// the MIP levels used for proxy images are counted against the
+// open files limit in the same way as full resolution files.
+typedef std::pair<std::string, int> FileCacheKey;
+
+CacheEntry fileCacheGetter( const FileCacheKey &key, size_t &cost, const IECore::Canceller *canceller )
 {
 	cost = 1;
 
+	const std::string &fileName = key.first;
+	const int mipLevel = key.second;
+
 	CacheEntry result;
 
 	ImageSpec imageSpec;
@@ -693,12 +740,56 @@ CacheEntry fileCacheGetter( const std::string &fileName, size_t &cost, const IEC
 		throw IECore::Exception( "OpenImageIOReader : " + fileName + " : GafferImage does not support 3D pixel arrays " );
 	}
 
-	result.file.reset( new File( std::move( imageInput ), imageSpec, fileName ) );
+	if( mipLevel )
+	{
+		const ImageSpec fullResolutionSpec = imageSpec;
+		if( fullResolutionSpec.deep || !imageInput->seek_subimage( 0, mipLevel, imageSpec ) )
+		{
+			result.error.reset( new std::string( "OpenImageIOReader : " + fileName + " : No MIP level " + std::to_string( mipLevel ) ) );
+			return result;
+		}
+
+		// MIP levels don't have a meaningful display window of their own,
+		// so we substitute the proxy display window. This makes the data
+		// window of the level directly comparable with the proxy data window.
+		const Box2i displayWindow = ImagePlug::proxyBox(
+			Box2i(
+				V2i( fullResolutionSpec.full_x, fullResolutionSpec.full_y ),
+				V2i( fullResolutionSpec.full_x + fullResolutionSpec.full_width, fullResolutionSpec.full_y + fullResolutionSpec.full_height )
+			),
+			mipLevel
+		);
+		imageSpec.full_x = displayWindow.min.x;
+		imageSpec.full_y = displayWindow.min.y;
+		imageSpec.full_width = displayWindow.size().x;
+		imageSpec.full_height = displayWindow.size().y;
+
+		// `proxyBox()` rounds partial pixels outwards, but EXR and OIIO
+		// round MIP level sizes down, so a 1080 line image has 67 lines
+		// at level 4 where the proxy data window has 68. We accept levels
+		// within a pixel of the proxy data window, reading them using
+		// their own data window. The missing partial pixels are treated
+		// as being outside the data window.
+		const Box2i mipDataWindow = File::dataWindow( imageSpec );
+		const Box2i proxyDataWindow = ImagePlug::proxyBox( File::dataWindow( fullResolutionSpec ), mipLevel );
+		const V2i minDifference = mipDataWindow.min - proxyDataWindow.min;
+		const V2i maxDifference = mipDataWindow.max - proxyDataWindow.max;
+		if(
+			std::abs( minDifference.x ) > 1 || std::abs( minDifference.y ) > 1 ||
+			std::abs( maxDifference.x ) > 1 || std::abs( maxDifference.y ) > 1
+		)
+		{
+			result.error.reset( new std::string( "OpenImageIOReader : " + fileName + " : MIP level " + std::to_string( mipLevel ) + " does not match proxy data window" ) );
+			return result;
+		}
+	}
+
+	result.file.reset( new File( std::move( imageInput ), imageSpec, fileName, mipLevel ) );
 
 	return result;
 }
 
-typedef IECorePreview::LRUCache<std::string, CacheEntry> FileHandleCache;
+typedef IECorePreview::LRUCache<FileCacheKey, CacheEntry> FileHandleCache;
 
 FileHandleCache *fileCache()
 {
@@ -719,7 +810,7 @@ FilePtr retrieveFile( std::string &fileName, OpenImageIOReader::MissingFrameMode
 	const std::string resolvedFileName = context->substitute( fileName );
 
 	FileHandleCache *cache = fileCache();
-	CacheEntry cacheEntry = cache->get( resolvedFileName );
+	CacheEntry cacheEntry = cache->get( FileCacheKey( resolvedFileName, 0 ) );
 	if( !cacheEntry.file )
 	{
 		if( mode == OpenImageIOReader::Black )
@@ -763,6 +854,26 @@ FilePtr retrieveFile( std::string &fileName, OpenImageIOReader::MissingFrameMode
 	return cacheEntry.file;
 }
 
+// Returns the file to read from for the proxy level specified by `context`.
+// Returns null if there is no MIP level matching the layout we require for a
+// proxy image, in which case `OpenImageIOReader::supportsProxyLevel()` is false.
+FilePtr proxyFile( const FilePtr &file, const Context *context )
+{
+	const int proxyLevel = ImagePlug::proxyLevel( context );
+	if( !file || !proxyLevel )
+	{
+		return file;
+	}
+
+	CacheEntry cacheEntry = fileCache()->get( FileCacheKey( file->fileName(), proxyLevel ) );
+	if( !cacheEntry.file || cacheEntry.file->channelNamesData()->readable() != file->channelNamesData()->readable() )
+	{
+		return nullptr;
+	}
+
+	return cacheEntry.file;
+}
+
 boost::container::flat_set<ustring> g_metadataBlacklist = {
 	// These two attributes are used by OIIO/EXR to specify the names of
 	// subimages. We don't want to load them because :
@@ -807,8 +918,10 @@ OpenImageIOReader::OpenImageIOReader( const std::string &name )
 	);
 	addChild( new IntPlug( "refreshCount" ) );
 	addChild( new IntPlug( "missingFrameMode", Plug::In, Error, /* min */ Error, /* max */ Hold ) );
+	addChild( new IntPlug( "cachePrecision", Plug::In, Float, /* min */ Float, /* max */ Automatic ) );
 	addChild( new IntVectorDataPlug( "availableFrames", Plug::Out, new IntVectorData ) );
 	addChild( new ObjectVectorPlug( "__tileBatch", Plug::Out, new ObjectVector ) );
+	addChild( new BoolPlug( "__supportsProxyLevel", Plug::Out ) );
 
 	plugSetSignal().connect( boost::bind( &OpenImageIOReader::plugSet, this, ::_1 ) );
 }
@@ -847,24 +960,44 @@ const Gaffer::IntPlug *OpenImageIOReader::missingFrameModePlug() const
 	return getChild<IntPlug>( g_firstPlugIndex + 2 );
 }
 
+Gaffer::IntPlug *OpenImageIOReader::cachePrecisionPlug()
+{
+	return getChild<IntPlug>( g_firstPlugIndex + 3 );
+}
+
+const Gaffer::IntPlug *OpenImageIOReader::cachePrecisionPlug() const
+{
+	return getChild<IntPlug>( g_firstPlugIndex + 3 );
+}
+
 Gaffer::IntVectorDataPlug *OpenImageIOReader::availableFramesPlug()
 {
-	return getChild<IntVectorDataPlug>( g_firstPlugIndex + 3 );
+	return getChild<IntVectorDataPlug>( g_firstPlugIndex + 4 );
 }
 
 const Gaffer::IntVectorDataPlug *OpenImageIOReader::availableFramesPlug() const
 {
-	return getChild<IntVectorDataPlug>( g_firstPlugIndex + 3 );
+	return getChild<IntVectorDataPlug>( g_firstPlugIndex + 4 );
 }
 
 Gaffer::ObjectVectorPlug *OpenImageIOReader::tileBatchPlug()
 {
-	return getChild<ObjectVectorPlug>( g_firstPlugIndex + 4 );
+	return getChild<ObjectVectorPlug>( g_firstPlugIndex + 5 );
 }
 
 const Gaffer::ObjectVectorPlug *OpenImageIOReader::tileBatchPlug() const
 {
-	return getChild<ObjectVectorPlug>( g_firstPlugIndex + 4 );
+	return getChild<ObjectVectorPlug>( g_firstPlugIndex + 5 );
+}
+
+Gaffer::BoolPlug *OpenImageIOReader::supportsProxyLevelPlug()
+{
+	return getChild<BoolPlug>( g_firstPlugIndex + 6 );
+}
+
+const Gaffer::BoolPlug *OpenImageIOReader::supportsProxyLevelPlug() const
+{
+	return getChild<BoolPlug>( g_firstPlugIndex + 6 );
 }
 
 void OpenImageIOReader::setOpenFilesLimit( size_t maxOpenFiles )
@@ -910,13 +1043,19 @@ void OpenImageIOReader::affects( const Gaffer::Plug *input, AffectedPlugsContain
 		outputs.push_back( availableFramesPlug() );
 	}
 
-	if( input == fileNamePlug() || input == refreshCountPlug() || input == missingFrameModePlug() )
+	if( input == fileNamePlug() || input == refreshCountPlug() || input == missingFrameModePlug() || input == cachePrecisionPlug() )
 	{
 		outputs.push_back( tileBatchPlug() );
 	}
 
+	if( input == cachePrecisionPlug() )
+	{
+		outputs.push_back( outPlug()->channelDataPlug() );
+	}
+
 	if( input == fileNamePlug() || input == refreshCountPlug() || input == missingFrameModePlug() )
 	{
+		outputs.push_back( supportsProxyLevelPlug() );
 		for( ValuePlug::Iterator it( outPlug() ); !it.done(); ++it )
 		{
 			outputs.push_back( it->get() );
@@ -943,6 +1082,15 @@ void OpenImageIOReader::hash( const ValuePlug *output, const Context *context, I
 		hashFileName( c.context(), h );
 		refreshCountPlug()->hash( h );
 		missingFrameModePlug()->hash( h );
+		cachePrecisionPlug()->hash( h );
+		h.append( ImagePlug::proxyLevel( context ) );
+	}
+	else if( output == supportsProxyLevelPlug() )
+	{
+		hashFileName( context, h );
+		refreshCountPlug()->hash( h );
+		missingFrameModePlug()->hash( h );
+		h.append( ImagePlug::proxyLevel( context ) );
 	}
 }
 
@@ -976,7 +1124,7 @@ void OpenImageIOReader::compute( ValuePlug *output, const Context *context ) con
 		c.remove( g_tileBatchIndexContextName );
 
 		std::string fileName = fileNamePlug()->getValue();
-		FilePtr file = retrieveFile( fileName, (MissingFrameMode)missingFrameModePlug()->getValue(), this, c.context() );
+		FilePtr file = proxyFile( retrieveFile( fileName, (MissingFrameMode)missingFrameModePlug()->getValue(), this, c.context() ), context );
 
 		if( !file )
 		{
@@ -984,9 +1132,29 @@ void OpenImageIOReader::compute( ValuePlug *output, const Context *context ) con
 		}
 
 		static_cast<ObjectVectorPlug *>( output )->setValue(
-			file->readTileBatch( tileBatchIndex )
+			file->readTileBatch( tileBatchIndex, (CachePrecision)cachePrecisionPlug()->getValue() )
 		);
 	}
+	else if( output == supportsProxyLevelPlug() )
+	{
+		bool result = false;
+		try
+		{
+			std::string fileName = fileNamePlug()->getValue();
+			result = (bool)proxyFile( retrieveFile( fileName, (MissingFrameMode)missingFrameModePlug()->getValue(), this, context ), context );
+		}
+		catch( const IECore::Cancelled & )
+		{
+			throw;
+		}
+		catch( ... )
+		{
+			// An invalid file doesn't support proxy levels. We leave it to
+			// the full resolution computes used by the ImageNode fallback to
+			// report the error.
+		}
+		static_cast<BoolPlug *>( output )->setValue( result );
+	}
 	else
 	{
 		ImageNode::compute( output, context );
@@ -1024,12 +1192,21 @@ void OpenImageIOReader::hashFileName( const Gaffer::Context *context, IECore::Mu
 	}
 }
 
+bool OpenImageIOReader::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	// We are called for every output at a non-zero proxy level, so we
+	// query the file via a plug, allowing the result to be cached.
+	ImagePlug::GlobalScope c( context );
+	return supportsProxyLevelPlug()->getValue();
+}
+
 void OpenImageIOReader::hashFormat( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	ImageNode::hashFormat( output, context, h );
 	hashFileName( context, h );
 	refreshCountPlug()->hash( h );
 	missingFrameModePlug()->hash( h );
+	h.append( ImagePlug::proxyLevel( context ) );
 	GafferImage::Format format = FormatPlug::getDefaultFormat( context );
 	h.append( format.getDisplayWindow() );
 	h.append( format.getPixelAspect() );
@@ -1042,7 +1219,7 @@ GafferImage::Format OpenImageIOReader::computeFormat( const Gaffer::Context *con
 	// match the format of the Hold frame.
 	MissingFrameMode mode = (MissingFrameMode)missingFrameModePlug()->getValue();
 	mode = ( mode == Black ) ? Hold : mode;
-	FilePtr file = retrieveFile( fileName, mode, this, context );
+	FilePtr file = proxyFile( retrieveFile( fileName, mode, this, context ), context );
 	if( !file )
 	{
 		return FormatPlug::getDefaultFormat( context );
@@ -1064,21 +1241,19 @@ void OpenImageIOReader::hashDataWindow( const GafferImage::ImagePlug *output, co
 	hashFileName( context, h );
 	refreshCountPlug()->hash( h );
 	missingFrameModePlug()->hash( h );
+	h.append( ImagePlug::proxyLevel( context ) );
 }
 
 Imath::Box2i OpenImageIOReader::computeDataWindow( const Gaffer::Context *context, const ImagePlug *parent ) const
 {
 	std::string fileName = fileNamePlug()->getValue();
-	FilePtr file = retrieveFile( fileName, (MissingFrameMode)missingFrameModePlug()->getValue(), this, context );
+	FilePtr file = proxyFile( retrieveFile( fileName, (MissingFrameMode)missingFrameModePlug()->getValue(), this, context ), context );
 	if( !file )
 	{
 		return parent->dataWindowPlug()->defaultValue();
 	}
 
-	const ImageSpec &spec = file->imageSpec();
-
-	Imath::Box2i dataWindow( Imath::V2i( spec.x, spec.y ), Imath::V2i( spec.width + spec.x, spec.height + spec.y ) );
-	return flopDisplayWindow( dataWindow, spec.full_y, spec.full_height );
+	return File::dataWindow( file->imageSpec() );
 }
 
 void OpenImageIOReader::hashMetadata( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
@@ -1236,12 +1411,18 @@ void OpenImageIOReader::hashChannelData( const GafferImage::ImagePlug *output, c
 	ImageNode::hashChannelData( output, context, h );
 	h.append( context->get<V2i>( ImagePlug::tileOriginContextName ) );
 	h.append( context->get<std::string>( ImagePlug::channelNameContextName ) );
+	h.append( ImagePlug::proxyLevel( context ) );
 
 	{
 		ImagePlug::GlobalScope c( context );
 		hashFileName( context, h );
 		refreshCountPlug()->hash( h );
 		missingFrameModePlug()->hash( h );
+		// Automatic mode only stores channels as half if they are
+		// half in the file, so it produces the same data as Float
+		// mode. We hash only whether precision may be lost, so that
+		// the two modes share cache entries downstream.
+		h.append( cachePrecisionPlug()->getValue() == Half );
 	}
 }
 
@@ -1249,7 +1430,7 @@ IECore::ConstFloatVectorDataPtr OpenImageIOReader::computeChannelData( const std
 {
 	ImagePlug::GlobalScope c( context );
 	std::string fileName = fileNamePlug()->getValue();
-	FilePtr file = retrieveFile( fileName, (MissingFrameMode)missingFrameModePlug()->getValue(), this, context );
+	FilePtr file = proxyFile( retrieveFile( fileName, (MissingFrameMode)missingFrameModePlug()->getValue(), this, context ), context );
 
 	if( !file )
 	{
@@ -1283,6 +1464,16 @@ IECore::ConstFloatVectorDataPtr OpenImageIOReader::computeChannelData( const std
 	{
 		curTileChannel = IECore::runTimeCast< const ObjectVector >( tileBatch->members()[1] )->members()[ subIndex ];
 	}
+
+	if( const HalfVectorData *halfTile = IECore::runTimeCast<const HalfVectorData>( curTileChannel.get() ) )
+	{
+		// Stored at half precision to reduce cache memory usage. We convert
+		// to float on demand, relying on our channel data being uncached so
+		// that the converted tile isn't stored as well.
+		const vector<half> &halfData = halfTile->readable();
+		return new FloatVectorData( vector<float>( halfData.begin(), halfData.end() ) );
+	}
+
 	return IECore::runTimeCast< const FloatVectorData >( curTileChannel );
 }
 
@@ -46,6 +46,27 @@ using namespace IECore;
 using namespace GafferImage;
 using namespace Gaffer;
 
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// Appends a scale to the transform, mapping from full resolution pixels
+// to the proxy level specified by the context.
+M33f proxyTransform( const M33f &transform, const Gaffer::Context *context )
+{
+	const int proxyLevel = ImagePlug::proxyLevel( context );
+	if( !proxyLevel )
+	{
+		return transform;
+	}
+	return transform * M33f().setScale( V2f( 1.0f / (float)( 1 << proxyLevel ) ) );
+}
+
+} // namespace
+
 //////////////////////////////////////////////////////////////////////////
 // Ramp implementation
 //////////////////////////////////////////////////////////////////////////
@@ -164,26 +185,38 @@ void Ramp::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs )
 	}
 }
 
+bool Ramp::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void Ramp::hashFormat( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	FlatImageSource::hashFormat( output, context, h );
 	h.append( formatPlug()->hash() );
+	h.append( ImagePlug::proxyLevel( context ) );
 }
 
 GafferImage::Format Ramp::computeFormat( const Gaffer::Context *context, const ImagePlug *parent ) const
 {
-	return formatPlug()->getValue();
+	const Format format = formatPlug()->getValue();
+	if( const int proxyLevel = ImagePlug::proxyLevel( context ) )
+	{
+		return Format( ImagePlug::proxyBox( format.getDisplayWindow(), proxyLevel ), format.getPixelAspect() );
+	}
+	return format;
 }
 
 void Ramp::hashDataWindow( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	FlatImageSource::hashDataWindow( output, context, h );
 	h.append( formatPlug()->hash() );
+	h.append( ImagePlug::proxyLevel( context ) );
 }
 
 Imath::Box2i Ramp::computeDataWindow( const Gaffer::Context *context, const ImagePlug *parent ) const
 {
-	return formatPlug()->getValue().getDisplayWindow();
+	return ImagePlug::proxyBox( formatPlug()->getValue().getDisplayWindow(), ImagePlug::proxyLevel( context ) );
 }
 
 IECore::ConstCompoundDataPtr Ramp::computeMetadata( const Gaffer::Context *context, const ImagePlug *parent ) const
@@ -227,7 +260,7 @@ void Ramp::hashChannelData( const GafferImage::ImagePlug *output, const Gaffer::
 	h.append( channelName );
 
 	rampPlug()->hash( h );
-	transformPlug()->hash( h );
+	h.append( proxyTransform( transformPlug()->matrix(), context ) );
 
 	startPositionPlug()->hash( h );
 	endPositionPlug()->hash( h );
@@ -239,7 +272,7 @@ IECore::ConstFloatVectorDataPtr Ramp::computeChannelData( const std::string &cha
 
 	const SplinefColor4f ramp = rampPlug()->getValue().spline();
 
-	const M33f inverseTransform = transformPlug()->matrix().inverse();
+	const M33f inverseTransform = proxyTransform( transformPlug()->matrix(), context ).inverse();
 	const V2f startPosition = startPositionPlug()->getValue();
 	const V2f endPosition = endPositionPlug()->getValue();
 
@@ -42,6 +42,7 @@
 
 #include <algorithm>
 #include <climits>
+#include <cstring>
 
 using namespace std;
 using namespace Imath;
@@ -49,6 +50,241 @@ using namespace IECore;
 using namespace Gaffer;
 using namespace GafferImage;
 
+//////////////////////////////////////////////////////////////////////////
+// Sliding window algorithms
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// The sliding window algorithms buffer all the input pixels needed
+// for a tile. Beyond this many pixels, we fall back to computing each
+// output pixel independently, which needs no extra memory.
+const int64_t g_maxSlidingWindowInputPixels = 1 << 20;
+
+void fetchPixels( Sampler &sampler, const Box2i &bound, vector<float> &pixels, const IECore::Canceller *canceller )
+{
+	pixels.resize( bound.size().x * bound.size().y );
+	vector<float>::iterator it = pixels.begin();
+	for( int y = bound.min.y; y < bound.max.y; ++y )
+	{
+		IECore::Canceller::check( canceller );
+		for( int x = bound.min.x; x < bound.max.x; ++x )
+		{
+			*it++ = sampler.sample( x, y );
+		}
+	}
+}
+
+// Computes the extremum of each run of `2 * radius + 1` values in `in`,
+// using the van Herk/Gil-Werman algorithm. This uses 3 comparisons per
+// output value regardless of radius. `count` outputs are written to `out`,
+// and `count + 2 * radius` inputs are read from `in`. Strides allow the
+// same function to be used for rows and columns.
+template<typename Extremum>
+void slidingExtremum( const float *in, int inStride, float *out, int outStride, int count, int radius, vector<float> &prefix, vector<float> &suffix, Extremum extremum )
+{
+	const int windowSize = 2 * radius + 1;
+	const int length = count + 2 * radius;
+	prefix.resize( length );
+	suffix.resize( length );
+
+	// Extrema from the start of each block of `windowSize`
+	// values, and to the end of each block.
+	for( int i = 0; i < length; ++i )
+	{
+		const float v = in[i * inStride];
+		prefix[i] = i % windowSize ? extremum( prefix[i-1], v ) : v;
+	}
+	for( int i = length - 1; i >= 0; --i )
+	{
+		const float v = in[i * inStride];
+		suffix[i] = ( i == length - 1 || ( i + 1 ) % windowSize == 0 ) ? v : extremum( suffix[i+1], v );
+	}
+
+	// Every window spans at most two blocks, so is covered by
+	// the suffix of one and the prefix of the next.
+	for( int i = 0; i < count; ++i )
+	{
+		out[i * outStride] = extremum( suffix[i], prefix[i + windowSize - 1] );
+	}
+}
+
+template<typename Extremum>
+void extremumFilter( const vector<float> &input, const V2i &inputSize, const V2i &radius, vector<float> &result, Extremum extremum, const IECore::Canceller *canceller )
+{
+	const int tileSize = ImagePlug::tileSize();
+	vector<float> prefix, suffix;
+
+	// The filter is separable, so we filter the rows first,
+	// and then the columns of the result.
+
+	vector<float> rowsFiltered( inputSize.y * tileSize );
+	for( int y = 0; y < inputSize.y; ++y )
+	{
+		IECore::Canceller::check( canceller );
+		slidingExtremum( &input[y * inputSize.x], 1, &rowsFiltered[y * tileSize], 1, tileSize, radius.x, prefix, suffix, extremum );
+	}
+
+	result.resize( tileSize * tileSize );
+	for( int x = 0; x < tileSize; ++x )
+	{
+		IECore::Canceller::check( canceller );
+		slidingExtremum( &rowsFiltered[x], tileSize, &result[x], tileSize, tileSize, radius.y, prefix, suffix, extremum );
+	}
+}
+
+// Maps floats to unsigned integers with the same ordering.
+uint32_t orderedBits( float f )
+{
+	if( f == 0.0f )
+	{
+		// Treat -0 and 0 as identical, as `nth_element()` does.
+		f = 0.0f;
+	}
+	uint32_t u;
+	std::memcpy( &u, &f, sizeof( u ) );
+	return ( u & 0x80000000 ) ? ~u : ( u | 0x80000000 );
+}
+
+// Computes the median using a sliding window histogram, after Huang.
+// Moving the window by one pixel removes one row or column of pixels
+// from the histogram and adds another, so the cost per output pixel
+// is linear in the radius rather than quadratic. This is not the
+// constant time algorithm of Perreault and Hebert, which needs a
+// histogram per column over a quantised range of values. Instead,
+// pixels are converted to ranks by sorting them once per tile, so
+// that the histogram gives exact results for arbitrary floating
+// point values.
+void medianFilter( const vector<float> &input, const V2i &inputSize, const V2i &radius, vector<float> &result, const IECore::Canceller *canceller )
+{
+	const int tileSize = ImagePlug::tileSize();
+
+	// Convert to ranks, by sorting keys which combine the value
+	// in the high bits with the pixel index in the low bits.
+
+	vector<uint64_t> keys( input.size() );
+	for( size_t i = 0; i < input.size(); ++i )
+	{
+		keys[i] = ( (uint64_t)orderedBits( input[i] ) << 32 ) | i;
+	}
+	IECore::Canceller::check( canceller );
+	std::sort( keys.begin(), keys.end() );
+	IECore::Canceller::check( canceller );
+
+	vector<uint32_t> ranks( input.size() );
+	vector<float> rankValues;
+	for( size_t i = 0; i < keys.size(); ++i )
+	{
+		if( !i || ( keys[i] >> 32 ) != ( keys[i-1] >> 32 ) )
+		{
+			rankValues.push_back( input[keys[i] & 0xFFFFFFFF] );
+		}
+		ranks[keys[i] & 0xFFFFFFFF] = rankValues.size() - 1;
+	}
+	keys = vector<uint64_t>();
+
+	// Two level histogram, so we can find the median without
+	// visiting every rank.
+
+	const int fineBitsPerCoarse = 6;
+	vector<uint32_t> fine( rankValues.size(), 0 );
+	vector<uint32_t> coarse( ( rankValues.size() >> fineBitsPerCoarse ) + 1, 0 );
+
+	// Huang's trick : track the coarse bin containing the median,
+	// and the number of values in the bins below it, updating both
+	// incrementally as the window moves.
+	size_t medianCoarse = 0;
+	uint32_t belowMedianCoarse = 0;
+	const uint32_t medianIndex = ( 2 * radius.x + 1 ) * ( 2 * radius.y + 1 ) / 2;
+
+	auto add = [&] ( int x, int y ) {
+		const uint32_t r = ranks[y * inputSize.x + x];
+		fine[r]++;
+		coarse[r >> fineBitsPerCoarse]++;
+		belowMedianCoarse += ( r >> fineBitsPerCoarse ) < medianCoarse;
+	};
+
+	auto remove = [&] ( int x, int y ) {
+		const uint32_t r = ranks[y * inputSize.x + x];
+		fine[r]--;
+		coarse[r >> fineBitsPerCoarse]--;
+		belowMedianCoarse -= ( r >> fineBitsPerCoarse ) < medianCoarse;
+	};
+
+	auto median = [&] () {
+		while( belowMedianCoarse > medianIndex )
+		{
+			belowMedianCoarse -= coarse[--medianCoarse];
+		}
+		while( belowMedianCoarse + coarse[medianCoarse] <= medianIndex )
+		{
+			belowMedianCoarse += coarse[medianCoarse++];
+		}
+		uint32_t count = belowMedianCoarse;
+		for( size_t r = medianCoarse << fineBitsPerCoarse; ; ++r )
+		{
+			count += fine[r];
+			if( count > medianIndex )
+			{
+				return rankValues[r];
+			}
+		}
+	};
+
+	// Visit the output pixels in a serpentine order, so the
+	// window only ever moves by a single pixel.
+
+	for( int y = 0; y <= 2 * radius.y; ++y )
+	{
+		for( int x = 0; x <= 2 * radius.x; ++x )
+		{
+			add( x, y );
+		}
+	}
+
+	result.resize( tileSize * tileSize );
+	int x = 0;
+	for( int y = 0; y < tileSize; ++y )
+	{
+		IECore::Canceller::check( canceller );
+
+		if( y )
+		{
+			for( int wx = x; wx <= x + 2 * radius.x; ++wx )
+			{
+				remove( wx, y - 1 );
+				add( wx, y + 2 * radius.y );
+			}
+		}
+
+		const int step = y % 2 ? -1 : 1;
+		while( true )
+		{
+			result[y * tileSize + x] = median();
+			const int nextX = x + step;
+			if( nextX < 0 || nextX >= tileSize )
+			{
+				break;
+			}
+			const int removeX = step > 0 ? x : x + 2 * radius.x;
+			const int addX = step > 0 ? x + 2 * radius.x + 1 : x - 1;
+			for( int wy = y; wy <= y + 2 * radius.y; ++wy )
+			{
+				remove( removeX, wy );
+				add( addX, wy );
+			}
+			x = nextX;
+		}
+	}
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// RankFilter
+//////////////////////////////////////////////////////////////////////////
+
 GAFFER_NODE_DEFINE_TYPE( RankFilter );
 
 size_t RankFilter::g_firstPlugIndex = 0;
@@ -397,6 +633,27 @@ IECore::ConstFloatVectorDataPtr RankFilter::computeChannelData( const std::strin
 		return resultData;
 	}
 
+	if( (int64_t)inputBound.size().x * inputBound.size().y <= g_maxSlidingWindowInputPixels )
+	{
+		vector<float> input;
+		fetchPixels( sampler, inputBound, input, context->canceller() );
+		switch( m_mode )
+		{
+			case MedianRank :
+				medianFilter( input, inputBound.size(), radius, result, context->canceller() );
+				break;
+			case ErodeRank :
+				extremumFilter( input, inputBound.size(), radius, result, [] ( float a, float b ) { return std::min( a, b ); }, context->canceller() );
+				break;
+			case DilateRank :
+				extremumFilter( input, inputBound.size(), radius, result, [] ( float a, float b ) { return std::max( a, b ); }, context->canceller() );
+				break;
+		}
+		return resultData;
+	}
+
+	// Too large to buffer the input. Compute each pixel independently.
+
 	vector<float> pixels( ( 1 + 2 * radius.x ) * ( 1 + 2 * radius.y ) );
 	vector<float>::iterator resultIt = pixels.begin() + pixels.size() / 2;
 
@@ -103,6 +103,29 @@ void ratioAndOffset( const M33f &matrix, V2f &ratio, V2f &offset )
 	offset = -V2f( matrix[2][0], matrix[2][1] ) / ratio;
 }
 
+// Adjusts the matrix for evaluation at a proxy level. Both the
+// input and output are downsampled by the same factor, so the scale
+// is unchanged but the translation must be reduced to match.
+M33f proxyMatrix( const M33f &matrix, int proxyLevel )
+{
+	M33f result = matrix;
+	result[2][0] /= (float)( 1 << proxyLevel );
+	result[2][1] /= (float)( 1 << proxyLevel );
+	return result;
+}
+
+// Adjusts the input filter scale for evaluation at a proxy level. The
+// filter covers fewer input pixels at the proxy resolution, but we don't
+// let it cover less than one pixel unless it already did at full resolution.
+V2f proxyFilterScale( const V2f &inputFilterScale, int proxyLevel )
+{
+	const float f = 1 << proxyLevel;
+	return V2f(
+		std::max( inputFilterScale.x / f, std::min( inputFilterScale.x, 1.0f ) ),
+		std::max( inputFilterScale.y / f, std::min( inputFilterScale.y, 1.0f ) )
+	);
+}
+
 // The radius for the filter is specified in the output space. This
 // method returns it as a number of pixels in the input space.
 V2i inputFilterRadius( const OIIO::Filter2D *filter, const V2f &inputFilterScale )
@@ -385,6 +408,12 @@ void Resample::hashDataWindow( const GafferImage::ImagePlug *parent, const Gaffe
 	filterPlug()->hash( h );
 	filterScalePlug()->hash( h );
 	debugPlug()->hash( h );
+	h.append( ImagePlug::proxyLevel( context ) );
+}
+
+bool Resample::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
 }
 
 Imath::Box2i Resample::computeDataWindow( const Gaffer::Context *context, const ImagePlug *parent ) const
@@ -398,7 +427,8 @@ Imath::Box2i Resample::computeDataWindow( const Gaffer::Context *context, const
 	// Figure out our data window as a Box2f with fractional
 	// pixel values.
 
-	const M33f matrix = matrixPlug()->getValue();
+	const int proxyLevel = ImagePlug::proxyLevel( context );
+	const M33f matrix = proxyMatrix( matrixPlug()->getValue(), proxyLevel );
 	Box2f dstDataWindow = transform( Box2f( srcDataWindow.min, srcDataWindow.max ), matrix );
 
 	if( expandDataWindowPlug()->getValue() )
@@ -408,7 +438,7 @@ Imath::Box2i Resample::computeDataWindow( const Gaffer::Context *context, const
 
 		V2f inputFilterScale;
 		const OIIO::Filter2D *filter = filterAndScale( filterPlug()->getValue(), ratio, inputFilterScale );
-		inputFilterScale *= filterScalePlug()->getValue();
+		inputFilterScale = proxyFilterScale( inputFilterScale * filterScalePlug()->getValue(), proxyLevel );
 
 		const V2f filterRadius = V2f( filter->width(), filter->height() ) * inputFilterScale * 0.5f;
 
@@ -458,15 +488,16 @@ void Resample::hashChannelData( const GafferImage::ImagePlug *parent, const Gaff
 {
 	FlatImageProcessor::hashChannelData( parent, context, h );
 
+	const int proxyLevel = ImagePlug::proxyLevel( context );
 	V2f ratio, offset;
 	{
 		ImagePlug::GlobalScope c( context );
-		ratioAndOffset( matrixPlug()->getValue(), ratio, offset );
+		ratioAndOffset( proxyMatrix( matrixPlug()->getValue(), proxyLevel ), ratio, offset );
 	}
 
 	V2f inputFilterScale;
 	const OIIO::Filter2D *filter = filterAndScale( filterPlug()->getValue(), ratio, inputFilterScale );
-	inputFilterScale *= filterScalePlug()->getValue();
+	inputFilterScale = proxyFilterScale( inputFilterScale * filterScalePlug()->getValue(), proxyLevel );
 
 	filterPlug()->hash( h );
 
@@ -501,15 +532,16 @@ void Resample::hashChannelData( const GafferImage::ImagePlug *parent, const Gaff
 
 IECore::ConstFloatVectorDataPtr Resample::computeChannelData( const std::string &channelName, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent ) const
 {
+	const int proxyLevel = ImagePlug::proxyLevel( context );
 	V2f ratio, offset;
 	{
 		ImagePlug::GlobalScope c( context );
-		ratioAndOffset( matrixPlug()->getValue(), ratio, offset );
+		ratioAndOffset( proxyMatrix( matrixPlug()->getValue(), proxyLevel ), ratio, offset );
 	}
 
 	V2f inputFilterScale;
 	const OIIO::Filter2D *filter = filterAndScale( filterPlug()->getValue(), ratio, inputFilterScale );
-	inputFilterScale *= filterScalePlug()->getValue();
+	inputFilterScale = proxyFilterScale( inputFilterScale * filterScalePlug()->getValue(), proxyLevel );
 
 	const unsigned passes = requiredPasses( this, parent, filter );
 
@@ -179,6 +179,10 @@ void Resize::hash( const ValuePlug *output, const Context *context, IECore::Murm
 
 	if( output == matrixPlug() )
 	{
+		// The matrix is always computed at full resolution, and is
+		// adjusted for proxy levels by the internal Resample node.
+		Context::EditableScope fullResolutionScope( context );
+		fullResolutionScope.remove( ImagePlug::proxyLevelContextName );
 		formatPlug()->hash( h );
 		fitModePlug()->hash( h );
 		inPlug()->formatPlug()->hash( h );
@@ -190,6 +194,9 @@ void Resize::compute( ValuePlug *output, const Context *context ) const
 {
 	if( output == matrixPlug() )
 	{
+		Context::EditableScope fullResolutionScope( context );
+		fullResolutionScope.remove( ImagePlug::proxyLevelContextName );
+
 		const Format inFormat = inPlug()->formatPlug()->getValue();
 		const Format outFormat = formatPlug()->getValue();
 
@@ -236,14 +243,28 @@ void Resize::compute( ValuePlug *output, const Context *context ) const
 	FlatImageProcessor::compute( output, context );
 }
 
+bool Resize::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void Resize::hashFormat( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	h = formatPlug()->hash();
+	if( const int proxyLevel = ImagePlug::proxyLevel( context ) )
+	{
+		h.append( proxyLevel );
+	}
 }
 
 GafferImage::Format Resize::computeFormat( const Gaffer::Context *context, const ImagePlug *parent ) const
 {
-	return formatPlug()->getValue();
+	const Format format = formatPlug()->getValue();
+	if( const int proxyLevel = ImagePlug::proxyLevel( context ) )
+	{
+		return Format( ImagePlug::proxyBox( format.getDisplayWindow(), proxyLevel ), format.getPixelAspect() );
+	}
+	return format;
 }
 
 void Resize::hashDataWindow( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
@@ -269,6 +290,7 @@ IECore::ConstFloatVectorDataPtr Resize::computeChannelData( const std::string &c
 const ImagePlug *Resize::source() const
 {
 	ImagePlug::GlobalScope c( Context::current() );
+	c.remove( ImagePlug::proxyLevelContextName );
 	if( formatPlug()->getValue().getDisplayWindow() == inPlug()->formatPlug()->getValue().getDisplayWindow() )
 	{
 		return inPlug();
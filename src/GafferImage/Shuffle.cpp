@@ -151,6 +151,11 @@ void Shuffle::affects( const Gaffer::Plug *input, AffectedPlugsContainer &output
 	}
 }
 
+bool Shuffle::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void Shuffle::hashChannelNames( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	ImageProcessor::hashChannelNames( parent, context, h );
@@ -38,6 +38,7 @@
 
 #include "GafferImage/BufferAlgo.h"
 
+#include "Gaffer/Context.h"
 #include "Gaffer/StringPlug.h"
 #include "Gaffer/Transform2DPlug.h"
 #include "Gaffer/Private/IECorePreview/LRUCache.h"
@@ -199,6 +200,18 @@ struct Line
 	int width;
 };
 
+// Appends a scale to the transform, so that the glyphs are rendered
+// directly at the proxy level specified by the context.
+M33f proxyTransform( const M33f &transform, const Gaffer::Context *context )
+{
+	const int proxyLevel = ImagePlug::proxyLevel( context );
+	if( !proxyLevel )
+	{
+		return transform;
+	}
+	return transform * M33f().setScale( V2f( 1.0f / (float)( 1 << proxyLevel ) ) );
+}
+
 } // namespace
 
 //////////////////////////////////////////////////////////////////////////
@@ -355,16 +368,26 @@ bool Text::affectsLayout( const Gaffer::Plug *input ) const
 		transformPlug()->isAncestorOf( input );
 }
 
+bool Text::supportsProxyLevel( const Gaffer::Context *context ) const
+{
+	return true;
+}
+
 void Text::hashLayout( const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	textPlug()->hash( h );
 	fontPlug()->hash( h );
 	sizePlug()->hash( h );
 	areaPlug()->hash( h );
-	inPlug()->formatPlug()->hash( h );
+	{
+		Context::EditableScope fullResolutionScope( context );
+		fullResolutionScope.remove( ImagePlug::proxyLevelContextName );
+		inPlug()->formatPlug()->hash( h );
+	}
 	horizontalAlignmentPlug()->hash( h );
 	verticalAlignmentPlug()->hash( h );
 	transformPlug()->hash( h );
+	h.append( ImagePlug::proxyLevel( context ) );
 }
 
 IECore::ConstCompoundObjectPtr Text::computeLayout( const Gaffer::Context *context ) const
@@ -385,6 +408,10 @@ IECore::ConstCompoundObjectPtr Text::computeLayout( const Gaffer::Context *conte
 	Box2i area = areaPlug()->getValue();
 	if( BufferAlgo::empty( area ) )
 	{
+		// The layout is always performed in full resolution pixels, with
+		// the proxy level being accounted for by the transform below.
+		Context::EditableScope fullResolutionScope( context );
+		fullResolutionScope.remove( ImagePlug::proxyLevelContextName );
 		area = inPlug()->formatPlug()->getValue().getDisplayWindow();
 	}
 
@@ -471,7 +498,7 @@ IECore::ConstCompoundObjectPtr Text::computeLayout( const Gaffer::Context *conte
 
 	const HorizontalAlignment horizontalAlignment = (HorizontalAlignment)horizontalAlignmentPlug()->getValue();
 	const VerticalAlignment verticalAlignment = (VerticalAlignment)verticalAlignmentPlug()->getValue();
-	const M33f transform = transformPlug()->matrix();
+	const M33f transform = proxyTransform( transformPlug()->matrix(), context );
 
 	float yOffset = 0;
 	if( verticalAlignment == Bottom )
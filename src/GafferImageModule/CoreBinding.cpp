@@ -55,6 +55,8 @@
 
 #include "IECorePython/SimpleTypedDataBinding.h"
 
+#include "boost/python/suite/indexing/container_utils.hpp"
+
 using namespace boost::python;
 using namespace Gaffer;
 using namespace GafferImage;
@@ -76,6 +78,34 @@ IECore::MurmurHash channelDataHash( const ImagePlug &plug, const std::string &ch
 	return plug.channelDataHash( channelName, tileOrigin );
 }
 
+boost::python::list channelDataBatch( const ImagePlug &plug, object pythonChannelNames, const Imath::V2i &tile, bool copy )
+{
+	std::vector<std::string> channelNames;
+	boost::python::container_utils::extend_container( channelNames, pythonChannelNames );
+
+	std::vector<IECore::ConstFloatVectorDataPtr> channelData;
+	{
+		IECorePython::ScopedGILRelease gilRelease;
+		channelData = plug.channelData( channelNames, tile );
+	}
+
+	boost::python::list result;
+	for( const auto &d : channelData )
+	{
+		result.append( copy ? d->copy() : boost::const_pointer_cast<IECore::FloatVectorData>( d ) );
+	}
+	return result;
+}
+
+IECore::MurmurHash channelDataHashBatch( const ImagePlug &plug, object pythonChannelNames, const Imath::V2i &tileOrigin )
+{
+	std::vector<std::string> channelNames;
+	boost::python::container_utils::extend_container( channelNames, pythonChannelNames );
+
+	IECorePython::ScopedGILRelease gilRelease;
+	return plug.channelDataHash( channelNames, tileOrigin );
+}
+
 GafferImage::Format format( const ImagePlug &plug )
 {
 	IECorePython::ScopedGILRelease gilRelease;
@@ -281,7 +311,9 @@ void GafferImageModule::bindCore()
 				)
 			)
 		)
+		.def( "channelData", &channelDataBatch, ( arg( "_copy" ) = true ) )
 		.def( "channelData", &channelData, ( arg( "_copy" ) = true ) )
+		.def( "channelDataHash", &channelDataHashBatch )
 		.def( "channelDataHash", &channelDataHash )
 		.def( "format", &format )
 		.def( "formatHash", &formatHash )
@@ -300,6 +332,7 @@ void GafferImageModule::bindCore()
 		.def( "tileIndex", &ImagePlug::tileIndex ).staticmethod( "tileIndex" )
 		.def( "tileOrigin", &ImagePlug::tileOrigin ).staticmethod( "tileOrigin" )
 		.def( "pixelIndex", &ImagePlug::pixelIndex ).staticmethod( "pixelIndex" )
+		.def( "proxyBox", &ImagePlug::proxyBox ).staticmethod( "proxyBox" )
 		.def( "emptyTileSampleOffsets", &emptyTileSampleOffsets, ( arg( "_copy" ) = true ) ).staticmethod( "emptyTileSampleOffsets" )
 		.def( "flatTileSampleOffsets", &flatTileSampleOffsets, ( arg( "_copy" ) = true ) ).staticmethod( "flatTileSampleOffsets" )
 		.def( "emptyTile", &emptyTile, ( arg( "_copy" ) = true ) ).staticmethod( "emptyTile" )
@@ -139,6 +139,12 @@ void GafferImageModule::bindIO()
 			.value( "Black", OpenImageIOReader::Black )
 			.value( "Hold", OpenImageIOReader::Hold )
 		;
+
+		enum_<OpenImageIOReader::CachePrecision>( "CachePrecision" )
+			.value( "Float", OpenImageIOReader::Float )
+			.value( "Half", OpenImageIOReader::Half )
+			.value( "Automatic", OpenImageIOReader::Automatic )
+		;
 	}
 
 	{
@@ -163,6 +169,12 @@ void GafferImageModule::bindIO()
 			.value( "BlackOutside", ImageReader::BlackOutside )
 			.value( "ClampToFrame", ImageReader::ClampToFrame )
 		;
+
+		enum_<ImageReader::CachePrecision>( "CachePrecision" )
+			.value( "Float", ImageReader::Float )
+			.value( "Half", ImageReader::Half )
+			.value( "Automatic", ImageReader::Automatic )
+		;
 	}
 
 	{
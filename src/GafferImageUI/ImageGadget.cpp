@@ -392,6 +392,7 @@ ImageGadget::ImageGadget()
 		m_paused( false ),
 		m_dirtyFlags( AllDirty ),
 		m_renderRequestPending( false ),
+		m_proxyLevel( 0 ),
 		m_shaderDirty( true )
 {
 	m_rgbaChannels[0] = "R";
@@ -838,12 +839,21 @@ const Imath::Box2i &ImageGadget::dataWindow() const
 	{
 		if( !m_image )
 		{
-			m_dataWindow = Box2i();
+			m_dataWindow = m_proxyDataWindow = Box2i();
 		}
 		else
 		{
-			Context::Scope scopedContext( m_context.get() );
+			Context::EditableScope scopedContext( m_context.get() );
 			m_dataWindow = m_image->dataWindowPlug()->getValue();
+			if( m_proxyLevel )
+			{
+				scopedContext.set( ImagePlug::proxyLevelContextName, &m_proxyLevel );
+				m_proxyDataWindow = m_image->dataWindowPlug()->getValue();
+			}
+			else
+			{
+				m_proxyDataWindow = m_dataWindow;
+			}
 		}
 		m_dirtyFlags &= ~DataWindowDirty;
 	}
@@ -851,6 +861,12 @@ const Imath::Box2i &ImageGadget::dataWindow() const
 	return m_dataWindow;
 }
 
+const Imath::Box2i &ImageGadget::proxyDataWindow() const
+{
+	dataWindow();
+	return m_proxyDataWindow;
+}
+
 const std::vector<std::string> &ImageGadget::channelNames() const
 {
 	if( m_dirtyFlags & ChannelNamesDirty )
@@ -1066,7 +1082,7 @@ void ImageGadget::updateTiles()
 		}
 	}
 
-	const Box2i dataWindow = this->dataWindow();
+	const Box2i dataWindow = this->proxyDataWindow();
 
 	// Do the actual work of generating the tiles asynchronously,
 	// in the background.
@@ -1105,7 +1121,11 @@ void ImageGadget::updateTiles()
 	// This means that any internal nodes of ImageGadget are not part of the automatic
 	// task cancellation and we must ensure that we never modify internal nodes while
 	// the background task is running.
-	Context::Scope scopedContext( m_context.get() );
+	Context::EditableScope scopedContext( m_context.get() );
+	if( m_proxyLevel )
+	{
+		scopedContext.set( ImagePlug::proxyLevelContextName, &m_proxyLevel );
+	}
 	m_tilesTask = ParallelAlgo::callOnBackgroundThread(
 		// Subject
 		m_image.get(),
@@ -1137,7 +1157,7 @@ void ImageGadget::removeOutOfBoundsTiles() const
 	// so here we prune out any tiles that we know can't be useful for
 	// the current image, because they either have an invalid channel
 	// name or are outside the data window.
-	const Box2i &dw = dataWindow();
+	const Box2i &dw = proxyDataWindow();
 	const vector<string> &ch = channelNames();
 	for( Tiles::iterator it = m_tiles.begin(); it != m_tiles.end(); )
 	{
@@ -1153,6 +1173,53 @@ void ImageGadget::removeOutOfBoundsTiles() const
 	}
 }
 
+//////////////////////////////////////////////////////////////////////////
+// Proxy level
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+const int g_maxProxyLevel = 8;
+
+} // namespace
+
+void ImageGadget::updateProxyLevel()
+{
+	if( m_paused )
+	{
+		return;
+	}
+
+	int proxyLevel = 0;
+	if( const ViewportGadget *viewport = ancestor<ViewportGadget>() )
+	{
+		// Measure the size of an image pixel on screen. We measure
+		// vertically so that we are unaffected by the pixel aspect.
+		const float pixelSize = (
+			viewport->gadgetToRasterSpace( V3f( 0, 1, 0 ), this ) -
+			viewport->gadgetToRasterSpace( V3f( 0 ), this )
+		).length();
+		if( pixelSize > 0.0f && pixelSize < 1.0f )
+		{
+			proxyLevel = std::min( (int)floorf( log2f( 1.0f / pixelSize ) ), g_maxProxyLevel );
+		}
+	}
+
+	if( proxyLevel == m_proxyLevel )
+	{
+		return;
+	}
+
+	// Cancel any update in progress and discard our tiles,
+	// since they are all for the previous level.
+	m_tilesTask.reset();
+	m_tiles.clear();
+
+	m_proxyLevel = proxyLevel;
+	m_dirtyFlags |= DataWindowDirty | TilesDirty;
+}
+
 //////////////////////////////////////////////////////////////////////////
 // Rendering
 //////////////////////////////////////////////////////////////////////////
@@ -1194,12 +1261,14 @@ void ImageGadget::renderTiles() const
 	);
 
 	const Box2i dataWindow = this->dataWindow();
+	const Box2i proxyDataWindow = this->proxyDataWindow();
+	const int proxyScale = 1 << m_proxyLevel;
 	const float pixelAspect = this->format().getPixelAspect();
 
-	V2i tileOrigin = ImagePlug::tileOrigin( dataWindow.min );
-	for( ; tileOrigin.y < dataWindow.max.y; tileOrigin.y += ImagePlug::tileSize() )
+	V2i tileOrigin = ImagePlug::tileOrigin( proxyDataWindow.min );
+	for( ; tileOrigin.y < proxyDataWindow.max.y; tileOrigin.y += ImagePlug::tileSize() )
 	{
-		for( tileOrigin.x = ImagePlug::tileOrigin( dataWindow.min ).x; tileOrigin.x < dataWindow.max.x; tileOrigin.x += ImagePlug::tileSize() )
+		for( tileOrigin.x = ImagePlug::tileOrigin( proxyDataWindow.min ).x; tileOrigin.x < proxyDataWindow.max.x; tileOrigin.x += ImagePlug::tileSize() )
 		{
 			bool active = false;
 			IECoreGL::ConstTexturePtr channelTextures[4];
@@ -1218,7 +1287,8 @@ void ImageGadget::renderTiles() const
 			}
 			shaderBinding.loadTile( channelTextures, active );
 
-			const Box2i tileBound( tileOrigin, tileOrigin + V2i( ImagePlug::tileSize() ) );
+			// Bound of the tile in full resolution pixels.
+			const Box2i tileBound( tileOrigin * proxyScale, ( tileOrigin + V2i( ImagePlug::tileSize() ) ) * proxyScale );
 			const Box2i validBound = BufferAlgo::intersection( tileBound, dataWindow );
 			const Box2f uvBound(
 				V2f(
@@ -1283,6 +1353,7 @@ void ImageGadget::renderLayer( Layer layer, const GafferUI::Style *style, Render
 	try
 	{
 		format = this->format();
+		const_cast<ImageGadget *>( this )->updateProxyLevel();
 		dataWindow = this->dataWindow();
 		const_cast<ImageGadget *>( this )->updateTiles();
 	}
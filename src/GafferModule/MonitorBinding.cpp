@@ -44,6 +44,8 @@
 #include "Gaffer/Node.h"
 #include "Gaffer/PerformanceMonitor.h"
 #include "Gaffer/Plug.h"
+#include "Gaffer/SamplingMonitor.h"
+#include "Gaffer/TimelineMonitor.h"
 #include "Gaffer/VTuneMonitor.h"
 
 #include "IECorePython/RefCountedBinding.h"
@@ -122,6 +124,105 @@ list contextMonitorVariableNames( const ContextMonitor::Statistics &s )
 	return result;
 }
 
+SamplingMonitorPtr samplingMonitorConstructor( boost::chrono::microseconds::rep interval )
+{
+	return new SamplingMonitor( boost::chrono::microseconds( interval ) );
+}
+
+boost::chrono::microseconds::rep samplingMonitorInterval( const SamplingMonitor &m )
+{
+	return m.interval().count();
+}
+
+dict samplingMonitorNodeTypeStatistics( const SamplingMonitor &m )
+{
+	dict result;
+	for( const auto &s : m.nodeTypeStatistics() )
+	{
+		result[IECore::RunTimeTyped::typeNameFromTypeId( s.first )] = s.second;
+	}
+	return result;
+}
+
+void writeCollapsedStacks( const SamplingMonitor &m, const std::string &fileName )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	m.writeCollapsedStacks( fileName );
+}
+
+std::string samplingStatisticsRepr( SamplingMonitor::Statistics &s )
+{
+	return boost::str(
+		boost::format( "Gaffer.SamplingMonitor.Statistics( inclusiveDuration = %d, exclusiveDuration = %d )" )
+			% s.inclusiveDuration.count()
+			% s.exclusiveDuration.count()
+	);
+}
+
+SamplingMonitor::Statistics *samplingStatisticsConstructor(
+	boost::chrono::nanoseconds::rep inclusiveDuration,
+	boost::chrono::nanoseconds::rep exclusiveDuration
+)
+{
+	return new SamplingMonitor::Statistics( boost::chrono::nanoseconds( inclusiveDuration ), boost::chrono::nanoseconds( exclusiveDuration ) );
+}
+
+boost::chrono::nanoseconds::rep getInclusiveDuration( SamplingMonitor::Statistics &s )
+{
+	return s.inclusiveDuration.count();
+}
+
+void setInclusiveDuration( SamplingMonitor::Statistics &s, boost::chrono::nanoseconds::rep v )
+{
+	s.inclusiveDuration = boost::chrono::nanoseconds( v );
+}
+
+boost::chrono::nanoseconds::rep getExclusiveDuration( SamplingMonitor::Statistics &s )
+{
+	return s.exclusiveDuration.count();
+}
+
+void setExclusiveDuration( SamplingMonitor::Statistics &s, boost::chrono::nanoseconds::rep v )
+{
+	s.exclusiveDuration = boost::chrono::nanoseconds( v );
+}
+
+list timelineEvents( const TimelineMonitor &m )
+{
+	list result;
+	for( const auto &e : m.events() )
+	{
+		result.append( e );
+	}
+	return result;
+}
+
+void writeChromeTrace( const TimelineMonitor &m, const std::string &fileName )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	m.writeChromeTrace( fileName );
+}
+
+std::string timelineEventType( const TimelineMonitor::Event &e )
+{
+	return e.type.string();
+}
+
+PlugPtr timelineEventPlug( const TimelineMonitor::Event &e )
+{
+	return boost::const_pointer_cast<Plug>( e.plug );
+}
+
+boost::chrono::nanoseconds::rep timelineEventStartTime( const TimelineMonitor::Event &e )
+{
+	return e.startTime.count();
+}
+
+boost::chrono::nanoseconds::rep timelineEventFinishTime( const TimelineMonitor::Event &e )
+{
+	return e.finishTime.count();
+}
+
 void annotateWrapper1( Node &root, const PerformanceMonitor &monitor, bool persistent )
 {
 	IECorePython::ScopedGILRelease gilRelease;
@@ -267,6 +368,53 @@ void GafferModule::bindMonitor()
 		;
 	}
 
+	{
+		scope s = IECorePython::RefCountedClass<SamplingMonitor, Monitor>( "SamplingMonitor" )
+			.def( "__init__", make_constructor( samplingMonitorConstructor, default_call_policies(), ( arg( "interval" ) = 1000 ) ) )
+			.def( "interval", &samplingMonitorInterval )
+			.def( "numSamples", &SamplingMonitor::numSamples )
+			.def( "allStatistics", &allStatistics<SamplingMonitor> )
+			.def( "plugStatistics", &SamplingMonitor::plugStatistics )
+			.def( "nodeTypeStatistics", &samplingMonitorNodeTypeStatistics )
+			.def( "combinedStatistics", &SamplingMonitor::combinedStatistics )
+			.def( "writeCollapsedStacks", &writeCollapsedStacks )
+		;
+
+		class_<SamplingMonitor::Statistics>( "Statistics" )
+			.def( "__init__", make_constructor( samplingStatisticsConstructor, default_call_policies(),
+					(
+						arg( "inclusiveDuration" ) = 0,
+						arg( "exclusiveDuration" ) = 0
+					)
+				)
+			)
+			.add_property( "inclusiveDuration", &getInclusiveDuration, &setInclusiveDuration )
+			.add_property( "exclusiveDuration", &getExclusiveDuration, &setExclusiveDuration )
+			.def( self == self )
+			.def( self != self )
+			.def( "__repr__", &samplingStatisticsRepr )
+		;
+	}
+
+	{
+		scope s = IECorePython::RefCountedClass<TimelineMonitor, Monitor>( "TimelineMonitor" )
+			.def( init<>() )
+			.def( "events", &timelineEvents )
+			.def( "writeChromeTrace", &writeChromeTrace )
+		;
+
+		class_<TimelineMonitor::Event>( "Event", no_init )
+			.def_readonly( "id", &TimelineMonitor::Event::id )
+			.def_readonly( "parentId", &TimelineMonitor::Event::parentId )
+			.add_property( "type", &timelineEventType )
+			.add_property( "plug", &timelineEventPlug )
+			.def_readonly( "contextHash", &TimelineMonitor::Event::contextHash )
+			.def_readonly( "threadIndex", &TimelineMonitor::Event::threadIndex )
+			.add_property( "startTime", &timelineEventStartTime )
+			.add_property( "finishTime", &timelineEventFinishTime )
+		;
+	}
+
 #ifdef GAFFER_VTUNE
 	{
 		scope s = IECorePython::RefCountedClass<VTuneMonitor, Monitor>( "VTuneMonitor" )
@@ -105,6 +105,68 @@ void hash2( ValuePlug *plug, IECore::MurmurHash &h )
 	plug->hash( h);
 }
 
+template<typename T>
+std::string cacheStatisticsRepr( const T &s, const char *className )
+{
+	return boost::str(
+		boost::format( "Gaffer.ValuePlug.%s( hits = %d, misses = %d, evictions = %d, cost = %d )" )
+			% className
+			% s.hits
+			% s.misses
+			% s.evictions
+			% s.cost
+	);
+}
+
+std::string hashCacheStatisticsRepr( const ValuePlug::HashCacheStatistics &s )
+{
+	return cacheStatisticsRepr( s, "HashCacheStatistics" );
+}
+
+std::string computeCacheStatisticsRepr( const ValuePlug::ComputeCacheStatistics &s )
+{
+	return boost::str(
+		boost::format( "Gaffer.ValuePlug.ComputeCacheStatistics( hits = %d, misses = %d, waits = %d, evictions = %d, cost = %d )" )
+			% s.hits
+			% s.misses
+			% s.waits
+			% s.evictions
+			% s.cost
+	);
+}
+
+// Maps are converted to dicts keyed by type name, since that is
+// more useful for reporting than the type id.
+template<typename T>
+dict cacheStatisticsDict( const std::map<IECore::TypeId, T> &m )
+{
+	dict result;
+	for( const auto &s : m )
+	{
+		result[std::string( IECore::RunTimeTyped::typeNameFromTypeId( s.first ) )] = s.second;
+	}
+	return result;
+}
+
+dict hashCacheStatisticsByPlugType()
+{
+	return cacheStatisticsDict( ValuePlug::hashCacheStatisticsByPlugType() );
+}
+
+dict hashCacheStatisticsByNodeType()
+{
+	return cacheStatisticsDict( ValuePlug::hashCacheStatisticsByNodeType() );
+}
+
+dict computeCacheStatisticsByPlugType()
+{
+	return cacheStatisticsDict( ValuePlug::computeCacheStatisticsByPlugType() );
+}
+
+dict computeCacheStatisticsByNodeType()
+{
+	return cacheStatisticsDict( ValuePlug::computeCacheStatisticsByNodeType() );
+}
 
 } // namespace
 
@@ -145,6 +207,48 @@ void GafferModule::bindValuePlug()
 		.staticmethod( "getHashCacheMode" )
 		.def( "setHashCacheMode", &ValuePlug::setHashCacheMode )
 		.staticmethod( "setHashCacheMode" )
+		.def( "getHashCacheMemoryLimit", &ValuePlug::getHashCacheMemoryLimit )
+		.staticmethod( "getHashCacheMemoryLimit" )
+		.def( "setHashCacheMemoryLimit", &ValuePlug::setHashCacheMemoryLimit )
+		.staticmethod( "setHashCacheMemoryLimit" )
+		.def( "hashCacheMemoryUsage", &ValuePlug::hashCacheMemoryUsage )
+		.staticmethod( "hashCacheMemoryUsage" )
+		.def( "setCacheStatisticsEnabled", &ValuePlug::setCacheStatisticsEnabled )
+		.staticmethod( "setCacheStatisticsEnabled" )
+		.def( "getCacheStatisticsEnabled", &ValuePlug::getCacheStatisticsEnabled )
+		.staticmethod( "getCacheStatisticsEnabled" )
+		.def( "hashCacheStatistics", &ValuePlug::hashCacheStatistics )
+		.staticmethod( "hashCacheStatistics" )
+		.def( "hashCacheStatisticsByPlugType", &hashCacheStatisticsByPlugType )
+		.staticmethod( "hashCacheStatisticsByPlugType" )
+		.def( "hashCacheStatisticsByNodeType", &hashCacheStatisticsByNodeType )
+		.staticmethod( "hashCacheStatisticsByNodeType" )
+		.def( "resetHashCacheStatistics", &ValuePlug::resetHashCacheStatistics )
+		.staticmethod( "resetHashCacheStatistics" )
+		.def( "computeCacheStatistics", &ValuePlug::computeCacheStatistics )
+		.staticmethod( "computeCacheStatistics" )
+		.def( "computeCacheStatisticsByPlugType", &computeCacheStatisticsByPlugType )
+		.staticmethod( "computeCacheStatisticsByPlugType" )
+		.def( "computeCacheStatisticsByNodeType", &computeCacheStatisticsByNodeType )
+		.staticmethod( "computeCacheStatisticsByNodeType" )
+		.def( "resetComputeCacheStatistics", &ValuePlug::resetComputeCacheStatistics )
+		.staticmethod( "resetComputeCacheStatistics" )
+		.def( "getDiskCacheDirectory", &ValuePlug::getDiskCacheDirectory )
+		.staticmethod( "getDiskCacheDirectory" )
+		.def( "setDiskCacheDirectory", &ValuePlug::setDiskCacheDirectory )
+		.staticmethod( "setDiskCacheDirectory" )
+		.def( "getDiskCacheEnabled", &ValuePlug::getDiskCacheEnabled )
+		.staticmethod( "getDiskCacheEnabled" )
+		.def( "setDiskCacheEnabled", &ValuePlug::setDiskCacheEnabled )
+		.staticmethod( "setDiskCacheEnabled" )
+		.def( "getDiskCacheSizeLimit", &ValuePlug::getDiskCacheSizeLimit )
+		.staticmethod( "getDiskCacheSizeLimit" )
+		.def( "setDiskCacheSizeLimit", &ValuePlug::setDiskCacheSizeLimit )
+		.staticmethod( "setDiskCacheSizeLimit" )
+		.def( "diskCacheUsage", &ValuePlug::diskCacheUsage )
+		.staticmethod( "diskCacheUsage" )
+		.def( "clearDiskCache", &ValuePlug::clearDiskCache )
+		.staticmethod( "clearDiskCache" )
 		.def( "dirtyCount", &ValuePlug::dirtyCount )
 		.def( "__repr__", &repr )
 	;
@@ -155,6 +259,27 @@ void GafferModule::bindValuePlug()
 		.value( "Legacy", ValuePlug::HashCacheMode::Legacy )
 	;
 
+	class_<ValuePlug::HashCacheStatistics>( "HashCacheStatistics" )
+		.def_readonly( "hits", &ValuePlug::HashCacheStatistics::hits )
+		.def_readonly( "misses", &ValuePlug::HashCacheStatistics::misses )
+		.def_readonly( "evictions", &ValuePlug::HashCacheStatistics::evictions )
+		.def_readonly( "cost", &ValuePlug::HashCacheStatistics::cost )
+		.def( self == self )
+		.def( self != self )
+		.def( "__repr__", &hashCacheStatisticsRepr )
+	;
+
+	class_<ValuePlug::ComputeCacheStatistics>( "ComputeCacheStatistics" )
+		.def_readonly( "hits", &ValuePlug::ComputeCacheStatistics::hits )
+		.def_readonly( "misses", &ValuePlug::ComputeCacheStatistics::misses )
+		.def_readonly( "waits", &ValuePlug::ComputeCacheStatistics::waits )
+		.def_readonly( "evictions", &ValuePlug::ComputeCacheStatistics::evictions )
+		.def_readonly( "cost", &ValuePlug::ComputeCacheStatistics::cost )
+		.def( self == self )
+		.def( self != self )
+		.def( "__repr__", &computeCacheStatisticsRepr )
+	;
+
 	enum_<ValuePlug::CachePolicy>( "CachePolicy" )
 		.value( "Uncached", ValuePlug::CachePolicy::Uncached )
 		.value( "Standard", ValuePlug::CachePolicy::Standard )
@@ -38,6 +38,7 @@
 #include "GafferScene/Instancer.h"
 
 #include "GafferScene/Capsule.h"
+#include "GafferScene/InstancerCapsule.h"
 #include "GafferScene/SceneAlgo.h"
 
 #include "GafferScene/Private/ChildNamesMap.h"
@@ -54,6 +55,7 @@
 #include "IECore/VectorTypedData.h"
 
 #include "boost/lexical_cast.hpp"
+#include "boost/unordered_map.hpp"
 #include "boost/unordered_set.hpp"
 
 #include "tbb/blocked_range.h"
@@ -281,11 +283,309 @@ int seedForPoint( int index, const PrimitiveVariable *primVar, int numSeeds, int
 	return id;
 }
 
+void hashPrimitiveVariable( const Primitive *primitive, const std::string &name, IECore::MurmurHash &h )
+{
+	h.append( name );
+	PrimitiveVariableMap::const_iterator it = primitive->variables.find( name );
+	if( it == primitive->variables.end() )
+	{
+		return;
+	}
+
+	h.append( (int)it->second.interpolation );
+	it->second.data->hash( h );
+	if( it->second.indices )
+	{
+		it->second.indices->hash( h );
+	}
+}
+
 InternedString g_prototypeRootName( "root" );
 ConstInternedStringVectorDataPtr g_emptyNames = new InternedStringVectorData();
 
 }
 
+//////////////////////////////////////////////////////////////////////////
+// TopologyData
+//////////////////////////////////////////////////////////////////////////
+
+// Custom Data derived class used to store the mapping from points to
+// prototypes and instance ids. This depends only on the point count, the
+// ids, the prototype indices and the prototype roots, so it is computed
+// separately from the EngineData. This allows it to be reused when only
+// the positions or other attributes of the points change, as is typical
+// when scrubbing through a simulation.
+class Instancer::TopologyData : public Data
+{
+
+	public :
+
+		TopologyData(
+			const Primitive *primitive,
+			PrototypeMode mode,
+			const std::string &index,
+			const std::string &rootsVariable,
+			const StringVectorData *rootsList,
+			const ScenePlug *prototypes,
+			const std::string &id
+		)
+			:	m_numPoints( primitive ? primitive->variableSize( PrimitiveVariable::Vertex ) : 0 ),
+				m_numPrototypes( 0 ),
+				m_numValidPrototypes( 0 ),
+				m_indices( nullptr ),
+				m_ids( nullptr )
+		{
+			if( !primitive )
+			{
+				return;
+			}
+
+			initPrototypes( primitive, mode, index, rootsVariable, rootsList, prototypes );
+
+			if( const IntVectorData *ids = primitive->variableData<IntVectorData>( id ) )
+			{
+				m_idsData = ids;
+				m_ids = &ids->readable();
+				if( m_ids->size() != numPoints() )
+				{
+					throw IECore::Exception( boost::str( boost::format( "Id primitive variable \"%1%\" has incorrect size" ) % id ) );
+				}
+			}
+
+			if( m_ids )
+			{
+				for( size_t i = 0; i<numPoints(); ++i )
+				{
+					// Iterate in reverse order so that in case of duplicates, the first one will override
+					size_t reverseI = numPoints() - 1 - i;
+					m_idsToPointIndices[(*m_ids)[reverseI]] = reverseI;
+				}
+			}
+		}
+
+		size_t numPoints() const
+		{
+			return m_numPoints;
+		}
+
+		size_t instanceId( size_t pointIndex ) const
+		{
+			return m_ids ? (*m_ids)[pointIndex] : pointIndex;
+		}
+
+		size_t pointIndex( const InternedString &name ) const
+		{
+			const size_t i = boost::lexical_cast<size_t>( name );
+			if( !m_ids )
+			{
+				if( i >= numPoints() )
+				{
+					throw IECore::Exception( boost::str( boost::format( "Instance id \"%1%\" is invalid, instancer produces only %2% children.  Topology may have changed during shutter." ) % name % numPoints() ) );
+				}
+				return i;
+			}
+
+			IdsToPointIndices::const_iterator it = m_idsToPointIndices.find( i );
+			if( it == m_idsToPointIndices.end() )
+			{
+				throw IECore::Exception( boost::str( boost::format( "Instance id \"%1%\" is invalid.  Topology may have changed during shutter." ) % name ) );
+			}
+
+			return it->second;
+		}
+
+		size_t numValidPrototypes() const
+		{
+			return m_numValidPrototypes;
+		}
+
+		int prototypeIndex( size_t pointIndex ) const
+		{
+			if( m_numPrototypes )
+			{
+				return m_prototypeIndexRemap[ ( m_indices ? (*m_indices)[pointIndex] : 0 ) % m_numPrototypes ];
+			}
+			else
+			{
+				return -1;
+			}
+		}
+
+		const ScenePlug::ScenePath *prototypeRoot( const InternedString &name ) const
+		{
+			return &( m_roots[m_names->input( name ).index]->readable() );
+		}
+
+		const std::vector<ConstInternedStringVectorDataPtr> &prototypeRoots() const
+		{
+			return m_roots;
+		}
+
+		const InternedStringVectorData *prototypeNames() const
+		{
+			return m_names ? m_names->outputChildNames() : g_emptyNames.get();
+		}
+
+	protected :
+
+		void copyFrom( const Object *other, CopyContext *context ) override
+		{
+			Data::copyFrom( other, context );
+			msg( Msg::Warning, "TopologyData::copyFrom", "Not implemented" );
+		}
+
+		void save( SaveContext *context ) const override
+		{
+			Data::save( context );
+			msg( Msg::Warning, "TopologyData::save", "Not implemented" );
+		}
+
+		void load( LoadContextPtr context ) override
+		{
+			Data::load( context );
+			msg( Msg::Warning, "TopologyData::load", "Not implemented" );
+		}
+
+	private :
+
+		void initPrototypes( const Primitive *primitive, PrototypeMode mode, const std::string &index, const std::string &rootsVariable, const StringVectorData *rootsList, const ScenePlug *prototypes )
+		{
+			const std::vector<std::string> *rootStrings = nullptr;
+
+			switch( mode )
+			{
+				case PrototypeMode::IndexedRootsList :
+				{
+					if( const auto *indices = primitive->variableData<IntVectorData>( index ) )
+					{
+						m_indicesData = indices;
+						m_indices = &indices->readable();
+						if( m_indices->size() != numPoints() )
+						{
+							throw IECore::Exception( boost::str( boost::format( "prototypeIndex primitive variable \"%1%\" has incorrect size" ) % index ) );
+						}
+					}
+
+					rootStrings = &rootsList->readable();
+
+					break;
+				}
+				case PrototypeMode::IndexedRootsVariable :
+				{
+					if( const auto *indices = primitive->variableData<IntVectorData>( index ) )
+					{
+						m_indicesData = indices;
+						m_indices = &indices->readable();
+						if( m_indices->size() != numPoints() )
+						{
+							throw IECore::Exception( boost::str( boost::format( "prototypeIndex primitive variable \"%1%\" has incorrect size" ) % index ) );
+						}
+					}
+
+					const auto *roots = primitive->variableData<StringVectorData>( rootsVariable, PrimitiveVariable::Constant );
+					if( !roots )
+					{
+						std::string message = boost::str( boost::format( "prototypeRoots primitive variable \"%1%\" must be Constant StringVectorData when using IndexedRootsVariable mode" ) % rootsVariable );
+						if( primitive->variables.find( rootsVariable ) == primitive->variables.end() )
+						{
+							message += ", but it does not exist";
+						}
+						throw IECore::Exception( message );
+					}
+
+					rootStrings = &roots->readable();
+					if( rootStrings->empty() )
+					{
+						throw IECore::Exception( boost::str( boost::format( "prototypeRoots primitive variable \"%1%\" must specify at least one root location" ) % rootsVariable ) );
+					}
+
+					break;
+				}
+				case PrototypeMode::RootPerVertex :
+				{
+					const auto view = primitive->variableIndexedView<StringVectorData>( rootsVariable, PrimitiveVariable::Vertex );
+					if( !view )
+					{
+						std::string message = boost::str( boost::format( "prototypeRoots primitive variable \"%1%\" must be Vertex StringVectorData when using RootPerVertex mode" ) % rootsVariable );
+						if( primitive->variables.find( rootsVariable ) == primitive->variables.end() )
+						{
+							message += ", but it does not exist";
+						}
+						throw IECore::Exception( message );
+					}
+
+					m_indicesData = primitive->variables.find( rootsVariable )->second.indices;
+					m_indices = view->indices();
+					rootStrings = &view->data();
+					if( rootStrings->empty() )
+					{
+						throw IECore::Exception( boost::str( boost::format( "prototypeRoots primitive variable \"%1%\" must specify at least one root location" ) % rootsVariable ) );
+					}
+
+					break;
+				}
+			}
+
+			std::vector<ConstInternedStringVectorDataPtr> inputNames;
+			inputNames.reserve( rootStrings->size() );
+			m_roots.reserve( rootStrings->size() );
+			m_prototypeIndexRemap.reserve( rootStrings->size() );
+
+			size_t i = 0;
+			ScenePlug::ScenePath path;
+			for( const auto &root : *rootStrings )
+			{
+				ScenePlug::stringToPath( root, path );
+				if( !prototypes->exists( path ) )
+				{
+					throw IECore::Exception( boost::str( boost::format( "Prototype root \"%1%\" does not exist in the `prototypes` scene" ) % root ) );
+				}
+
+				if( path.empty() )
+				{
+					if( root == "/" )
+					{
+						inputNames.emplace_back( new InternedStringVectorData( { g_prototypeRootName } ) );
+						m_roots.emplace_back( new InternedStringVectorData( path ) );
+						m_prototypeIndexRemap.emplace_back( i++ );
+					}
+					else
+					{
+						m_prototypeIndexRemap.emplace_back( -1 );
+					}
+				}
+				else
+				{
+					inputNames.emplace_back( new InternedStringVectorData( { path.back() } ) );
+					m_roots.emplace_back( new InternedStringVectorData( path ) );
+					m_prototypeIndexRemap.emplace_back( i++ );
+				}
+			}
+
+			m_names = new Private::ChildNamesMap( inputNames );
+			m_numPrototypes = m_prototypeIndexRemap.size();
+			m_numValidPrototypes = m_names->outputChildNames()->readable().size();
+		}
+
+		const size_t m_numPoints;
+		size_t m_numPrototypes;
+		size_t m_numValidPrototypes;
+		Private::ChildNamesMapPtr m_names;
+		std::vector<ConstInternedStringVectorDataPtr> m_roots;
+		std::vector<int> m_prototypeIndexRemap;
+		// We don't hold onto the primitive, because that would keep
+		// all its other primitive variables alive for as long as we are
+		// reused. Instead we just hold onto the data we need.
+		ConstIntVectorDataPtr m_indicesData;
+		const std::vector<int> *m_indices;
+		ConstIntVectorDataPtr m_idsData;
+		const std::vector<int> *m_ids;
+
+		typedef std::unordered_map <int, size_t> IdsToPointIndices;
+		IdsToPointIndices m_idsToPointIndices;
+
+};
+
 //////////////////////////////////////////////////////////////////////////
 // EngineData
 //////////////////////////////////////////////////////////////////////////
@@ -300,12 +600,7 @@ class Instancer::EngineData : public Data
 
 		EngineData(
 			ConstPrimitivePtr primitive,
-			PrototypeMode mode,
-			const std::string &index,
-			const std::string &rootsVariable,
-			const StringVectorData *rootsList,
-			const ScenePlug *prototypes,
-			const std::string &id,
+			ConstTopologyDataPtr topology,
 			const std::string &position,
 			const std::string &orientation,
 			const std::string &scale,
@@ -314,10 +609,7 @@ class Instancer::EngineData : public Data
 			const std::vector< PrototypeContextVariable > &prototypeContextVariables
 		)
 			:	m_primitive( primitive ),
-				m_numPrototypes( 0 ),
-				m_numValidPrototypes( 0 ),
-				m_indices( nullptr ),
-				m_ids( nullptr ),
+				m_topology( topology ),
 				m_positions( nullptr ),
 				m_orientations( nullptr ),
 				m_scales( nullptr ),
@@ -329,17 +621,6 @@ class Instancer::EngineData : public Data
 				return;
 			}
 
-			initPrototypes( mode, index, rootsVariable, rootsList, prototypes );
-
-			if( const IntVectorData *ids = m_primitive->variableData<IntVectorData>( id ) )
-			{
-				m_ids = &ids->readable();
-				if( m_ids->size() != numPoints() )
-				{
-					throw IECore::Exception( boost::str( boost::format( "Id primitive variable \"%1%\" has incorrect size" ) % id ) );
-				}
-			}
-
 			if( const V3fVectorData *p = m_primitive->variableData<V3fVectorData>( position ) )
 			{
 				m_positions = &p->readable();
@@ -375,16 +656,6 @@ class Instancer::EngineData : public Data
 				}
 			}
 
-			if( m_ids )
-			{
-				for( size_t i = 0; i<numPoints(); ++i )
-				{
-					// Iterate in reverse order so that in case of duplicates, the first one will override
-					size_t reverseI = numPoints() - 1 - i;
-					m_idsToPointIndices[(*m_ids)[reverseI]] = reverseI;
-				}
-			}
-
 			initAttributes( attributes, attributePrefix );
 
 			for( const auto &v : m_prototypeContextVariables )
@@ -403,64 +674,46 @@ class Instancer::EngineData : public Data
 			}
 		}
 
+		const TopologyData *topology() const
+		{
+			return m_topology.get();
+		}
+
 		size_t numPoints() const
 		{
-			return m_primitive ? m_primitive->variableSize( PrimitiveVariable::Vertex ) : 0;
+			return m_topology->numPoints();
 		}
 
 		size_t instanceId( size_t pointIndex ) const
 		{
-			return m_ids ? (*m_ids)[pointIndex] : pointIndex;
+			return m_topology->instanceId( pointIndex );
 		}
 
 		size_t pointIndex( const InternedString &name ) const
-		{
-			const size_t i = boost::lexical_cast<size_t>( name );
-			if( !m_ids )
-			{
-				if( i >= numPoints() )
-				{
-					throw IECore::Exception( boost::str( boost::format( "Instance id \"%1%\" is invalid, instancer produces only %2% children.  Topology may have changed during shutter." ) % name % numPoints() ) );
-				}
-				return i;
-			}
-
-			IdsToPointIndices::const_iterator it = m_idsToPointIndices.find( i );
-			if( it == m_idsToPointIndices.end() )
-			{
-				throw IECore::Exception( boost::str( boost::format( "Instance id \"%1%\" is invalid.  Topology may have changed during shutter." ) % name ) );
-			}
-
-			return it->second;
+		{
+			return m_topology->pointIndex( name );
 		}
 
 		size_t numValidPrototypes() const
 		{
-			return m_numValidPrototypes;
+			return m_topology->numValidPrototypes();
 		}
 
 		int prototypeIndex( size_t pointIndex ) const
 		{
-			if( m_numPrototypes )
-			{
-				return m_prototypeIndexRemap[ ( m_indices ? (*m_indices)[pointIndex] : 0 ) % m_numPrototypes ];
-			}
-			else
-			{
-				return -1;
-			}
+			return m_topology->prototypeIndex( pointIndex );
 		}
 
 		// Return a pointer since this is for internal use only, and it helps communicate that we
 		// are responsible for holding the storage for this scene path when it gets put in the context
 		const ScenePlug::ScenePath *prototypeRoot( const InternedString &name ) const
 		{
-			return &( m_roots[m_names->input( name ).index]->readable() );
+			return m_topology->prototypeRoot( name );
 		}
 
 		const InternedStringVectorData *prototypeNames() const
 		{
-			return m_names ? m_names->outputChildNames() : g_emptyNames.get();
+			return m_topology->prototypeNames();
 		}
 
 		M44f instanceTransform( size_t pointIndex ) const
@@ -505,6 +758,18 @@ class Instancer::EngineData : public Data
 			}
 		}
 
+		// Returns the instance attributes for the specified points, packed
+		// into a VectorData per attribute.
+		CompoundDataPtr packedInstanceAttributes( const std::vector<size_t> &pointIndices ) const
+		{
+			CompoundDataPtr result = new CompoundData;
+			for( const auto &attributeData : m_attributeData )
+			{
+				result->writable()[attributeData.first] = dispatch( attributeData.second.get(), PackAttribute(), pointIndices );
+			}
+			return result;
+		}
+
 		typedef std::map< InternedString, boost::unordered_set< IECore::MurmurHash > > PrototypeHashes;
 
 		// In order to compute the number of variations, we compute a unique hash for every context we use
@@ -527,7 +792,7 @@ class Instancer::EngineData : public Data
 				}
 
 				IECore::MurmurHash totalHash;
-				const InternedStringVectorData &rootPath = *m_roots[ protoIndex ];
+				const InternedStringVectorData &rootPath = *m_topology->prototypeRoots()[ protoIndex ];
 
 				// Note that we are rehashing the root path for every point, even though they are heavily
 				// reused.  This seems suboptimal, but is simpler, and the more complex version doesn't
@@ -559,6 +824,16 @@ class Instancer::EngineData : public Data
 			return m_prototypeContextVariables.size() != 0;
 		}
 
+		// Hashes the prototype context variables for a single point. Points
+		// with equal hashes share the same prototype context.
+		void prototypeContextHash( size_t pointIndex, IECore::MurmurHash &h ) const
+		{
+			for( const auto &v : m_prototypeContextVariables )
+			{
+				hashPrototypeContextVariable( pointIndex, v, h );
+			}
+		}
+
 		// Set the context variables in the context for this index, based on the m_prototypeContextVariables
 		// set up for this EngineData
 		void setPrototypeContextVariables( int index, Context::EditableScope &scope ) const
@@ -644,13 +919,13 @@ class Instancer::EngineData : public Data
 			template<typename T>
 			AttributeCreator operator()( const TypedData<vector<T>> *data )
 			{
-				return std::bind( &createAttribute<T>, data->readable(), ::_1 );
+				return std::bind( &createAttribute<T>, &data->readable(), ::_1 );
 			}
 
 			template<typename T>
 			AttributeCreator operator()( const GeometricTypedData<vector<T>> *data )
 			{
-				return std::bind( &createGeometricAttribute<T>, data->readable(), data->getInterpretation(), ::_1 );
+				return std::bind( &createGeometricAttribute<T>, &data->readable(), data->getInterpretation(), ::_1 );
 			}
 
 			AttributeCreator operator()( const Data *data )
@@ -660,175 +935,93 @@ class Instancer::EngineData : public Data
 
 			private :
 
+				// The values are owned by `m_attributeData`, which has the
+				// same lifetime as the creator.
 				template<typename T>
-				static DataPtr createAttribute( const vector<T> &values, size_t index )
+				static DataPtr createAttribute( const vector<T> *values, size_t index )
 				{
-					return new TypedData<T>( values[index] );
+					return new TypedData<T>( (*values)[index] );
 				}
 
 				template<typename T>
-				static DataPtr createGeometricAttribute( const vector<T> &values, GeometricData::Interpretation interpretation, size_t index )
+				static DataPtr createGeometricAttribute( const vector<T> *values, GeometricData::Interpretation interpretation, size_t index )
 				{
-					return new GeometricTypedData<T>( values[index], interpretation );
+					return new GeometricTypedData<T>( (*values)[index], interpretation );
 				}
 
 		};
 
-		void initAttributes( const std::string &attributes, const std::string &attributePrefix )
+		struct PackAttribute
 		{
-			m_attributesHash.append( attributePrefix );
 
-			for( auto &primVar : m_primitive->variables )
+			template<typename T>
+			DataPtr operator()( const TypedData<vector<T>> *data, const vector<size_t> &pointIndices )
 			{
-				if( primVar.second.interpolation != PrimitiveVariable::Vertex )
-				{
-					continue;
-				}
-				if( !StringAlgo::matchMultiple( primVar.first, attributes ) )
-				{
-					continue;
-				}
-				DataPtr d = primVar.second.expandedData();
-				AttributeCreator attributeCreator = dispatch( d.get(), MakeAttributeCreator() );
-				m_attributeCreators[attributePrefix + primVar.first] = attributeCreator;
-				m_attributesHash.append( primVar.first );
-				d->hash( m_attributesHash );
+				typename TypedData<vector<T>>::Ptr result = new TypedData<vector<T>>;
+				pack( data->readable(), pointIndices, result->writable() );
+				return result;
 			}
-		}
 
-		void initPrototypes( PrototypeMode mode, const std::string &index, const std::string &rootsVariable, const StringVectorData *rootsList, const ScenePlug *prototypes )
-		{
-			const std::vector<std::string> *rootStrings = nullptr;
+			template<typename T>
+			DataPtr operator()( const GeometricTypedData<vector<T>> *data, const vector<size_t> &pointIndices )
+			{
+				typename GeometricTypedData<vector<T>>::Ptr result = new GeometricTypedData<vector<T>>;
+				result->setInterpretation( data->getInterpretation() );
+				pack( data->readable(), pointIndices, result->writable() );
+				return result;
+			}
 
-			switch( mode )
+			DataPtr operator()( const Data *data, const vector<size_t> &pointIndices )
 			{
-				case PrototypeMode::IndexedRootsList :
-				{
-					if( const auto *indices = m_primitive->variableData<IntVectorData>( index ) )
-					{
-						m_indices = &indices->readable();
-						if( m_indices->size() != numPoints() )
-						{
-							throw IECore::Exception( boost::str( boost::format( "prototypeIndex primitive variable \"%1%\" has incorrect size" ) % index ) );
-						}
-					}
+				throw IECore::InvalidArgumentException( "Expected VectorTypedData" );
+			}
 
-					rootStrings = &rootsList->readable();
+			private :
 
-					break;
-				}
-				case PrototypeMode::IndexedRootsVariable :
+				template<typename T>
+				static void pack( const vector<T> &values, const vector<size_t> &pointIndices, vector<T> &result )
 				{
-					if( const auto *indices = m_primitive->variableData<IntVectorData>( index ) )
-					{
-						m_indices = &indices->readable();
-						if( m_indices->size() != numPoints() )
-						{
-							throw IECore::Exception( boost::str( boost::format( "prototypeIndex primitive variable \"%1%\" has incorrect size" ) % index ) );
-						}
-					}
-
-					const auto *roots = m_primitive->variableData<StringVectorData>( rootsVariable, PrimitiveVariable::Constant );
-					if( !roots )
-					{
-						std::string message = boost::str( boost::format( "prototypeRoots primitive variable \"%1%\" must be Constant StringVectorData when using IndexedRootsVariable mode" ) % rootsVariable );
-						if( m_primitive->variables.find( rootsVariable ) == m_primitive->variables.end() )
-						{
-							message += ", but it does not exist";
-						}
-						throw IECore::Exception( message );
-					}
-
-					rootStrings = &roots->readable();
-					if( rootStrings->empty() )
+					result.reserve( pointIndices.size() );
+					for( size_t i : pointIndices )
 					{
-						throw IECore::Exception( boost::str( boost::format( "prototypeRoots primitive variable \"%1%\" must specify at least one root location" ) % rootsVariable ) );
+						result.push_back( values[i] );
 					}
-
-					break;
 				}
-				case PrototypeMode::RootPerVertex :
-				{
-					const auto view = m_primitive->variableIndexedView<StringVectorData>( rootsVariable, PrimitiveVariable::Vertex );
-					if( !view )
-					{
-						std::string message = boost::str( boost::format( "prototypeRoots primitive variable \"%1%\" must be Vertex StringVectorData when using RootPerVertex mode" ) % rootsVariable );
-						if( m_primitive->variables.find( rootsVariable ) == m_primitive->variables.end() )
-						{
-							message += ", but it does not exist";
-						}
-						throw IECore::Exception( message );
-					}
-
-					m_indices = view->indices();
-					rootStrings = &view->data();
-					if( rootStrings->empty() )
-					{
-						throw IECore::Exception( boost::str( boost::format( "prototypeRoots primitive variable \"%1%\" must specify at least one root location" ) % rootsVariable ) );
-					}
 
-					break;
-				}
-			}
+		};
 
-			std::vector<ConstInternedStringVectorDataPtr> inputNames;
-			inputNames.reserve( rootStrings->size() );
-			m_roots.reserve( rootStrings->size() );
-			m_prototypeIndexRemap.reserve( rootStrings->size() );
+		void initAttributes( const std::string &attributes, const std::string &attributePrefix )
+		{
+			m_attributesHash.append( attributePrefix );
 
-			size_t i = 0;
-			ScenePlug::ScenePath path;
-			for( const auto &root : *rootStrings )
+			for( auto &primVar : m_primitive->variables )
 			{
-				ScenePlug::stringToPath( root, path );
-				if( !prototypes->exists( path ) )
-				{
-					throw IECore::Exception( boost::str( boost::format( "Prototype root \"%1%\" does not exist in the `prototypes` scene" ) % root ) );
-				}
-
-				if( path.empty() )
+				if( primVar.second.interpolation != PrimitiveVariable::Vertex )
 				{
-					if( root == "/" )
-					{
-						inputNames.emplace_back( new InternedStringVectorData( { g_prototypeRootName } ) );
-						m_roots.emplace_back( new InternedStringVectorData( path ) );
-						m_prototypeIndexRemap.emplace_back( i++ );
-					}
-					else
-					{
-						m_prototypeIndexRemap.emplace_back( -1 );
-					}
+					continue;
 				}
-				else
+				if( !StringAlgo::matchMultiple( primVar.first, attributes ) )
 				{
-					inputNames.emplace_back( new InternedStringVectorData( { path.back() } ) );
-					m_roots.emplace_back( new InternedStringVectorData( path ) );
-					m_prototypeIndexRemap.emplace_back( i++ );
+					continue;
 				}
+				DataPtr d = primVar.second.expandedData();
+				AttributeCreator attributeCreator = dispatch( d.get(), MakeAttributeCreator() );
+				m_attributeCreators[attributePrefix + primVar.first] = attributeCreator;
+				m_attributeData[attributePrefix + primVar.first] = d;
+				m_attributesHash.append( primVar.first );
+				d->hash( m_attributesHash );
 			}
-
-			m_names = new Private::ChildNamesMap( inputNames );
-			m_numPrototypes = m_prototypeIndexRemap.size();
-			m_numValidPrototypes = m_names->outputChildNames()->readable().size();
 		}
 
 		IECoreScene::ConstPrimitivePtr m_primitive;
-		size_t m_numPrototypes;
-		size_t m_numValidPrototypes;
-		Private::ChildNamesMapPtr m_names;
-		std::vector<ConstInternedStringVectorDataPtr> m_roots;
-		std::vector<int> m_prototypeIndexRemap;
-		const std::vector<int> *m_indices;
-		const std::vector<int> *m_ids;
+		ConstTopologyDataPtr m_topology;
 		const std::vector<Imath::V3f> *m_positions;
 		const std::vector<Imath::Quatf> *m_orientations;
 		const std::vector<Imath::V3f> *m_scales;
 		const std::vector<float> *m_uniformScales;
 
-		typedef std::unordered_map <int, size_t> IdsToPointIndices;
-		IdsToPointIndices m_idsToPointIndices;
-
 		boost::container::flat_map<InternedString, AttributeCreator> m_attributeCreators;
+		boost::container::flat_map<InternedString, ConstDataPtr> m_attributeData;
 		MurmurHash m_attributesHash;
 
 		const std::vector< PrototypeContextVariable > m_prototypeContextVariables;
@@ -925,6 +1118,8 @@ Instancer::Instancer( const std::string &name )
 	addChild( new AtomicCompoundDataPlug( "__prototypeChildNames", Plug::Out, new CompoundData ) );
 	addChild( new ScenePlug( "__capsuleScene", Plug::Out ) );
 	addChild( new PathMatcherDataPlug( "__setCollaborate", Plug::Out, new IECore::PathMatcherData() ) );
+	addChild( new BoolPlug( "packInstanceGroups", Plug::In ) );
+	addChild( new ObjectPlug( "__topology", Plug::Out, NullObject::defaultNullObject() ) );
 
 	// Hide `destination` plug until we resolve issues surrounding `processesRootObject()`.
 	// See `BranchCreator::computeObject()`.
@@ -1071,6 +1266,16 @@ const Gaffer::BoolPlug *Instancer::encapsulateInstanceGroupsPlug() const
 	return getChild<BoolPlug>( g_firstPlugIndex + 12 );
 }
 
+Gaffer::BoolPlug *Instancer::packInstanceGroupsPlug()
+{
+	return getChild<BoolPlug>( g_firstPlugIndex + 25 );
+}
+
+const Gaffer::BoolPlug *Instancer::packInstanceGroupsPlug() const
+{
+	return getChild<BoolPlug>( g_firstPlugIndex + 25 );
+}
+
 Gaffer::BoolPlug *Instancer::seedEnabledPlug()
 {
 	return getChild<BoolPlug>( g_firstPlugIndex + 13 );
@@ -1191,6 +1396,16 @@ const Gaffer::PathMatcherDataPlug *Instancer::setCollaboratePlug() const
 	return getChild<PathMatcherDataPlug>( g_firstPlugIndex + 24 );
 }
 
+Gaffer::ObjectPlug *Instancer::topologyPlug()
+{
+	return getChild<ObjectPlug>( g_firstPlugIndex + 26 );
+}
+
+const Gaffer::ObjectPlug *Instancer::topologyPlug() const
+{
+	return getChild<ObjectPlug>( g_firstPlugIndex + 26 );
+}
+
 void Instancer::affects( const Plug *input, AffectedPlugsContainer &outputs ) const
 {
 	BranchCreator::affects( input, outputs );
@@ -1203,6 +1418,21 @@ void Instancer::affects( const Plug *input, AffectedPlugsContainer &outputs ) co
 		input == prototypeRootsListPlug() ||
 		input == prototypesPlug()->childNamesPlug() ||
 		input == prototypesPlug()->existsPlug() ||
+		input == idPlug()
+	)
+	{
+		outputs.push_back( topologyPlug() );
+	}
+
+	if(
+		input == inPlug()->objectPlug() ||
+		input == topologyPlug() ||
+		input == prototypeModePlug() ||
+		input == prototypeIndexPlug() ||
+		input == prototypeRootsPlug() ||
+		input == prototypeRootsListPlug() ||
+		input == prototypesPlug()->childNamesPlug() ||
+		input == prototypesPlug()->existsPlug() ||
 		input == idPlug() ||
 		input == positionPlug() ||
 		input == orientationPlug() ||
@@ -1221,7 +1451,7 @@ void Instancer::affects( const Plug *input, AffectedPlugsContainer &outputs ) co
 		outputs.push_back( enginePlug() );
 	}
 
-	if( input == enginePlug() )
+	if( input == topologyPlug() )
 	{
 		outputs.push_back( prototypeChildNamesPlug() );
 	}
@@ -1229,14 +1459,21 @@ void Instancer::affects( const Plug *input, AffectedPlugsContainer &outputs ) co
 	// For the affects of our output plug, we can mostly rely on BranchCreator's mechanism driven
 	// by affectsBranchObject etc., but for these 3 plugs, we have an overridden hash/compute
 	// which in addition to everything that BranchCreator handles, are also affected by
-	// encapsulateInstanceGroupsPlug()
-	if( input == encapsulateInstanceGroupsPlug() )
+	// encapsulateInstanceGroupsPlug() and packInstanceGroupsPlug()
+	if( input == encapsulateInstanceGroupsPlug() || input == packInstanceGroupsPlug() )
 	{
 		outputs.push_back( outPlug()->objectPlug() );
 		outputs.push_back( outPlug()->childNamesPlug() );
 		outputs.push_back( outPlug()->setPlug() );
 	}
 
+	// Packed instance groups store the input globals, so that the shutter
+	// can be used when rendering the prototypes.
+	if( input == inPlug()->globalsPlug() )
+	{
+		outputs.push_back( outPlug()->objectPlug() );
+	}
+
 	// The capsule scene depends on all the same things as the regular output scene ( aside from not
 	// being affected by the encapsulate plug, which always must be true when it's evaluated anyway ),
 	// so we can leverage the logic in BranchCreator to drive it
@@ -1277,7 +1514,27 @@ void Instancer::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *co
 {
 	BranchCreator::hash( output, context, h );
 
-	if( output == enginePlug() )
+	if( output == topologyPlug() )
+	{
+		// We want this hash to remain unchanged when only the positions or
+		// other attributes of the points change, so we can't use the hash
+		// of the whole object. Instead we hash only the primitive variables
+		// we depend on. This requires us to load the object, but the engine
+		// will need it anyway, and hashing the primitive variables is much
+		// cheaper than building the topology.
+		if( ConstPrimitivePtr primitive = runTimeCast<const Primitive>( inPlug()->objectPlug()->getValue() ) )
+		{
+			h.append( (uint64_t)primitive->variableSize( PrimitiveVariable::Vertex ) );
+			hashPrimitiveVariable( primitive.get(), prototypeIndexPlug()->getValue(), h );
+			hashPrimitiveVariable( primitive.get(), prototypeRootsPlug()->getValue(), h );
+			hashPrimitiveVariable( primitive.get(), idPlug()->getValue(), h );
+		}
+
+		prototypeModePlug()->hash( h );
+		prototypeRootsListPlug()->hash( h );
+		h.append( prototypesPlug()->childNamesHash( ScenePath() ) );
+	}
+	else if( output == enginePlug() )
 	{
 		inPlug()->objectPlug()->hash( h );
 
@@ -1318,7 +1575,7 @@ void Instancer::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *co
 	}
 	else if( output == prototypeChildNamesPlug() )
 	{
-		enginePlug()->hash( h );
+		topologyPlug()->hash( h );
 	}
 	else if( output == variationsPlug() )
 	{
@@ -1352,10 +1609,10 @@ void Instancer::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *co
 			// computeBranchSet checks the accurate hasContextVariables before evaluating setCollaboratePlug.
 			// But hashBranchSet is evaluating us, so we have to give a hash that will work for it.
 			//
-			// We could always hash this stuff in hashBranchSet, but we would lose out a benefit of a more
-			// accurate hash when we do actually have context variables:  the slower hash won't change
-			// if point locations change, unlike the engineHash which includes all changes
-			engineHash( sourcePath, context, h );
+			// Note that we use the topology hash rather than the engine hash, because without context
+			// variables the set depends only on the mapping of points to prototypes and ids, and not on
+			// the point positions.
+			topologyHash( sourcePath, context, h );
 			prototypeChildNamesHash( sourcePath, context, h );
 			prototypesPlug()->setPlug()->hash( h );
 			namePlug()->hash( h );
@@ -1402,10 +1659,10 @@ void Instancer::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *co
 
 void Instancer::compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const
 {
-	// Both the enginePlug and prototypeChildNamesPlug are evaluated
-	// in a context in which scene:path holds the parent path for a
-	// branch.
-	if( output == enginePlug() )
+	// The topologyPlug, enginePlug and prototypeChildNamesPlug are
+	// evaluated in a context in which scene:path holds the parent path
+	// for a branch.
+	if( output == topologyPlug() )
 	{
 		PrototypeMode mode = (PrototypeMode)prototypeModePlug()->getValue();
 		ConstStringVectorDataPtr prototypeRootsList = prototypeRootsListPlug()->getValue();
@@ -1422,6 +1679,24 @@ void Instancer::compute( Gaffer::ValuePlug *output, const Gaffer::Context *conte
 
 		ConstPrimitivePtr primitive = runTimeCast<const Primitive>( inPlug()->objectPlug()->getValue() );
 
+		static_cast<ObjectPlug *>( output )->setValue(
+			new TopologyData(
+				primitive.get(),
+				mode,
+				prototypeIndexPlug()->getValue(),
+				prototypeRootsPlug()->getValue(),
+				prototypeRootsList.get(),
+				prototypesPlug(),
+				idPlug()->getValue()
+			)
+		);
+		return;
+	}
+	else if( output == enginePlug() )
+	{
+		ConstPrimitivePtr primitive = runTimeCast<const Primitive>( inPlug()->objectPlug()->getValue() );
+		ConstTopologyDataPtr topology = boost::static_pointer_cast<const TopologyData>( topologyPlug()->getValue() );
+
 		// Prepare the list of all context variables that affect the prototype scope, in an internal
 		// struct that makes it easier to use them later
 		std::vector< PrototypeContextVariable > prototypeContextVariables;
@@ -1509,12 +1784,7 @@ void Instancer::compute( Gaffer::ValuePlug *output, const Gaffer::Context *conte
 		static_cast<ObjectPlug *>( output )->setValue(
 			new EngineData(
 				primitive,
-				mode,
-				prototypeIndexPlug()->getValue(),
-				prototypeRootsPlug()->getValue(),
-				prototypeRootsList.get(),
-				prototypesPlug(),
-				idPlug()->getValue(),
+				topology,
 				positionPlug()->getValue(),
 				orientationPlug()->getValue(),
 				scalePlug()->getValue(),
@@ -1533,21 +1803,21 @@ void Instancer::compute( Gaffer::ValuePlug *output, const Gaffer::Context *conte
 		// computeBranchChildNames() but that would require N
 		// passes over the input points, where N is the number
 		// of prototypes.
-		ConstEngineDataPtr engine = boost::static_pointer_cast<const EngineData>( enginePlug()->getValue() );
-		const auto &prototypeNames = engine->prototypeNames()->readable();
+		ConstTopologyDataPtr topology = boost::static_pointer_cast<const TopologyData>( topologyPlug()->getValue() );
+		const auto &prototypeNames = topology->prototypeNames()->readable();
 
 		vector<vector<size_t>> indexedPrototypeChildIds;
 
-		size_t numPrototypes = engine->numValidPrototypes();
+		size_t numPrototypes = topology->numValidPrototypes();
 		if( numPrototypes )
 		{
 			indexedPrototypeChildIds.resize( numPrototypes );
-			for( size_t i = 0, e = engine->numPoints(); i < e; ++i )
+			for( size_t i = 0, e = topology->numPoints(); i < e; ++i )
 			{
-				int prototypeIndex = engine->prototypeIndex( i );
+				int prototypeIndex = topology->prototypeIndex( i );
 				if( prototypeIndex != -1 )
 				{
-					indexedPrototypeChildIds[prototypeIndex].push_back( engine->instanceId( i ) );
+					indexedPrototypeChildIds[prototypeIndex].push_back( topology->instanceId( i ) );
 				}
 			}
 		}
@@ -2010,7 +2280,7 @@ IECore::ConstObjectPtr Instancer::computeBranchObject( const ScenePath &sourcePa
 
 void Instancer::hashObject( const ScenePath &path, const Gaffer::Context *context, const ScenePlug *parent, IECore::MurmurHash &h ) const
 {
-	if( parent != capsuleScenePlug() && encapsulateInstanceGroupsPlug()->getValue() )
+	if( collapsesInstanceGroups( parent ) )
 	{
 		// Handling this special case here means an extra call to sourceAndBranchPaths
 		// when we're encapsulating and we're not inside a branch - this is a small
@@ -2032,6 +2302,11 @@ void Instancer::hashObject( const ScenePath &path, const Gaffer::Context *contex
 			engineHash( sourcePath, context, h );
 			h.append( context->hash() );
 			outPlug()->boundPlug()->hash( h );
+			if( packInstanceGroupsPlug()->getValue() )
+			{
+				prototypeChildNamesHash( sourcePath, context, h );
+				h.append( inPlug()->globalsHash() );
+			}
 			return;
 		}
 	}
@@ -2041,12 +2316,17 @@ void Instancer::hashObject( const ScenePath &path, const Gaffer::Context *contex
 
 IECore::ConstObjectPtr Instancer::computeObject( const ScenePath &path, const Gaffer::Context *context, const ScenePlug *parent ) const
 {
-	if( parent != capsuleScenePlug() && encapsulateInstanceGroupsPlug()->getValue() )
+	if( collapsesInstanceGroups( parent ) )
 	{
 		ScenePath sourcePath, branchPath;
 		parentAndBranchPaths( path, sourcePath, branchPath );
 		if( branchPath.size() == 2 )
 		{
+			if( packInstanceGroupsPlug()->getValue() )
+			{
+				return packedInstances( sourcePath, branchPath, context );
+			}
+
 			return new Capsule(
 				capsuleScenePlug(),
 				context->get<ScenePlug::ScenePath>( ScenePlug::scenePathContextName ) ,
@@ -2083,7 +2363,7 @@ void Instancer::hashBranchChildNames( const ScenePath &sourcePath, const ScenePa
 	{
 		// "/instances"
 		BranchCreator::hashBranchChildNames( sourcePath, branchPath, context, h );
-		engineHash( sourcePath, context, h );
+		topologyHash( sourcePath, context, h );
 	}
 	else if( branchPath.size() == 2 )
 	{
@@ -2135,7 +2415,7 @@ IECore::ConstInternedStringVectorDataPtr Instancer::computeBranchChildNames( con
 
 void Instancer::hashChildNames( const ScenePath &path, const Gaffer::Context *context, const ScenePlug *parent, IECore::MurmurHash &h ) const
 {
-	if( parent != capsuleScenePlug() && encapsulateInstanceGroupsPlug()->getValue() )
+	if( collapsesInstanceGroups( parent ) )
 	{
 		ScenePath sourcePath, branchPath;
 		parentAndBranchPaths( path, sourcePath, branchPath );
@@ -2151,7 +2431,7 @@ void Instancer::hashChildNames( const ScenePath &path, const Gaffer::Context *co
 
 IECore::ConstInternedStringVectorDataPtr Instancer::computeChildNames( const ScenePath &path, const Gaffer::Context *context, const ScenePlug *parent ) const
 {
-	if( parent != capsuleScenePlug() && encapsulateInstanceGroupsPlug()->getValue() )
+	if( collapsesInstanceGroups( parent ) )
 	{
 		ScenePath sourcePath, branchPath;
 		parentAndBranchPaths( path, sourcePath, branchPath );
@@ -2222,7 +2502,7 @@ void Instancer::hashBranchSet( const ScenePath &sourcePath, const IECore::Intern
 	}
 	else
 	{
-		engineHash( sourcePath, context, h );
+		topologyHash( sourcePath, context, h );
 		prototypeChildNamesHash( sourcePath, context, h );
 		prototypesPlug()->setPlug()->hash( h );
 		namePlug()->hash( h );
@@ -2274,7 +2554,7 @@ IECore::ConstPathMatcherDataPtr Instancer::computeBranchSet( const ScenePath &so
 
 void Instancer::hashSet( const IECore::InternedString &setName, const Gaffer::Context *context, const ScenePlug *parent, IECore::MurmurHash &h ) const
 {
-	if( parent != capsuleScenePlug() && encapsulateInstanceGroupsPlug()->getValue() )
+	if( collapsesInstanceGroups( parent ) )
 	{
 		h = inPlug()->setPlug()->hash();
 		return;
@@ -2285,7 +2565,7 @@ void Instancer::hashSet( const IECore::InternedString &setName, const Gaffer::Co
 
 IECore::ConstPathMatcherDataPtr Instancer::computeSet( const IECore::InternedString &setName, const Gaffer::Context *context, const ScenePlug *parent ) const
 {
-	if( parent != capsuleScenePlug() && encapsulateInstanceGroupsPlug()->getValue() )
+	if( collapsesInstanceGroups( parent ) )
 	{
 		return inPlug()->setPlug()->getValue();
 	}
@@ -2293,6 +2573,98 @@ IECore::ConstPathMatcherDataPtr Instancer::computeSet( const IECore::InternedStr
 	return BranchCreator::computeSet( setName, context, parent );
 }
 
+bool Instancer::collapsesInstanceGroups( const ScenePlug *parent ) const
+{
+	return
+		parent != capsuleScenePlug() &&
+		( encapsulateInstanceGroupsPlug()->getValue() || packInstanceGroupsPlug()->getValue() )
+	;
+}
+
+IECore::ConstObjectPtr Instancer::packedInstances( const ScenePath &sourcePath, const ScenePath &branchPath, const Gaffer::Context *context ) const
+{
+	// "/instances/<prototypeName>"
+
+	ConstEngineDataPtr e = engine( sourcePath, context );
+	ConstCompoundDataPtr ic = prototypeChildNames( sourcePath, context );
+	ConstInternedStringVectorDataPtr names = ic->member<InternedStringVectorData>( branchPath.back() );
+	const vector<InternedString> &childNames = names->readable();
+
+	// Find the point index and transform for each instance.
+
+	vector<size_t> pointIndices( childNames.size() );
+	M44fVectorDataPtr transformsData = new M44fVectorData;
+	vector<M44f> &transforms = transformsData->writable();
+	transforms.resize( childNames.size() );
+
+	task_group_context taskGroupContext( task_group_context::isolated );
+	parallel_for(
+		blocked_range<size_t>( 0, childNames.size() ),
+		[&e, &childNames, &pointIndices, &transforms] ( const blocked_range<size_t> &r ) {
+			for( size_t i = r.begin(); i != r.end(); ++i )
+			{
+				pointIndices[i] = e->pointIndex( childNames[i] );
+				transforms[i] = e->instanceTransform( pointIndices[i] );
+			}
+		},
+		taskGroupContext
+	);
+
+	// Make a capsule for each distinct prototype context. We only need more
+	// than one if the context varies from instance to instance.
+
+	const MurmurHash objectHash = outPlug()->objectPlug()->hash();
+	const ScenePlug::ScenePath *prototypeRoot = e->prototypeRoot( branchPath.back() );
+
+	vector<ConstCapsulePtr> prototypes;
+	auto addPrototype = [&] ( const ScenePath &prototypeBranchPath ) {
+		PrototypeScope scope( e.get(), context, &sourcePath, &prototypeBranchPath );
+		MurmurHash h = objectHash;
+		h.append( (uint64_t)prototypes.size() );
+		prototypes.push_back(
+			new Capsule( prototypesPlug(), *prototypeRoot, *Context::current(), h, prototypesPlug()->boundPlug()->getValue() )
+		);
+	};
+
+	IntVectorDataPtr prototypeIndicesData = new IntVectorData;
+	vector<int> &prototypeIndices = prototypeIndicesData->writable();
+	prototypeIndices.resize( childNames.size(), 0 );
+
+	if( !e->hasContextVariables() )
+	{
+		addPrototype( branchPath );
+	}
+	else
+	{
+		boost::unordered_map<MurmurHash, int> contextIndices;
+		ScenePath prototypeBranchPath = branchPath;
+		prototypeBranchPath.push_back( InternedString() );
+		for( size_t i = 0; i < childNames.size(); ++i )
+		{
+			MurmurHash h;
+			e->prototypeContextHash( pointIndices[i], h );
+			auto inserted = contextIndices.insert( { h, (int)prototypes.size() } );
+			if( inserted.second )
+			{
+				prototypeBranchPath.back() = childNames[i];
+				addPrototype( prototypeBranchPath );
+			}
+			prototypeIndices[i] = inserted.first->second;
+		}
+	}
+
+	return new InstancerCapsule(
+		prototypes,
+		prototypeIndicesData,
+		names,
+		transformsData,
+		e->packedInstanceAttributes( pointIndices ),
+		inPlug()->globals(),
+		objectHash,
+		outPlug()->boundPlug()->getValue()
+	);
+}
+
 Instancer::ConstEngineDataPtr Instancer::engine( const ScenePath &sourcePath, const Gaffer::Context *context ) const
 {
 	ScenePlug::PathScope scope( context, &sourcePath );
@@ -2305,6 +2677,12 @@ void Instancer::engineHash( const ScenePath &sourcePath, const Gaffer::Context *
 	enginePlug()->hash( h );
 }
 
+void Instancer::topologyHash( const ScenePath &sourcePath, const Gaffer::Context *context, IECore::MurmurHash &h ) const
+{
+	ScenePlug::PathScope scope( context, &sourcePath );
+	topologyPlug()->hash( h );
+}
+
 IECore::ConstCompoundDataPtr Instancer::prototypeChildNames( const ScenePath &sourcePath, const Gaffer::Context *context ) const
 {
 	ScenePlug::PathScope scope( context, &sourcePath );
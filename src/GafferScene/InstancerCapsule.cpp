@@ -0,0 +1,595 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2021, Cinesite VFX Ltd. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#include "GafferScene/InstancerCapsule.h"
+
+#include "GafferScene/Private/RendererAlgo.h"
+#include "GafferScene/SceneAlgo.h"
+
+#include "IECore/DataAlgo.h"
+#include "IECore/MessageHandler.h"
+#include "IECore/SimpleTypedData.h"
+
+#include "boost/algorithm/string/predicate.hpp"
+
+#include "tbb/blocked_range.h"
+#include "tbb/concurrent_vector.h"
+#include "tbb/parallel_for.h"
+
+#include <memory>
+
+using namespace std;
+using namespace Imath;
+using namespace IECore;
+using namespace IECoreScene;
+using namespace Gaffer;
+using namespace GafferScene;
+
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+const InternedString g_visibleAttributeName( "scene:visible" );
+const std::string g_attributeGlobalPrefix( "attribute:" );
+
+// Renderer used to capture the output of a prototype, so that it can be
+// replayed for each instance. Capture is performed with the prototype
+// root as the root, so the captured attributes and transforms are relative
+// to the root.
+class PrototypeRenderer : public IECoreScenePreview::Renderer
+{
+
+	public :
+
+		IE_CORE_DECLAREMEMBERPTR( PrototypeRenderer )
+
+		class Attributes : public AttributesInterface
+		{
+
+			public :
+
+				Attributes( const CompoundObject *attributes )
+					:	attributes( attributes )
+				{
+				}
+
+				const ConstCompoundObjectPtr attributes;
+
+		};
+
+		struct CapturedObject
+		{
+			std::string name;
+			std::vector<ConstObjectPtr> samples;
+			std::vector<float> sampleTimes;
+			std::vector<M44f> transforms;
+			std::vector<float> transformTimes;
+			ConstCompoundObjectPtr attributes;
+		};
+
+		using CapturedObjects = tbb::concurrent_vector<std::shared_ptr<CapturedObject>>;
+
+		const CapturedObjects &capturedObjects() const
+		{
+			return m_capturedObjects;
+		}
+
+		InternedString name() const override
+		{
+			return "PrototypeRenderer";
+		}
+
+		void option( const InternedString &name, const IECore::Object *value ) override
+		{
+		}
+
+		void output( const InternedString &name, const IECoreScene::Output *output ) override
+		{
+		}
+
+		AttributesInterfacePtr attributes( const CompoundObject *attributes ) override
+		{
+			return new Attributes( attributes );
+		}
+
+		ObjectInterfacePtr camera( const std::string &name, const IECoreScene::Camera *camera, const AttributesInterface *attributes ) override
+		{
+			return nullptr;
+		}
+
+		ObjectInterfacePtr light( const std::string &name, const IECore::Object *object, const AttributesInterface *attributes ) override
+		{
+			return nullptr;
+		}
+
+		ObjectInterfacePtr lightFilter( const std::string &name, const IECore::Object *object, const AttributesInterface *attributes ) override
+		{
+			return nullptr;
+		}
+
+		ObjectInterfacePtr object( const std::string &name, const IECore::Object *object, const AttributesInterface *attributes ) override
+		{
+			return this->object( name, std::vector<const IECore::Object *>( { object } ), std::vector<float>(), attributes );
+		}
+
+		ObjectInterfacePtr object( const std::string &name, const std::vector<const IECore::Object *> &samples, const std::vector<float> &times, const AttributesInterface *attributes ) override
+		{
+			auto capturedObject = std::make_shared<CapturedObject>();
+			capturedObject->name = name;
+			capturedObject->samples.insert( capturedObject->samples.end(), samples.begin(), samples.end() );
+			capturedObject->sampleTimes = times;
+			capturedObject->attributes = static_cast<const Attributes *>( attributes )->attributes;
+			m_capturedObjects.push_back( capturedObject );
+			return new CapturingObject( capturedObject.get() );
+		}
+
+		void render() override
+		{
+		}
+
+		void pause() override
+		{
+		}
+
+	private :
+
+		class CapturingObject : public ObjectInterface
+		{
+
+			public :
+
+				CapturingObject( CapturedObject *capturedObject )
+					:	m_capturedObject( capturedObject )
+				{
+				}
+
+				void transform( const M44f &transform ) override
+				{
+					m_capturedObject->transforms = { transform };
+					m_capturedObject->transformTimes.clear();
+				}
+
+				void transform( const std::vector<M44f> &samples, const std::vector<float> &times ) override
+				{
+					m_capturedObject->transforms = samples;
+					m_capturedObject->transformTimes = times;
+				}
+
+				bool attributes( const AttributesInterface *attributes ) override
+				{
+					m_capturedObject->attributes = static_cast<const Attributes *>( attributes )->attributes;
+					return true;
+				}
+
+				void link( const InternedString &type, const ConstObjectSetPtr &objects ) override
+				{
+				}
+
+			private :
+
+				CapturedObject *m_capturedObject;
+
+		};
+
+		CapturedObjects m_capturedObjects;
+
+};
+
+struct InstanceAttribute
+{
+
+	template<typename T>
+	DataPtr operator()( const TypedData<vector<T>> *data, size_t index )
+	{
+		return new TypedData<T>( data->readable()[index] );
+	}
+
+	template<typename T>
+	DataPtr operator()( const GeometricTypedData<vector<T>> *data, size_t index )
+	{
+		return new GeometricTypedData<T>( data->readable()[index], data->getInterpretation() );
+	}
+
+	DataPtr operator()( const Data *data, size_t index )
+	{
+		throw IECore::InvalidArgumentException( "Expected VectorTypedData" );
+	}
+
+};
+
+struct ArraySize
+{
+
+	template<typename T>
+	size_t operator()( const TypedData<vector<T>> *data )
+	{
+		return data->readable().size();
+	}
+
+	size_t operator()( const Data *data )
+	{
+		throw IECore::InvalidArgumentException( "Expected VectorTypedData" );
+	}
+
+};
+
+bool visible( const CompoundObject *attributes )
+{
+	const BoolData *d = attributes->member<BoolData>( g_visibleAttributeName );
+	return !d || d->readable();
+}
+
+// Returns `attributes` with `overrides` applied on top.
+ConstCompoundObjectPtr mergeAttributes( const CompoundObject *attributes, const CompoundObject *overrides )
+{
+	if( overrides->members().empty() )
+	{
+		return attributes;
+	}
+
+	CompoundObjectPtr result = new CompoundObject;
+	result->members() = attributes->members();
+	for( const auto &a : overrides->members() )
+	{
+		result->members()[a.first] = a.second;
+	}
+	return result;
+}
+
+IECoreScenePreview::Renderer::ObjectInterfacePtr outputInstanceObject(
+	IECoreScenePreview::Renderer *renderer, const std::string &name,
+	const PrototypeRenderer::CapturedObject &object, const IECoreScenePreview::Renderer::AttributesInterface *attributes,
+	const M44f &instanceTransform
+)
+{
+	IECoreScenePreview::Renderer::ObjectInterfacePtr result;
+	if( object.sampleTimes.empty() )
+	{
+		result = renderer->object( name, object.samples[0].get(), attributes );
+	}
+	else
+	{
+		vector<const IECore::Object *> samples; samples.reserve( object.samples.size() );
+		for( const auto &sample : object.samples )
+		{
+			samples.push_back( sample.get() );
+		}
+		result = renderer->object( name, samples, object.sampleTimes, attributes );
+	}
+
+	if( !result )
+	{
+		return result;
+	}
+
+	/// \todo Support motion blur for the instance transforms themselves.
+	/// This would require `transforms` to provide samples across the shutter.
+	if( object.transforms.empty() )
+	{
+		result->transform( instanceTransform );
+	}
+	else if( object.transformTimes.empty() )
+	{
+		result->transform( object.transforms[0] * instanceTransform );
+	}
+	else
+	{
+		vector<M44f> transforms; transforms.reserve( object.transforms.size() );
+		for( const auto &m : object.transforms )
+		{
+			transforms.push_back( m * instanceTransform );
+		}
+		result->transform( transforms, object.transformTimes );
+	}
+
+	return result;
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// InstancerCapsule
+//////////////////////////////////////////////////////////////////////////
+
+IE_CORE_DEFINEOBJECTTYPEDESCRIPTION( InstancerCapsule );
+
+InstancerCapsule::InstancerCapsule()
+	:	m_prototypeIndices( new IntVectorData ), m_names( new InternedStringVectorData ), m_transforms( new M44fVectorData ),
+		m_attributes( new CompoundData ), m_globals( new CompoundObject )
+{
+}
+
+InstancerCapsule::InstancerCapsule(
+	const std::vector<ConstCapsulePtr> &prototypes,
+	const IECore::ConstIntVectorDataPtr &prototypeIndices,
+	const IECore::ConstInternedStringVectorDataPtr &names,
+	const IECore::ConstM44fVectorDataPtr &transforms,
+	const IECore::ConstCompoundDataPtr &attributes,
+	const IECore::ConstCompoundObjectPtr &globals,
+	const IECore::MurmurHash &hash,
+	const Imath::Box3f &bound
+)
+	:	m_prototypes( prototypes ), m_prototypeIndices( prototypeIndices ), m_names( names ), m_transforms( transforms ),
+		m_attributes( attributes ? attributes : new CompoundData ), m_globals( globals ), m_hash( hash ), m_bound( bound )
+{
+	const size_t n = m_prototypeIndices->readable().size();
+	if( m_names->readable().size() != n || m_transforms->readable().size() != n )
+	{
+		throw IECore::InvalidArgumentException( "InstancerCapsule : Instance arrays have inconsistent lengths" );
+	}
+
+	for( const auto &a : m_attributes->readable() )
+	{
+		if( dispatch( a.second.get(), ArraySize() ) != n )
+		{
+			throw IECore::InvalidArgumentException( "InstancerCapsule : Attribute \"" + a.first.string() + "\" has incorrect length" );
+		}
+	}
+
+	for( int i : m_prototypeIndices->readable() )
+	{
+		if( i < 0 || i >= (int)m_prototypes.size() )
+		{
+			throw IECore::InvalidArgumentException( "InstancerCapsule : Prototype index out of range" );
+		}
+	}
+}
+
+InstancerCapsule::~InstancerCapsule()
+{
+}
+
+bool InstancerCapsule::isEqualTo( const IECore::Object *other ) const
+{
+	if( !Procedural::isEqualTo( other ) )
+	{
+		return false;
+	}
+
+	const InstancerCapsule *capsule = static_cast<const InstancerCapsule *>( other );
+	return m_hash == capsule->m_hash;
+}
+
+void InstancerCapsule::hash( IECore::MurmurHash &h ) const
+{
+	Procedural::hash( h );
+	h.append( m_hash );
+}
+
+void InstancerCapsule::copyFrom( const IECore::Object *other, IECore::Object::CopyContext *context )
+{
+	Procedural::copyFrom( other, context );
+
+	const InstancerCapsule *capsule = static_cast<const InstancerCapsule *>( other );
+	m_prototypes = capsule->m_prototypes;
+	m_prototypeIndices = capsule->m_prototypeIndices;
+	m_names = capsule->m_names;
+	m_transforms = capsule->m_transforms;
+	m_attributes = capsule->m_attributes;
+	m_globals = capsule->m_globals;
+	m_hash = capsule->m_hash;
+	m_bound = capsule->m_bound;
+}
+
+void InstancerCapsule::save( IECore::Object::SaveContext *context ) const
+{
+	Procedural::save( context );
+	msg( Msg::Warning, "InstancerCapsule::save", "Not implemented" );
+}
+
+void InstancerCapsule::load( IECore::Object::LoadContextPtr context )
+{
+	Procedural::load( context );
+	msg( Msg::Warning, "InstancerCapsule::load", "Not implemented" );
+}
+
+void InstancerCapsule::memoryUsage( IECore::Object::MemoryAccumulator &accumulator ) const
+{
+	Procedural::memoryUsage( accumulator );
+	accumulator.accumulate( sizeof( InstancerCapsule ) );
+	accumulator.accumulate( m_prototypes.capacity() * sizeof( ConstCapsulePtr ) );
+	accumulator.accumulate( m_prototypeIndices.get() );
+	accumulator.accumulate( m_names.get() );
+	accumulator.accumulate( m_transforms.get() );
+	accumulator.accumulate( m_attributes.get() );
+}
+
+Imath::Box3f InstancerCapsule::bound() const
+{
+	return m_bound;
+}
+
+void InstancerCapsule::render( IECoreScenePreview::Renderer *renderer ) const
+{
+	// Split the globals, so that the global attributes can be applied
+	// to each instance, and the prototypes can be captured without them.
+
+	ConstCompoundObjectPtr globalAttributes = SceneAlgo::globalAttributes( m_globals.get() );
+	CompoundObjectPtr prototypeGlobals = new CompoundObject;
+	for( const auto &g : m_globals->members() )
+	{
+		if( !boost::starts_with( g.first.string(), g_attributeGlobalPrefix ) )
+		{
+			prototypeGlobals->members().insert( g );
+		}
+	}
+
+	// Group the instances by prototype.
+
+	const vector<int> &prototypeIndices = m_prototypeIndices->readable();
+	vector<vector<size_t>> prototypeInstances( m_prototypes.size() );
+	for( size_t i = 0; i < prototypeIndices.size(); ++i )
+	{
+		prototypeInstances[prototypeIndices[i]].push_back( i );
+	}
+
+	const vector<InternedString> &names = m_names->readable();
+	const vector<M44f> &transforms = m_transforms->readable();
+	const CompoundDataMap &instanceAttributes = m_attributes->readable();
+
+	// Capture each prototype once, and then output the captured
+	// objects for each of its instances.
+
+	for( size_t p = 0; p < m_prototypes.size(); ++p )
+	{
+		const vector<size_t> &instances = prototypeInstances[p];
+		if( instances.empty() )
+		{
+			continue;
+		}
+
+		const Capsule *prototype = m_prototypes[p].get();
+		const ScenePlug *scene = prototype->scene();
+		if( !scene )
+		{
+			throw IECore::Exception( "Prototype capsule has expired" );
+		}
+
+		PrototypeRenderer::Ptr prototypeRenderer = new PrototypeRenderer;
+		ConstCompoundObjectPtr rootAttributes;
+		M44f rootTransform;
+		{
+			ScenePlug::GlobalScope globalScope( prototype->context() );
+			GafferScene::Private::RendererAlgo::RenderSets renderSets( scene );
+			GafferScene::Private::RendererAlgo::outputObjects( scene, prototypeGlobals.get(), renderSets, /* lightLinks = */ nullptr, prototypeRenderer.get(), prototype->root() );
+
+			ScenePlug::PathScope pathScope( Context::current(), &prototype->root() );
+			rootAttributes = scene->attributesPlug()->getValue();
+			rootTransform = scene->transformPlug()->getValue();
+		}
+
+		const PrototypeRenderer::CapturedObjects &objects = prototypeRenderer->capturedObjects();
+		ConstCompoundObjectPtr prototypeAttributes = mergeAttributes( globalAttributes.get(), rootAttributes.get() );
+
+		// When there are no per-instance attributes, all instances can share
+		// the same AttributesInterfaces.
+		const bool shareAttributes = instanceAttributes.empty();
+		vector<IECoreScenePreview::Renderer::AttributesInterfacePtr> sharedAttributes;
+		if( shareAttributes )
+		{
+			if( !visible( prototypeAttributes.get() ) )
+			{
+				continue;
+			}
+			for( const auto &object : objects )
+			{
+				sharedAttributes.push_back( renderer->attributes( mergeAttributes( prototypeAttributes.get(), object->attributes.get() ).get() ) );
+			}
+		}
+
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for(
+			tbb::blocked_range<size_t>( 0, instances.size() ),
+			[&]( const tbb::blocked_range<size_t> &range ) {
+				for( size_t r = range.begin(); r != range.end(); ++r )
+				{
+					const size_t i = instances[r];
+
+					ConstCompoundObjectPtr attributes;
+					if( !shareAttributes )
+					{
+						CompoundObjectPtr a = new CompoundObject;
+						a->members() = prototypeAttributes->members();
+						for( const auto &attribute : instanceAttributes )
+						{
+							a->members()[attribute.first] = dispatch( attribute.second.get(), InstanceAttribute(), i );
+						}
+						if( !visible( a.get() ) )
+						{
+							continue;
+						}
+						attributes = a;
+					}
+
+					const M44f instanceTransform = rootTransform * transforms[i];
+					const std::string instanceName = "/" + names[i].string();
+					for( size_t o = 0; o < objects.size(); ++o )
+					{
+						const PrototypeRenderer::CapturedObject &object = *objects[o];
+						IECoreScenePreview::Renderer::AttributesInterfacePtr objectAttributes = shareAttributes ?
+							sharedAttributes[o] :
+							renderer->attributes( mergeAttributes( attributes.get(), object.attributes.get() ).get() )
+						;
+						outputInstanceObject(
+							renderer, object.name == "/" ? instanceName : instanceName + object.name,
+							object, objectAttributes.get(), instanceTransform
+						);
+					}
+				}
+			},
+			taskGroupContext
+		);
+	}
+}
+
+size_t InstancerCapsule::numInstances() const
+{
+	return m_prototypeIndices->readable().size();
+}
+
+const std::vector<ConstCapsulePtr> &InstancerCapsule::prototypes() const
+{
+	return m_prototypes;
+}
+
+const IECore::IntVectorData *InstancerCapsule::prototypeIndices() const
+{
+	return m_prototypeIndices.get();
+}
+
+const IECore::InternedStringVectorData *InstancerCapsule::names() const
+{
+	return m_names.get();
+}
+
+const IECore::M44fVectorData *InstancerCapsule::transforms() const
+{
+	return m_transforms.get();
+}
+
+const IECore::CompoundData *InstancerCapsule::attributes() const
+{
+	return m_attributes.get();
+}
+
+const IECore::CompoundObject *InstancerCapsule::globals() const
+{
+	return m_globals.get();
+}
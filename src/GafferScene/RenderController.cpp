@@ -47,12 +47,16 @@
 #include "IECore/Interpolator.h"
 #include "IECore/NullObject.h"
 
+#include "OpenEXR/ImathBoxAlgo.h"
+
 #include "boost/algorithm/string/predicate.hpp"
 #include "boost/bind.hpp"
 #include "boost/container/flat_set.hpp"
 
 #include "tbb/task.h"
 
+#include <queue>
+
 using namespace std;
 using namespace Imath;
 using namespace IECore;
@@ -211,6 +215,59 @@ struct ObjectInterfaceHandle : public boost::noncopyable
 
 };
 
+//////////////////////////////////////////////////////////////////////////
+// Expansion budget utilities
+//////////////////////////////////////////////////////////////////////////
+
+struct ExpansionCandidate
+{
+	float score;
+	ScenePlug::ScenePath path;
+	M44f transform;
+	ConstInternedStringVectorDataPtr childNames;
+
+	bool operator < ( const ExpansionCandidate &rhs ) const
+	{
+		return score < rhs.score;
+	}
+};
+
+// Visits `path` and any descendants expanded explicitly, adding each unexpanded
+// location with children to `candidates`. `transform` is the full transform
+// for `path`.
+void addExpansionCandidates(
+	const ScenePlug *scene, ScenePlug::ScenePath &path, const M44f &transform,
+	const PathMatcher &expandedPaths, size_t minimumExpansionDepth,
+	const RenderController::PriorityFunction &expansionFunction,
+	std::priority_queue<ExpansionCandidate> &candidates
+)
+{
+	ConstInternedStringVectorDataPtr childNames = scene->childNames( path );
+	if( childNames->readable().empty() )
+	{
+		return;
+	}
+
+	const bool expanded = ( minimumExpansionDepth >= path.size() ) || ( expandedPaths.match( path ) & PathMatcher::ExactMatch );
+	if( !expanded )
+	{
+		const float score = expansionFunction( Imath::transform( scene->bound( path ), transform ) );
+		if( score > 0.0f )
+		{
+			candidates.push( { score, path, transform, childNames } );
+		}
+		return;
+	}
+
+	path.push_back( IECore::InternedString() );
+	for( const auto &childName : childNames->readable() )
+	{
+		path.back() = childName;
+		addExpansionCandidates( scene, path, scene->transform( path ) * transform, expandedPaths, minimumExpansionDepth, expansionFunction, candidates );
+	}
+	path.pop_back();
+}
+
 } // namespace
 
 //////////////////////////////////////////////////////////////////////////
@@ -447,7 +504,7 @@ class RenderController::SceneGraph
 
 			// Expansion
 
-			if( ( m_dirtyComponents & ExpansionComponent ) && updateExpansion( path, controller->m_expandedPaths, controller->m_minimumExpansionDepth ) )
+			if( ( m_dirtyComponents & ExpansionComponent ) && updateExpansion( path, controller->m_expandedPaths, controller->m_minimumExpansionDepth, controller->m_budgetExpandedPaths ) )
 			{
 				m_changedComponents |= ExpansionComponent;
 			}
@@ -519,6 +576,19 @@ class RenderController::SceneGraph
 			return m_expanded;
 		}
 
+		// Returns the bound of this location in world space. Must be called
+		// with the location's path in the current context, and after its parent
+		// has been updated.
+		Box3f worldBound( const ScenePlug *scene ) const
+		{
+			M44f transform = scene->transformPlug()->getValue();
+			if( m_parent && m_parent->m_fullTransform.size() )
+			{
+				transform *= m_parent->m_fullTransform[0];
+			}
+			return Imath::transform( scene->boundPlug()->getValue(), transform );
+		}
+
 		const std::vector<std::unique_ptr<SceneGraph>> &children()
 		{
 			return m_children;
@@ -880,9 +950,13 @@ class RenderController::SceneGraph
 			m_objectHash = MurmurHash();
 		}
 
-		bool updateExpansion( const ScenePlug::ScenePath &path, const IECore::PathMatcher &expandedPaths, size_t minimumExpansionDepth )
+		bool updateExpansion( const ScenePlug::ScenePath &path, const IECore::PathMatcher &expandedPaths, size_t minimumExpansionDepth, const IECore::PathMatcher &budgetExpandedPaths )
 		{
-			const bool expanded = ( minimumExpansionDepth >= path.size() ) || ( expandedPaths.match( path ) & PathMatcher::ExactMatch );
+			const bool expanded =
+				( minimumExpansionDepth >= path.size() ) ||
+				( expandedPaths.match( path ) & PathMatcher::ExactMatch ) ||
+				( budgetExpandedPaths.match( path ) & PathMatcher::ExactMatch )
+			;
 			if( expanded == m_expanded )
 			{
 				return false;
@@ -1068,7 +1142,8 @@ class RenderController::SceneGraphUpdateTask : public tbb::task
 			const ThreadState &threadState,
 			const ScenePlug::ScenePath &scenePath,
 			const ProgressCallback &callback,
-			const PathMatcher *pathsToUpdate
+			const PathMatcher *pathsToUpdate,
+			const PriorityFunction *priorityFunction
 		)
 			:	m_controller( controller ),
 				m_sceneGraph( sceneGraph ),
@@ -1077,7 +1152,8 @@ class RenderController::SceneGraphUpdateTask : public tbb::task
 				m_threadState( threadState ),
 				m_scenePath( scenePath ),
 				m_callback( callback ),
-				m_pathsToUpdate( pathsToUpdate )
+				m_pathsToUpdate( pathsToUpdate ),
+				m_priorityFunction( priorityFunction )
 		{
 		}
 
@@ -1107,6 +1183,18 @@ class RenderController::SceneGraphUpdateTask : public tbb::task
 
 			ScenePlug::PathScope pathScope( m_threadState, &m_scenePath );
 
+			// If we're only updating priority locations, skip this location
+			// and all its descendants if it isn't a priority. We always update
+			// lights and cameras, because they affect the whole scene.
+
+			if( m_priorityFunction && m_sceneGraphType == SceneGraph::ObjectType && m_scenePath.size() )
+			{
+				if( (*m_priorityFunction)( m_sceneGraph->worldBound( scene() ) ) <= 0.0f )
+				{
+					return nullptr;
+				}
+			}
+
 			// Update the scene graph at this location.
 
 			const bool changesMade = m_sceneGraph->update(
@@ -1133,7 +1221,7 @@ class RenderController::SceneGraphUpdateTask : public tbb::task
 				for( const auto &child : children )
 				{
 					childPath.back() = child->name();
-					SceneGraphUpdateTask *t = new( allocate_child() ) SceneGraphUpdateTask( m_controller, child.get(), m_sceneGraphType, m_changedGlobalComponents, m_threadState, childPath, m_callback, m_pathsToUpdate );
+					SceneGraphUpdateTask *t = new( allocate_child() ) SceneGraphUpdateTask( m_controller, child.get(), m_sceneGraphType, m_changedGlobalComponents, m_threadState, childPath, m_callback, m_pathsToUpdate, m_priorityFunction );
 					spawn( *t );
 				}
 
@@ -1147,7 +1235,10 @@ class RenderController::SceneGraphUpdateTask : public tbb::task
 				}
 			}
 
-			if( pathsToUpdateMatch & ( PathMatcher::AncestorMatch | PathMatcher::ExactMatch ) )
+			// Children skipped by the priority function still need to
+			// know what changed in their parent when they are updated
+			// later, so we only consider them updated after a full update.
+			if( !m_priorityFunction && ( pathsToUpdateMatch & ( PathMatcher::AncestorMatch | PathMatcher::ExactMatch ) ) )
 			{
 				m_sceneGraph->allChildrenUpdated();
 			}
@@ -1199,6 +1290,7 @@ class RenderController::SceneGraphUpdateTask : public tbb::task
 		ScenePlug::ScenePath m_scenePath;
 		const ProgressCallback &m_callback;
 		const PathMatcher *m_pathsToUpdate;
+		const PriorityFunction *m_priorityFunction;
 
 };
 
@@ -1209,6 +1301,8 @@ class RenderController::SceneGraphUpdateTask : public tbb::task
 RenderController::RenderController( const ConstScenePlugPtr &scene, const Gaffer::ConstContextPtr &context, const IECoreScenePreview::RendererPtr &renderer )
 	:	m_renderer( renderer ),
 		m_minimumExpansionDepth( 0 ),
+		m_expansionBudget( 0 ),
+		m_budgetExpandedPathsDirty( false ),
 		m_updateRequired( false ),
 		m_updateRequested( false ),
 		m_failedAttributeEdits( 0 ),
@@ -1344,6 +1438,31 @@ size_t RenderController::getMinimumExpansionDepth() const
 	return m_minimumExpansionDepth;
 }
 
+void RenderController::setExpansionBudget( size_t budget, const PriorityFunction &expansionFunction )
+{
+	if( !budget && !m_expansionBudget )
+	{
+		return;
+	}
+
+	cancelBackgroundTask();
+
+	m_expansionBudget = budget;
+	m_expansionFunction = expansionFunction;
+	m_budgetExpandedPathsDirty = true;
+	requestUpdate();
+}
+
+size_t RenderController::getExpansionBudget() const
+{
+	return m_expansionBudget;
+}
+
+const IECore::PathMatcher &RenderController::getBudgetExpandedPaths() const
+{
+	return m_budgetExpandedPaths;
+}
+
 RenderController::UpdateRequiredSignal &RenderController::updateRequiredSignal()
 {
 	return m_updateRequiredSignal;
@@ -1426,6 +1545,11 @@ void RenderController::dirtySceneGraphs( unsigned components )
 		sg->dirty( components );
 	}
 
+	if( components & ( SceneGraph::BoundComponent | SceneGraph::TransformComponent | SceneGraph::ChildNamesComponent | SceneGraph::ExpansionComponent ) )
+	{
+		m_budgetExpandedPathsDirty = m_budgetExpandedPathsDirty || m_expansionBudget > 0;
+	}
+
 	if( components & SceneGraph::ObjectComponent )
 	{
 		// We don't track dirtiness of different SceneGraphs separately anyway,
@@ -1435,6 +1559,59 @@ void RenderController::dirtySceneGraphs( unsigned components )
 	}
 }
 
+void RenderController::updateBudgetExpandedPaths()
+{
+	PathMatcher budgetExpandedPaths;
+	if( m_expansionBudget && m_expansionFunction )
+	{
+		// Find the unexpanded locations at the boundary of the explicitly
+		// expanded part of the scene. These are our initial candidates for
+		// automatic expansion.
+
+		std::priority_queue<ExpansionCandidate> candidates;
+		ScenePlug::ScenePath path;
+		addExpansionCandidates( m_scene.get(), path, M44f(), m_expandedPaths, m_minimumExpansionDepth, m_expansionFunction, candidates );
+
+		// Expand the highest scoring candidates until the budget is spent,
+		// adding their children as new candidates as we go.
+
+		size_t spent = 0;
+		while( !candidates.empty() )
+		{
+			const ExpansionCandidate candidate = candidates.top();
+			candidates.pop();
+
+			if( spent + candidate.childNames->readable().size() > m_expansionBudget )
+			{
+				// A cheaper candidate may still fit.
+				continue;
+			}
+
+			spent += candidate.childNames->readable().size();
+			budgetExpandedPaths.addPath( candidate.path );
+
+			ScenePlug::ScenePath childPath = candidate.path;
+			childPath.push_back( IECore::InternedString() );
+			for( const auto &childName : candidate.childNames->readable() )
+			{
+				childPath.back() = childName;
+				addExpansionCandidates(
+					m_scene.get(), childPath, m_scene->transform( childPath ) * candidate.transform,
+					m_expandedPaths, m_minimumExpansionDepth, m_expansionFunction, candidates
+				);
+			}
+		}
+	}
+
+	if( budgetExpandedPaths != m_budgetExpandedPaths )
+	{
+		m_budgetExpandedPaths = budgetExpandedPaths;
+		dirtySceneGraphs( SceneGraph::ExpansionComponent );
+	}
+
+	m_budgetExpandedPathsDirty = false;
+}
+
 void RenderController::update( const ProgressCallback &callback )
 {
 	if( !m_scene || !m_context )
@@ -1450,7 +1627,7 @@ void RenderController::update( const ProgressCallback &callback )
 	updateInternal( callback );
 }
 
-std::shared_ptr<Gaffer::BackgroundTask> RenderController::updateInBackground( const ProgressCallback &callback, const IECore::PathMatcher &priorityPaths )
+std::shared_ptr<Gaffer::BackgroundTask> RenderController::updateInBackground( const ProgressCallback &callback, const IECore::PathMatcher &priorityPaths, const PriorityFunction &priorityFunction )
 {
 	if( !m_scene || !m_context )
 	{
@@ -1466,11 +1643,15 @@ std::shared_ptr<Gaffer::BackgroundTask> RenderController::updateInBackground( co
 	m_backgroundTask = ParallelAlgo::callOnBackgroundThread(
 		// Subject
 		m_scene.get(),
-		[this, callback, priorityPaths] {
+		[this, callback, priorityPaths, priorityFunction] {
 			if( !priorityPaths.isEmpty() )
 			{
 				updateInternal( callback, &priorityPaths );
 			}
+			if( priorityFunction )
+			{
+				updateInternal( callback, nullptr, &priorityFunction );
+			}
 			updateInternal( callback );
 		}
 	);
@@ -1491,7 +1672,20 @@ void RenderController::updateMatchingPaths( const IECore::PathMatcher &pathsToUp
 	updateInternal( callback, &pathsToUpdate );
 }
 
-void RenderController::updateInternal( const ProgressCallback &callback, const IECore::PathMatcher *pathsToUpdate )
+void RenderController::updatePriorityLocations( const PriorityFunction &priorityFunction, const ProgressCallback &callback )
+{
+	if( !m_scene || !m_context )
+	{
+		return;
+	}
+
+	Context::EditableScope scopedContext( m_context.get() );
+	scopedContext.set( "scene:renderer", &m_renderer->name().string() );
+
+	updateInternal( callback, nullptr, &priorityFunction );
+}
+
+void RenderController::updateInternal( const ProgressCallback &callback, const IECore::PathMatcher *pathsToUpdate, const PriorityFunction *priorityFunction )
 {
 	try
 	{
@@ -1556,6 +1750,13 @@ void RenderController::updateInternal( const ProgressCallback &callback, const I
 
 		m_dirtyGlobalComponents = NoGlobalComponent;
 
+		// Update automatic expansion
+
+		if( m_budgetExpandedPathsDirty )
+		{
+			updateBudgetExpandedPaths();
+		}
+
 		// Update scene graphs
 
 		for( int i = SceneGraph::FirstType; i <= SceneGraph::LastType; ++i )
@@ -1571,7 +1772,7 @@ void RenderController::updateInternal( const ProgressCallback &callback, const I
 
 			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
 			SceneGraphUpdateTask *task = new( tbb::task::allocate_root( taskGroupContext ) ) SceneGraphUpdateTask(
-				this, sceneGraph, (SceneGraph::Type)i, m_changedGlobalComponents, ThreadState::current(), ScenePlug::ScenePath(), callback, pathsToUpdate
+				this, sceneGraph, (SceneGraph::Type)i, m_changedGlobalComponents, ThreadState::current(), ScenePlug::ScenePath(), callback, pathsToUpdate, priorityFunction
 			);
 			tbb::task::spawn_root_and_wait( *task );
 
@@ -1586,7 +1787,7 @@ void RenderController::updateInternal( const ProgressCallback &callback, const I
 			updateDefaultCamera();
 		}
 
-		if( !pathsToUpdate )
+		if( !pathsToUpdate && !priorityFunction )
 		{
 			// Only clear `m_changedGlobalComponents` when we
 			// know our entire scene has been updated successfully.
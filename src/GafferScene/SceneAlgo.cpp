@@ -43,6 +43,7 @@
 #include "GafferScene/LocaliseAttributes.h"
 #include "GafferScene/MergeScenes.h"
 #include "GafferScene/PathFilter.h"
+#include "GafferScene/SceneReader.h"
 #include "GafferScene/ScenePlug.h"
 #include "GafferScene/SetAlgo.h"
 #include "GafferScene/ShaderTweaks.h"
@@ -317,6 +318,24 @@ IECore::ConstCompoundDataPtr GafferScene::SceneAlgo::sets( const ScenePlug *scen
 
 IECore::ConstCompoundDataPtr GafferScene::SceneAlgo::sets( const ScenePlug *scene, const std::vector<IECore::InternedString> &setNames )
 {
+	// A SceneReader can load all its sets in a single traversal of the file,
+	// which is much quicker than traversing once for each set.
+	const ScenePlug *source = scene->source<ScenePlug>();
+	const SceneReader *sceneReader = runTimeCast<const SceneReader>( source->node() );
+	if( sceneReader && source == sceneReader->outPlug() )
+	{
+		ConstCompoundDataPtr allSets = sceneReader->allSets();
+		CompoundDataPtr result = new CompoundData;
+		for( const auto &setName : setNames )
+		{
+			// The const_cast is ok because the container will be const on
+			// return, and we never modify the set itself.
+			const PathMatcherData *set = allSets->member<PathMatcherData>( setName );
+			result->writable()[setName] = set ? const_cast<PathMatcherData *>( set ) : new PathMatcherData;
+		}
+		return result;
+	}
+
 	std::vector<IECore::ConstPathMatcherDataPtr> setsVector;
 	setsVector.resize( setNames.size(), nullptr );
 
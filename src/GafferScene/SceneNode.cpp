@@ -480,6 +480,13 @@ bool SceneNode::enabled( const Gaffer::Context *context ) const
 	}
 }
 
+void SceneNode::cacheSet( const IECore::InternedString &setName, const IECore::PathMatcherData *set ) const
+{
+	ScenePlug::SetScope setScope( Context::current(), &setName );
+	const PathMatcherDataPlug *setPlug = outPlug()->setPlug();
+	ScenePlug::setCachedObjectValue( setPlug, setPlug->hash(), set );
+}
+
 void SceneNode::plugInputChanged( Gaffer::Plug *plug )
 {
 	// If a node makes a pass-through connection for a `childNamesPlug()` then we
@@ -37,6 +37,7 @@
 #include "GafferScene/SceneReader.h"
 
 #include "Gaffer/Context.h"
+#include "Gaffer/TypedObjectPlug.h"
 #include "Gaffer/StringPlug.h"
 #include "Gaffer/TransformPlug.h"
 
@@ -48,6 +49,9 @@
 
 #include "boost/bind.hpp"
 
+#include "tbb/enumerable_thread_specific.h"
+#include "tbb/parallel_for.h"
+
 using namespace std;
 using namespace Imath;
 using namespace IECore;
@@ -75,6 +79,7 @@ SceneReader::SceneReader( const std::string &name )
 	addChild( new IntPlug( "refreshCount" ) );
 	addChild( new StringPlug( "tags" ) );
 	addChild( new TransformPlug( "transform" ) );
+	addChild( new ObjectPlug( "__sets", Plug::Out, new CompoundData ) );
 
 	outPlug()->childBoundsPlug()->setFlags( Plug::AcceptsDependencyCycles, true );
 	plugSetSignal().connect( boost::bind( &SceneReader::plugSet, this, ::_1 ) );
@@ -124,6 +129,16 @@ const Gaffer::TransformPlug *SceneReader::transformPlug() const
 	return getChild<TransformPlug>( g_firstPlugIndex + 3 );
 }
 
+Gaffer::ObjectPlug *SceneReader::setsPlug()
+{
+	return getChild<ObjectPlug>( g_firstPlugIndex + 4 );
+}
+
+const Gaffer::ObjectPlug *SceneReader::setsPlug() const
+{
+	return getChild<ObjectPlug>( g_firstPlugIndex + 4 );
+}
+
 void SceneReader::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const
 {
 	SceneNode::affects( input, outputs );
@@ -155,9 +170,32 @@ void SceneReader::affects( const Gaffer::Plug *input, AffectedPlugsContainer &ou
 		outputs.push_back( outPlug()->objectPlug() );
 		outputs.push_back( outPlug()->setNamesPlug() );
 		outputs.push_back( outPlug()->setPlug() );
+		outputs.push_back( setsPlug() );
 	}
 }
 
+void SceneReader::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
+{
+	SceneNode::hash( output, context, h );
+
+	if( output == setsPlug() )
+	{
+		fileNamePlug()->hash( h );
+		refreshCountPlug()->hash( h );
+	}
+}
+
+void SceneReader::compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const
+{
+	if( output == setsPlug() )
+	{
+		static_cast<ObjectPlug *>( output )->setValue( loadSets( context ) );
+		return;
+	}
+
+	SceneNode::compute( output, context );
+}
+
 size_t SceneReader::supportedExtensions( std::vector<std::string> &extensions )
 {
 	extensions = SceneInterface::supportedExtensions();
@@ -469,11 +507,16 @@ void SceneReader::hashSet( const IECore::InternedString &setName, const Gaffer::
 	h.append( setName );
 }
 
-static void loadSetWalk( const SceneInterface *s, const InternedString &setName, const Gaffer::Context *context, PathMatcher &set, const vector<InternedString> &path )
+namespace
+{
+
+typedef tbb::enumerable_thread_specific<PathMatcher> ThreadPathMatcher;
+
+void loadSetWalk( const SceneInterface *s, const InternedString &setName, const Gaffer::Context *context, ThreadPathMatcher &set, const vector<InternedString> &path, tbb::task_group_context &taskGroupContext )
 {
 	if( s->hasTag( setName, SceneInterface::LocalTag ) )
 	{
-		set.addPath( path );
+		set.local().addPath( path );
 	}
 
 	// Figure out if we need to recurse by querying descendant tags to see if they include
@@ -484,33 +527,176 @@ static void loadSetWalk( const SceneInterface *s, const InternedString &setName,
 		return;
 	}
 
-	// Recurse to the children.
+	// Recurse to the children, in parallel. Each thread accumulates
+	// into its own PathMatcher, and we merge them at the end.
 
 	SceneInterface::NameList childNames;
 	s->childNames( childNames );
-	vector<InternedString> childPath( path );
-	childPath.push_back( InternedString() ); // room for the child name
-	for( SceneInterface::NameList::const_iterator it = childNames.begin(), eIt = childNames.end(); it != eIt; ++it )
+
+	using ChildNameRange = tbb::blocked_range<SceneInterface::NameList::const_iterator>;
+	const ChildNameRange loopRange( childNames.begin(), childNames.end() );
+
+	auto loopBody = [&] ( const ChildNameRange &range ) {
+		vector<InternedString> childPath( path );
+		childPath.push_back( InternedString() ); // room for the child name
+		for( const auto &childName : range )
+		{
+			Canceller::check( context->canceller() );
+
+			ConstSceneInterfacePtr child = s->child( childName );
+			childPath.back() = childName;
+			loadSetWalk( child.get(), setName, context, set, childPath, taskGroupContext );
+		}
+	};
+
+	if( childNames.size() > 1 )
+	{
+		tbb::parallel_for( loopRange, loopBody, taskGroupContext );
+	}
+	else
 	{
-		Canceller::check( context->canceller() );
+		loopBody( loopRange );
+	}
+}
 
-		ConstSceneInterfacePtr child = s->child( *it );
-		childPath.back() = *it;
-		loadSetWalk( child.get(), setName, context, set, childPath );
+typedef std::map<InternedString, PathMatcher> PathMatchers;
+typedef tbb::enumerable_thread_specific<PathMatchers> ThreadPathMatchers;
+
+void loadSetsWalk( const SceneInterface *s, const Gaffer::Context *context, ThreadPathMatchers &sets, const vector<InternedString> &path, tbb::task_group_context &taskGroupContext )
+{
+	SceneInterface::NameList tags;
+	s->readTags( tags, SceneInterface::LocalTag );
+	if( tags.size() )
+	{
+		PathMatchers &threadSets = sets.local();
+		for( const auto &tag : tags )
+		{
+			threadSets[tag].addPath( path );
+		}
+	}
+
+	// Figure out if we need to recurse by querying descendant tags to see
+	// if there are any at all.
+
+	tags.clear();
+	s->readTags( tags, SceneInterface::DescendantTag );
+	if( tags.empty() )
+	{
+		return;
+	}
+
+	// Recurse to the children, in parallel. Each thread accumulates
+	// into its own PathMatchers, and we merge them at the end.
+
+	SceneInterface::NameList childNames;
+	s->childNames( childNames );
+
+	using ChildNameRange = tbb::blocked_range<SceneInterface::NameList::const_iterator>;
+	const ChildNameRange loopRange( childNames.begin(), childNames.end() );
+
+	auto loopBody = [&] ( const ChildNameRange &range ) {
+		vector<InternedString> childPath( path );
+		childPath.push_back( InternedString() ); // room for the child name
+		for( const auto &childName : range )
+		{
+			Canceller::check( context->canceller() );
+
+			ConstSceneInterfacePtr child = s->child( childName );
+			childPath.back() = childName;
+			loadSetsWalk( child.get(), context, sets, childPath, taskGroupContext );
+		}
+	};
+
+	if( childNames.size() > 1 )
+	{
+		tbb::parallel_for( loopRange, loopBody, taskGroupContext );
+	}
+	else
+	{
+		loopBody( loopRange );
 	}
 }
 
+} // namespace
+
+IECore::ConstCompoundDataPtr SceneReader::loadSets( const Gaffer::Context *context ) const
+{
+	CompoundDataPtr result = new CompoundData;
+	ConstSceneInterfacePtr rootScene = scene( ScenePath() );
+	if( !rootScene )
+	{
+		return result;
+	}
+
+	ThreadPathMatchers threadSets;
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated ); // Prevents outer tasks silently cancelling our tasks
+	loadSetsWalk( rootScene.get(), context, threadSets, ScenePath(), taskGroupContext );
+
+	for( const auto &sets : threadSets )
+	{
+		for( const auto &set : sets )
+		{
+			PathMatcherData *setData = result->member<PathMatcherData>( set.first, /* throwExceptions = */ false, /* createIfMissing = */ true );
+			setData->writable().addPaths( set.second );
+		}
+	}
+
+	return result;
+}
+
+IECore::ConstCompoundDataPtr SceneReader::allSets() const
+{
+	// All sets are loaded together, so we remove `scene:setName` from the
+	// context to ensure that all requests share the same cache entry.
+	ScenePlug::GlobalScope globalScope( Context::current() );
+	if( !enabledPlug()->getValue() )
+	{
+		return new CompoundData;
+	}
+
+	ConstCompoundDataPtr result = boost::static_pointer_cast<const CompoundData>( setsPlug()->getValue() );
+	// Store the sets as the values of `out.set` too, so that they needn't be
+	// loaded again when accessed individually.
+	for( const auto &set : result->readable() )
+	{
+		cacheSet( set.first, static_cast<const PathMatcherData *>( set.second.get() ) );
+	}
+	return result;
+}
+
 IECore::ConstPathMatcherDataPtr SceneReader::computeSet( const IECore::InternedString &setName, const Gaffer::Context *context, const ScenePlug *parent ) const
 {
+	// We load individual sets with a separate traversal, rather than
+	// extracting them from `allSets()`. This lets us prune the traversal
+	// to only the locations which have the set as a descendant tag,
+	// which is much quicker for sparse sets.
 	PathMatcherDataPtr result = new PathMatcherData;
 	ConstSceneInterfacePtr rootScene = scene( ScenePath() );
 	if( rootScene )
 	{
-		loadSetWalk( rootScene.get(), setName, context, result->writable(), ScenePath() );
+		ThreadPathMatcher threadSets;
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated ); // Prevents outer tasks silently cancelling our tasks
+		loadSetWalk( rootScene.get(), setName, context, threadSets, ScenePath(), taskGroupContext );
+		for( const auto &threadSet : threadSets )
+		{
+			result->writable().addPaths( threadSet );
+		}
 	}
 	return result;
 }
 
+Gaffer::ValuePlug::CachePolicy SceneReader::computeCachePolicy( const Gaffer::ValuePlug *output ) const
+{
+	if( output == outPlug()->setPlug() || output == setsPlug() )
+	{
+		// Set loading is parallelised internally, so we want other threads
+		// requesting the same sets to collaborate rather than duplicate the
+		// (potentially very expensive) file traversal.
+		return ValuePlug::CachePolicy::TaskCollaboration;
+	}
+	return SceneNode::computeCachePolicy( output );
+}
+
 void SceneReader::plugSet( Gaffer::Plug *plug )
 {
 	// this clears the cache every time the refresh count is updated, so you don't get entries
@@ -46,7 +46,12 @@
 #include "boost/filesystem.hpp"
 
 #include "tbb/concurrent_unordered_map.h"
-#include "tbb/mutex.h"
+#include "tbb/parallel_invoke.h"
+#include "tbb/spin_mutex.h"
+
+#include <atomic>
+#include <memory>
+#include <unordered_map>
 
 using namespace std;
 using namespace IECore;
@@ -57,44 +62,149 @@ using namespace GafferScene;
 namespace
 {
 
-struct LocationWriter
+// The memory we are prepared to use for the samples of the frame being
+// written and the frame being computed concurrently. When a frame uses more
+// than its share, the next frame isn't computed until it has been written.
+const size_t g_maxMemoryInFlight = 1024 * 1024 * 1024;
+
+// Samples for a single location on a single frame. Samples which are unchanged
+// since the previous frame are left null, and are not computed at all.
+struct LocationSample
 {
-	LocationWriter(SceneInterfacePtr output, ConstCompoundDataPtr sets, float time, tbb::mutex& mutex) : m_output( output ), m_sets(sets), m_time( time ), m_mutex( mutex )
+
+	LocationSample( const InternedString &name )
+		:	name( name )
 	{
 	}
 
-	/// first half of this function can be lock free reading data from ScenePlug
-	/// once all the data has been read then we take a global lock and write
-	/// into the SceneInterface
-	bool operator()( const ScenePlug *scene, const ScenePlug::ScenePath &scenePath )
+	LocationSample *addChild( const InternedString &childName )
 	{
-		ConstCompoundObjectPtr attributes = scene->attributesPlug()->getValue();
+		tbb::spin_mutex::scoped_lock lock( childrenMutex );
+		children.push_back( std::unique_ptr<LocationSample>( new LocationSample( childName ) ) );
+		return children.back().get();
+	}
+
+	const InternedString name;
+	Imath::Box3d bound;
+	ConstCompoundObjectPtr attributes;
+	ConstCompoundObjectPtr globals;
+	ConstObjectPtr object;
+	ConstM44dDataPtr transform;
+	SceneInterface::NameList sets;
 
-		ConstCompoundObjectPtr globals;
+	tbb::spin_mutex childrenMutex;
+	std::vector<std::unique_ptr<LocationSample>> children;
+
+};
 
-		ConstObjectPtr object = scene->objectPlug()->getValue();
-		Imath::Box3f bound = scene->boundPlug()->getValue();
+struct FrameSample
+{
+
+	FrameSample( const std::string &fileName, float time )
+		:	fileName( fileName ), time( time ), root( InternedString() ), memoryUsage( 0 )
+	{
+	}
+
+	const std::string fileName;
+	const float time;
+	LocationSample root;
+	// The memory used by the objects and attributes sampled.
+	std::atomic<size_t> memoryUsage;
+
+};
 
-		IECore::M44dDataPtr transformData;
+using FrameSamplePtr = std::shared_ptr<FrameSample>;
+
+// Hashes of the samples computed for a location on the previous frame.
+struct SampleHashes
+{
+	MurmurHash attributes;
+	MurmurHash globals;
+	MurmurHash object;
+	MurmurHash transform;
+};
+
+using SampleHashesMap = tbb::concurrent_unordered_map<std::string, SampleHashes>;
+
+// Computes the samples for a location. This is lock free, so is run in parallel
+// across all locations, and can also run concurrently with the writing of a
+// previous frame.
+struct LocationSampler
+{
+
+	LocationSampler( FrameSample *frameSample, ConstCompoundDataPtr sets, const SampleHashesMap &previousHashes, SampleHashesMap &hashes )
+		:	m_frameSample( frameSample ), m_sample( &frameSample->root ), m_sets( sets ), m_previousHashes( previousHashes ), m_hashes( hashes )
+	{
+	}
+
+	bool operator()( const ScenePlug *scene, const ScenePlug::ScenePath &scenePath )
+	{
+		// We are copied for each child location, with `m_sample` holding the
+		// sample for the parent location.
+		if( !scenePath.empty() )
+		{
+			m_sample = m_sample->addChild( scenePath.back() );
+		}
+
+		// Each location is visited by only one thread, so it is safe to
+		// modify the hashes in place. We start from the hashes for the
+		// previous frame, and only locations visited on this frame are
+		// carried forward to the next.
+		const std::string pathString = ScenePlug::pathToString( scenePath );
+		SampleHashes &hashes = m_hashes[pathString];
+		auto previousIt = m_previousHashes.find( pathString );
+		if( previousIt != m_previousHashes.end() )
+		{
+			hashes = previousIt->second;
+		}
+
+		const MurmurHash attributesHash = scene->attributesPlug()->hash();
+		if( attributesHash != hashes.attributes )
+		{
+			m_sample->attributes = scene->attributesPlug()->getValue( &attributesHash );
+			m_frameSample->memoryUsage += m_sample->attributes->memoryUsage();
+			hashes.attributes = attributesHash;
+		}
 
 		if( scenePath.empty() )
 		{
-			globals = scene->globals();
+			ScenePlug::GlobalScope globalScope( Context::current() );
+			const MurmurHash globalsHash = scene->globalsPlug()->hash();
+			if( globalsHash != hashes.globals )
+			{
+				m_sample->globals = scene->globalsPlug()->getValue( &globalsHash );
+				hashes.globals = globalsHash;
+			}
 		}
 		else
 		{
-			Imath::M44f t = scene->transformPlug()->getValue();
-			transformData = new IECore::M44dData( Imath::M44d (
-				t[0][0], t[0][1], t[0][2], t[0][3],
-				t[1][0], t[1][1], t[1][2], t[1][3],
-				t[2][0], t[2][1], t[2][2], t[2][3],
-				t[3][0], t[3][1], t[3][2], t[3][3]
-			) );
+			const MurmurHash objectHash = scene->objectPlug()->hash();
+			if( objectHash != hashes.object )
+			{
+				m_sample->object = scene->objectPlug()->getValue( &objectHash );
+				m_frameSample->memoryUsage += m_sample->object->memoryUsage();
+				hashes.object = objectHash;
+			}
+
+			const MurmurHash transformHash = scene->transformPlug()->hash();
+			if( transformHash != hashes.transform )
+			{
+				const Imath::M44f t = scene->transformPlug()->getValue( &transformHash );
+				m_sample->transform = new IECore::M44dData( Imath::M44d (
+					t[0][0], t[0][1], t[0][2], t[0][3],
+					t[1][0], t[1][1], t[1][2], t[1][3],
+					t[2][0], t[2][1], t[2][2], t[2][3],
+					t[3][0], t[3][1], t[3][2], t[3][3]
+				) );
+				hashes.transform = transformHash;
+			}
 		}
 
-		SceneInterface::NameList locationSets;
+		const Imath::Box3f bound = scene->boundPlug()->getValue();
+		m_sample->bound = Imath::Box3d( Imath::V3d( bound.min ), Imath::V3d( bound.max ) );
+
 		const CompoundDataMap &setsMap = m_sets->readable();
-		locationSets.reserve( setsMap.size() );
+		m_sample->sets.reserve( setsMap.size() );
 
 		for( CompoundDataMap::const_iterator it = setsMap.begin(); it != setsMap.end(); ++it)
 		{
@@ -102,55 +212,140 @@ struct LocationWriter
 
 			if( pathMatcher->readable().match( scenePath ) & IECore::PathMatcher::ExactMatch )
 			{
-				locationSets.push_back( it->first );
+				m_sample->sets.push_back( it->first );
 			}
 		}
 
-		tbb::mutex::scoped_lock scopedLock( m_mutex );
+		return true;
+	}
 
-		if( !scenePath.empty() )
-		{
-			m_output = m_output->child( scenePath.back(), SceneInterface::CreateIfMissing );
-		}
+	FrameSample *m_frameSample;
+	LocationSample *m_sample;
+	ConstCompoundDataPtr m_sets;
+	const SampleHashesMap &m_previousHashes;
+	SampleHashesMap &m_hashes;
 
-		for( CompoundObject::ObjectMap::const_iterator it = attributes->members().begin(), eIt = attributes->members().end(); it != eIt; it++ )
+};
+
+// Tracks the last sample written for a property of a location, so that
+// samples which don't change from frame to frame are only written once.
+struct WrittenSample
+{
+
+	template<typename WriteFunctor>
+	void write( const Object *sample, float time, WriteFunctor &&writeFunctor )
+	{
+		if( !sample )
 		{
-			m_output->writeAttribute( it->first, it->second.get(), m_time );
+			// Unchanged since the previous frame. We don't write anything now,
+			// but must remember the time in case the value changes later.
+			if( value )
+			{
+				heldTime = time;
+				held = true;
+			}
+			return;
 		}
 
-		if( globals && !globals->members().empty() )
+		if( held )
 		{
-			m_output->writeAttribute( "gaffer:globals", globals.get(), m_time );
+			// The value was held for several frames before changing. Write
+			// it again at the end of the hold, so that readers don't interpolate
+			// across the whole of the held range.
+			writeFunctor( value.get(), heldTime );
+			held = false;
 		}
 
-		if( object->typeId() != IECore::NullObjectTypeId && scenePath.size() > 0 )
-		{
-			m_output->writeObject( object.get(), m_time );
+		writeFunctor( sample, time );
+		value = sample;
+	}
+
+	ConstObjectPtr value;
+	float heldTime = 0;
+	bool held = false;
+
+};
+
+// Output for a single location, persisting across all the frames
+// written to a file.
+struct LocationOutput
+{
+
+	LocationOutput( SceneInterfacePtr output )
+		:	output( output )
+	{
+	}
+
+	SceneInterfacePtr output;
+	WrittenSample attributes;
+	WrittenSample globals;
+	WrittenSample object;
+	WrittenSample transform;
+	std::unordered_map<InternedString, std::unique_ptr<LocationOutput>> children;
+
+};
+
+void writeLocation( const LocationSample &sample, LocationOutput &location, float time )
+{
+	SceneInterface *output = location.output.get();
+
+	location.attributes.write(
+		sample.attributes.get(), time,
+		[output] ( const Object *attributes, float time ) {
+			for( const auto &attribute : static_cast<const CompoundObject *>( attributes )->members() )
+			{
+				output->writeAttribute( attribute.first, attribute.second.get(), time );
+			}
 		}
+	);
 
-		m_output->writeBound( Imath::Box3d( Imath::V3f( bound.min ), Imath::V3f( bound.max ) ), m_time );
+	location.globals.write(
+		sample.globals.get(), time,
+		[output] ( const Object *globals, float time ) {
+			if( !static_cast<const CompoundObject *>( globals )->members().empty() )
+			{
+				output->writeAttribute( "gaffer:globals", globals, time );
+			}
+		}
+	);
 
-		if( transformData )
-		{
-			m_output->writeTransform( transformData.get(), m_time );
+	location.object.write(
+		sample.object.get(), time,
+		[output] ( const Object *object, float time ) {
+			if( object->typeId() != IECore::NullObjectTypeId )
+			{
+				output->writeObject( object, time );
+			}
 		}
+	);
 
-		if( !locationSets.empty() )
-		{
-			m_output->writeTags( locationSets );
+	output->writeBound( sample.bound, time );
+
+	location.transform.write(
+		sample.transform.get(), time,
+		[output] ( const Object *transform, float time ) {
+			output->writeTransform( static_cast<const Data *>( transform ), time );
 		}
+	);
 
-		return true;
+	if( !sample.sets.empty() )
+	{
+		output->writeTags( sample.sets );
 	}
 
-	SceneInterfacePtr m_output;
-	ConstCompoundDataPtr m_sets;
-	float m_time;
-	tbb::mutex &m_mutex;
-};
-
+	for( const auto &childSample : sample.children )
+	{
+		std::unique_ptr<LocationOutput> &child = location.children[childSample->name];
+		if( !child )
+		{
+			child.reset( new LocationOutput( output->child( childSample->name, SceneInterface::CreateIfMissing ) ) );
+		}
+		writeLocation( *childSample, *child, time );
+	}
 }
 
+} // namespace
+
 GAFFER_NODE_DEFINE_TYPE( SceneWriter );
 
 size_t SceneWriter::g_firstPlugIndex = 0;
@@ -230,26 +425,83 @@ void SceneWriter::executeSequence( const std::vector<float> &frames ) const
 		throw IECore::Exception( "No input scene" );
 	}
 
-	SceneInterfacePtr output;
-	tbb::mutex mutex;
-	ContextPtr context = new Context( *Context::current() );
-	Context::Scope scopedContext( context.get() );
+	const ThreadState &threadState = ThreadState::current();
 
-	for( std::vector<float>::const_iterator it = frames.begin(); it != frames.end(); ++it )
-	{
-		context->setFrame( *it );
+	// State used when computing frames.
+	std::vector<float>::const_iterator frameIt = frames.begin();
+	std::string sampledFileName;
+	SampleHashesMap previousHashes;
+
+	auto computeFrame = [&] () -> FrameSamplePtr {
+
+		Context::EditableScope frameScope( threadState );
+		frameScope.setFrame( *frameIt++ );
 
 		const std::string fileName = fileNamePlug()->getValue();
-		if( !output || output->fileName() != fileName )
+		if( fileName != sampledFileName )
 		{
-			createDirectories( fileName );
-			output = SceneInterface::create( fileName, IndexedIO::Write );
+			// We'll be writing to a new file, so we must
+			// compute everything afresh.
+			previousHashes.clear();
+			sampledFileName = fileName;
 		}
 
-		ConstCompoundDataPtr sets = SceneAlgo::sets( scene );
-		LocationWriter locationWriter( output, sets, context->getTime(), mutex );
+		FrameSamplePtr frameSample = std::make_shared<FrameSample>( fileName, Context::current()->getTime() );
+
+		SampleHashesMap hashes;
+		LocationSampler locationSampler( frameSample.get(), SceneAlgo::sets( scene ), previousHashes, hashes );
+		SceneAlgo::parallelProcessLocations( scene, locationSampler );
+		previousHashes.swap( hashes );
 
-		SceneAlgo::parallelProcessLocations( scene, locationWriter );
+		return frameSample;
+	};
+
+	// State used when writing frames.
+	std::unique_ptr<LocationOutput> rootOutput;
+
+	auto writeFrame = [&] ( const FrameSample &frameSample ) {
+
+		if( !rootOutput || rootOutput->output->fileName() != frameSample.fileName )
+		{
+			// Close the previous file before opening the next.
+			rootOutput.reset();
+			createDirectories( frameSample.fileName );
+			rootOutput.reset( new LocationOutput( SceneInterface::create( frameSample.fileName, IndexedIO::Write ) ) );
+		}
+
+		writeLocation( frameSample.root, *rootOutput, frameSample.time );
+	};
+
+	// We compute the next frame while writing the current one, provided
+	// that the memory used by their samples is within budget. We assume
+	// that the next frame will use no more memory than the current one,
+	// which is typical because unchanged samples are not computed at all.
+	// Frames are still computed and written in order, because the
+	// deduplication of samples relies on it.
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated ); // Prevents outer tasks silently cancelling our tasks
+	FrameSamplePtr frameSample = computeFrame();
+	while( frameSample )
+	{
+		FrameSamplePtr nextFrameSample;
+		if( frameIt != frames.end() && frameSample->memoryUsage <= g_maxMemoryInFlight / 2 )
+		{
+			tbb::parallel_invoke(
+				[&] { writeFrame( *frameSample ); },
+				[&] { nextFrameSample = computeFrame(); },
+				taskGroupContext
+			);
+		}
+		else
+		{
+			writeFrame( *frameSample );
+			// Release the samples before computing the next frame.
+			frameSample.reset();
+			if( frameIt != frames.end() )
+			{
+				nextFrameSample = computeFrame();
+			}
+		}
+		frameSample = nextFrameSample;
 	}
 }
 
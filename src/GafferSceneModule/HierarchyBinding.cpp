@@ -44,6 +44,7 @@
 #include "GafferScene/Encapsulate.h"
 #include "GafferScene/Group.h"
 #include "GafferScene/Instancer.h"
+#include "GafferScene/InstancerCapsule.h"
 #include "GafferScene/Isolate.h"
 #include "GafferScene/MergeScenes.h"
 #include "GafferScene/Parent.h"
@@ -82,6 +83,36 @@ ContextPtr context( const Capsule &c )
 	return const_cast<Context *>( c.context() );
 }
 
+boost::python::list prototypes( const InstancerCapsule &c )
+{
+	boost::python::list result;
+	for( const auto &p : c.prototypes() )
+	{
+		result.append( CapsulePtr( const_cast<Capsule *>( p.get() ) ) );
+	}
+	return result;
+}
+
+IECore::IntVectorDataPtr prototypeIndices( const InstancerCapsule &c )
+{
+	return c.prototypeIndices()->copy();
+}
+
+IECore::InternedStringVectorDataPtr names( const InstancerCapsule &c )
+{
+	return c.names()->copy();
+}
+
+IECore::M44fVectorDataPtr transforms( const InstancerCapsule &c )
+{
+	return c.transforms()->copy();
+}
+
+IECore::CompoundDataPtr attributes( const InstancerCapsule &c )
+{
+	return c.attributes()->copy();
+}
+
 } // namespace
 
 void GafferSceneModule::bindHierarchy()
@@ -102,6 +133,15 @@ void GafferSceneModule::bindHierarchy()
 		.def( "context", &context )
 	;
 
+	IECorePython::RunTimeTypedClass<InstancerCapsule>()
+		.def( "numInstances", &InstancerCapsule::numInstances )
+		.def( "prototypes", &prototypes )
+		.def( "prototypeIndices", &prototypeIndices )
+		.def( "names", &names )
+		.def( "transforms", &transforms )
+		.def( "attributes", &attributes )
+	;
+
 	GafferBindings::DependencyNodeClass<Group>()
 		.def( "nextInPlug", (ScenePlug *(Group::*)())&Group::nextInPlug, return_value_policy<CastToIntrusivePtr>() )
 	;
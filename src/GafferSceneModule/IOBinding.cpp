@@ -45,6 +45,8 @@
 
 #include "GafferBindings/DependencyNodeBinding.h"
 
+#include "IECorePython/ScopedGILRelease.h"
+
 using namespace GafferScene;
 
 namespace
@@ -64,6 +66,13 @@ boost::python::list supportedExtensions()
 	return result;
 }
 
+IECore::CompoundDataPtr allSetsWrapper( const SceneReader &sceneReader, bool copy )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	IECore::ConstCompoundDataPtr result = sceneReader.allSets();
+	return copy ? result->copy() : boost::const_pointer_cast<IECore::CompoundData>( result );
+}
+
 } // namespace
 
 void GafferSceneModule::bindIO()
@@ -72,6 +81,7 @@ void GafferSceneModule::bindIO()
 	GafferBindings::DependencyNodeClass<SceneReader>()
 		.def( "supportedExtensions", &supportedExtensions )
 		.staticmethod( "supportedExtensions" )
+		.def( "allSets", &allSetsWrapper, ( boost::python::arg( "_copy" ) = true ) )
 	;
 
 	typedef GafferDispatchBindings::TaskNodeWrapper<SceneWriter> SceneWriterWrapper;
@@ -44,7 +44,9 @@
 
 #include "Gaffer/Context.h"
 
+#include "IECorePython/ExceptionAlgo.h"
 #include "IECorePython/RefCountedBinding.h"
+#include "IECorePython/ScopedGILLock.h"
 
 using namespace boost::python;
 
@@ -103,6 +105,61 @@ void updateMatchingPaths( RenderController &r, const IECore::PathMatcher &pathsT
 	r.updateMatchingPaths( pathsToUpdate );
 }
 
+// The RenderController may copy and destroy the function without
+// holding the GIL, so we hold the Python function via a shared pointer
+// which acquires the GIL before deleting it.
+struct PriorityFunctionWrapper
+{
+
+	PriorityFunctionWrapper( object pythonFunction )
+		:	m_pythonFunction(
+				new object( pythonFunction ),
+				[] ( object *o ) {
+					IECorePython::ScopedGILLock gilLock;
+					delete o;
+				}
+			)
+	{
+	}
+
+	float operator()( const Box3f &bound )
+	{
+		IECorePython::ScopedGILLock gilLock;
+		try
+		{
+			return extract<float>( (*m_pythonFunction)( bound ) );
+		}
+		catch( const error_already_set &e )
+		{
+			IECorePython::ExceptionAlgo::translatePythonException();
+		}
+		return 0.0f;
+	}
+
+	private :
+
+		std::shared_ptr<object> m_pythonFunction;
+
+};
+
+void updatePriorityLocations( RenderController &r, object priorityFunction )
+{
+	const RenderController::PriorityFunction f = PriorityFunctionWrapper( priorityFunction );
+	IECorePython::ScopedGILRelease gilRelease;
+	r.updatePriorityLocations( f );
+}
+
+void setExpansionBudget( RenderController &r, size_t budget, object expansionFunction )
+{
+	RenderController::PriorityFunction f;
+	if( expansionFunction != object() )
+	{
+		f = PriorityFunctionWrapper( expansionFunction );
+	}
+	IECorePython::ScopedGILRelease gilRelease;
+	r.setExpansionBudget( budget, f );
+}
+
 } // namespace
 
 void GafferSceneModule::bindRenderController()
@@ -119,9 +176,13 @@ void GafferSceneModule::bindRenderController()
 		.def( "getExpandedPaths", &RenderController::getExpandedPaths, return_value_policy<copy_const_reference>() )
 		.def( "setMinimumExpansionDepth", &setMinimumExpansionDepth )
 		.def( "getMinimumExpansionDepth", &RenderController::getMinimumExpansionDepth )
+		.def( "setExpansionBudget", &setExpansionBudget, ( arg( "budget" ), arg( "expansionFunction" ) = object() ) )
+		.def( "getExpansionBudget", &RenderController::getExpansionBudget )
+		.def( "getBudgetExpandedPaths", &RenderController::getBudgetExpandedPaths, return_value_policy<copy_const_reference>() )
 		.def( "updateRequiredSignal", &RenderController::updateRequiredSignal, return_internal_reference<1>() )
 		.def( "update", &update )
 		.def( "updateMatchingPaths", &updateMatchingPaths )
+		.def( "updatePriorityLocations", &updatePriorityLocations )
 	;
 
 	SignalClass<RenderController::UpdateRequiredSignal>( "UpdateRequiredSignal" );
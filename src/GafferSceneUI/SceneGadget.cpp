@@ -40,6 +40,12 @@
 
 #include "Gaffer/BackgroundTask.h"
 
+#include "IECoreScene/Camera.h"
+
+#include "OpenEXR/ImathBoxAlgo.h"
+#include "OpenEXR/ImathFrustum.h"
+#include "OpenEXR/ImathFrustumTest.h"
+
 #include "boost/bind.hpp"
 
 using namespace std;
@@ -61,6 +67,90 @@ namespace
 		const float f = - ( m[15] - m[14] ) / ( m[11] - m[10] );
 		return ( 2.0f * n * f ) / ( f + n - ( bufferDepth * 2.0f - 1.0f ) * ( f - n ) );
 	}
+
+	// Scores bounds according to how they are seen by the
+	// viewport's camera.
+	class CameraScorer
+	{
+
+		public :
+
+			CameraScorer( const ViewportGadget *viewportGadget, const M44f &cameraTransform )
+				:	m_valid( false ), m_orthographic( false ), m_pixelsPerUnit( 0.0f ), m_near( 0.0f ), m_cameraPosition( 0.0f )
+			{
+				const IECoreScene::Camera *camera = viewportGadget->getCamera().get();
+				const V2i viewport = viewportGadget->getViewport();
+				if( viewport.x <= 0 || viewport.y <= 0 )
+				{
+					return;
+				}
+
+				const V2f clippingPlanes = camera->getClippingPlanes();
+				m_orthographic = camera->getProjection() == "orthographic";
+				Box2f screenWindow = camera->frustum( camera->getFilmFit(), (float)viewport.x / (float)viewport.y );
+				m_pixelsPerUnit = (float)viewport.x / screenWindow.size().x;
+				m_near = clippingPlanes[0];
+				if( !m_orthographic )
+				{
+					// `Camera::frustum()` is specified at a distance of 1, but
+					// `Imath::Frustum` expects it at the near clipping plane.
+					screenWindow.min *= m_near;
+					screenWindow.max *= m_near;
+				}
+
+				const Frustumf frustum(
+					clippingPlanes[0], clippingPlanes[1],
+					screenWindow.min.x, screenWindow.max.x, screenWindow.max.y, screenWindow.min.y,
+					m_orthographic
+				);
+
+				m_frustumTest.setFrustum( frustum, cameraTransform );
+				m_cameraPosition = V3f( 0.0f ) * cameraTransform;
+				m_valid = true;
+			}
+
+			bool valid() const
+			{
+				return m_valid;
+			}
+
+			// Returns a positive score for visible bounds, with higher
+			// scores for bounds nearer to the camera.
+			float priority( const Box3f &bound ) const
+			{
+				if( !m_frustumTest.isVisible( bound ) )
+				{
+					return 0.0f;
+				}
+				return 1.0f / ( 1.0f + distance( bound ) );
+			}
+
+			// Returns the approximate size of visible bounds in pixels.
+			float screenSize( const Box3f &bound ) const
+			{
+				if( !m_frustumTest.isVisible( bound ) )
+				{
+					return 0.0f;
+				}
+				const float size = bound.size().length() * m_pixelsPerUnit;
+				return m_orthographic ? size : size / std::max( distance( bound ), m_near );
+			}
+
+		private :
+
+			float distance( const Box3f &bound ) const
+			{
+				return ( closestPointInBox( m_cameraPosition, bound ) - m_cameraPosition ).length();
+			}
+
+			bool m_valid;
+			bool m_orthographic;
+			float m_pixelsPerUnit;
+			float m_near;
+			FrustumTest<float> m_frustumTest;
+			V3f m_cameraPosition;
+
+	};
 }
 
 //////////////////////////////////////////////////////////////////////////
@@ -70,6 +160,7 @@ namespace
 SceneGadget::SceneGadget()
 	:	Gadget( defaultName<SceneGadget>() ),
 		m_paused( false ),
+		m_expansionBudget( 0 ),
 		m_renderer( IECoreScenePreview::Renderer::create( "OpenGL", IECoreScenePreview::Renderer::Interactive ) ),
 		m_controller( nullptr, nullptr, m_renderer ),
 		m_updateErrored( false ),
@@ -140,6 +231,28 @@ size_t SceneGadget::getMinimumExpansionDepth() const
 	return m_controller.getMinimumExpansionDepth();
 }
 
+void SceneGadget::setExpansionBudget( size_t budget )
+{
+	if( budget == m_expansionBudget )
+	{
+		return;
+	}
+
+	m_expansionBudget = budget;
+	// Force `updateRenderer()` to pass the budget to the controller.
+	m_expansionCameraHash = IECore::MurmurHash();
+	if( !m_expansionBudget )
+	{
+		m_controller.setExpansionBudget( 0 );
+	}
+	dirty( DirtyType::Bound );
+}
+
+size_t SceneGadget::getExpansionBudget() const
+{
+	return m_expansionBudget;
+}
+
 void SceneGadget::setPaused( bool paused )
 {
 	if( paused == m_paused )
@@ -520,6 +633,29 @@ void SceneGadget::updateRenderer()
 		m_updateTask.reset();
 	}
 
+	const ViewportGadget *viewportGadget = ancestor<ViewportGadget>();
+	const M44f cameraTransform = viewportGadget ? viewportGadget->getCameraTransform() * fullTransform().inverse() : M44f();
+
+	if( m_expansionBudget && viewportGadget )
+	{
+		// The automatic expansion depends on the camera, so must
+		// be recomputed whenever it changes.
+		IECore::MurmurHash cameraHash = viewportGadget->getCamera()->hash();
+		cameraHash.append( cameraTransform );
+		cameraHash.append( viewportGadget->getViewport() );
+		if( cameraHash != m_expansionCameraHash )
+		{
+			m_expansionCameraHash = cameraHash;
+			const CameraScorer scorer( viewportGadget, cameraTransform );
+			RenderController::PriorityFunction expansionFunction;
+			if( scorer.valid() )
+			{
+				expansionFunction = [scorer] ( const Box3f &bound ) { return scorer.screenSize( bound ); };
+			}
+			m_controller.setExpansionBudget( m_expansionBudget, expansionFunction );
+		}
+	}
+
 	if( !m_controller.updateRequired() )
 	{
 		return;
@@ -575,8 +711,18 @@ void SceneGadget::updateRenderer()
 		}
 	}
 
+	RenderController::PriorityFunction priorityFunction;
+	if( viewportGadget )
+	{
+		const CameraScorer scorer( viewportGadget, cameraTransform );
+		if( scorer.valid() )
+		{
+			priorityFunction = [scorer] ( const Box3f &bound ) { return scorer.priority( bound ); };
+		}
+	}
+
 	m_updateErrored = false;
-	m_updateTask = m_controller.updateInBackground( progressCallback, m_priorityPaths );
+	m_updateTask = m_controller.updateInBackground( progressCallback, m_priorityPaths, priorityFunction );
 	stateChangedSignal()( this );
 
 	// Give ourselves a 0.1s grace period in which we block
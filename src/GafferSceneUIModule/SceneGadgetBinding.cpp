@@ -85,6 +85,12 @@ void setMinimumExpansionDepth( SceneGadget &g, size_t depth )
 	g.setMinimumExpansionDepth( depth );
 }
 
+void setExpansionBudget( SceneGadget &g, size_t budget )
+{
+	ScopedGILRelease gilRelease;
+	g.setExpansionBudget( budget );
+}
+
 void setPaused( SceneGadget &g, bool paused )
 {
 	ScopedGILRelease gilRelease;
@@ -160,6 +166,8 @@ void GafferSceneUIModule::bindSceneGadget()
 		.def( "getExpandedPaths", &SceneGadget::getExpandedPaths, return_value_policy<copy_const_reference>() )
 		.def( "setMinimumExpansionDepth", &setMinimumExpansionDepth )
 		.def( "getMinimumExpansionDepth", &SceneGadget::getMinimumExpansionDepth )
+		.def( "setExpansionBudget", &setExpansionBudget )
+		.def( "getExpansionBudget", &SceneGadget::getExpansionBudget )
 		.def( "getPaused", &SceneGadget::getPaused )
 		.def( "setPaused", &setPaused )
 		.def( "state", &SceneGadget::state )